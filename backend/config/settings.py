@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 import os
 from pathlib import Path
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 # PyMySQL을 MySQLdb로 사용 (mysqlclient 대체)
@@ -94,11 +95,21 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# MySQL 연결 풀 (data_sources.pool - 워커 프로세스 + DB 별칭별)
+# SIZE는 요청 스레드 1 + DATA_QUERY_BATCH_WORKERS 이상 권장, 모두 사용 중이면 TIMEOUT_MS까지 대기
+# 유휴 PING_INTERVAL초 초과 연결은 ping 후 사용, RECYCLE초보다 오래된 연결은 재연결 (MySQL wait_timeout보다 짧게)
+DB_POOL_ENABLED = os.environ.get('DB_POOL_ENABLED', 'True') == 'True'
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+DB_POOL_TIMEOUT_MS = int(os.environ.get('DB_POOL_TIMEOUT_MS', '5000'))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '3600'))
+DB_POOL_PING_INTERVAL = int(os.environ.get('DB_POOL_PING_INTERVAL', '30'))
+
 # MySQL 데이터베이스 설정
 # TODO: 사내 환경에서는 MYSQL_HOST 환경변수를 적절히 설정하세요
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        # django.db.backends.mysql + 연결 풀 (DB_POOL_ENABLED=False면 기본 백엔드와 동일)
+        "ENGINE": "data_sources.backends.mysql",
         "NAME": os.environ.get('MYSQL_DATABASE', 'email_reports'),
         "USER": os.environ.get('MYSQL_USER', 'django_user'),
         "PASSWORD": os.environ.get('MYSQL_PASSWORD', 'django_password'),
@@ -108,9 +119,32 @@ DATABASES = {
             'charset': 'utf8mb4',
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
         },
+        # 풀 사용 시 0 유지 (요청 종료마다 풀에 반납), 풀 미사용 시 연결 유지 시간(초)
+        "CONN_MAX_AGE": 0 if DB_POOL_ENABLED else int(os.environ.get('DB_CONN_MAX_AGE', '0')),
+        "CONN_HEALTH_CHECKS": not DB_POOL_ENABLED,
     }
 }
 
+# 분석 조회용 읽기 복제본 (data_sources.replicas - 리포트 데이터 조회 SELECT만 복제본에서 실행)
+# 쉼표로 여러 개 지정 (host 또는 host:port) → DATABASES['analytics'], ['analytics_2'], ...
+# 비어 있으면 모든 조회를 default(primary)에서 실행
+MYSQL_REPLICA_HOSTS = [
+    host.strip() for host in os.environ.get('MYSQL_REPLICA_HOSTS', '').split(',') if host.strip()
+]
+for index, replica in enumerate(MYSQL_REPLICA_HOSTS):
+    replica_host, _, replica_port = replica.partition(':')
+    DATABASES['analytics' if index == 0 else f'analytics_{index + 1}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'USER': os.environ.get('MYSQL_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.environ.get('MYSQL_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# ORM(메타데이터)은 항상 default, 복제본에는 마이그레이션 미실행
+DATABASE_ROUTERS = ['data_sources.replicas.AnalyticsRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -205,6 +239,107 @@ SPECTACULAR_SETTINGS = {
 }
 
 
+# Data query settings
+# 데이터 조회 계층(스키마 레지스트리 등) 설정
+
+# 프로세스 간 캐시 무효화 스탬프 파일 디렉토리 (기본: 시스템 임시 디렉토리)
+DATA_QUERY_STATE_DIR = os.environ.get('DATA_QUERY_STATE_DIR', '')
+
+# 스키마 레지스트리 최대 보관 시간 (초) - 무효화 신호 유실 대비 안전장치
+DATA_SOURCE_SCHEMA_TTL = int(os.environ.get('DATA_SOURCE_SCHEMA_TTL', '300'))
+
+# 조회 결과 캐시 (키: 정규화된 요청 + 테이블 데이터 버전, load_fcc_data 실행 시 버전 갱신)
+# L2_BACKEND: '' (사용 안 함), 'django' (CACHES[L2_CACHE_ALIAS]), 'file' (L2_LOCATION 디렉토리)
+# L2_MAX_ENTRIES / L2_MAX_BYTES: 'file' 저장소 한도 (넘으면 오래된 파일부터 삭제)
+DATA_QUERY_CACHE = {
+    'ENABLED': os.environ.get('DATA_QUERY_CACHE_ENABLED', 'True') == 'True',
+    'MAX_ENTRIES': int(os.environ.get('DATA_QUERY_CACHE_MAX_ENTRIES', '512')),
+    'MAX_BYTES': int(os.environ.get('DATA_QUERY_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+    'L2_BACKEND': os.environ.get('DATA_QUERY_CACHE_L2_BACKEND', ''),
+    'L2_CACHE_ALIAS': os.environ.get('DATA_QUERY_CACHE_L2_CACHE_ALIAS', 'default'),
+    'L2_LOCATION': os.environ.get('DATA_QUERY_CACHE_L2_LOCATION', ''),
+    'L2_TIMEOUT': int(os.environ.get('DATA_QUERY_CACHE_L2_TIMEOUT', str(24 * 60 * 60))),
+    'L2_MAX_ENTRIES': int(os.environ.get('DATA_QUERY_CACHE_L2_MAX_ENTRIES', '4096')),
+    'L2_MAX_BYTES': int(os.environ.get('DATA_QUERY_CACHE_L2_MAX_BYTES', str(256 * 1024 * 1024))),
+}
+
+# 컴파일된 SQL 실행 계획 캐시 크기 (요청 구조별 1항목, 워커 프로세스 단위)
+DATA_QUERY_PLAN_CACHE_SIZE = int(os.environ.get('DATA_QUERY_PLAN_CACHE_SIZE', '256'))
+
+# 사전 집계(롤업) 테이블 자동 라우팅 (python manage.py build_rollups로 빌드)
+DATA_QUERY_ROLLUP_ROUTING = os.environ.get('DATA_QUERY_ROLLUP_ROUTING', 'True') == 'True'
+
+# 일괄 조회 (/api/data-sources/query/batch/) 동시 실행 스레드 수 및 최대 요청 수
+DATA_QUERY_BATCH_WORKERS = int(os.environ.get('DATA_QUERY_BATCH_WORKERS', '4'))
+DATA_QUERY_BATCH_MAX_SIZE = int(os.environ.get('DATA_QUERY_BATCH_MAX_SIZE', '20'))
+
+# 스트리밍 조회 ("stream": true) 최대 행 수 및 서버 측 커서 fetch 단위
+DATA_QUERY_STREAM_MAX_ROWS = int(os.environ.get('DATA_QUERY_STREAM_MAX_ROWS', '1000000'))
+DATA_QUERY_STREAM_CHUNK_SIZE = int(os.environ.get('DATA_QUERY_STREAM_CHUNK_SIZE', '2000'))
+
+# DECIMAL 결과(정수 컬럼의 AVG/SUM 등)를 float로 변환 (False면 Decimal 유지 → JSON 렌더러가 변환)
+DATA_QUERY_DECIMAL_AS_FLOAT = os.environ.get('DATA_QUERY_DECIMAL_AS_FLOAT', 'True') == 'True'
+
+# 차원 필터 (filters) IN/NOT IN 목록 최대 값 수 및 임시 테이블 조회 기준 값 수
+# TEMP_TABLE_MIN개 이상이면 값을 연결별 임시 테이블에 적재 후 IN (SELECT ...)로 조회
+DATA_QUERY_FILTER_MAX_VALUES = int(os.environ.get('DATA_QUERY_FILTER_MAX_VALUES', '10000'))
+DATA_QUERY_FILTER_TEMP_TABLE_MIN = int(os.environ.get('DATA_QUERY_FILTER_TEMP_TABLE_MIN', '200'))
+
+# 빈 구간 채우기 (fill) 최대 행 수 (bucket 수 × 계열 수, 초과 시 채우지 않고 응답)
+DATA_QUERY_FILL_MAX_ROWS = int(os.environ.get('DATA_QUERY_FILL_MAX_ROWS', '100000'))
+
+# 근사 집계 (accuracy="approximate") 그룹별 최소 샘플 행 수 (미만이면 422로 거부)
+DATA_QUERY_SAMPLE_MIN_ROWS = int(os.environ.get('DATA_QUERY_SAMPLE_MIN_ROWS', '100'))
+
+# 조회 비용 제한 (cost guard) - DataSource별 max_examined_rows/max_execution_ms가 우선
+# EXPLAIN 예상 행 수 예산, MAX_EXECUTION_TIME 힌트 (gunicorn 기본 timeout 30초보다 짧게)
+DATA_QUERY_COST_GUARD = os.environ.get('DATA_QUERY_COST_GUARD', 'True') == 'True'
+DATA_QUERY_MAX_EXAMINED_ROWS = int(os.environ.get('DATA_QUERY_MAX_EXAMINED_ROWS', '5000000'))
+DATA_QUERY_MAX_EXECUTION_MS = int(os.environ.get('DATA_QUERY_MAX_EXECUTION_MS', '20000'))
+# 예산 초과 집계(AVG/SUM/COUNT)를 샘플 테이블 근사 집계로 낮춰 응답 (False면 422로 거부)
+DATA_QUERY_COST_DOWNGRADE = os.environ.get('DATA_QUERY_COST_DOWNGRADE', 'True') == 'True'
+# EXPLAIN 추정 캐시 최대 항목 수 (워커 프로세스당)
+DATA_QUERY_COST_CACHE_SIZE = int(os.environ.get('DATA_QUERY_COST_CACHE_SIZE', '1024'))
+
+# 동시 실행 제한 (admission control) - 캐시 미스 조회만 슬롯 사용, 전체 워커 합계 기준
+# DataSource별 max_concurrent_queries가 DATA_QUERY_MAX_CONCURRENT_PER_SOURCE보다 우선
+DATA_QUERY_ADMISSION = os.environ.get('DATA_QUERY_ADMISSION', 'True') == 'True'
+DATA_QUERY_MAX_CONCURRENT = int(os.environ.get('DATA_QUERY_MAX_CONCURRENT', '6'))
+DATA_QUERY_MAX_CONCURRENT_PER_SOURCE = int(os.environ.get('DATA_QUERY_MAX_CONCURRENT_PER_SOURCE', '4'))
+# 슬롯 대기열 크기와 최대 대기 시간 (초과 시 503 + Retry-After)
+DATA_QUERY_QUEUE_SIZE = int(os.environ.get('DATA_QUERY_QUEUE_SIZE', '64'))
+DATA_QUERY_QUEUE_TIMEOUT_MS = int(os.environ.get('DATA_QUERY_QUEUE_TIMEOUT_MS', '5000'))
+
+# 동일 조회 병합 (single-flight) - 동시에 들어온 같은 조회는 워커 내부/워커 간 1회만 실행
+# 결과를 기다리는 최대 시간 (초과 시 직접 실행, gunicorn 기본 timeout 30초보다 짧게)
+DATA_QUERY_SINGLEFLIGHT = os.environ.get('DATA_QUERY_SINGLEFLIGHT', 'True') == 'True'
+DATA_QUERY_SINGLEFLIGHT_TIMEOUT_MS = int(os.environ.get('DATA_QUERY_SINGLEFLIGHT_TIMEOUT_MS', '25000'))
+
+# 비동기 조회 엔드포인트 (query/async/, query/batch/async/ - uvicorn 워커에서 aiomysql 연결 풀 사용)
+# aiomysql 미설치 또는 False면 같은 엔드포인트가 동기 실행 경로를 스레드에서 실행
+# 연결 풀 크기는 워커(이벤트 루프)별, RECYCLE초보다 오래된 연결은 재연결 (MySQL wait_timeout보다 짧게)
+DATA_QUERY_ASYNC = os.environ.get('DATA_QUERY_ASYNC', 'True') == 'True'
+DATA_QUERY_ASYNC_POOL_MIN = int(os.environ.get('DATA_QUERY_ASYNC_POOL_MIN', '1'))
+DATA_QUERY_ASYNC_POOL_MAX = int(os.environ.get('DATA_QUERY_ASYNC_POOL_MAX', '10'))
+DATA_QUERY_ASYNC_POOL_RECYCLE = int(os.environ.get('DATA_QUERY_ASYNC_POOL_RECYCLE', '3600'))
+
+# 읽기 복제본 라우팅 (MYSQL_REPLICA_HOSTS 설정 시)
+# 지연이 MAX_LAG초를 넘거나 최근 적재/빌드를 아직 반영하지 못한 복제본 대신 primary에서 실행
+# 복제본 상태(지연, 연결)는 워커별로 CHECK_INTERVAL초마다 확인
+DATA_QUERY_REPLICA_ROUTING = os.environ.get('DATA_QUERY_REPLICA_ROUTING', 'True') == 'True'
+DATA_QUERY_REPLICA_MAX_LAG = int(os.environ.get('DATA_QUERY_REPLICA_MAX_LAG', '30'))
+DATA_QUERY_REPLICA_CHECK_INTERVAL = int(os.environ.get('DATA_QUERY_REPLICA_CHECK_INTERVAL', '5'))
+
+# 백분위 집계 (P50/P75/P95/P99) 정확 계산 기준
+# 날짜 범위가 이 일수 이하이거나 스케치가 없으면 원본 행으로 정확히 계산 (최대 행 수 초과 시 422)
+DATA_QUERY_PERCENTILE_EXACT_DAYS = int(os.environ.get('DATA_QUERY_PERCENTILE_EXACT_DAYS', '7'))
+DATA_QUERY_PERCENTILE_EXACT_MAX_ROWS = int(os.environ.get('DATA_QUERY_PERCENTILE_EXACT_MAX_ROWS', '500000'))
+
+# 조회 형태 수집 (advise_indexes 인덱스 추천 입력) 및 DB 반영 주기 (초)
+DATA_QUERY_SHAPE_TRACKING = os.environ.get('DATA_QUERY_SHAPE_TRACKING', 'True') == 'True'
+DATA_QUERY_SHAPE_FLUSH_INTERVAL = int(os.environ.get('DATA_QUERY_SHAPE_FLUSH_INTERVAL', '60'))
+
+
 # CORS settings
 # https://github.com/adamchainz/django-cors-headers
 
@@ -223,6 +358,8 @@ else:
 # iframe 삽입을 위한 설정
 # TODO: 프로덕션에서는 특정 도메인만 허용하도록 설정
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ['X-Cache', 'Retry-After']  # 캐시 적중 여부, 동시 실행 대기 초과 시 재시도 간격
+CORS_ALLOW_HEADERS = (*default_headers, 'x-query-priority')  # 조회 우선순위 (admission control)
 X_FRAME_OPTIONS = 'ALLOWALL'  # iframe 허용 (프로덕션에서는 SAMEORIGIN 또는 DENY 권장)
 
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# 데이터 소스 스키마 레지스트리 예열 (워커별 1회)
+from data_sources.registry import warm_schema_registry  # noqa: E402
+
+warm_schema_registry()
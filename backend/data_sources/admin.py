@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import DataSource
+from .models import (
+    DataSource, IndexRecommendation, PercentileSketch, QueryShape, Rollup, SampleTable
+)
 
 
 @admin.register(DataSource)
@@ -14,6 +16,16 @@ class DataSourceAdmin(admin.ModelAdmin):
         ('기본 정보', {
             'fields': ('name', 'table_name', 'description', 'is_active')
         }),
+        ('조회 비용 제한', {
+            'fields': ('max_examined_rows', 'max_execution_ms'),
+            'classes': ('collapse',),
+            'description': '비워두면 settings의 DATA_QUERY_MAX_EXAMINED_ROWS / DATA_QUERY_MAX_EXECUTION_MS 사용'
+        }),
+        ('동시 실행 제한', {
+            'fields': ('max_concurrent_queries',),
+            'classes': ('collapse',),
+            'description': '비워두면 settings의 DATA_QUERY_MAX_CONCURRENT_PER_SOURCE 사용'
+        }),
         ('메타데이터', {
             'fields': ('columns_metadata',),
             'classes': ('collapse',),
@@ -29,3 +41,100 @@ class DataSourceAdmin(admin.ModelAdmin):
         """활성/비활성 모두 표시"""
         qs = super().get_queryset(request)
         return qs
+
+
+@admin.register(Rollup)
+class RollupAdmin(admin.ModelAdmin):
+    """롤업 테이블 Admin"""
+    list_display = ['__str__', 'grain', 'is_active', 'last_built_at']
+    list_filter = ['grain', 'is_active', 'data_source']
+    readonly_fields = ['last_built_at', 'created_at', 'updated_at']
+
+    fieldsets = (
+        ('기본 정보', {
+            'fields': ('data_source', 'date_column', 'grain', 'is_active')
+        }),
+        ('집계 설정', {
+            'fields': ('dimensions', 'measures'),
+            'description': 'JSON 배열 형식: ["fcc_group"], ["fcc"] (빌드: python manage.py build_rollups)'
+        }),
+        ('메타 정보', {
+            'fields': ('last_built_at', 'created_at', 'updated_at'),
+            'classes': ('collapse',),
+        }),
+    )
+
+
+@admin.register(SampleTable)
+class SampleTableAdmin(admin.ModelAdmin):
+    """근사 집계용 샘플 테이블 Admin"""
+    list_display = ['__str__', 'rate', 'row_count', 'is_active', 'last_built_at']
+    list_filter = ['is_active', 'data_source']
+    readonly_fields = ['row_count', 'last_built_at', 'created_at', 'updated_at']
+
+    fieldsets = (
+        ('기본 정보', {
+            'fields': ('data_source', 'date_column', 'key_column', 'rate', 'is_active'),
+            'description': '빌드: python manage.py build_samples'
+        }),
+        ('메타 정보', {
+            'fields': ('row_count', 'last_built_at', 'created_at', 'updated_at'),
+            'classes': ('collapse',),
+        }),
+    )
+
+
+@admin.register(PercentileSketch)
+class PercentileSketchAdmin(admin.ModelAdmin):
+    """백분위 스케치 테이블 Admin"""
+    list_display = ['__str__', 'compression', 'row_count', 'is_active', 'last_built_at']
+    list_filter = ['is_active', 'data_source']
+    readonly_fields = ['row_count', 'last_built_at', 'created_at', 'updated_at']
+
+    fieldsets = (
+        ('기본 정보', {
+            'fields': ('data_source', 'date_column', 'compression', 'is_active')
+        }),
+        ('스케치 설정', {
+            'fields': ('dimensions', 'measures'),
+            'description': 'JSON 배열 형식: ["fcc_group"], ["fcc"] (빌드: python manage.py build_sketches)'
+        }),
+        ('메타 정보', {
+            'fields': ('row_count', 'last_built_at', 'created_at', 'updated_at'),
+            'classes': ('collapse',),
+        }),
+    )
+
+
+@admin.register(QueryShape)
+class QueryShapeAdmin(admin.ModelAdmin):
+    """관측된 조회 형태 Admin (읽기 전용 통계)"""
+    list_display = ['__str__', 'date_column', 'has_date_filter', 'hits', 'last_seen_at']
+    list_filter = ['data_source', 'group_by_period']
+    readonly_fields = [
+        'data_source', 'shape_hash', 'date_column', 'has_date_filter',
+        'group_by_period', 'group_columns', 'measures', 'equality_filters', 'range_filters',
+        'hits', 'last_seen_at'
+    ]
+
+
+@admin.register(IndexRecommendation)
+class IndexRecommendationAdmin(admin.ModelAdmin):
+    """인덱스 추천 Admin"""
+    list_display = ['__str__', 'status', 'hits', 'rows_before', 'rows_after', 'applied_at']
+    list_filter = ['status', 'data_source']
+    readonly_fields = ['rows_before', 'rows_after', 'applied_at', 'created_at', 'updated_at']
+
+    fieldsets = (
+        ('기본 정보', {
+            'fields': ('data_source', 'index_name', 'columns', 'status'),
+            'description': '추천 생성/적용: python manage.py advise_indexes --apply'
+        }),
+        ('효과 추정', {
+            'fields': ('hits', 'rows_before', 'rows_after'),
+        }),
+        ('메타 정보', {
+            'fields': ('applied_at', 'created_at', 'updated_at'),
+            'classes': ('collapse',),
+        }),
+    )
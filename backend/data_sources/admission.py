@@ -0,0 +1,618 @@
+"""
+조회 동시 실행 제한 (admission control)
+
+메일 발송 직후 수백 명이 같은 리포트 iframe을 열면 같은 DataSource 조회가 한꺼번에 몰려
+에디터/관리자 조회까지 밀립니다. 캐시 미스로 DB에서 실행하는 조회만 슬롯을 잡고 실행합니다.
+
+1. 동시 실행 슬롯 (전체 + DataSource별)
+   - 전체: DATA_QUERY_MAX_CONCURRENT
+   - DataSource별: max_concurrent_queries (없으면 DATA_QUERY_MAX_CONCURRENT_PER_SOURCE)
+   - 슬롯은 state_dir()/admission/ 아래 잠금 파일(fcntl.flock)이므로 gunicorn 워커 간에 공유되고,
+     프로세스가 죽으면 OS가 잠금을 풀어 슬롯이 새지 않습니다.
+
+2. 우선순위 (서버에서 결정, request_priority)
+   - interactive (에디터 - 로그인한 staff 세션): 슬롯 전부 사용
+   - viewer (리포트 조회 등 그 외 요청, 기본값): 슬롯의 75%까지
+   - batch (일괄 생성/자동화): 슬롯의 50%까지
+   - 나머지 슬롯은 상위 우선순위용으로 남겨두며, 대기 중 재시도 간격도 상위 우선순위가 짧음
+   - X-Query-Priority 헤더는 인증 없이 보낼 수 있으므로 우선순위를 낮출 때만 적용
+     (익명 요청의 interactive 헤더는 무시, batch 헤더는 적용)
+
+3. 대기열
+   - 바로 실행할 수 없으면 대기열 슬롯(DATA_QUERY_QUEUE_SIZE, 우선순위 비율 동일)을 잡고 대기
+   - 같은 풀 조합 + 우선순위 안에서는 번호표(TicketQueue) 순서대로 실행 (FIFO).
+     대기자가 있으면 새 요청도 번호표를 받고 뒤에 서므로 빈 슬롯을 가로채지 못하며,
+     차례가 된 맨 앞 대기자만 슬롯 잠금을 시도합니다.
+   - 대기열이 가득 차거나 DATA_QUERY_QUEUE_TIMEOUT_MS 안에 슬롯을 얻지 못하면 503
+
+fcntl이 없는 환경(Windows 개발 PC)에서는 제한 없이 실행합니다.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import struct
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from django.conf import settings
+
+from .generations import state_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HEADER = 'X-Query-Priority'
+PRIORITIES = ('interactive', 'viewer', 'batch')
+DEFAULT_PRIORITY = 'viewer'
+
+# 우선순위별 사용 가능한 슬롯 비율 (나머지는 상위 우선순위용으로 예약)
+PRIORITY_SHARES = {'interactive': 1.0, 'viewer': 0.75, 'batch': 0.5}
+
+# 대기 중 슬롯 재시도 간격 (초) - 상위 우선순위가 빈 슬롯을 먼저 잡도록 짧게
+# (같은 워커 안에서 슬롯/번호표를 반환하면 간격을 기다리지 않고 바로 깨어남)
+POLL_INTERVALS = {'interactive': 0.005, 'viewer': 0.02, 'batch': 0.05}
+
+# 대기 시간 분위수 계산에 사용할 최근 표본 수 (우선순위별)
+WAIT_SAMPLES = 1000
+
+GLOBAL_POOL = 'global'
+QUEUE_POOL = 'queue'
+# DataSource 슬롯 파일 접두어 (테이블명이 global/queue여도 겹치지 않도록)
+SOURCE_PREFIX = 'table.'
+
+# 번호표 생존 확인용 잠금 파일 수 (번호 % TICKET_FILES) - 대기열 크기보다 충분히 크게
+TICKET_FILES = 256
+# 번호 파일 내용: (다음 발급 번호, 현재 차례)
+_SEQUENCE = struct.Struct('<QQ')
+
+
+def admission_enabled():
+    return fcntl is not None and getattr(settings, 'DATA_QUERY_ADMISSION', True)
+
+
+def global_capacity():
+    return getattr(settings, 'DATA_QUERY_MAX_CONCURRENT', 6)
+
+
+def source_capacity(schema):
+    """DataSource의 동시 실행 슬롯 수"""
+    if schema is not None and schema.max_concurrent_queries:
+        return schema.max_concurrent_queries
+    return getattr(settings, 'DATA_QUERY_MAX_CONCURRENT_PER_SOURCE', 4)
+
+
+def queue_size():
+    return getattr(settings, 'DATA_QUERY_QUEUE_SIZE', 64)
+
+
+def queue_timeout_ms():
+    return getattr(settings, 'DATA_QUERY_QUEUE_TIMEOUT_MS', 5000)
+
+
+def granted_priority(user):
+    """사용자에게 허용되는 최고 우선순위 (staff 세션은 interactive, 그 외 viewer)"""
+    if user is not None and user.is_authenticated and user.is_staff:
+        return 'interactive'
+    return DEFAULT_PRIORITY
+
+
+def request_priority(request):
+    """
+    요청의 동시 실행 우선순위
+
+    X-Query-Priority 헤더는 허용된 우선순위보다 낮은 값(viewer → batch 등)일 때만 따르고,
+    높이는 값이나 알 수 없는 값은 무시합니다.
+    """
+    granted = granted_priority(getattr(request, 'user', None))
+    requested = (request.headers.get(PRIORITY_HEADER) or '').strip().lower()
+    if requested in PRIORITIES and PRIORITIES.index(requested) > PRIORITIES.index(granted):
+        return requested
+    return granted
+
+
+def usable_slots(capacity, priority):
+    """우선순위가 사용할 수 있는 슬롯 수 (최소 1)"""
+    return max(1, math.floor(capacity * PRIORITY_SHARES[priority]))
+
+
+class AdmissionRejected(Exception):
+    """
+    슬롯을 얻지 못해 조회 거부
+
+    Attributes:
+        reason: 'queue_full' (대기열 초과) 또는 'queue_timeout' (대기 시간 초과)
+        pool: 마지막으로 기다린 슬롯 (GLOBAL_POOL 또는 테이블명)
+        priority: 요청 우선순위
+        waited_ms: 거부까지 기다린 시간
+    """
+
+    def __init__(self, message, reason, pool, priority, waited_ms):
+        super().__init__(message)
+        self.reason = reason
+        self.pool = pool
+        self.priority = priority
+        self.waited_ms = waited_ms
+
+    def to_extra(self):
+        return {
+            'reason': self.reason,
+            'pool': self.pool,
+            'priority': self.priority,
+            'waited_ms': round(self.waited_ms),
+            'retry_after': max(1, math.ceil(queue_timeout_ms() / 1000)),
+        }
+
+
+class SlotPool:
+    """
+    잠금 파일 N개로 만든 프로세스 간 세마포어
+
+    슬롯 i = {이름}.{i}.lock 파일의 배타 잠금. 같은 프로세스의 다른 스레드도
+    파일을 따로 열므로 서로 다른 보유자로 취급됩니다.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    @classmethod
+    def for_source(cls, table_name):
+        return cls(f"{SOURCE_PREFIX}{table_name}")
+
+    @property
+    def label(self):
+        """응답/로그용 이름 (DataSource 슬롯은 테이블명)"""
+        return self.name.removeprefix(SOURCE_PREFIX)
+
+    def _path(self, index):
+        return state_dir() / 'admission' / f"{self.name}.{index}.lock"
+
+    def _lock(self, index):
+        """슬롯 잠금 시도 → 파일 디스크립터 (이미 잠겨 있으면 None)"""
+        path = self._path(index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def try_acquire(self, usable):
+        """앞쪽 usable개 슬롯 중 빈 슬롯 하나 잠금 (없으면 None)"""
+        for index in range(usable):
+            fd = self._lock(index)
+            if fd is not None:
+                return fd
+        return None
+
+    @staticmethod
+    def release(fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def in_use(self, capacity):
+        """사용 중인 슬롯 수 (통계용, 빈 슬롯을 잠깐 잠갔다 풀어 확인)"""
+        busy = 0
+        for index in range(capacity):
+            fd = self._lock(index)
+            if fd is None:
+                busy += 1
+            else:
+                self.release(fd)
+        return busy
+
+
+class TicketQueue:
+    """
+    잠금 파일로 만든 프로세스 간 FIFO 번호표 (풀 조합 + 우선순위별)
+
+    - {이름}.seq: (다음 발급 번호, 현재 차례) - flock으로 보호
+    - {이름}.{번호 % TICKET_FILES}.lock: 번호표를 가진 요청이 잠금 유지.
+      보유자가 포기하거나 프로세스가 죽으면 잠금이 풀리므로 뒤의 대기자가 그 번호를 건너뜁니다.
+    - 현재 차례 ≥ 내 번호일 때만 슬롯을 잡으므로 늦게 온 요청이 앞지르지 못합니다.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def _open(self, suffix):
+        path = state_dir() / 'admission' / 'fifo' / f"{self.name}.{suffix}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    @staticmethod
+    def _read(fd):
+        data = os.pread(fd, _SEQUENCE.size, 0)
+        return _SEQUENCE.unpack(data) if len(data) == _SEQUENCE.size else (0, 0)
+
+    def _update(self, change):
+        """
+        번호 파일을 배타 잠금 상태에서 갱신
+
+        Args:
+            change: (다음 발급 번호, 현재 차례) → ((새 다음 발급 번호, 새 현재 차례), 반환값)
+        """
+        fd = self._open('seq')
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            current = self._read(fd)
+            updated, result = change(*current)
+            if updated != current:
+                os.pwrite(fd, _SEQUENCE.pack(*updated), 0)
+            return result
+        finally:
+            os.close(fd)
+
+    def _lock_ticket(self, ticket):
+        """번호표 잠금 → 파일 디스크립터 (다른 요청이 잠그고 있으면 None)"""
+        fd = self._open(f"{ticket % TICKET_FILES}.lock")
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def take(self):
+        """
+        번호표 발급
+
+        번호 파일 잠금 중에 번호표도 잠가, 발급 직후 '버려진 번호'로 보이지 않게 합니다.
+        같은 잠금 파일을 쓰는 앞 번호가 아직 대기 중이면 잠금 없이 진행합니다
+        (앞 번호가 끝나면 이 번호는 건너뛰어지고, 건너뛴 번호는 바로 차례로 취급).
+
+        Returns:
+            (번호, 번호표 잠금 fd 또는 None)
+        """
+        def change(next_ticket, serving):
+            return (next_ticket + 1, serving), (next_ticket, self._lock_ticket(next_ticket))
+
+        return self._update(change)
+
+    def _serving(self):
+        fd = self._open('seq')
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            return self._read(fd)[1]
+        finally:
+            os.close(fd)
+
+    def is_turn(self, ticket):
+        """
+        내 차례인지
+
+        현재 차례 번호의 보유자가 없으면(시간 초과로 포기했거나 프로세스가 죽음) 그 번호를 건너뜁니다.
+        대기 중 확인할 때마다 맨 앞 번호 하나만 잠가 보므로, 중간에 버려진 번호가 있어도
+        뒤의 대기자가 차례로 넘기며 진행합니다.
+        """
+        serving = self._serving()
+        while serving < ticket:
+            abandoned = self._lock_ticket(serving)
+            if abandoned is None:
+                return False
+            SlotPool.release(abandoned)
+            self._advance(serving)
+            serving = self._serving()
+        return True
+
+    def _advance(self, ticket):
+        """현재 차례가 ticket이면 다음 번호로 넘김 (이미 넘어갔으면 그대로)"""
+        self._update(lambda next_ticket, serving: (
+            (next_ticket, serving + 1 if serving == ticket else serving), None
+        ))
+
+    def leave(self, ticket, fd):
+        """번호표 반납 (슬롯 획득 또는 포기) - 차례를 넘긴 뒤 번호표 잠금 해제"""
+        try:
+            self._advance(ticket)
+        finally:
+            if fd is not None:
+                SlotPool.release(fd)
+
+
+async def _off_loop(func, *args, cleanup=None):
+    """
+    파일 잠금 작업을 스레드에서 실행 (이벤트 루프를 막지 않음)
+
+    기다리던 태스크가 취소되어도 작업은 끝까지 실행되며, 그 결과로 얻은 잠금은
+    cleanup(결과)으로 반환합니다.
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if cleanup is not None:
+            def undo(done):
+                if not done.cancelled() and done.exception() is None:
+                    asyncio.get_running_loop().run_in_executor(None, cleanup, done.result())
+
+            future.add_done_callback(undo)
+        raise
+
+
+class AdmissionController:
+    """
+    조회 슬롯 발급 및 대기 통계 (대기 통계는 프로세스 단위)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 슬롯/번호표 반환 알림 (같은 워커의 대기자를 재시도 간격 전에 깨움)
+        self._released = threading.Condition()
+        self._capacities = {}
+        self.waiting = 0
+        self.counters = {
+            priority: {
+                'admitted': 0,
+                'queued': 0,
+                'queue_full': 0,
+                'queue_timeout': 0,
+                'wait_ms_total': 0.0,
+                'wait_ms_max': 0.0,
+            }
+            for priority in PRIORITIES
+        }
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITIES}
+
+    def _try_slots(self, pools, priority):
+        """모든 풀의 슬롯을 한 번에 잠금 시도 (하나라도 실패하면 모두 반환)"""
+        held = []
+        for pool, capacity in pools:
+            fd = pool.try_acquire(usable_slots(capacity, priority))
+            if fd is None:
+                for acquired in held:
+                    SlotPool.release(acquired)
+                return None, pool.label
+            held.append(fd)
+        return held, None
+
+    def _join(self, pools, priority):
+        """풀 조합 + 우선순위 대기열의 번호표 발급 → (대기열, 번호, 번호표 fd)"""
+        queue = TicketQueue('+'.join(pool.name for pool, _ in pools) + f'.{priority}')
+        return (queue, *queue.take())
+
+    def _attempt(self, queue, ticket, pools, priority):
+        """내 차례일 때만 슬롯 잠금 시도 → (잡은 fd 목록 또는 None, 막힌 풀)"""
+        if not queue.is_turn(ticket):
+            return None, pools[0][0].label
+        return self._try_slots(pools, priority)
+
+    def _notify(self):
+        with self._released:
+            self._released.notify_all()
+
+    def _leave(self, queue, ticket, fd):
+        queue.leave(ticket, fd)
+        self._notify()
+
+    def _release(self, held):
+        for fd in held or ():
+            SlotPool.release(fd)
+        self._notify()
+
+    def _record(self, priority, outcome, waited_ms=None):
+        with self._lock:
+            counters = self.counters[priority]
+            counters[outcome] += 1
+            if waited_ms is not None:
+                counters['wait_ms_total'] += waited_ms
+                counters['wait_ms_max'] = max(counters['wait_ms_max'], waited_ms)
+                self._waits[priority].append(waited_ms)
+
+    @contextmanager
+    def slot(self, schema, priority=DEFAULT_PRIORITY):
+        """
+        DataSource 슬롯 + 전체 슬롯을 잡고 실행
+
+        Args:
+            schema: DataSourceSchema (None이면 전체 슬롯만 사용)
+            priority: PRIORITIES 중 하나
+
+        Yields:
+            대기 시간 (밀리초)
+
+        Raises:
+            AdmissionRejected: 대기열 초과 또는 대기 시간 초과
+        """
+        if not admission_enabled():
+            yield 0.0
+            return
+
+        pools = self._pools(schema)
+        started = time.monotonic()
+        queue, ticket, ticket_fd = self._join(pools, priority)
+
+        try:
+            held, blocked = self._attempt(queue, ticket, pools, priority)
+            if held is None:
+                waiter = self._enqueue(priority, started, blocked)
+                try:
+                    deadline = started + queue_timeout_ms() / 1000
+                    while held is None:
+                        if time.monotonic() >= deadline:
+                            raise self._timed_out(priority, started, blocked)
+                        with self._released:
+                            self._released.wait(POLL_INTERVALS[priority])
+                        held, blocked = self._attempt(queue, ticket, pools, priority)
+                finally:
+                    self._dequeue(waiter)
+        finally:
+            self._leave(queue, ticket, ticket_fd)
+
+        waited_ms = (time.monotonic() - started) * 1000
+        self._record(priority, 'admitted', waited_ms)
+        try:
+            yield waited_ms
+        finally:
+            self._release(held)
+
+    @asynccontextmanager
+    async def aslot(self, schema, priority=DEFAULT_PRIORITY):
+        """
+        slot()의 비동기 버전 (ASGI 뷰용, 잠금 파일 작업은 스레드에서 실행해 이벤트 루프를 막지 않음)
+
+        잠금 파일은 동기 경로와 같으므로 gunicorn 동기 워커와 uvicorn 워커가 슬롯을 공유합니다.
+        """
+        if not admission_enabled():
+            yield 0.0
+            return
+
+        pools = self._pools(schema)
+        started = time.monotonic()
+        queue, ticket, ticket_fd = await _off_loop(
+            self._join, pools, priority, cleanup=lambda joined: self._leave(*joined),
+        )
+
+        try:
+            held, blocked = await _off_loop(
+                self._attempt, queue, ticket, pools, priority,
+                cleanup=lambda attempt: self._release(attempt[0]),
+            )
+            if held is None:
+                waiter = await _off_loop(
+                    self._enqueue, priority, started, blocked, cleanup=self._dequeue,
+                )
+                try:
+                    deadline = started + queue_timeout_ms() / 1000
+                    while held is None:
+                        if time.monotonic() >= deadline:
+                            raise self._timed_out(priority, started, blocked)
+                        await asyncio.sleep(POLL_INTERVALS[priority])
+                        held, blocked = await _off_loop(
+                            self._attempt, queue, ticket, pools, priority,
+                            cleanup=lambda attempt: self._release(attempt[0]),
+                        )
+                finally:
+                    await _off_loop(self._dequeue, waiter)
+        finally:
+            await _off_loop(self._leave, queue, ticket, ticket_fd)
+
+        waited_ms = (time.monotonic() - started) * 1000
+        self._record(priority, 'admitted', waited_ms)
+        try:
+            yield waited_ms
+        finally:
+            await _off_loop(self._release, held)
+
+    def _pools(self, schema):
+        """DataSource 슬롯(있으면) + 전체 슬롯 (풀, 용량) 목록"""
+        pools = []
+        if schema is not None:
+            capacity = source_capacity(schema)
+            pools.append((SlotPool.for_source(schema.table_name), capacity))
+            with self._lock:
+                self._capacities[schema.table_name] = capacity
+        pools.append((SlotPool(GLOBAL_POOL), global_capacity()))
+        return pools
+
+    def _enqueue(self, priority, started, blocked):
+        """
+        대기열 슬롯 획득
+
+        Raises:
+            AdmissionRejected: 대기열 초과
+        """
+        waiter = SlotPool(QUEUE_POOL).try_acquire(usable_slots(queue_size(), priority))
+        if waiter is None:
+            waited_ms = (time.monotonic() - started) * 1000
+            self._record(priority, 'queue_full')
+            logger.warning(f"조회 대기열 초과: {blocked} ({priority})")
+            raise AdmissionRejected(
+                '조회 요청이 많아 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.',
+                'queue_full', blocked, priority, waited_ms,
+            )
+
+        self._record(priority, 'queued')
+        with self._lock:
+            self.waiting += 1
+        return waiter
+
+    def _dequeue(self, waiter):
+        with self._lock:
+            self.waiting -= 1
+        SlotPool.release(waiter)
+
+    def _timed_out(self, priority, started, blocked):
+        """대기 시간 초과 → AdmissionRejected"""
+        waited_ms = (time.monotonic() - started) * 1000
+        self._record(priority, 'queue_timeout')
+        logger.warning(f"조회 대기 시간 초과: {blocked} ({priority}, {waited_ms:.0f}ms)")
+        return AdmissionRejected(
+            f'조회 요청이 많아 {queue_timeout_ms():,}ms 안에 실행하지 못했습니다. '
+            f'잠시 후 다시 시도하세요.',
+            'queue_timeout', blocked, priority, waited_ms,
+        )
+
+    @staticmethod
+    def _percentile(samples, q):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self):
+        """
+        우선순위별 승인/대기/거부 카운터, 대기 시간, 현재 슬롯 사용량
+
+        running/queue_depth는 잠금 파일 기준이므로 전체 워커 합계,
+        나머지는 현재 워커 프로세스 값입니다.
+        """
+        enabled = admission_enabled()
+        with self._lock:
+            capacities = dict(self._capacities)
+            priorities = {}
+            for priority in PRIORITIES:
+                counters = self.counters[priority]
+                waits = list(self._waits[priority])
+                priorities[priority] = {
+                    'admitted': counters['admitted'],
+                    'queued': counters['queued'],
+                    'rejected': {
+                        'queue_full': counters['queue_full'],
+                        'queue_timeout': counters['queue_timeout'],
+                    },
+                    'wait_ms': {
+                        'avg': round(counters['wait_ms_total'] / counters['admitted'], 1)
+                        if counters['admitted'] else 0.0,
+                        'p50': round(self._percentile(waits, 0.5), 1),
+                        'p95': round(self._percentile(waits, 0.95), 1),
+                        'max': round(counters['wait_ms_max'], 1),
+                    },
+                }
+            waiting = self.waiting
+
+        running = {}
+        queue_depth = None
+        if enabled:
+            running[GLOBAL_POOL] = SlotPool(GLOBAL_POOL).in_use(global_capacity())
+            for table_name, capacity in sorted(capacities.items()):
+                running[table_name] = SlotPool.for_source(table_name).in_use(capacity)
+            queue_depth = SlotPool(QUEUE_POOL).in_use(queue_size())
+
+        return {
+            'enabled': enabled,
+            'max_concurrent': global_capacity(),
+            'max_concurrent_per_source': {
+                table_name: capacity for table_name, capacity in sorted(capacities.items())
+            },
+            'queue_size': queue_size(),
+            'queue_timeout_ms': queue_timeout_ms(),
+            'running': running,
+            'queue_depth': queue_depth,
+            'waiting': waiting,
+            'priorities': priorities,
+        }
+
+
+admission_controller = AdmissionController()
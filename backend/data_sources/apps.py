@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DataSourcesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "data_sources"
+
+    def ready(self):
+        # 시그널 핸들러 등록 (스키마 레지스트리 무효화)
+        from . import signals  # noqa: F401
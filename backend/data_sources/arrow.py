@@ -0,0 +1,200 @@
+"""
+Apache Arrow IPC 스트림 응답 (application/vnd.apache.arrow.stream)
+
+분석용 대량 조회를 JSON 인코딩/디코딩 없이 전달합니다.
+커서 chunk마다 Arrow record batch를 만들어 바로 전송하며,
+클라이언트는 pyarrow.ipc.open_stream()으로 복사 없이 읽을 수 있습니다.
+
+    import pyarrow as pa
+    table = pa.ipc.open_stream(response.content).read_all()
+    df = table.to_pandas()
+
+컬럼 타입은 DataSource 메타데이터(columns_metadata의 type, 없으면 information_schema)에서 결정합니다.
+pyarrow가 설치되지 않았으면 ArrowUnavailable을 발생시킵니다 (뷰에서 406 응답).
+"""
+
+import io
+from datetime import date, datetime
+from decimal import Decimal
+
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+# MySQL 컬럼 타입 → Arrow 타입 이름
+INTEGER_TYPES = {'tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint', 'year'}
+FLOAT_TYPES = {'float', 'double', 'real', 'decimal', 'numeric'}
+DATE_TYPES = {'date'}
+TIMESTAMP_TYPES = {'datetime', 'timestamp'}
+BOOLEAN_TYPES = {'bool', 'boolean', 'bit'}
+
+# group_by_period 결과 타입 (query.PERIOD_EXPRESSIONS 값 형식)
+PERIOD_TYPES = {
+    'day': 'date',
+    'week': 'int',
+    'month': 'string',
+    'year': 'int',
+}
+
+
+class ArrowUnavailable(Exception):
+    """pyarrow 미설치"""
+
+
+class ArrowContentNegotiation(DefaultContentNegotiation):
+    """
+    Accept: application/vnd.apache.arrow.stream 요청 허용
+
+    Arrow 응답은 뷰가 StreamingHttpResponse로 직접 만들고,
+    검증 오류 등 Response 객체는 JSON으로 렌더링합니다.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except NotAcceptable:
+            if ARROW_STREAM_MEDIA_TYPE not in request.headers.get('Accept', ''):
+                raise
+            return renderers[0], renderers[0].media_type
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ArrowUnavailable(
+            'Arrow 응답을 사용하려면 pyarrow를 설치해야 합니다 (pip install pyarrow).'
+        )
+    return pyarrow
+
+
+def _logical_type(mysql_type):
+    """MySQL 타입 → 논리 타입 (int, float, date, timestamp, bool, string, None)"""
+    if not mysql_type:
+        return None
+    mysql_type = mysql_type.lower().split('(')[0].strip()
+    if mysql_type in INTEGER_TYPES:
+        return 'int'
+    if mysql_type in FLOAT_TYPES:
+        return 'float'
+    if mysql_type in DATE_TYPES:
+        return 'date'
+    if mysql_type in TIMESTAMP_TYPES:
+        return 'timestamp'
+    if mysql_type in BOOLEAN_TYPES:
+        return 'bool'
+    return 'string'
+
+
+def result_logical_types(spec, schema):
+    """
+    결과 컬럼별 논리 타입 (build_query의 result_columns 순서와 동일)
+
+    - 날짜 그룹 컬럼: group_by_period별 고정 타입
+    - 일반 컬럼: 메타데이터 타입
+    - 집계: COUNT → int, AVG/SUM → float, MIN/MAX → 원본 컬럼 타입
+    """
+    types = []
+
+    if spec.get('group_by_period'):
+        types.append(PERIOD_TYPES[spec['group_by_period']])
+
+    for col in spec.get('columns', []):
+        types.append(_logical_type(schema.column_types.get(col)))
+
+    for agg in spec.get('aggregations', []):
+        func = agg['function']
+        if func == 'COUNT':
+            types.append('int')
+        elif func in ('AVG', 'SUM'):
+            types.append('float')
+        else:
+            types.append(_logical_type(schema.column_types.get(agg['column'])))
+
+    return types
+
+
+def arrow_schema(result_columns, logical_types):
+    pa = _pyarrow()
+    arrow_types = {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'date': pa.date32(),
+        'timestamp': pa.timestamp('us'),
+        'bool': pa.bool_(),
+        'string': pa.string(),
+    }
+    return pa.schema([
+        # 타입을 알 수 없는 컬럼은 문자열로 전송
+        pa.field(col, arrow_types.get(logical_type, pa.string()))
+        for col, logical_type in zip(result_columns, logical_types)
+    ])
+
+
+def _column_array(pa, values, field):
+    """변환된 컬럼 값 → Arrow 배열 (메타데이터 타입과 값 타입이 다른 경우만 보정)"""
+    if pa.types.is_integer(field.type) and any(isinstance(v, (Decimal, float)) for v in values):
+        values = [None if v is None else int(v) for v in values]
+    elif (pa.types.is_date(field.type) or pa.types.is_timestamp(field.type)) and any(
+        isinstance(v, str) for v in values
+    ):
+        parse = date.fromisoformat if pa.types.is_date(field.type) else datetime.fromisoformat
+        values = [parse(v) if isinstance(v, str) else v for v in values]
+    elif pa.types.is_string(field.type) and any(
+        v is not None and not isinstance(v, str) for v in values
+    ):
+        values = [
+            None if v is None else (v.isoformat() if hasattr(v, 'isoformat') else str(v))
+            for v in values
+        ]
+    return pa.array(values, type=field.type)
+
+
+def record_batch(schema, columns):
+    """
+    컬럼 값 리스트 목록 → Arrow record batch
+
+    Args:
+        columns: materialize.materialize(rows, compile_converters(..., temporal=False)) 결과
+    """
+    pa = _pyarrow()
+    return pa.record_batch(
+        [_column_array(pa, values, field) for values, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+def iter_ipc_stream(schema, column_chunks):
+    """
+    Arrow IPC 스트림 바이트 생성
+
+    스키마 메시지 → chunk별 record batch → 종료 표시 순서로 전송합니다.
+
+    Args:
+        schema: arrow_schema() 결과
+        column_chunks: chunk별 컬럼 값 리스트 목록의 iterable
+    """
+    pa = _pyarrow()
+    sink = io.BytesIO()
+
+    def drain():
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    writer = pa.ipc.new_stream(sink, schema)
+    yield drain()
+    for columns in column_chunks:
+        writer.write_batch(record_batch(schema, columns))
+        yield drain()
+
+    # 정상 종료 시에만 종료 표시 전송 (중간 오류 시 클라이언트가 잘린 스트림을 감지)
+    writer.close()
+    yield drain()
+
+
+def ensure_available():
+    """pyarrow 설치 여부 확인 (응답 시작 전에 호출)"""
+    _pyarrow()
@@ -0,0 +1,305 @@
+"""
+비동기 데이터 조회 실행 계층 (ASGI / uvicorn 워커)
+
+gunicorn 동기 워커는 느린 조회 하나가 워커 전체를 점유합니다.
+비동기 뷰(AsyncDataQueryView, AsyncDataQueryBatchView)는 조회 SQL을 aiomysql 연결 풀에서 await하므로
+워커 하나가 여러 iframe 조회를 동시에 처리하고, 일괄 조회의 독립 스캔도 asyncio.gather로 동시 실행합니다.
+
+- 검증, 화이트리스트, 캐시 조회, SQL 생성은 동기 경로(query/batch/fusion 모듈)를 그대로 사용
+- ORM/스키마 레지스트리/EXPLAIN 등 동기 DB 접근은 sync_to_async로 이벤트 루프 밖 스레드에서 실행
+- 실행 계획(롤업 라우팅 → SQL 생성 → 비용 검사)은 query.execution_steps를 공유하고 SQL 실행만 await
+- 비동기 실행 대상: 롤업 조회, 원본 테이블 집계/행 조회 (MAX_EXECUTION_TIME 힌트 동일 적용)
+- 백분위, 근사 집계(accuracy=approximate), 비용 검사는 동기 함수를 스레드에서 실행
+- aiomysql 미설치 또는 MySQL 외 DB(개발용)면 모든 조회를 동기 경로로 실행
+- 동시 실행 슬롯(admission), 동일 조회 병합(singleflight)은 동기 경로와 잠금 파일을 공유
+- 읽기 복제본 선택(replicas)도 동기 경로와 같으며, 연결 풀은 DB 별칭(default/analytics...)별로 생성
+
+실행 예:
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker --workers 3 --bind 0.0.0.0:10004
+"""
+
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+from rest_framework import status
+
+from .admission import DEFAULT_PRIORITY, AdmissionRejected, admission_controller
+from .batch import plan_key, prepare_batch, record_plan_result, store_bodies
+from .filters import needs_temp_tables
+from .fusion import plan_scans
+from .materialize import compile_converters
+from .query import (
+    FETCH_STEP,
+    QueryError,
+    QueryResult,
+    execute_spec,
+    execution_steps,
+    lookup_cached,
+    present_result,
+    query_key,
+    resolve_schema,
+    store_cached,
+    validate_columns,
+)
+from .registry import schema_registry
+from .replicas import replica_router
+from .results import build_result
+from .singleflight import single_flight
+
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+
+logger = logging.getLogger(__name__)
+
+
+def async_enabled():
+    """aiomysql 비동기 실행 가능 여부 (불가하면 동기 경로를 스레드에서 실행)"""
+    return (
+        aiomysql is not None
+        and getattr(settings, 'DATA_QUERY_ASYNC', True)
+        and settings.DATABASES['default']['ENGINE'].endswith('mysql')
+    )
+
+
+def _run_sync(fn, *args, **kwargs):
+    """스레드에서 동기 함수 실행 (batch._run_in_worker와 같이 전후로 연결 정리)"""
+    close_old_connections()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def in_thread(fn, *args, **kwargs):
+    """
+    동기 함수를 이벤트 루프 밖 스레드에서 실행
+
+    thread_sensitive=False: 요청마다 별도 스레드(별도 DB 연결)에서 동시에 실행
+    """
+    return await sync_to_async(_run_sync, thread_sensitive=False)(fn, *args, **kwargs)
+
+
+class AsyncConnectionPool:
+    """
+    이벤트 루프 + DB 별칭별 aiomysql 연결 풀 (uvicorn 워커는 루프 1개, 첫 조회 시 생성)
+
+    DATABASES[별칭] 접속 정보를 사용하며 크기는 DATA_QUERY_ASYNC_POOL_MIN/MAX입니다.
+    """
+
+    def __init__(self):
+        self._pools = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _connect_kwargs(using):
+        database = settings.DATABASES[using]
+        options = database.get('OPTIONS', {})
+        return {
+            'host': database.get('HOST') or 'localhost',
+            'port': int(database.get('PORT') or 3306),
+            'user': database.get('USER'),
+            'password': database.get('PASSWORD'),
+            'db': database.get('NAME'),
+            'charset': options.get('charset', 'utf8mb4'),
+            'init_command': options.get('init_command'),
+            'autocommit': True,
+            'minsize': getattr(settings, 'DATA_QUERY_ASYNC_POOL_MIN', 1),
+            'maxsize': getattr(settings, 'DATA_QUERY_ASYNC_POOL_MAX', 10),
+            'pool_recycle': getattr(settings, 'DATA_QUERY_ASYNC_POOL_RECYCLE', 3600),
+        }
+
+    async def get(self, using=DEFAULT_DB_ALIAS):
+        loop = asyncio.get_running_loop()
+        pools = self._pools.setdefault(loop, {})
+        task = pools.get(using)
+        if task is None:
+            # 동시에 들어온 첫 조회들이 풀을 여러 개 만들지 않도록 생성 태스크를 공유
+            task = pools[using] = loop.create_task(
+                aiomysql.create_pool(**self._connect_kwargs(using))
+            )
+            logger.info(f'비동기 조회 연결 풀 생성: {using}')
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            pools.pop(using, None)
+            if using == DEFAULT_DB_ALIAS:
+                raise
+            # 복제본 접속 실패 → 제외 표시 후 primary 풀 사용 (replicas.read_connection과 동일)
+            replica_router.mark_down(using, e)
+            return await self.get(DEFAULT_DB_ALIAS)
+
+
+async_pool = AsyncConnectionPool()
+
+
+async def fetch_rows_async(query, params, result_columns, using=DEFAULT_DB_ALIAS):
+    """query.fetch_rows의 비동기 버전 (aiomysql 커서, 같은 결과 변환)"""
+    pool = await async_pool.get(using)
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(query, params)
+            converters = compile_converters(cursor.description)
+            rows = await cursor.fetchall()
+
+    return build_result(rows, result_columns, converters)
+
+
+@asynccontextmanager
+async def execution_slot_async(schema, priority=DEFAULT_PRIORITY):
+    """query.execution_slot의 비동기 버전 (대기 중 이벤트 루프를 막지 않음)"""
+    try:
+        async with admission_controller.aslot(schema, priority):
+            yield
+    except AdmissionRejected as e:
+        raise QueryError(str(e), status.HTTP_503_SERVICE_UNAVAILABLE, e.to_extra())
+
+
+async def run_steps_async(steps, using):
+    """query.execution_steps 비동기 실행기 (SQL은 aiomysql 풀, 동기 DB 작업은 스레드)"""
+    reply, error = None, None
+    while True:
+        try:
+            step = steps.send(reply) if error is None else steps.throw(error)
+        except StopIteration as stop:
+            return stop.value
+
+        reply, error = None, None
+        try:
+            if step[0] == FETCH_STEP:
+                reply = await fetch_rows_async(*step[1:], using)
+            else:
+                reply = await in_thread(step[1])
+        except Exception as e:
+            error = e
+
+
+async def execute_spec_async(spec, schema):
+    """
+    query.execute_spec의 비동기 버전
+
+    실행 계획(query.execution_steps)은 동기 경로와 같고 SQL만 aiomysql로 await합니다.
+    백분위/근사 집계와 비용 검사 같은 동기 DB 작업은 스레드에서 실행합니다.
+
+    Raises:
+        QueryError: 비용 예산 초과 (422) 실행 실패 (500)
+    """
+    # 큰 IN 목록 임시 테이블은 연결별이므로 적재와 조회를 같은 동기 연결에서 실행
+    if not async_enabled() or needs_temp_tables(spec):
+        return await in_thread(execute_spec, spec)
+
+    table_name = spec['table_name']
+    # 읽기 복제본 선택 (상태 확인이 동기 DB 접속이므로 스레드에서 실행)
+    using = await in_thread(replica_router.read_alias, table_name)
+
+    try:
+        return await run_steps_async(execution_steps(spec, schema, using), using)
+    except QueryError:
+        raise
+    except Exception as e:
+        logger.error(f"데이터 조회 실패: {table_name} - {str(e)}")
+        raise QueryError(
+            f'데이터 조회 중 오류 발생: {str(e)}',
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _prepare_query(spec):
+    """화이트리스트 검증 + 결과 캐시 조회 (스키마 레지스트리/L2 캐시 접근이 있으므로 스레드에서 실행)"""
+    schema = resolve_schema(spec['table_name'])
+    validate_columns(schema, spec)
+    cache_key, cached_body = lookup_cached(spec)
+    return schema, cache_key, cached_body
+
+
+async def run_query_async(spec, priority=DEFAULT_PRIORITY):
+    """
+    query.run_query의 비동기 버전
+
+    Returns:
+        QueryResult
+
+    Raises:
+        QueryError: 검증 또는 실행 실패, 동시 실행 대기 초과 (503)
+    """
+    schema, cache_key, cached_body = await in_thread(_prepare_query, spec)
+    if cached_body is not None:
+        return QueryResult(present_result(cached_body, spec), 'HIT')
+
+    async def execute():
+        async with execution_slot_async(schema, priority):
+            body = await execute_spec_async(spec, schema)
+        await in_thread(store_cached, cache_key, body)
+        return body
+
+    body, shared = await single_flight.ado(cache_key or query_key(spec), execute)
+    if not shared:
+        return QueryResult(present_result(body, spec), 'MISS')
+
+    await in_thread(store_cached, cache_key, body)
+    return QueryResult(present_result(body, spec), 'COALESCED')
+
+
+async def _execute_plan_async(plan, schema, priority, cache_keys):
+    """batch._execute_plan의 비동기 버전"""
+    spec, split = plan.prepare()
+
+    async def execute():
+        async with execution_slot_async(schema, priority):
+            bodies = split(await execute_spec_async(spec, schema))
+        await in_thread(store_bodies, bodies, cache_keys)
+        return bodies
+
+    bodies, shared = await single_flight.ado(plan_key(plan), execute)
+    if shared:
+        await in_thread(store_bodies, bodies, cache_keys)
+    return bodies, shared
+
+
+def _prepare_batch(queries):
+    """일괄 조회 1~3단계 + 실행할 테이블 스키마 (스레드에서 실행)"""
+    results, pending, cache_keys = prepare_batch(queries)
+    plans = plan_scans(pending)
+    schemas = {
+        table_name: schema_registry.get(table_name)
+        for table_name in {spec['table_name'] for spec in pending.values()}
+    }
+    return results, plans, cache_keys, schemas
+
+
+async def run_batch_async(queries, priority=DEFAULT_PRIORITY):
+    """
+    batch.run_batch의 비동기 버전 (스캔들을 asyncio.gather로 동시 실행)
+
+    Returns:
+        {차트 ID: 결과} - batch.run_batch와 같은 형식
+    """
+    results, plans, cache_keys, schemas = await in_thread(_prepare_batch, queries)
+
+    outcomes = await asyncio.gather(
+        *(
+            _execute_plan_async(
+                plan,
+                schemas[next(iter(plan.members.values()))['table_name']],
+                priority,
+                cache_keys,
+            )
+            for plan in plans
+        ),
+        return_exceptions=True,
+    )
+
+    for plan, outcome in zip(plans, outcomes):
+        if isinstance(outcome, BaseException):
+            record_plan_result(results, plan, error=outcome)
+        else:
+            bodies, shared = outcome
+            record_plan_result(results, plan, bodies, shared)
+
+    # 요청 순서대로 정렬
+    return {chart_id: results[chart_id] for chart_id in queries}
@@ -0,0 +1,58 @@
+"""
+연결 풀을 사용하는 MySQL 백엔드 (ENGINE: data_sources.backends.mysql)
+
+django.db.backends.mysql과 같고, 연결을 열고 닫는 대신 data_sources.pool의 풀에서 빌리고 반납합니다.
+DB_POOL_ENABLED=False면 기본 MySQL 백엔드와 동일하게 동작합니다 (CONN_MAX_AGE 적용).
+"""
+
+from django.db.backends.mysql import base as mysql_base
+
+from data_sources.pool import PoolTimeout, connection_pools, pool_enabled
+
+Database = mysql_base.Database
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+    """
+    풀 연결 DatabaseWrapper
+
+    - 재사용한 연결은 init_connection_state(세션 설정 쿼리)를 생략
+      (init_command는 물리 연결 생성 시 드라이버가 1회 실행)
+    - close()는 풀에 반납, 오류가 났거나 트랜잭션 블록 안에서 닫히면 폐기
+    - CONN_MAX_AGE=0이면 요청 종료 시(close_old_connections) 반납되어 다른 스레드가 재사용
+    """
+
+    _pooled_reuse = False
+
+    def connection_pool(self):
+        """이 별칭의 연결 풀 (워커 프로세스 단위)"""
+        conn_params = self.get_connection_params()
+        return connection_pools.get(
+            self.alias, lambda: mysql_base.DatabaseWrapper.get_new_connection(self, conn_params)
+        )
+
+    def get_new_connection(self, conn_params):
+        self._pooled_reuse = False
+        if not pool_enabled():
+            return super().get_new_connection(conn_params)
+        try:
+            connection, created = self.connection_pool().acquire()
+        except PoolTimeout as e:
+            raise Database.OperationalError(str(e)) from e
+        self._pooled_reuse = not created
+        return connection
+
+    def init_connection_state(self):
+        if self._pooled_reuse:
+            return
+        super().init_connection_state()
+
+    def _close(self):
+        if self.connection is None:
+            return None
+        if not pool_enabled():
+            return super()._close()
+        # 트랜잭션 블록 안에서 닫히면 Django가 연결 참조를 유지하므로 반납하지 않고 폐기
+        discard = self.in_atomic_block or self.errors_occurred
+        with self.wrap_database_errors:
+            self.connection_pool().release(self.connection, discard=discard)
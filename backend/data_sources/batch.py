@@ -0,0 +1,247 @@
+"""
+일괄 데이터 조회 실행
+
+리포트 하나의 차트 조회 요청들을 한 번의 HTTP 요청으로 받아 실행합니다.
+
+- 요청별 DataQuerySerializer 검증 (하나가 실패해도 나머지는 실행)
+- 같은 테이블은 화이트리스트 검증(스키마 조회)을 1회만 수행
+- 테이블/필터/그룹화가 같은 집계 요청은 하나의 SQL로 병합 (fusion 모듈)
+- 독립적인 쿼리는 스레드 풀에서 동시 실행
+  (Django DB 연결은 스레드별로 분리되므로 각 쿼리가 별도 연결 사용)
+- 다른 요청에서 같은 스캔이 실행 중이면 그 결과를 공유 (singleflight 모듈)
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework import status
+
+from .admission import DEFAULT_PRIORITY
+from .fusion import plan_scans
+from .query import (
+    QueryError,
+    lookup_cached,
+    present_result,
+    query_key,
+    resolve_schema,
+    store_cached,
+    validate_columns,
+)
+from .serializers import DataQuerySerializer
+from .singleflight import single_flight
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    일괄 조회용 스레드 풀 (프로세스당 1개, 지연 생성)
+
+    스레드별 DB 연결은 스캔마다 연결 풀(data_sources.pool)에서 빌리고 반납합니다.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'DATA_QUERY_BATCH_WORKERS', 4),
+                thread_name_prefix='data-query',
+            )
+        return _executor
+
+
+def plan_key(plan):
+    """스캔 계획의 병합 키 (차트 ID + 차트별 조회 키가 모두 같아야 같은 스캔)"""
+    members = sorted((chart_id, query_key(spec)) for chart_id, spec in plan.members.items())
+    digest = hashlib.sha256(json.dumps(members).encode('utf-8')).hexdigest()
+    return f"dq-scan:{digest}"
+
+
+def store_bodies(bodies, cache_keys):
+    """스캔 결과를 차트별 결과 캐시에 저장"""
+    for chart_id, body in bodies.items():
+        store_cached(cache_keys[chart_id], body)
+
+
+def _execute_plan(plan, priority, cache_keys):
+    """
+    스캔 계획 1건 실행 (같은 스캔이 실행 중이면 결과 공유)
+
+    Returns:
+        ({차트 ID: 컬럼 단위 결과}, 공유 여부)
+    """
+    def execute():
+        bodies = plan.execute(priority)
+        store_bodies(bodies, cache_keys)
+        return bodies
+
+    bodies, shared = single_flight.do(plan_key(plan), execute)
+    if shared:
+        store_bodies(bodies, cache_keys)
+    return bodies, shared
+
+
+def _run_in_worker(plan, priority, cache_keys):
+    """
+    워커 스레드에서 스캔 계획 1건 실행
+
+    요청 스레드의 request_started/finished 처리와 동일하게
+    실행 전후로 만료되었거나 오류가 난 연결을 정리합니다.
+    """
+    close_old_connections()
+    try:
+        return _execute_plan(plan, priority, cache_keys)
+    finally:
+        close_old_connections()
+
+
+def _error_entry(status_code, body):
+    return {'status': status_code, **body}
+
+
+def _success_entry(spec, body, cache_status):
+    return {
+        'status': status.HTTP_200_OK,
+        'cache': cache_status,
+        **present_result(body, spec),
+    }
+
+
+def prepare_batch(queries):
+    """
+    일괄 조회 1~3단계 (요청 검증, 테이블 화이트리스트, 컬럼 검증 및 결과 캐시 조회)
+
+    동기(run_batch)/비동기(async_query.run_batch_async) 실행 경로 공용
+
+    Returns:
+        (results, pending, cache_keys)
+        - results: 이미 결정된 차트 결과 (검증 실패, 캐시 적중)
+        - pending: 실행할 {차트 ID: 검증된 조회 요청}
+        - cache_keys: {차트 ID: 결과 캐시 키}
+    """
+    results = {}
+    specs = {}
+
+    # 1. 요청별 검증 (실패한 요청만 에러 처리)
+    for chart_id, raw_spec in queries.items():
+        serializer = DataQuerySerializer(data=raw_spec)
+        if serializer.is_valid() and serializer.validated_data.get('stream'):
+            results[chart_id] = _error_entry(
+                status.HTTP_400_BAD_REQUEST,
+                {'error': '일괄 조회에서는 스트리밍 응답을 사용할 수 없습니다.'}
+            )
+        elif serializer.is_valid():
+            specs[chart_id] = serializer.validated_data
+        else:
+            logger.warning(
+                f"일괄 조회 요청 검증 실패: {chart_id} - {serializer.errors}"
+            )
+            results[chart_id] = _error_entry(
+                status.HTTP_400_BAD_REQUEST,
+                {'error': '요청 검증 실패', 'details': serializer.errors}
+            )
+
+    # 2. 테이블명 화이트리스트 검증 (테이블별 1회)
+    schemas = {}
+    table_errors = {}
+    for table_name in {spec['table_name'] for spec in specs.values()}:
+        try:
+            schemas[table_name] = resolve_schema(table_name)
+        except QueryError as e:
+            table_errors[table_name] = e
+
+    runnable = {}
+    for chart_id, spec in specs.items():
+        error = table_errors.get(spec['table_name'])
+        if error is not None:
+            results[chart_id] = _error_entry(error.status_code, error.to_response_body())
+        else:
+            runnable[chart_id] = spec
+
+    # 3. 컬럼 검증 및 결과 캐시 조회
+    pending = {}
+    cache_keys = {}
+    for chart_id, spec in runnable.items():
+        try:
+            validate_columns(schemas[spec['table_name']], spec)
+        except QueryError as e:
+            results[chart_id] = _error_entry(e.status_code, e.to_response_body())
+            continue
+
+        cache_key, cached_body = lookup_cached(spec)
+        if cached_body is not None:
+            results[chart_id] = _success_entry(spec, cached_body, 'HIT')
+        else:
+            cache_keys[chart_id] = cache_key
+            pending[chart_id] = spec
+
+    return results, pending, cache_keys
+
+
+def record_plan_result(results, plan, bodies=None, shared=False, error=None):
+    """스캔 계획 1건의 실행 결과(또는 오류)를 병합된 차트별 결과로 기록"""
+    if isinstance(error, QueryError):
+        for chart_id in plan.members:
+            results[chart_id] = _error_entry(error.status_code, error.to_response_body())
+        return
+
+    if error is not None:
+        logger.error(f"일괄 조회 실패: {', '.join(plan.members)} - {str(error)}")
+        for chart_id in plan.members:
+            results[chart_id] = _error_entry(
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                {'error': f'데이터 조회 중 오류 발생: {str(error)}'}
+            )
+        return
+
+    for chart_id, body in bodies.items():
+        results[chart_id] = _success_entry(
+            plan.members[chart_id], body, 'COALESCED' if shared else 'MISS'
+        )
+
+
+def run_batch(queries, priority=DEFAULT_PRIORITY):
+    """
+    일괄 조회 실행
+
+    Args:
+        queries: {차트 ID: 조회 요청(검증 전 dict)}
+        priority: 동시 실행 슬롯 우선순위 (스캔마다 슬롯 1개)
+
+    Returns:
+        {차트 ID: 결과} - 성공 시 {'status': 200, 'cache': 'HIT'|'MISS'|'COALESCED', 'data': ..., ...},
+        실패 시 {'status': 4xx/5xx, 'error': ...}
+    """
+    results, pending, cache_keys = prepare_batch(queries)
+
+    # 4. 공유 스캔 병합 후 동시 실행 (스캔 1건이면 요청 스레드에서 바로 실행)
+    plans = plan_scans(pending)
+    if len(plans) == 1:
+        futures = None
+    else:
+        executor = get_executor()
+        futures = [
+            executor.submit(_run_in_worker, plan, priority, cache_keys) for plan in plans
+        ]
+
+    for index, plan in enumerate(plans):
+        try:
+            if futures is None:
+                bodies, shared = _execute_plan(plan, priority, cache_keys)
+            else:
+                bodies, shared = futures[index].result()
+        except Exception as e:
+            record_plan_result(results, plan, error=e)
+            continue
+
+        record_plan_result(results, plan, bodies, shared)
+
+    # 요청 순서대로 정렬
+    return {chart_id: results[chart_id] for chart_id in queries}
@@ -0,0 +1,301 @@
+"""
+데이터 조회 결과 캐시
+
+fcc_data 등 DataSource 테이블은 load_fcc_data 실행 시에만 바뀌므로,
+정규화된 조회 요청 + 테이블별 데이터 버전을 키로 조회 결과를 재사용합니다.
+
+- L1: 프로세스 내 LRU (항목 수 + 바이트 크기 기준 축출)
+- L2 (선택): Django 캐시 또는 로컬 파일 저장소 (워커 간 공유)
+- 데이터 버전은 generations 스탬프로 관리하며 load_fcc_data가 갱신
+  → 키가 바뀌므로 이전 결과는 자연히 조회되지 않음
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+from . import generations
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 512,
+    'MAX_BYTES': 32 * 1024 * 1024,
+    'L2_BACKEND': '',
+    'L2_CACHE_ALIAS': 'default',
+    'L2_LOCATION': '',
+    'L2_TIMEOUT': 24 * 60 * 60,
+    'L2_MAX_ENTRIES': 4096,
+    'L2_MAX_BYTES': 256 * 1024 * 1024,
+}
+
+# 결과 내용과 무관한 요청 필드 (캐시 키에서 제외)
+# - 다운샘플링(max_points), 빈 구간 채우기(fill)는 캐시된 전체 결과에 응답 직전 적용
+RESULT_INDEPENDENT_KEYS = ('format', 'stream', 'max_points', 'downsample', 'fill')
+
+# 캐시 항목 구조 버전 (구조 변경 시 증가 → L2에 남은 이전 구조 항목을 읽지 않음)
+CACHE_LAYOUT_VERSION = 2
+
+
+def get_cache_settings():
+    """settings.DATA_QUERY_CACHE와 기본값 병합"""
+    return {**DEFAULT_CACHE_SETTINGS, **getattr(settings, 'DATA_QUERY_CACHE', {})}
+
+
+def _data_generation_name(table_name):
+    return f"data_{table_name}"
+
+
+def data_version(table_name):
+    """테이블의 현재 데이터 버전"""
+    return generations.current(_data_generation_name(table_name))
+
+
+def bump_data_version(table_name):
+    """테이블 데이터 변경 알림 (캐시된 조회 결과 전체 무효화)"""
+    version = generations.bump(_data_generation_name(table_name))
+    logger.info(f"데이터 버전 갱신: {table_name} -> {version}")
+    return version
+
+
+def make_cache_key(spec, version):
+    """
+    정규화된 조회 요청과 데이터 버전으로 캐시 키 생성
+
+    Args:
+        spec: DataQuerySerializer.validated_data (기본값 적용 후)
+        version: 테이블 데이터 버전
+    """
+    # 응답 형식은 결과 내용에 영향이 없으므로 키에서 제외 (형식별로 같은 캐시 항목 공유)
+    spec = {key: value for key, value in spec.items() if key not in RESULT_INDEPENDENT_KEYS}
+    payload = json.dumps(
+        {'spec': spec, 'version': version, 'layout': CACHE_LAYOUT_VERSION},
+        sort_keys=True,
+        cls=DjangoJSONEncoder,
+        separators=(',', ':'),
+    )
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    return f"dq:{spec['table_name']}:{digest}"
+
+
+class DjangoCacheStore:
+    """Django 캐시 프레임워크 기반 L2 저장소"""
+
+    def __init__(self, alias, timeout):
+        self.alias = alias
+        self.timeout = timeout
+
+    def get(self, key):
+        return caches[self.alias].get(key)
+
+    def set(self, key, value):
+        caches[self.alias].set(key, value, self.timeout)
+
+
+class FileStore:
+    """
+    로컬 파일 기반 L2 저장소
+
+    키별 JSON 파일로 저장하며, timeout이 지난 파일은 조회/저장 시 삭제합니다.
+    저장할 때마다 파일 수(max_entries)와 전체 크기(max_bytes) 한도를 넘으면
+    가장 오래 전에 저장된 파일(mtime 기준)부터 삭제합니다 (None이면 한도 없음).
+    """
+
+    def __init__(self, location, timeout, max_entries=None, max_bytes=None):
+        self.location = Path(location)
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return self.location / f"{key.replace(':', '_')}.json"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.timeout:
+                path.unlink(missing_ok=True)
+                return None
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def set(self, key, value):
+        self.location.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        # 다른 워커/스레드가 쓰는 중인 파일을 읽지 않도록 임시 파일 후 교체
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(value, cls=DjangoJSONEncoder), encoding='utf-8')
+        tmp_path.replace(path)
+        self._prune()
+
+    def _prune(self):
+        """만료 파일(남은 임시 파일 포함) 삭제 후 한도를 넘으면 오래된 파일부터 삭제"""
+        now = time.time()
+        entries = []
+        for path in self.location.iterdir():
+            # 같은 디렉토리의 다른 파일(동일 조회 잠금 파일 등)은 건드리지 않음
+            if path.suffix not in ('.json', '.tmp'):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.timeout:
+                path.unlink(missing_ok=True)
+            elif path.suffix == '.json':
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        max_entries = self.max_entries if self.max_entries is not None else len(entries)
+        max_bytes = self.max_bytes if self.max_bytes is not None else float('inf')
+        count = len(entries)
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if count <= max_entries and total_bytes <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            count -= 1
+            total_bytes -= size
+
+
+class QueryResultCache:
+    """
+    조회 결과 LRU 캐시 (L1) + 선택적 L2
+
+    값은 JSON 직렬화 가능한 응답 본문(dict)이며,
+    크기는 직렬화된 바이트 수로 계산합니다.
+    """
+
+    def __init__(self, max_entries, max_bytes, l2=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.l2 = l2
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self.hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """캐시 조회 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        if self.l2 is not None:
+            try:
+                value = self.l2.get(key)
+            except Exception as e:
+                logger.warning(f"L2 캐시 조회 실패: {str(e)}")
+                value = None
+
+            if value is not None:
+                self._store(key, value)
+                with self._lock:
+                    self.l2_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        """캐시 저장 (L1 + L2)"""
+        self._store(key, value)
+
+        if self.l2 is not None:
+            try:
+                self.l2.set(key, value)
+            except Exception as e:
+                logger.warning(f"L2 캐시 저장 실패: {str(e)}")
+
+    def _store(self, key, value):
+        size = len(json.dumps(value, cls=DjangoJSONEncoder).encode('utf-8'))
+
+        # 단일 항목이 전체 한도를 넘으면 L1에 저장하지 않음
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while (
+                len(self._entries) > self.max_entries
+                or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """L1 전체 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """hit/miss 카운터 및 사용량 반환"""
+        with self._lock:
+            lookups = self.hits + self.l2_hits + self.misses
+            return {
+                'hits': self.hits,
+                'l2_hits': self.l2_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': (
+                    round((self.hits + self.l2_hits) / lookups, 4) if lookups else None
+                ),
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'l2_backend': type(self.l2).__name__ if self.l2 is not None else None,
+            }
+
+
+def _build_l2(config):
+    backend = config['L2_BACKEND']
+    if not backend:
+        return None
+    if backend == 'django':
+        return DjangoCacheStore(config['L2_CACHE_ALIAS'], config['L2_TIMEOUT'])
+    if backend == 'file':
+        location = config['L2_LOCATION'] or (
+            generations.state_dir() / 'query_cache'
+        )
+        return FileStore(
+            location, config['L2_TIMEOUT'], config['L2_MAX_ENTRIES'], config['L2_MAX_BYTES'],
+        )
+    raise ValueError(f"지원하지 않는 L2 캐시 백엔드: '{backend}'")
+
+
+def _build_cache():
+    config = get_cache_settings()
+    return QueryResultCache(
+        max_entries=config['MAX_ENTRIES'],
+        max_bytes=config['MAX_BYTES'],
+        l2=_build_l2(config),
+    )
+
+
+query_cache = _build_cache()
@@ -0,0 +1,303 @@
+"""
+조회 요청 → SQL 컴파일러 (구조 기준 실행 계획 캐시)
+
+요청마다 SELECT/WHERE/GROUP BY/ORDER BY 문자열을 새로 조립하지 않고,
+요청의 구조(테이블, 컬럼, 집계, 날짜 그룹화, 날짜 필터 유무)가 같으면
+한 번 만든 SQL 템플릿을 재사용합니다.
+
+- 날짜 값, 필터 값, limit은 파라미터 슬롯으로 남겨 실행 시 바인딩 (CompiledQuery.bind)
+- 차원 필터는 구조(컬럼, 연산자, IN 목록 크기)만 키에 포함 (filters.filter_shape)
+- 프로세스 내 LRU (settings.DATA_QUERY_PLAN_CACHE_SIZE 항목)
+- bucket 생성 컬럼 사용 여부도 키에 포함 (create_bucket_columns 실행 전후 구분)
+- 커서 페이지네이션(paginate) 조회는 (date_column, id) 순서 탐색 SQL 생성 (pagination 모듈)
+- top_n 조회는 그룹별 집계 SQL을 상위 N개 + "기타" 순위 SQL로 감쌈 (topn 모듈)
+- hit/miss 카운터로 재사용 효과 확인
+
+새 집계 함수나 절을 추가할 때는 QueryCompiler._compile만 수정하면 됩니다.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+
+from .filters import filter_clauses, filter_params, filter_shape
+from .pagination import KEY_COLUMN
+from .topn import helper_aggregations, wrap_query
+
+# group_by_period별 날짜 bucket 표현식
+# (리터럴 %는 파라미터 치환과 충돌하지 않도록 %%로 작성하고, 실행 시 항상 params를 전달)
+PERIOD_EXPRESSIONS = {
+    'day': "DATE(`{col}`)",
+    'week': "YEARWEEK(`{col}`)",
+    'month': "DATE_FORMAT(`{col}`, '%%Y-%%m')",
+    'year': "YEAR(`{col}`)",
+}
+
+# 파라미터 슬롯 → 요청 값 변환
+PARAM_SLOTS = {
+    'start_date': lambda spec: spec['start_date'],
+    # 반열린 구간: 종료일 다음 날 0시 미만
+    'end_date': lambda spec: spec['end_date'] + timedelta(days=1),
+    'limit': lambda spec: int(spec.get('limit', 1000)),
+    # 커서 페이지네이션: 마지막 행 위치 및 다음 페이지 존재 확인용 1건 추가
+    'after_date': lambda spec: spec['after'][0],
+    'after_id': lambda spec: spec['after'][1],
+    'page_limit': lambda spec: int(spec.get('limit', 1000)) + 1,
+    'top_n': lambda spec: int(spec['top_n']),
+}
+
+# 값 여러 개로 펼쳐지는 파라미터 슬롯 (필터 조건 전체)
+MULTI_PARAM_SLOTS = {
+    'filters': filter_params,
+}
+
+
+class CompileError(Exception):
+    """SQL로 변환할 수 없는 조회 요청 (예: SELECT 절이 비어있음)"""
+
+
+def bucket_column_name(date_column, period):
+    """저장 생성 컬럼(bucket) 이름 - 결과 별칭과 같음 (예: cdate_day)"""
+    return f"{date_column}_{period}"
+
+
+def uses_bucket_column(date_column, period, schema):
+    return schema is not None and bucket_column_name(date_column, period) in schema.column_set
+
+
+def period_expression(date_column, period, schema=None):
+    """
+    날짜 그룹화 표현식
+
+    create_bucket_columns 커맨드로 만든 저장 생성 컬럼(예: cdate_day)이 있으면
+    인덱스를 사용할 수 있도록 컬럼을 그대로 사용하고, 없으면 함수 표현식을 사용합니다.
+    """
+    if uses_bucket_column(date_column, period, schema):
+        return f"`{bucket_column_name(date_column, period)}`"
+    return PERIOD_EXPRESSIONS[period].format(col=date_column)
+
+
+class CompiledQuery:
+    """
+    컴파일된 SQL 실행 계획
+
+    Attributes:
+        sql: 파라미터 자리표시자(%s)가 있는 SQL 템플릿
+        param_slots: 자리표시자 순서의 슬롯 이름 (PARAM_SLOTS 키)
+        result_columns: 결과 컬럼명 목록
+    """
+
+    __slots__ = ('sql', 'param_slots', 'result_columns')
+
+    def __init__(self, sql, param_slots, result_columns):
+        self.sql = sql
+        self.param_slots = tuple(param_slots)
+        self.result_columns = tuple(result_columns)
+
+    def bind(self, spec):
+        """요청 값 바인딩 → (query, params)"""
+        params = []
+        for slot in self.param_slots:
+            if slot in MULTI_PARAM_SLOTS:
+                params.extend(MULTI_PARAM_SLOTS[slot](spec))
+            else:
+                params.append(PARAM_SLOTS[slot](spec))
+        return self.sql, params
+
+
+def plan_key(spec, schema=None):
+    """
+    실행 계획 캐시 키 (요청의 구조 부분만 사용)
+
+    날짜 값, 필터 값, limit, 커서 위치는 키에서 제외하고 지정 여부(필터는 구조)만 포함합니다.
+    """
+    date_column = spec.get('date_column', 'date')
+    group_by_period = spec.get('group_by_period')
+
+    return (
+        spec['table_name'],
+        date_column,
+        group_by_period,
+        group_by_period is not None and uses_bucket_column(date_column, group_by_period, schema),
+        tuple(spec.get('columns', [])),
+        tuple(
+            (agg['function'], agg['column'], agg.get('alias'))
+            for agg in spec.get('aggregations', [])
+        ),
+        bool(spec.get('start_date')),
+        bool(spec.get('end_date')),
+        bool(spec.get('paginate')),
+        spec.get('after') is not None,
+        filter_shape(spec),
+        spec.get('top_n_by') if spec.get('top_n') else None,
+    )
+
+
+class QueryCompiler:
+    """
+    조회 요청 → CompiledQuery 변환 및 캐시
+
+    키는 plan_key(), 항목 수 기준 LRU로 축출합니다.
+    """
+
+    def __init__(self, max_entries=None):
+        self._lock = threading.Lock()
+        self._plans = OrderedDict()  # plan_key -> CompiledQuery
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_entries(self):
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, 'DATA_QUERY_PLAN_CACHE_SIZE', 256)
+
+    def compile(self, spec, schema=None):
+        """
+        조회 요청 컴파일 (캐시 적중 시 저장된 계획 반환)
+
+        Raises:
+            CompileError: SELECT 절이 비어있는 경우
+        """
+        key = plan_key(spec, schema)
+
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+
+        plan = self._compile(spec, schema)
+
+        with self._lock:
+            self.misses += 1
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > max(self.max_entries, 1):
+                self._plans.popitem(last=False)
+
+        return plan
+
+    def _compile(self, spec, schema):
+        table_name = spec['table_name']
+        columns = spec.get('columns', [])
+        date_column = spec.get('date_column', 'date')
+        group_by_period = spec.get('group_by_period')
+        aggregations = spec.get('aggregations', [])
+        top_n = bool(spec.get('top_n'))
+        if top_n:
+            # "기타" 행 AVG 재계산용 SUM/COUNT (바깥 쿼리에서만 사용)
+            aggregations = aggregations + helper_aggregations(spec)
+
+        # SELECT 절 생성
+        select_parts = []
+        result_columns = []  # 결과 컬럼명 목록 (딕셔너리 변환용)
+        param_slots = []
+
+        # 1. 날짜 그룹화 (group_by_period가 있는 경우)
+        period_expr = None
+        if group_by_period:
+            period_expr = period_expression(date_column, group_by_period, schema)
+            date_alias = bucket_column_name(date_column, group_by_period)
+            select_parts.append(f"{period_expr} as {date_alias}")
+            result_columns.append(date_alias)
+
+        # 2. 일반 컬럼 (GROUP BY에 사용)
+        for col in columns:
+            select_parts.append(f"`{col}`")
+            result_columns.append(col)
+
+        # 페이지 위치 계산용 키 컬럼 (요청하지 않았으면 추가 조회 후 pagination에서 제거)
+        paginate = spec.get('paginate')
+        if paginate:
+            for col in (date_column, KEY_COLUMN):
+                if col not in result_columns:
+                    select_parts.append(f"`{col}`")
+                    result_columns.append(col)
+
+        # 3. 집계 함수
+        for agg in aggregations:
+            col = agg['column']
+            func = agg['function']
+            alias = agg.get('alias', f"{func.lower()}_{col}")
+            select_parts.append(f"{func}(`{col}`) as {alias}")
+            result_columns.append(alias)
+
+        # SELECT 절이 비어있으면 에러
+        if not select_parts:
+            raise CompileError('조회할 컬럼 또는 집계 함수를 지정해야 합니다.')
+
+        sql = f"SELECT {', '.join(select_parts)} FROM `{table_name}`"
+
+        # WHERE 절 추가 (날짜 필터링 sargable 반열린 구간, 차원 필터)
+        where_clauses = []
+        if spec.get('start_date'):
+            where_clauses.append(f"`{date_column}` >= %s")
+            param_slots.append('start_date')
+        if spec.get('end_date'):
+            where_clauses.append(f"`{date_column}` < %s")
+            param_slots.append('end_date')
+        if spec.get('filters'):
+            where_clauses.extend(filter_clauses(spec))
+            param_slots.append('filters')
+        if paginate:
+            where_clauses.append(f"`{date_column}` IS NOT NULL")
+            if spec.get('after') is not None:
+                # (date, id) > (마지막 날짜, 마지막 id) - 선두 범위 조건으로 날짜 인덱스 탐색
+                where_clauses.append(
+                    f"`{date_column}` >= %s AND "
+                    f"(`{date_column}` > %s OR `{KEY_COLUMN}` > %s)"
+                )
+                param_slots.extend(['after_date', 'after_date', 'after_id'])
+
+        if where_clauses:
+            sql += " WHERE " + " AND ".join(where_clauses)
+
+        # GROUP BY 절 추가 (집계 사용 시)
+        if aggregations:
+            group_by_parts = []
+            if period_expr:
+                group_by_parts.append(period_expr)
+            group_by_parts.extend(f"`{col}`" for col in columns)
+
+            if group_by_parts:
+                sql += " GROUP BY " + ", ".join(group_by_parts)
+
+        # 상위 N개 + "기타" (순위/정렬은 바깥 쿼리, 그룹 수 제한 없음)
+        if top_n:
+            sql, result_columns = wrap_query(spec, sql)
+            return CompiledQuery(sql, ['top_n', *param_slots, 'top_n'], result_columns)
+
+        # ORDER BY 추가 (별칭 대신 그룹화 표현식 사용 → bucket 컬럼 인덱스 활용)
+        if paginate:
+            sql += f" ORDER BY `{date_column}` ASC, `{KEY_COLUMN}` ASC"
+        elif period_expr:
+            sql += f" ORDER BY {period_expr} ASC"
+        elif date_column in columns:
+            sql += f" ORDER BY `{date_column}` ASC"
+
+        # LIMIT (파라미터 - 값이 달라도 같은 계획 재사용)
+        sql += " LIMIT %s"
+        param_slots.append('page_limit' if paginate else 'limit')
+
+        return CompiledQuery(sql, param_slots, result_columns)
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._plans),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+query_compiler = QueryCompiler()
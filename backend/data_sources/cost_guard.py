@@ -0,0 +1,242 @@
+"""
+조회 비용 제한 (cost guard)
+
+gunicorn 워커가 3개뿐이라 넓은 범위의 ad-hoc 조회 하나가
+워커와 MySQL 스레드를 오래 점유하면 다른 리포트 조회가 모두 밀립니다.
+
+1. 실행 전 승인 (admit)
+   - 원본 테이블 쿼리를 EXPLAIN하여 읽을 행 수(rows) 추정
+   - 추정값이 DataSource별 예산(max_examined_rows, 없으면 DATA_QUERY_MAX_EXAMINED_ROWS)을
+     넘으면 CostExceeded → 근사 집계로 낮추거나(downgrade) 422로 거부
+   - EXPLAIN 결과는 컴파일된 SQL 템플릿 + 바인딩 값 + 테이블 데이터 버전별로 캐시
+     (같은 리포트 조회는 EXPLAIN 왕복 없이 승인)
+   - EXPLAIN은 MySQL에서만 실행하며, 실패하면 승인 (조회 자체를 막지 않음)
+
+2. 실행 시간 제한 (with_time_limit)
+   - SELECT에 MAX_EXECUTION_TIME 옵티마이저 힌트 추가
+     (DataSource별 max_execution_ms, 없으면 DATA_QUERY_MAX_EXECUTION_MS)
+   - 제한을 넘으면 MySQL이 쿼리를 중단(오류 3024)하고 422로 응답
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from .cache import data_version
+from .replicas import read_connection
+
+logger = logging.getLogger(__name__)
+
+# MySQL: 최대 실행 시간 초과로 쿼리 중단 (ER_QUERY_TIMEOUT)
+QUERY_TIMEOUT_ERROR = 3024
+
+
+def guard_enabled():
+    return getattr(settings, 'DATA_QUERY_COST_GUARD', True)
+
+
+def downgrade_enabled():
+    return getattr(settings, 'DATA_QUERY_COST_DOWNGRADE', True)
+
+
+def row_budget(schema):
+    """DataSource의 읽기 행 수 예산 (None이면 제한 없음)"""
+    if schema is not None and schema.max_examined_rows:
+        return schema.max_examined_rows
+    return getattr(settings, 'DATA_QUERY_MAX_EXAMINED_ROWS', 5000000) or None
+
+
+def time_budget(schema):
+    """DataSource의 실행 시간 예산 (밀리초, None이면 제한 없음)"""
+    if schema is not None and schema.max_execution_ms:
+        return schema.max_execution_ms
+    return getattr(settings, 'DATA_QUERY_MAX_EXECUTION_MS', 20000) or None
+
+
+class CostExceeded(Exception):
+    """
+    조회 비용 예산 초과
+
+    Attributes:
+        budget: 초과한 예산 이름 ('max_examined_rows' 또는 'max_execution_ms')
+        limit: 예산 값
+        estimate: 추정/측정 값 (실행 시간 초과는 None)
+    """
+
+    def __init__(self, message, budget, limit, estimate=None):
+        super().__init__(message)
+        self.budget = budget
+        self.limit = limit
+        self.estimate = estimate
+
+    def to_extra(self, schema):
+        extra = {
+            'budget': self.budget,
+            'limit': self.limit,
+            'data_source': schema.name if schema is not None else None,
+        }
+        if self.estimate is not None:
+            extra['estimated_rows'] = self.estimate
+        return extra
+
+
+class CostEstimator:
+    """
+    EXPLAIN 행 수 추정 캐시 (프로세스 단위 LRU)
+
+    키: (테이블 데이터 버전, SQL 템플릿, 바인딩 값)
+    load_fcc_data가 데이터 버전을 올리면 이전 추정은 더 이상 조회되지 않습니다.
+    """
+
+    def __init__(self, max_entries=None):
+        self._lock = threading.Lock()
+        self._estimates = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.downgraded = 0
+        self.timeouts = 0
+
+    @property
+    def max_entries(self):
+        if self._max_entries is not None:
+            return self._max_entries
+        return getattr(settings, 'DATA_QUERY_COST_CACHE_SIZE', 1024)
+
+    def estimate(self, table_name, query, params, using=DEFAULT_DB_ALIAS):
+        """
+        읽을 행 수 추정 (EXPLAIN rows 합계)
+
+        Returns:
+            추정 행 수 (EXPLAIN을 쓸 수 없으면 None)
+        """
+        key = (data_version(table_name), query, tuple(params))
+        with self._lock:
+            if key in self._estimates:
+                self._estimates.move_to_end(key)
+                self.hits += 1
+                return self._estimates[key]
+            self.misses += 1
+
+        rows = explain_rows(query, params, using)
+
+        with self._lock:
+            self._estimates[key] = rows
+            while len(self._estimates) > self.max_entries:
+                self._estimates.popitem(last=False)
+        return rows
+
+    def admit(self, schema, query, params, using=DEFAULT_DB_ALIAS):
+        """
+        원본 테이블 쿼리 실행 승인
+
+        Returns:
+            추정 행 수 (추정 불가 시 None)
+
+        Raises:
+            CostExceeded: 추정 행 수가 예산 초과
+        """
+        if not guard_enabled() or schema is None:
+            return None
+
+        budget = row_budget(schema)
+        if budget is None:
+            return None
+
+        rows = self.estimate(schema.table_name, query, params, using)
+        if rows is not None and rows > budget:
+            raise CostExceeded(
+                f"조회 예상 행 수({rows:,}행)가 '{schema.name}'의 예산"
+                f"(max_examined_rows {budget:,}행)을 초과합니다. "
+                f"날짜 범위를 줄이거나 롤업/집계 조회를 사용하세요.",
+                'max_examined_rows',
+                budget,
+                rows,
+            )
+        return rows
+
+    def record(self, outcome):
+        """rejected / downgraded / timeouts 카운터 증가"""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def clear(self):
+        with self._lock:
+            self._estimates.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': guard_enabled(),
+                'entries': len(self._estimates),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'rejected': self.rejected,
+                'downgraded': self.downgraded,
+                'timeouts': self.timeouts,
+            }
+
+
+def explain_rows(query, params, using=DEFAULT_DB_ALIAS):
+    """EXPLAIN 결과의 rows 합계 (MySQL 외 DB 또는 실패 시 None)"""
+    connection = read_connection(using)
+    if connection.vendor != 'mysql':
+        return None
+
+    started = time.monotonic()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {query}", params)
+            columns = [column[0].lower() for column in cursor.description]
+            rows = cursor.fetchall()
+    except Exception as e:
+        logger.warning(f"EXPLAIN 실패, 비용 검사 생략: {str(e)}")
+        return None
+
+    if 'rows' not in columns:
+        return None
+    index = columns.index('rows')
+    estimate = sum(int(row[index] or 0) for row in rows)
+
+    logger.debug(
+        f"EXPLAIN 추정 {estimate}행 ({(time.monotonic() - started) * 1000:.1f}ms)"
+    )
+    return estimate
+
+
+def with_time_limit(query, schema):
+    """SELECT 문에 MAX_EXECUTION_TIME 힌트 추가 (제한 없음/비활성 시 그대로)"""
+    limit = time_budget(schema) if guard_enabled() else None
+    if not limit or not query.startswith('SELECT '):
+        return query
+    return f"SELECT /*+ MAX_EXECUTION_TIME({int(limit)}) */ " + query[len('SELECT '):]
+
+
+def is_timeout(error):
+    """MAX_EXECUTION_TIME 초과로 중단된 쿼리 오류인지"""
+    while error is not None:
+        if getattr(error, 'args', None) and error.args[0] == QUERY_TIMEOUT_ERROR:
+            return True
+        error = error.__cause__
+    return False
+
+
+def timeout_exceeded(schema):
+    """실행 시간 초과 → CostExceeded (응답 형식을 예산 초과와 맞춤)"""
+    limit = time_budget(schema)
+    return CostExceeded(
+        f"조회 실행 시간이 '{schema.name if schema is not None else ''}'의 예산"
+        f"(max_execution_ms {limit:,}ms)을 초과하여 중단되었습니다. "
+        f"날짜 범위를 줄이거나 롤업/집계 조회를 사용하세요.",
+        'max_execution_ms',
+        limit,
+    )
+
+
+cost_estimator = CostEstimator()
@@ -0,0 +1,251 @@
+"""
+라인/영역 차트용 서버 측 다운샘플링 (max_points)
+
+1년치 cdate 행처럼 점이 수천 개인 결과를 그대로 보내면
+이메일 클라이언트의 iframe 렌더러가 모든 점을 그리느라 느려집니다.
+조회 결과를 계열(series)별 max_points개 이하로 줄이되 시각적 최고/최저점은 유지합니다.
+
+- lttb (기본): Largest-Triangle-Three-Buckets
+  구간마다 이전 선택점·다음 구간 평균과 만드는 삼각형 넓이가 가장 큰 점을 선택
+  (구간 평균은 누적합으로 한 번에 계산, 구간 내 넓이는 NumPy 벡터 연산)
+- minmax: 구간별 최솟값/최댓값 점 선택 (reduceat으로 전체 벡터 연산)
+
+두 방식 모두 입력 행 수에 선형 시간입니다.
+
+컬럼 역할:
+- x: 날짜 그룹 컬럼(예: cdate_day) 또는 date_column (없으면 행 순서)
+- 측정값: 숫자 집계 별칭 (집계가 없으면 숫자 컬럼) - 숫자 측정값이 없으면 다운샘플링하지 않음
+- 계열: 나머지 컬럼 (예: fcc_group) - 값별로 따로 다운샘플링
+측정값이 여러 개면 max_points를 나눠 각 측정값의 선택점을 합칩니다.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ['lttb', 'minmax']
+
+# lttb는 첫 점/마지막 점 + 구간 1개 이상이 필요
+MIN_POINTS = 3
+
+
+# ==================== 알고리즘 ====================
+
+def lttb_indices(x, y, threshold):
+    """
+    LTTB 선택 인덱스
+
+    Args:
+        x: 정렬된 x 값 (float 배열)
+        y: 측정값 (float 배열, NULL은 nan)
+        threshold: 선택할 점 수
+
+    Returns:
+        선택된 인덱스 배열 (오름차순, 첫 점/마지막 점 포함)
+    """
+    n = len(y)
+    if threshold >= n or threshold < MIN_POINTS:
+        return np.arange(n)
+
+    # 첫 점/마지막 점을 제외한 점을 threshold - 2개 구간으로 분할
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # 구간 평균 (누적합 차로 한 번에 계산)
+    filled = np.nan_to_num(y)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(filled)))
+    sizes = ends - starts
+    avg_x = np.append((cum_x[ends] - cum_x[starts]) / sizes, x[-1])
+    avg_y = np.append((cum_y[ends] - cum_y[starts]) / sizes, filled[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start, end = starts[bucket], ends[bucket]
+        next_x, next_y = avg_x[bucket + 1], avg_y[bucket + 1]
+        ax, ay = x[anchor], filled[anchor]
+
+        area = np.abs(
+            (ax - next_x) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y - ay)
+        )
+        # NULL 측정값은 선택하지 않음 (구간 전체가 NULL이면 첫 점)
+        anchor = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[bucket + 1] = anchor
+
+    return selected
+
+
+def _first_per_bucket(mask, bucket):
+    """mask가 참인 인덱스 중 구간별 첫 인덱스"""
+    indices = np.flatnonzero(mask)
+    buckets = bucket[indices]
+    first = np.ones(len(indices), dtype=bool)
+    first[1:] = buckets[1:] != buckets[:-1]
+    return indices[first]
+
+
+def minmax_indices(y, threshold):
+    """
+    구간별 최솟값/최댓값 선택 인덱스 (첫 점/마지막 점 포함 threshold개 이하)
+
+    Returns:
+        선택된 인덱스 배열 (오름차순, 첫 점/마지막 점 포함)
+    """
+    n = len(y)
+    if threshold >= n or threshold < MIN_POINTS:
+        return np.arange(n)
+
+    buckets = max((threshold - 2) // 2, 1)
+
+    bucket = (np.arange(n) * buckets) // n
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+
+    low = np.where(np.isnan(y), np.inf, y)
+    high = np.where(np.isnan(y), -np.inf, y)
+    mins = np.minimum.reduceat(low, starts)
+    maxs = np.maximum.reduceat(high, starts)
+
+    return np.unique(np.concatenate((
+        [0, n - 1],
+        _first_per_bucket(low == mins[bucket], bucket),
+        _first_per_bucket(high == maxs[bucket], bucket),
+    )))
+
+
+# ==================== 결과 적용 ====================
+
+def _x_axis(values):
+    """x 컬럼 값 → float 배열 (ISO 날짜/월 문자열, 연도/주 정수)"""
+    try:
+        sample = next(value for value in values if value is not None)
+    except StopIteration:
+        return np.arange(len(values), dtype=float)
+
+    try:
+        if isinstance(sample, str):
+            return np.asarray(values, dtype='datetime64[s]').astype(np.int64).astype(float)
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.arange(len(values), dtype=float)
+
+
+def _is_numeric(values):
+    sample = next((value for value in values if value is not None), None)
+    return isinstance(sample, (int, float, Decimal)) and not isinstance(sample, bool)
+
+
+def column_roles(result, spec):
+    """
+    결과 컬럼 → (x 컬럼, 측정값 컬럼 목록, 계열 컬럼 목록)
+
+    숫자 측정값이 없으면 (None, [], [])
+    """
+    columns = result['columns']
+    values = dict(zip(columns, result['values']))
+    date_column = spec.get('date_column', 'date')
+
+    x_column = None
+    if spec.get('group_by_period'):
+        x_column = columns[0]
+    elif date_column in values:
+        x_column = date_column
+
+    aggregations = spec.get('aggregations', [])
+    if aggregations:
+        aliases = [
+            agg.get('alias', f"{agg['function'].lower()}_{agg['column']}")
+            for agg in aggregations
+        ]
+        # 숫자 집계만 측정값으로 사용 (MAX(fcc_group) 등 문자열 집계는 선택된 행을 따라감)
+        measures = [col for col in aliases if col in values and _is_numeric(values[col])]
+    else:
+        measures = aliases = [
+            col for col in columns
+            if col != x_column and _is_numeric(values[col])
+        ]
+
+    if not measures:
+        return None, [], []
+
+    # 계열은 요청한 차원 컬럼만 (신뢰구간 등 파생 컬럼 제외)
+    series = [
+        col for col in spec.get('columns', [])
+        if col in values and col != x_column and col not in aliases
+    ]
+    return x_column, measures, series
+
+
+def select_indices(result, spec, max_points, method='lttb'):
+    """다운샘플링 후 남길 행 인덱스 (원래 순서)"""
+    x_column, measures, series = column_roles(result, spec)
+    if not measures:
+        return None
+
+    values = dict(zip(result['columns'], result['values']))
+    count = result['count']
+
+    # 계열별 행 인덱스 (계열 컬럼이 없으면 전체가 하나의 계열)
+    groups = defaultdict(list)
+    if series:
+        for index, key in enumerate(zip(*(values[col] for col in series))):
+            groups[key].append(index)
+    else:
+        groups[()] = range(count)
+
+    x_all = _x_axis(values[x_column]) if x_column else np.arange(count, dtype=float)
+    y_all = {
+        col: np.array([np.nan if v is None else v for v in values[col]], dtype=float)
+        for col in measures
+    }
+    budget = max(max_points // len(measures), MIN_POINTS)
+
+    keep = []
+    for rows in groups.values():
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) <= max_points:
+            keep.append(rows)
+            continue
+
+        chosen = [
+            lttb_indices(x_all[rows], y_all[col][rows], budget) if method == 'lttb'
+            else minmax_indices(y_all[col][rows], budget)
+            for col in measures
+        ]
+        keep.append(rows[np.unique(np.concatenate(chosen))])
+
+    return np.sort(np.concatenate(keep))
+
+
+def downsample_result(result, spec):
+    """
+    max_points가 지정된 요청의 결과 다운샘플링
+
+    Args:
+        result: 컬럼 단위 결과
+        spec: 조회 요청 (max_points, downsample)
+
+    Returns:
+        컬럼 단위 결과 - 줄어든 경우 original_count, downsample(방식) 포함
+    """
+    max_points = spec.get('max_points')
+    if not max_points or result['count'] <= max_points:
+        return result
+
+    method = spec.get('downsample', 'lttb')
+    keep = select_indices(result, spec, max_points, method)
+    if keep is None or len(keep) >= result['count']:
+        return result
+
+    keep = keep.tolist()
+    return {
+        **result,
+        'values': [[column[index] for index in keep] for column in result['values']],
+        'count': len(keep),
+        'original_count': result['count'],
+        'downsample': method,
+    }
@@ -0,0 +1,228 @@
+"""
+차원 필터 (filters) - WHERE 조건
+
+날짜 범위 외에 fcc_group/classname 같은 차원 컬럼으로 행을 거르는 조건입니다.
+클라이언트가 전체 그룹을 받아 걸러내지 않도록 SQL WHERE 절에서 처리합니다.
+
+    {"column": "fcc_group", "op": "eq", "value": "Mobile"}
+    {"column": "fcc_group", "op": "in", "values": ["Mobile", "Tablet"]}
+    {"column": "classname", "op": "not_in", "values": ["bot"]}
+    {"column": "fcc", "op": "range", "min": 0, "max": 5000}      (양 끝 포함, 한쪽만 지정 가능)
+    {"column": "classid", "op": "is_null", "value": false}       (false면 IS NOT NULL)
+
+1. 정규화 (normalize_filters - DataQuerySerializer)
+   - 같은 조건은 같은 형태가 되도록 컬럼/연산자 순 정렬, IN 목록 중복 제거 후 정렬
+   - 결과 캐시 키, 공유 스캔 병합 키, 동일 조회 병합 키가 조건 순서와 무관하게 같음
+
+2. SQL 변환 (filter_clauses / filter_params)
+   - 컬럼명은 화이트리스트(query.validate_columns) 검증 후 사용, 값은 모두 파라미터
+   - 실행 계획 캐시(compiler)는 조건 구조(filter_shape)만 키에 포함
+
+3. 큰 IN 목록 (DATA_QUERY_FILTER_TEMP_TABLE_MIN개 이상)
+   - 값을 연결별 임시 테이블(_dq_filter_N)에 적재 후 IN (SELECT ...) 조건으로 조회
+     (SQL 길이와 파라미터 수가 목록 크기와 무관, 임시 테이블 컬럼 타입/collation은 원본 컬럼과 같음)
+   - 임시 테이블은 조회가 끝나면 삭제 (연결 풀로 연결이 재사용되므로)
+
+롤업/스케치는 필터 컬럼이 모두 차원일 때만 사용하고, 샘플 테이블은 원본과 같은 컬럼이므로 항상 적용합니다.
+"""
+
+import json
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from .replicas import read_connection
+
+logger = logging.getLogger(__name__)
+
+FILTER_OPS = ('eq', 'in', 'not_in', 'range', 'is_null')
+LIST_OPS = ('in', 'not_in')
+
+TEMP_TABLE_PREFIX = '_dq_filter_'
+
+# 임시 테이블 적재 INSERT 배치 크기
+INSERT_BATCH_SIZE = 1000
+
+
+def max_values():
+    """IN/NOT IN 목록 최대 값 수"""
+    return getattr(settings, 'DATA_QUERY_FILTER_MAX_VALUES', 10000)
+
+
+def temp_table_min():
+    """임시 테이블로 조회할 IN/NOT IN 목록 최소 값 수"""
+    return getattr(settings, 'DATA_QUERY_FILTER_TEMP_TABLE_MIN', 200)
+
+
+def _value_order(value):
+    # 숫자/문자열이 섞인 목록도 정렬 가능하도록 숫자 먼저, 문자열 나중
+    return (isinstance(value, str), value)
+
+
+def normalize_filters(filters):
+    """
+    검증된 필터 목록 정규화 (캐시/병합 키가 조건 순서와 무관하도록)
+
+    Returns:
+        연산자별 필요한 키만 남긴 필터 목록 (중복 제거, 정렬)
+    """
+    normalized = {}
+    for clause in filters:
+        op = clause['op']
+        item = {'column': clause['column'], 'op': op}
+        if op == 'eq':
+            item['value'] = clause['value']
+        elif op in LIST_OPS:
+            item['values'] = sorted(set(clause['values']), key=_value_order)
+        elif op == 'range':
+            for bound in ('min', 'max'):
+                if clause.get(bound) is not None:
+                    item[bound] = clause[bound]
+        else:
+            item['value'] = bool(clause.get('value', True))
+        normalized[json.dumps(item, sort_keys=True)] = item
+
+    return [normalized[key] for key in sorted(normalized)]
+
+
+def filter_columns(spec):
+    """필터에 사용된 컬럼 집합"""
+    return {clause['column'] for clause in spec.get('filters', [])}
+
+
+def uses_temp_table(clause):
+    return clause['op'] in LIST_OPS and len(clause['values']) >= temp_table_min()
+
+
+def needs_temp_tables(spec):
+    return any(uses_temp_table(clause) for clause in spec.get('filters', []))
+
+
+def temp_table_name(index):
+    return f"{TEMP_TABLE_PREFIX}{index}"
+
+
+def filter_shape(spec):
+    """
+    필터 구조 (실행 계획 캐시 키용 - 값은 제외, SQL이 달라지는 부분만 포함)
+
+    IN 목록은 값 수(자리표시자 수) 또는 임시 테이블 사용 여부, range는 지정한 경계,
+    is_null은 IS NULL / IS NOT NULL 여부
+    """
+    shape = []
+    for clause in spec.get('filters', []):
+        op = clause['op']
+        if op in LIST_OPS:
+            detail = 'table' if uses_temp_table(clause) else len(clause['values'])
+        elif op == 'range':
+            detail = ('min' in clause, 'max' in clause)
+        elif op == 'is_null':
+            detail = clause['value']
+        else:
+            detail = None
+        shape.append((clause['column'], op, detail))
+    return tuple(shape)
+
+
+def filter_key(spec):
+    """필터 전체 (값 포함, 공유 스캔 병합 키용)"""
+    return json.dumps(spec.get('filters', []), sort_keys=True)
+
+
+def filter_clauses(spec):
+    """
+    WHERE 조건 목록 (자리표시자 %s, 값은 filter_params 순서)
+    """
+    clauses = []
+    for index, clause in enumerate(spec.get('filters', [])):
+        col = f"`{clause['column']}`"
+        op = clause['op']
+        if op == 'eq':
+            clauses.append(f"{col} = %s")
+        elif op in LIST_OPS:
+            negate = 'NOT ' if op == 'not_in' else ''
+            if uses_temp_table(clause):
+                clauses.append(
+                    f"{col} {negate}IN (SELECT `value` FROM `{temp_table_name(index)}`)"
+                )
+            else:
+                placeholders = ', '.join(['%s'] * len(clause['values']))
+                clauses.append(f"{col} {negate}IN ({placeholders})")
+        elif op == 'range':
+            if 'min' in clause:
+                clauses.append(f"{col} >= %s")
+            if 'max' in clause:
+                clauses.append(f"{col} <= %s")
+        else:
+            clauses.append(f"{col} IS NULL" if clause['value'] else f"{col} IS NOT NULL")
+    return clauses
+
+
+def filter_params(spec):
+    """filter_clauses 자리표시자 순서의 값 목록 (임시 테이블 IN 목록은 값 없음)"""
+    params = []
+    for clause in spec.get('filters', []):
+        op = clause['op']
+        if op == 'eq':
+            params.append(clause['value'])
+        elif op in LIST_OPS:
+            if not uses_temp_table(clause):
+                params.extend(clause['values'])
+        elif op == 'range':
+            params.extend(clause[bound] for bound in ('min', 'max') if bound in clause)
+    return params
+
+
+@contextmanager
+def filter_tables(spec, using=DEFAULT_DB_ALIAS):
+    """
+    큰 IN/NOT IN 목록을 임시 테이블에 적재하고 조회가 끝나면 삭제
+
+    임시 테이블은 연결별이므로 같은 연결에서 조회해야 합니다.
+    복제본 연결에 실패하면 primary에 적재하므로 실제로 사용할 DB 별칭을 돌려줍니다.
+
+    Yields:
+        조회를 실행할 DB 별칭
+    """
+    table_name = spec['table_name']
+    tables = [
+        (temp_table_name(index), clause)
+        for index, clause in enumerate(spec.get('filters', []))
+        if uses_temp_table(clause)
+    ]
+    if not tables:
+        yield using
+        return
+
+    connection = read_connection(using)
+    created = []
+    try:
+        with connection.cursor() as cursor:
+            for name, clause in tables:
+                # 원본 컬럼과 같은 타입/collation (IN 비교 시 변환 없이 인덱스 사용)
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE `{name}` AS "
+                    f"SELECT `{clause['column']}` AS `value` FROM `{table_name}` WHERE 1 = 0"
+                )
+                created.append(name)
+                values = clause['values']
+                for start in range(0, len(values), INSERT_BATCH_SIZE):
+                    cursor.executemany(
+                        f"INSERT INTO `{name}` (`value`) VALUES (%s)",
+                        [[value] for value in values[start:start + INSERT_BATCH_SIZE]]
+                    )
+        loaded = ', '.join(f"{name} {len(clause['values'])}건" for name, clause in tables)
+        logger.debug(f"필터 임시 테이블 적재: {table_name} - {loaded}")
+        yield connection.alias
+    finally:
+        drop = 'DROP TEMPORARY TABLE' if connection.vendor == 'mysql' else 'DROP TABLE'
+        try:
+            with connection.cursor() as cursor:
+                for name in created:
+                    cursor.execute(f"{drop} IF EXISTS `{name}`")
+        except Exception as e:
+            # 임시 테이블이 남은 연결은 재사용하지 않음 (풀에서 폐기)
+            logger.warning(f"필터 임시 테이블 삭제 실패, 연결 종료: {str(e)}")
+            connection.close()
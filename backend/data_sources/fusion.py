@@ -0,0 +1,227 @@
+"""
+공유 스캔(shared-scan) 쿼리 병합
+
+테이블, 날짜 필터, 차원 필터, 그룹화 기준이 같은 집계 조회 요청들을 하나의 SQL로 합쳐
+같은 범위를 한 번만 스캔하고, 결과를 요청별로 다시 나눠 돌려줍니다.
+
+예: 파이 차트 AVG(fcc) by fcc_group + 콤비네이션 차트 AVG(fcc), MAX(fcc) by fcc_group
+    → SELECT fcc_group, AVG(fcc), MAX(fcc) ... GROUP BY fcc_group 1회 실행
+"""
+
+import logging
+import threading
+
+from .admission import DEFAULT_PRIORITY
+from .filters import filter_key
+from .query import execute_spec, execution_slot
+from .registry import schema_registry
+from .results import select_columns
+from .sketches import has_percentiles
+
+logger = logging.getLogger(__name__)
+
+
+def scan_key(spec):
+    """
+    병합 가능 여부를 판단하는 키
+
+    집계 조회만 병합하며, 같은 키를 가진 요청은 같은 행 집합과 그룹을 만듭니다.
+    집계가 없는 원본 행 조회, 근사 집계, 백분위 집계, 상위 N개 조회는 None (병합하지 않음)
+    """
+    if not spec.get('aggregations'):
+        return None
+
+    # 근사 집계는 샘플 테이블을 조회하므로 정확한 집계와 병합하지 않음
+    if spec.get('accuracy') == 'approximate':
+        return None
+
+    # 백분위는 SQL 집계 함수가 아니므로 스케치/원본 행 계산 경로로 따로 실행
+    if has_percentiles(spec):
+        return None
+
+    # 상위 N개 순위는 요청 별칭(top_n_by) 기준이므로 병합하지 않음
+    if spec.get('top_n'):
+        return None
+
+    return (
+        spec['table_name'],
+        tuple(spec.get('columns', [])),
+        spec.get('date_column', 'date'),
+        spec.get('start_date'),
+        spec.get('end_date'),
+        spec.get('group_by_period'),
+        filter_key(spec),
+    )
+
+
+def _aggregation_alias(agg):
+    return agg.get('alias', f"{agg['function'].lower()}_{agg['column']}")
+
+
+class ScanPlan:
+    """
+    SQL 1회 실행 단위
+
+    Attributes:
+        members: {차트 ID: 조회 요청} - 이 스캔으로 결과를 얻는 요청들
+    """
+
+    def __init__(self, members):
+        self.members = members
+
+    @property
+    def is_fused(self):
+        return len(self.members) > 1
+
+    def _fused_spec(self):
+        """
+        요청들의 집계 함수 합집합으로 병합된 조회 요청 생성
+
+        차트마다 별칭이 다를 수 있으므로 (함수, 컬럼) 기준으로 중복 제거 후
+        내부 별칭(_fused_0, _fused_1, ...)을 부여합니다.
+
+        Returns:
+            (병합된 요청, {(함수, 컬럼): 내부 별칭})
+        """
+        first = next(iter(self.members.values()))
+        internal_aliases = {}
+        aggregations = []
+
+        for spec in self.members.values():
+            for agg in spec['aggregations']:
+                key = (agg['function'], agg['column'])
+                if key not in internal_aliases:
+                    internal_aliases[key] = f"_fused_{len(internal_aliases)}"
+                    aggregations.append({
+                        'column': agg['column'],
+                        'function': agg['function'],
+                        'alias': internal_aliases[key],
+                    })
+
+        fused = {
+            **first,
+            'aggregations': aggregations,
+            'limit': max(spec.get('limit', 1000) for spec in self.members.values()),
+        }
+        return fused, internal_aliases
+
+    def prepare(self):
+        """
+        실행할 조회 요청과 결과 분배 함수 (동기/비동기 실행 경로 공용)
+
+        Returns:
+            (실행할 조회 요청, 실행 결과 → {차트 ID: 컬럼 단위 결과} 함수)
+        """
+        if not self.is_fused:
+            chart_id, spec = next(iter(self.members.items()))
+            return spec, lambda body: {chart_id: body}
+
+        fused_spec, internal_aliases = self._fused_spec()
+
+        logger.info(
+            f"공유 스캔 실행: {fused_spec['table_name']} - "
+            f"차트 {len(self.members)}개 → 쿼리 1개 (집계 {len(internal_aliases)}개)"
+        )
+
+        return fused_spec, lambda body: self._split(fused_spec, internal_aliases, body)
+
+    def execute(self, priority=DEFAULT_PRIORITY):
+        """
+        스캔 실행 후 차트별 응답 본문 반환 (스캔 1건당 동시 실행 슬롯 1개)
+
+        Returns:
+            {차트 ID: 컬럼 단위 결과}
+
+        Raises:
+            QueryError: 실행 실패 (병합된 모든 차트에 동일하게 적용)
+        """
+        spec, split = self.prepare()
+        with execution_slot(schema_registry.get(spec['table_name']), priority):
+            body = execute_spec(spec)
+        return split(body)
+
+    def _split(self, fused_spec, internal_aliases, fused_body):
+        """병합 실행 결과 → 차트별 결과 (차트가 요청한 집계만, 차트별 별칭/limit)"""
+        # 그룹 컬럼 (날짜 그룹 별칭 + 일반 컬럼)
+        group_columns = []
+        if fused_spec.get('group_by_period'):
+            group_columns.append(
+                f"{fused_spec.get('date_column', 'date')}_{fused_spec['group_by_period']}"
+            )
+        group_columns.extend(fused_spec.get('columns', []))
+
+        # 비용 제한으로 근사 집계로 전환된 스캔은 신뢰구간 컬럼과 accuracy/cost_guard도 나눠 담음
+        fused_columns = set(fused_body['columns'])
+        meta = {key: fused_body[key] for key in ('accuracy', 'cost_guard') if key in fused_body}
+
+        bodies = {}
+        for chart_id, spec in self.members.items():
+            projection = [(col, col) for col in group_columns]
+            for agg in spec['aggregations']:
+                alias = _aggregation_alias(agg)
+                internal = internal_aliases[(agg['function'], agg['column'])]
+                projection.append((alias, internal))
+                projection.extend(
+                    (f"{alias}{suffix}", f"{internal}{suffix}")
+                    for suffix in ('_lower', '_upper')
+                    if f"{internal}{suffix}" in fused_columns
+                )
+            bodies[chart_id] = {
+                **select_columns(fused_body, projection, spec.get('limit', 1000)),
+                **meta,
+                'table_name': spec['table_name'],
+                'source_table': fused_body['source_table']
+            }
+
+        return bodies
+
+
+class FusionStats:
+    """병합 효과 카운터 (요청 수 대비 실제 스캔 수)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.scans = 0
+
+    def record(self, plans):
+        with self._lock:
+            self.queries += sum(len(plan.members) for plan in plans)
+            self.scans += len(plans)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queries': self.queries,
+                'scans': self.scans,
+                'scans_saved': self.queries - self.scans,
+            }
+
+
+fusion_stats = FusionStats()
+
+
+def plan_scans(specs):
+    """
+    조회 요청들을 스캔 계획으로 묶기
+
+    Args:
+        specs: {차트 ID: 검증된 조회 요청}
+
+    Returns:
+        ScanPlan 목록 (병합 불가한 요청은 단독 계획)
+    """
+    groups = {}
+    plans = []
+
+    for chart_id, spec in specs.items():
+        key = scan_key(spec)
+        if key is None:
+            plans.append(ScanPlan({chart_id: spec}))
+        else:
+            groups.setdefault(key, {})[chart_id] = spec
+
+    plans.extend(ScanPlan(members) for members in groups.values())
+
+    fusion_stats.record(plans)
+    return plans
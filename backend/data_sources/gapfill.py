@@ -0,0 +1,232 @@
+"""
+날짜 그룹 빈 구간 채우기 (fill) - 라인/영역/막대 차트
+
+group_by_period 조회는 행이 없는 날/주/월을 결과에서 빠뜨리므로 차트마다 x축이 어긋납니다.
+fill을 지정하면 [start_date, end_date] 전체 구간의 bucket이 계열별로 빠짐없이 나오도록 채웁니다.
+
+- null: 빈 구간 측정값 null
+- zero: 빈 구간 측정값 0 (COUNT/SUM 차트)
+- previous: 같은 계열의 직전 값 (첫 값 이전 구간은 null)
+
+1. 달력 생성: 기간 단위별 bucket 시작일 배열 (NumPy datetime64, 주는 MySQL YEARWEEK 기본 모드 - 일요일 시작)
+2. 병합: 결과 bucket 값 → 달력 위치를 벡터 연산으로 계산하고 (위치 × 계열 수 + 계열 번호)
+   자리에 원래 행 번호를 배치, 빈 자리는 채우기 값 (행마다 Python 반복 없음)
+3. 응답 직전 적용 (query.present_result) → 채우기 전 결과를 캐시/공유 스캔과 공유,
+   다운샘플링(max_points)과 컬럼 형식(columnar) 변환은 채운 결과에 적용
+
+채운 행 수는 응답의 fill.filled, 결과가 DATA_QUERY_FILL_MAX_ROWS행을 넘으면 채우지 않습니다 (fill.skipped).
+"""
+
+import logging
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FILL_METHODS = ['null', 'zero', 'previous']
+
+# 기간 단위별 (datetime64 단위, bucket 간격)
+PERIOD_STEPS = {
+    'day': ('D', 1),
+    'week': ('D', 7),
+    'month': ('M', 1),
+    'year': ('Y', 1),
+}
+
+
+def max_rows():
+    """채운 결과 최대 행 수 (bucket 수 × 계열 수)"""
+    return getattr(settings, 'DATA_QUERY_FILL_MAX_ROWS', 100000)
+
+
+class UnsupportedBuckets(Exception):
+    """결과 bucket 값을 달력 위치로 바꿀 수 없음 (예상하지 못한 형식)"""
+
+
+# ==================== 달력 ====================
+
+def _weekday(days):
+    """월요일=0 요일 (1970-01-01은 목요일)"""
+    return (days.astype(np.int64) + 3) % 7
+
+
+def _week_start(days):
+    """날짜가 속한 주의 일요일 (YEARWEEK 기본 모드)"""
+    return days - ((_weekday(days) + 1) % 7).astype('timedelta64[D]')
+
+
+def _first_sunday(years):
+    """연도별 첫 일요일 (YEARWEEK 기본 모드의 1주차 시작일)"""
+    jan1 = (years - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+    return jan1 + ((6 - _weekday(jan1)) % 7).astype('timedelta64[D]')
+
+
+def bucket_start(day, period):
+    """날짜 → 해당 bucket 시작 (datetime64)"""
+    days = np.datetime64(day, 'D')
+    if period == 'week':
+        return _week_start(days)
+    return days.astype(f'datetime64[{PERIOD_STEPS[period][0]}]')
+
+
+def calendar(start_date, end_date, period):
+    """[start_date, end_date]의 bucket 시작 배열"""
+    unit, step = PERIOD_STEPS[period]
+    start = bucket_start(start_date, period)
+    end = bucket_start(end_date, period)
+    return np.arange(start, end + np.timedelta64(step, unit), np.timedelta64(step, unit))
+
+
+def parse_buckets(values, period):
+    """
+    결과 bucket 값 → bucket 시작 (datetime64 배열)
+
+    day: 'YYYY-MM-DD', week: YEARWEEK 정수(YYYYWW), month: 'YYYY-MM', year: 정수
+
+    Raises:
+        UnsupportedBuckets
+    """
+    try:
+        if period == 'day':
+            return np.asarray(values, dtype='datetime64[D]')
+        if period == 'month':
+            return np.asarray(values, dtype='datetime64[M]')
+
+        numbers = np.asarray(values, dtype=np.int64)
+        if period == 'year':
+            return (numbers - 1970).astype('datetime64[Y]')
+        weeks = (numbers % 100 - 1).astype('timedelta64[D]') * 7
+        return _first_sunday(numbers // 100) + weeks
+    except (TypeError, ValueError, OverflowError) as e:
+        raise UnsupportedBuckets(str(e))
+
+
+def format_buckets(starts, period, sample):
+    """bucket 시작 배열 → 결과와 같은 형식의 bucket 값 목록"""
+    if period == 'day':
+        if isinstance(sample, str) or sample is None:
+            return np.datetime_as_string(starts, unit='D').tolist()
+        return starts.astype(object).tolist()
+    if period == 'month':
+        return np.datetime_as_string(starts, unit='M').tolist()
+
+    years = starts.astype('datetime64[Y]').astype(np.int64) + 1970
+    if period == 'year':
+        return years.tolist()
+    weeks = (starts - _first_sunday(years)).astype(np.int64) // 7 + 1
+    return (years * 100 + weeks).tolist()
+
+
+# ==================== 결과 적용 ====================
+
+def _source_index(result, spec, n_buckets, start):
+    """
+    채운 결과의 각 자리 → 원래 행 번호 (빈 자리 -1)
+
+    Returns:
+        (자리별 원래 행 번호 배열, 계열 컬럼 목록, 계열 키 목록)
+    """
+    period = spec['group_by_period']
+    step = PERIOD_STEPS[period][1]
+    columns = result['columns']
+    values = dict(zip(columns, result['values']))
+    series_columns = [col for col in spec.get('columns', []) if col in values]
+
+    count = result['count']
+    offsets = (parse_buckets(values[columns[0]], period) - start).astype(np.int64)
+    if np.any(offsets % step) or np.any(offsets < 0) or np.any(offsets >= n_buckets * step):
+        raise UnsupportedBuckets('요청 기간 밖이거나 bucket 경계가 아닌 값')
+
+    # 계열 번호 (처음 나온 순서)
+    if series_columns:
+        codes = {}
+        series = np.fromiter(
+            (codes.setdefault(key, len(codes)) for key in zip(*(values[col] for col in series_columns))),
+            dtype=np.int64,
+            count=count,
+        )
+        series_keys = list(codes)
+    else:
+        series = np.zeros(count, dtype=np.int64)
+        series_keys = [()]
+
+    slots = (offsets // step) * len(series_keys) + series
+    index = np.full(n_buckets * len(series_keys), -1, dtype=np.int64)
+    index[slots] = np.arange(count)
+    if len(np.unique(slots)) != count:
+        raise UnsupportedBuckets('같은 bucket/계열 행이 여러 개')
+
+    return index, series_columns, series_keys
+
+
+def fill_result(result, spec):
+    """
+    fill이 지정된 날짜 그룹 조회 결과의 빈 bucket 채우기
+
+    Args:
+        result: 컬럼 단위 결과 (첫 컬럼이 날짜 bucket, 날짜 순)
+        spec: 조회 요청 (fill, group_by_period, start_date, end_date)
+
+    Returns:
+        컬럼 단위 결과 - bucket 순, 같은 bucket 안에서는 계열이 처음 나온 순서, fill 정보 포함
+    """
+    method = spec.get('fill')
+    period = spec.get('group_by_period')
+    if not method or not period or not spec.get('start_date') or not spec.get('end_date'):
+        return result
+
+    buckets = calendar(spec['start_date'], spec['end_date'], period)
+    columns = result['columns']
+
+    try:
+        index, series_columns, series_keys = _source_index(
+            result, spec, len(buckets), buckets[0]
+        )
+    except UnsupportedBuckets as e:
+        logger.warning(f"빈 구간 채우기 생략: {spec['table_name']} - {str(e)}")
+        return result
+
+    total = len(index)
+    if total > max_rows():
+        logger.warning(
+            f"빈 구간 채우기 생략: {spec['table_name']} - {total:,}행 (최대 {max_rows():,}행)"
+        )
+        return {**result, 'fill': {'method': method, 'filled': 0, 'skipped': 'max_rows'}}
+
+    n_series = len(series_keys)
+    if method == 'previous':
+        # 계열별로 값이 있는 마지막 bucket 위치의 누적 최댓값 → 직전 값의 행 번호
+        grid = index.reshape(len(buckets), n_series)
+        positions = np.where(grid >= 0, np.arange(len(buckets))[:, None], -1)
+        last = np.maximum.accumulate(positions, axis=0)
+        index = np.where(
+            last >= 0, grid[np.maximum(last, 0), np.arange(n_series)], -1
+        ).ravel()
+    filler = 0 if method == 'zero' else None
+
+    sample = result['values'][0][0] if result['count'] else None
+    filled_values = []
+    for position, col in enumerate(columns):
+        if position == 0:
+            filled_values.append(np.repeat(
+                np.asarray(format_buckets(buckets, period, sample), dtype=object), n_series
+            ).tolist())
+        elif col in series_columns:
+            keys = np.empty(n_series, dtype=object)
+            keys[:] = [key[series_columns.index(col)] for key in series_keys]
+            filled_values.append(np.tile(keys, len(buckets)).tolist())
+        else:
+            # 마지막 자리에 채우기 값을 두고 빈 자리(-1)가 가리키게 함
+            source = np.empty(result['count'] + 1, dtype=object)
+            source[:-1] = result['values'][position]
+            source[-1] = filler
+            filled_values.append(source[index].tolist())
+
+    return {
+        **result,
+        'columns': list(columns),
+        'values': filled_values,
+        'count': total,
+        'fill': {'method': method, 'filled': total - result['count']},
+    }
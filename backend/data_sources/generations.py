@@ -0,0 +1,66 @@
+"""
+프로세스 간 공유되는 세대(generation) 스탬프
+
+gunicorn 워커와 manage.py 커맨드는 서로 다른 프로세스이므로,
+메모리 내 캐시의 무효화 신호를 스탬프 파일의 mtime으로 전파합니다.
+
+- current(): os.stat 1회 (DB 왕복 없음)
+- bump(): 스탬프 파일 갱신 → 모든 프로세스가 다음 조회 시 변경을 감지
+"""
+
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9_.-]+$')
+
+
+def state_dir():
+    """스탬프 파일 디렉토리 (settings.DATA_QUERY_STATE_DIR, 기본: 임시 디렉토리)"""
+    directory = getattr(settings, 'DATA_QUERY_STATE_DIR', None)
+    if not directory:
+        directory = Path(tempfile.gettempdir()) / 'email_report'
+    return Path(directory)
+
+
+def _stamp_path(name):
+    if not _NAME_PATTERN.match(name):
+        raise ValueError(f"유효하지 않은 스탬프 이름: '{name}'")
+    return state_dir() / f"{name}.stamp"
+
+
+def current(name):
+    """
+    현재 세대 값 반환
+
+    스탬프 파일이 없으면 0을 반환합니다.
+    """
+    try:
+        return os.stat(_stamp_path(name)).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def bump(name):
+    """
+    세대 값 증가
+
+    같은 시각에 연속 호출되어도 값이 항상 커지도록 이전 값 + 1 이상을 보장합니다.
+
+    Returns:
+        새 세대 값
+    """
+    path = _stamp_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    previous = current(name)
+    generation = max(time.time_ns(), previous + 1)
+
+    path.write_text(str(generation))
+    os.utime(path, ns=(generation, generation))
+
+    return generation
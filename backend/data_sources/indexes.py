@@ -0,0 +1,446 @@
+"""
+조회 형태 수집 및 인덱스 추천
+
+1. 수집 (shape_collector)
+   - 원본 테이블을 조회한 요청을 정규화된 형태(날짜 컬럼, 그룹화 컬럼, 집계 컬럼, 필터 컬럼)로 집계
+   - 프로세스 메모리에 누적 후 DATA_QUERY_SHAPE_FLUSH_INTERVAL 간격으로 QueryShape에 반영
+
+2. 추천 (propose_indexes)
+   - 형태별 복합/커버링 인덱스 제안: (동등 필터 컬럼, 날짜 컬럼, bucket 컬럼, 그룹화 컬럼, 범위 필터 컬럼, 집계 컬럼)
+   - 기존 인덱스나 다른 제안의 앞부분(left prefix)과 같으면 제외
+
+3. 적용 (apply_index / ensure_indexes)
+   - INVISIBLE 인덱스를 온라인(ALGORITHM=INPLACE, LOCK=NONE)으로 생성 후
+     EXPLAIN으로 사용 여부를 확인하고 VISIBLE 전환 또는 삭제
+   - 적용된 추천은 load_fcc_data 이후 인덱스가 없으면 다시 생성
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .registry import schema_registry
+
+logger = logging.getLogger(__name__)
+
+# MySQL 복합 인덱스 최대 컬럼 수
+MAX_INDEX_COLUMNS = 16
+
+# 전체 값을 인덱싱할 수 없는 타입 (prefix 길이 지정)
+PREFIX_INDEX_TYPES = {'text', 'tinytext', 'mediumtext', 'longtext', 'blob', 'tinyblob', 'mediumblob', 'longblob'}
+PREFIX_LENGTH = 64
+
+
+# ==================== 수집 ====================
+
+# 인덱스 선두에 둘 수 있는 필터 연산자 (값 하나 또는 목록과 같음 비교)
+EQUALITY_FILTER_OPS = ('eq', 'in', 'is_null')
+
+
+def query_shape(spec):
+    """
+    조회 요청 정규화 (날짜 값, limit, 집계 함수/별칭, 필터 값 제거)
+
+    Returns:
+        (date_column, has_date_filter, group_by_period, group_columns, measures,
+         equality_filters, range_filters)
+    """
+    filters = spec.get('filters', [])
+    equality = {clause['column'] for clause in filters if clause['op'] in EQUALITY_FILTER_OPS}
+    ranged = {clause['column'] for clause in filters} - equality
+    return (
+        spec.get('date_column', 'date'),
+        bool(spec.get('start_date') or spec.get('end_date')),
+        spec.get('group_by_period') or '',
+        tuple(spec.get('columns', [])),
+        tuple(sorted({agg['column'] for agg in spec.get('aggregations', [])})),
+        tuple(sorted(equality)),
+        tuple(sorted(ranged)),
+    )
+
+
+def shape_hash(shape):
+    # 필터가 없는 형태는 필터 도입 전과 같은 해시 (기존 QueryShape 누적 유지)
+    if not any(shape[5:]):
+        shape = shape[:5]
+    return hashlib.sha256(json.dumps(shape).encode('utf-8')).hexdigest()
+
+
+class ShapeCollector:
+    """
+    조회 형태 카운터 (프로세스 단위)
+
+    요청마다 DB에 쓰지 않도록 메모리에 누적한 뒤 주기적으로 한 번에 반영합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'DATA_QUERY_SHAPE_TRACKING', True)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'DATA_QUERY_SHAPE_FLUSH_INTERVAL', 60)
+
+    def record(self, spec):
+        """원본 테이블 조회 1건 기록 (주기가 지났으면 반영)"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._pending[(spec['table_name'], query_shape(spec))] += 1
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        누적된 카운트를 QueryShape에 반영
+
+        Returns:
+            반영된 형태 수
+        """
+        from .models import QueryShape
+
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        now = timezone.now()
+        try:
+            for (table_name, shape), count in pending.items():
+                schema = schema_registry.get(table_name)
+                if schema is None:
+                    continue
+
+                (date_column, has_date_filter, group_by_period, group_columns, measures,
+                 equality_filters, range_filters) = shape
+                record, _ = QueryShape.objects.get_or_create(
+                    data_source_id=schema.data_source_id,
+                    shape_hash=shape_hash(shape),
+                    defaults={
+                        'date_column': date_column,
+                        'has_date_filter': has_date_filter,
+                        'group_by_period': group_by_period,
+                        'group_columns': list(group_columns),
+                        'measures': list(measures),
+                        'equality_filters': list(equality_filters),
+                        'range_filters': list(range_filters),
+                    }
+                )
+                QueryShape.objects.filter(pk=record.pk).update(
+                    hits=F('hits') + count,
+                    last_seen_at=now
+                )
+        except Exception as e:
+            # 통계 수집 실패가 조회 응답에 영향을 주지 않도록 기록만 남김
+            logger.warning(f"조회 형태 기록 실패: {str(e)}")
+            return 0
+
+        return len(pending)
+
+
+shape_collector = ShapeCollector()
+
+
+# ==================== 추천 ====================
+
+def index_name_for(columns):
+    """컬럼 목록으로 결정되는 인덱스명 (같은 추천은 항상 같은 이름)"""
+    digest = hashlib.sha1(','.join(columns).encode('utf-8')).hexdigest()[:10]
+    return f"idx_adv_{digest}"
+
+
+def propose_columns(shape, schema):
+    """
+    조회 형태 하나에 대한 인덱스 컬럼 순서
+
+    - 동등 필터 컬럼 (=, IN, IS NULL - 선두에 두어야 뒤의 범위 검색에 인덱스 사용)
+    - 날짜 범위 조건 컬럼 (범위 검색)
+    - 날짜 bucket 생성 컬럼 (create_bucket_columns로 만든 경우)
+    - GROUP BY 컬럼
+    - 범위/제외 필터 컬럼 (인덱스 안에서 조건 검사)
+    - 집계 컬럼 (커버링 - 테이블 행 접근 없이 인덱스만으로 계산)
+    """
+    candidates = list(shape.equality_filters)
+    if shape.has_date_filter:
+        candidates.append(shape.date_column)
+    if shape.group_by_period:
+        candidates.append(f"{shape.date_column}_{shape.group_by_period}")
+    candidates.extend(shape.group_columns)
+    candidates.extend(shape.range_filters)
+    candidates.extend(shape.measures)
+
+    columns = []
+    for col in candidates:
+        if col in schema.column_set and col not in columns:
+            columns.append(col)
+
+    return columns[:MAX_INDEX_COLUMNS]
+
+
+def _is_prefix(columns, other):
+    return len(columns) <= len(other) and list(other[:len(columns)]) == list(columns)
+
+
+def existing_indexes(table_name):
+    """
+    테이블의 인덱스 목록
+
+    Returns:
+        {인덱스명: [컬럼, ...]}
+    """
+    indexes = {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+            "ORDER BY INDEX_NAME, SEQ_IN_INDEX",
+            [table_name]
+        )
+        for index_name, column_name in cursor.fetchall():
+            indexes.setdefault(index_name, []).append(column_name)
+    return indexes
+
+
+def propose_indexes(schema, shapes):
+    """
+    조회 형태 목록 → 인덱스 추천 목록
+
+    Args:
+        schema: DataSourceSchema
+        shapes: QueryShape 목록
+
+    Returns:
+        [{'index_name', 'columns', 'hits', 'shape'}] - 조회 횟수 내림차순
+    """
+    proposals = {}
+    for shape in shapes:
+        columns = propose_columns(shape, schema)
+        if not columns:
+            continue
+
+        key = tuple(columns)
+        proposal = proposals.setdefault(key, {
+            'index_name': index_name_for(columns),
+            'columns': columns,
+            'hits': 0,
+            'shape': shape,
+        })
+        proposal['hits'] += shape.hits
+        if shape.hits > proposal['shape'].hits:
+            proposal['shape'] = shape
+
+    # 다른 제안이나 기존 인덱스의 앞부분과 같은 제안은 그 인덱스로 처리 가능
+    current = existing_indexes(schema.table_name)
+    results = []
+    for key, proposal in proposals.items():
+        covered_by = [
+            other for other in proposals
+            if other != key and _is_prefix(key, other)
+        ]
+        if covered_by:
+            target = proposals[max(covered_by, key=len)]
+            target['hits'] += proposal['hits']
+            continue
+        if any(
+            _is_prefix(key, columns)
+            for name, columns in current.items()
+            if name != proposal['index_name']
+        ):
+            continue
+        results.append(proposal)
+
+    return sorted(results, key=lambda proposal: proposal['hits'], reverse=True)
+
+
+def _sample_value(schema, column):
+    """대표 쿼리의 동등 필터 값 (테이블에 있는 값 하나, 없으면 None)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT `{column}` FROM `{schema.table_name}` WHERE `{column}` IS NOT NULL LIMIT 1"
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def representative_query(schema, shape):
+    """
+    EXPLAIN용 대표 쿼리 (날짜 필터가 있으면 최근 30일)
+
+    동등 필터는 테이블에 있는 값 하나로 = 조건, 범위 필터는 IS NOT NULL 조건으로 재현합니다.
+    """
+    from .query import build_query
+
+    spec = {
+        'table_name': schema.table_name,
+        'date_column': shape.date_column,
+        'columns': list(shape.group_columns),
+        'aggregations': [
+            {'column': col, 'function': 'COUNT'} for col in shape.measures
+        ],
+    }
+    if shape.group_by_period:
+        spec['group_by_period'] = shape.group_by_period
+    if not spec['columns'] and not spec['aggregations'] and not shape.group_by_period:
+        spec['columns'] = [shape.date_column]
+    if shape.has_date_filter:
+        end_date = timezone.localdate()
+        spec['start_date'] = end_date - timedelta(days=30)
+        spec['end_date'] = end_date
+
+    filters = []
+    for col in shape.equality_filters:
+        value = _sample_value(schema, col)
+        if value is None:
+            filters.append({'column': col, 'op': 'is_null', 'value': True})
+        else:
+            filters.append({'column': col, 'op': 'eq', 'value': value})
+    for col in shape.range_filters:
+        filters.append({'column': col, 'op': 'is_null', 'value': False})
+    if filters:
+        spec['filters'] = filters
+
+    query, params, _ = build_query(spec, schema)
+    return query, params
+
+
+def explain(query, params, use_invisible_indexes=False):
+    """
+    실행 계획 요약
+
+    Returns:
+        {'keys': [사용 인덱스...], 'rows': 예상 검사 행 수 합계, 'extra': [...]}
+    """
+    with connection.cursor() as cursor:
+        if use_invisible_indexes:
+            cursor.execute("SET SESSION optimizer_switch = 'use_invisible_indexes=on'")
+        try:
+            cursor.execute("EXPLAIN " + query, params)
+            names = [col[0] for col in cursor.description]
+            plan = [dict(zip(names, row)) for row in cursor.fetchall()]
+        finally:
+            if use_invisible_indexes:
+                cursor.execute("SET SESSION optimizer_switch = 'use_invisible_indexes=off'")
+
+    return {
+        'keys': [row.get('key') for row in plan if row.get('key')],
+        'rows': sum(int(row.get('rows') or 0) for row in plan),
+        'extra': [row.get('Extra') or '' for row in plan],
+    }
+
+
+# ==================== 적용 ====================
+
+def index_definition(columns, schema):
+    """인덱스 컬럼 정의 (TEXT/BLOB 컬럼은 prefix 인덱스)"""
+    parts = []
+    for col in columns:
+        if schema.column_types.get(col) in PREFIX_INDEX_TYPES:
+            parts.append(f"`{col}`({PREFIX_LENGTH})")
+        else:
+            parts.append(f"`{col}`")
+    return ', '.join(parts)
+
+
+def create_index(schema, index_name, columns, visible=True):
+    """온라인 인덱스 생성 (테이블 잠금 없이 읽기/쓰기 허용)"""
+    visibility = 'VISIBLE' if visible else 'INVISIBLE'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE `{schema.table_name}` "
+            f"ADD INDEX `{index_name}` ({index_definition(columns, schema)}) {visibility}, "
+            f"ALGORITHM=INPLACE, LOCK=NONE"
+        )
+
+
+def drop_index(schema, index_name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE `{schema.table_name}` DROP INDEX `{index_name}`")
+
+
+def apply_index(schema, recommendation, query, params):
+    """
+    추천 인덱스 적용
+
+    INVISIBLE로 만든 뒤 대표 쿼리가 실제로 사용하는 경우에만 VISIBLE로 전환합니다.
+
+    Returns:
+        explain() 결과 (적용 후)
+    """
+    create_index(schema, recommendation.index_name, recommendation.columns, visible=False)
+
+    plan = explain(query, params, use_invisible_indexes=True)
+    recommendation.rows_after = plan['rows']
+
+    if recommendation.index_name in plan['keys']:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE `{schema.table_name}` "
+                f"ALTER INDEX `{recommendation.index_name}` VISIBLE"
+            )
+        recommendation.status = 'applied'
+        recommendation.applied_at = timezone.now()
+        logger.info(f"인덱스 적용: {schema.table_name}.{recommendation.index_name}")
+    else:
+        drop_index(schema, recommendation.index_name)
+        recommendation.status = 'rejected'
+        logger.info(f"인덱스 미사용으로 제거: {schema.table_name}.{recommendation.index_name}")
+
+    recommendation.save()
+    return plan
+
+
+def ensure_indexes(table_name):
+    """
+    적용된 추천 인덱스 복구 (전체 재적재로 테이블이 다시 만들어진 경우)
+
+    Returns:
+        다시 생성한 인덱스명 목록
+    """
+    from .models import IndexRecommendation
+
+    schema = schema_registry.get(table_name)
+    if schema is None:
+        return []
+
+    recommendations = IndexRecommendation.objects.filter(
+        data_source_id=schema.data_source_id,
+        status='applied',
+    )
+    if not recommendations:
+        return []
+
+    current = existing_indexes(table_name)
+    created = []
+    for recommendation in recommendations:
+        if recommendation.index_name in current:
+            continue
+        if schema.invalid_columns(recommendation.columns):
+            logger.warning(
+                f"인덱스 복구 건너뜀 (컬럼 없음): {table_name}.{recommendation.index_name}"
+            )
+            continue
+        create_index(schema, recommendation.index_name, recommendation.columns)
+        created.append(recommendation.index_name)
+
+    if created:
+        logger.info(f"인덱스 복구: {table_name} - {', '.join(created)}")
+    return created
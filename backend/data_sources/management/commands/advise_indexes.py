@@ -0,0 +1,137 @@
+"""
+Django Management Command: 관측된 조회 형태 기반 인덱스 추천/적용
+
+Usage:
+    python manage.py advise_indexes
+    python manage.py advise_indexes --table fcc_data --min-hits 10
+    python manage.py advise_indexes --apply
+    python manage.py advise_indexes --reapply
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data_sources.indexes import (
+    apply_index,
+    ensure_indexes,
+    explain,
+    propose_indexes,
+    representative_query,
+    shape_collector,
+)
+from data_sources.models import IndexRecommendation, QueryShape
+from data_sources.registry import schema_registry
+
+
+class Command(BaseCommand):
+    help = '관측된 조회 형태로 복합/커버링 인덱스를 추천하고 선택적으로 적용합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            default='fcc_data',
+            help='대상 DataSource 테이블명 (기본: fcc_data)'
+        )
+        parser.add_argument(
+            '--min-hits',
+            type=int,
+            default=1,
+            help='추천 대상 최소 조회 횟수 (기본: 1)'
+        )
+        parser.add_argument(
+            '--apply',
+            action='store_true',
+            help='추천 인덱스를 온라인으로 생성 (EXPLAIN에서 사용되지 않으면 제거)'
+        )
+        parser.add_argument(
+            '--reapply',
+            action='store_true',
+            help='저장된 적용 인덱스 중 없는 것만 다시 생성'
+        )
+
+    def handle(self, *args, **options):
+        table_name = options['table']
+
+        schema = schema_registry.get(table_name)
+        if schema is None:
+            raise CommandError(f"DataSource '{table_name}'이(가) 등록되지 않았거나 비활성 상태입니다.")
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('인덱스 추천 시작'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+
+        if options['reapply']:
+            created = ensure_indexes(table_name)
+            self.stdout.write(self.style.SUCCESS(f'✓ 인덱스 {len(created)}개 복구'))
+            for index_name in created:
+                self.stdout.write(f'  - {index_name}')
+            return
+
+        # 1. 조회 형태 로드 (현재 프로세스 누적분 반영 후)
+        shape_collector.flush()
+        shapes = list(
+            QueryShape.objects.filter(
+                data_source_id=schema.data_source_id,
+                hits__gte=options['min_hits'],
+            )
+        )
+        self.stdout.write(f'\n[1/3] 조회 형태 {len(shapes)}개 (최소 {options["min_hits"]}회)')
+
+        if not shapes:
+            self.stdout.write(self.style.WARNING('추천할 조회 형태가 없습니다.'))
+            return
+
+        # 2. 추천 생성
+        proposals = propose_indexes(schema, shapes)
+        self.stdout.write(f'\n[2/3] 추천 인덱스 {len(proposals)}개')
+
+        if not proposals:
+            self.stdout.write(self.style.SUCCESS('✓ 기존 인덱스로 모든 조회 형태를 처리할 수 있습니다.'))
+            return
+
+        # 3. EXPLAIN으로 효과 추정 (및 적용)
+        self.stdout.write(f'\n[3/3] EXPLAIN {"및 적용" if options["apply"] else "(추정만)"}')
+
+        failed = 0
+        for proposal in proposals:
+            query, params = representative_query(schema, proposal['shape'])
+            before = explain(query, params)
+
+            recommendation, _ = IndexRecommendation.objects.update_or_create(
+                data_source_id=schema.data_source_id,
+                index_name=proposal['index_name'],
+                defaults={
+                    'columns': proposal['columns'],
+                    'hits': proposal['hits'],
+                    'rows_before': before['rows'],
+                }
+            )
+
+            self.stdout.write(
+                f"\n  {recommendation.index_name} ({', '.join(proposal['columns'])})"
+            )
+            self.stdout.write(
+                f"    조회 {proposal['hits']:,}회 | 현재: key={before['keys'] or '-'}, "
+                f"rows={before['rows']:,}"
+            )
+
+            if not options['apply'] or recommendation.status == 'applied':
+                continue
+
+            try:
+                after = apply_index(schema, recommendation, query, params)
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'    ✗ 적용 실패: {str(e)}'))
+                continue
+
+            summary = f"적용 후: key={after['keys'] or '-'}, rows={after['rows']:,}"
+            if recommendation.status == 'applied':
+                self.stdout.write(self.style.SUCCESS(f'    ✓ {summary} → 적용'))
+            else:
+                self.stdout.write(self.style.WARNING(f'    {summary} → 미사용으로 제거'))
+
+        self.stdout.write('\n' + '=' * 60)
+        if failed:
+            raise CommandError(f'인덱스 {failed}개 적용 실패')
+        self.stdout.write(self.style.SUCCESS('✓ 인덱스 추천 완료!'))
+        self.stdout.write('=' * 60)
@@ -0,0 +1,243 @@
+"""
+Django Management Command: 동기/비동기 조회 엔드포인트 부하 테스트
+
+메일 발송 직후 여러 명이 /report/yyyymmdd iframe을 동시에 여는 상황처럼
+Report.tsx와 같은 4개 차트 일괄 조회를 동시에 보내고
+동기(gunicorn sync 워커)와 비동기(uvicorn 워커) 서버의 응답 시간, 처리량, 차트별 상태를 비교합니다.
+
+같은 코드로 두 서버를 띄운 뒤 실행합니다 (결과 캐시/병합을 끄면 실제 DB 실행만 비교):
+    DATA_QUERY_CACHE_ENABLED=False DATA_QUERY_SINGLEFLIGHT=False \\
+        gunicorn config.wsgi:application --bind 0.0.0.0:10004 --workers 3
+    DATA_QUERY_CACHE_ENABLED=False DATA_QUERY_SINGLEFLIGHT=False \\
+        gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:10005 --workers 3
+
+Usage:
+    python manage.py benchmark_async
+    python manage.py benchmark_async --concurrency 50 --requests 200
+    python manage.py benchmark_async --sync-url http://localhost:10004 --async-url http://localhost:10005 --end-date 2025-01-31
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.core.management.base import BaseCommand, CommandError
+
+from data_sources.admission import PRIORITY_HEADER
+
+SYNC_PATH = '/api/data-sources/query/batch/'
+ASYNC_PATH = '/api/data-sources/query/batch/async/'
+
+
+def report_queries(table_name, date_column, report_date):
+    """Report.tsx의 4개 차트 일괄 조회 요청 (report_date 기준 최근 7일/4주/1개월)"""
+    end = report_date.isoformat()
+    start_7_days = (report_date - timedelta(days=6)).isoformat()
+    start_4_weeks = (report_date - timedelta(days=27)).isoformat()
+    start_month = (report_date - relativedelta(months=1)).isoformat()
+    avg_fcc = {'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'}
+
+    return {
+        'dailyFcc': {
+            'table_name': table_name, 'columns': [], 'date_column': date_column,
+            'start_date': start_7_days, 'end_date': end,
+            'group_by_period': 'day', 'aggregations': [avg_fcc], 'limit': 7,
+        },
+        'weeklyFcc': {
+            'table_name': table_name, 'columns': [], 'date_column': date_column,
+            'start_date': start_4_weeks, 'end_date': end,
+            'group_by_period': 'week', 'aggregations': [avg_fcc], 'limit': 4,
+        },
+        'fccGroup': {
+            'table_name': table_name, 'columns': ['fcc_group'], 'date_column': date_column,
+            'start_date': start_month, 'end_date': end,
+            'aggregations': [avg_fcc], 'limit': 10,
+        },
+        'fccGroupComparison': {
+            'table_name': table_name, 'columns': ['fcc_group'], 'date_column': date_column,
+            'start_date': start_month, 'end_date': end,
+            'aggregations': [avg_fcc, {'column': 'fcc', 'function': 'MAX', 'alias': 'max_fcc'}],
+            'limit': 10,
+        },
+    }
+
+
+def _post(url, payload, priority, timeout):
+    """
+    일괄 조회 요청 1건
+
+    Returns:
+        (HTTP 상태 또는 오류 이름, 차트별 상태 목록, 응답 시간(ms))
+    """
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json', PRIORITY_HEADER: priority},
+        method='POST'
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = json.loads(response.read())
+            outcome = str(response.status)
+    except urllib.error.HTTPError as e:
+        body = {}
+        outcome = str(e.code)
+    except (urllib.error.URLError, OSError) as e:
+        body = {}
+        outcome = type(getattr(e, 'reason', e)).__name__
+    elapsed = (time.perf_counter() - started) * 1000
+
+    charts = [str(result.get('status')) for result in body.get('results', {}).values()]
+    return outcome, charts, elapsed
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help = '리포트 iframe 동시 로딩을 재현하여 동기/비동기 일괄 조회 엔드포인트의 응답 시간과 처리량을 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sync-url',
+            default='http://localhost:10004',
+            help='동기(WSGI) 서버 주소 (기본: http://localhost:10004, 빈 값이면 생략)'
+        )
+        parser.add_argument(
+            '--async-url',
+            default='http://localhost:10005',
+            help='비동기(ASGI/uvicorn) 서버 주소 (기본: http://localhost:10005, 빈 값이면 생략)'
+        )
+        parser.add_argument(
+            '--table',
+            default='fcc_data',
+            help='대상 DataSource 테이블명 (기본: fcc_data)'
+        )
+        parser.add_argument(
+            '--date-column',
+            default='cdate',
+            help='날짜 컬럼 (기본: cdate)'
+        )
+        parser.add_argument(
+            '--end-date',
+            help='가장 최근 리포트 날짜 YYYY-MM-DD (기본: 오늘)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='리포트 날짜 분산 일수 - 요청마다 end-date부터 거슬러 올라간 날짜 사용 (기본: 30)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=20,
+            help='동시에 열리는 리포트 iframe 수 (기본: 20)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=100,
+            help='엔드포인트별 전체 리포트 로딩 수 (기본: 100)'
+        )
+        parser.add_argument(
+            '--priority',
+            default='viewer',
+            help='X-Query-Priority 헤더 (기본: viewer, 익명 요청은 viewer/batch만 적용)'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=60.0,
+            help='요청별 타임아웃 초 (기본: 60)'
+        )
+
+    def _measure(self, url, payloads, concurrency, priority, timeout):
+        """모든 요청을 concurrency개씩 동시에 실행"""
+        outcomes = Counter()
+        charts = Counter()
+        latencies = []
+        lock = threading.Lock()
+
+        def load(payload):
+            outcome, chart_statuses, elapsed = _post(url, payload, priority, timeout)
+            with lock:
+                outcomes[outcome] += 1
+                charts.update(chart_statuses)
+                latencies.append(elapsed)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(load, payloads))
+        wall = time.perf_counter() - started
+
+        return outcomes, charts, latencies, wall
+
+    def handle(self, *args, **options):
+        try:
+            end_date = date.fromisoformat(options['end_date']) if options['end_date'] else date.today()
+        except ValueError:
+            raise CommandError('--end-date는 YYYY-MM-DD 형식이어야 합니다.')
+
+        concurrency = max(options['concurrency'], 1)
+        requests = max(options['requests'], 1)
+        days = max(options['days'], 1)
+
+        targets = [
+            (label, base_url.rstrip('/') + path)
+            for label, base_url, path in (
+                ('동기 (WSGI)', options['sync_url'], SYNC_PATH),
+                ('비동기 (ASGI)', options['async_url'], ASYNC_PATH),
+            )
+            if base_url
+        ]
+        if not targets:
+            raise CommandError('--sync-url 또는 --async-url 중 하나 이상이 필요합니다.')
+
+        payloads = [
+            {'queries': report_queries(
+                options['table'], options['date_column'], end_date - timedelta(days=i % days)
+            )}
+            for i in range(requests)
+        ]
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('동기/비동기 조회 엔드포인트 부하 테스트'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(
+            f'리포트 로딩 {requests:,}건 (동시 {concurrency}건, 요청당 차트 4개) - '
+            f'{options["table"]}, 리포트 날짜 {days}일 분산 (~{end_date.isoformat()})'
+        )
+
+        for label, url in targets:
+            # 연결/워커 준비 (측정 제외)
+            _post(url, payloads[0], options['priority'], options['timeout'])
+
+            outcomes, charts, latencies, wall = self._measure(
+                url, payloads, concurrency, options['priority'], options['timeout']
+            )
+
+            self.stdout.write(f'\n[{label}] {url}')
+            self.stdout.write(
+                f'  응답 {dict(sorted(outcomes.items()))} | 차트 {dict(sorted(charts.items()))}'
+            )
+            self.stdout.write(
+                f'  p50 {_percentile(latencies, 0.5):7.1f}ms  '
+                f'p95 {_percentile(latencies, 0.95):7.1f}ms  '
+                f'p99 {_percentile(latencies, 0.99):7.1f}ms  '
+                f'max {max(latencies):7.1f}ms'
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'  처리량 {requests / wall:7.1f} 리포트/초 (전체 {wall * 1000:,.0f}ms)'
+            ))
+
+        self.stdout.write('\n' + '=' * 60)
@@ -0,0 +1,101 @@
+"""
+Django Management Command: SQL 컴파일러 마이크로벤치마크
+
+대시보드 차트 형태의 조회 요청으로 SQL 생성 시간을 비교합니다.
+- uncached: 요청마다 SELECT/WHERE/GROUP BY/ORDER BY 조립 (QueryCompiler._compile)
+- cached: 구조가 같으면 실행 계획 재사용 후 날짜/limit만 바인딩 (query_compiler)
+
+Usage:
+    python manage.py benchmark_compiler
+    python manage.py benchmark_compiler --iterations 100000
+"""
+
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from data_sources.compiler import QueryCompiler
+
+SAMPLE_SPECS = [
+    {
+        'table_name': 'fcc_data',
+        'date_column': 'cdate',
+        'group_by_period': 'day',
+        'columns': ['fcc_group'],
+        'aggregations': [
+            {'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'},
+            {'column': 'fcc', 'function': 'MAX', 'alias': 'max_fcc'},
+        ],
+        'limit': 1000,
+    },
+    {
+        'table_name': 'fcc_data',
+        'date_column': 'cdate',
+        'columns': ['classname'],
+        'aggregations': [{'column': 'fcc', 'function': 'COUNT'}],
+        'limit': 20,
+    },
+    {
+        'table_name': 'fcc_data',
+        'date_column': 'cdate',
+        'columns': ['cdate', 'fcc_group', 'fcc'],
+        'limit': 5000,
+    },
+]
+
+
+def sample_requests(iterations):
+    """같은 구조, 다른 날짜 범위의 요청 목록 (대시보드 기간 변경과 같은 형태)"""
+    end_date = date(2025, 6, 30)
+    return [
+        {
+            **SAMPLE_SPECS[index % len(SAMPLE_SPECS)],
+            'start_date': end_date - timedelta(days=7 + index % 90),
+            'end_date': end_date,
+        }
+        for index in range(iterations)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'SQL 생성 시간을 실행 계획 캐시 사용 여부별로 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50000,
+            help='요청 수 (기본: 50000)'
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(options['iterations'], 1)
+        requests = sample_requests(iterations)
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('SQL 컴파일러 벤치마크'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(f'요청 {iterations:,}건 (구조 {len(SAMPLE_SPECS)}종)')
+
+        uncached = QueryCompiler()
+        started = time.perf_counter()
+        for spec in requests:
+            uncached._compile(spec, None).bind(spec)
+        uncached_time = time.perf_counter() - started
+
+        cached = QueryCompiler()
+        started = time.perf_counter()
+        for spec in requests:
+            cached.compile(spec, None).bind(spec)
+        cached_time = time.perf_counter() - started
+
+        self.stdout.write(
+            f'  uncached {uncached_time * 1000:8.1f}ms ({uncached_time / iterations * 1e6:5.2f}us/건)'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'  cached   {cached_time * 1000:8.1f}ms ({cached_time / iterations * 1e6:5.2f}us/건) | '
+            f'{uncached_time / cached_time:.2f}x 빠름'
+        ))
+        self.stdout.write(f'  캐시: {cached.stats()}')
+        self.stdout.write('\n' + '=' * 60)
@@ -0,0 +1,113 @@
+"""
+Django Management Command: DB 연결 풀 벤치마크
+
+요청마다 연결을 열고 닫는 경우(DB_POOL_ENABLED=False, CONN_MAX_AGE=0)와
+연결 풀에서 빌리고 반납하는 경우의 "연결 + 짧은 조회 + 반납" 시간을 비교합니다.
+일괄 조회 스레드처럼 여러 스레드가 동시에 연결을 쓰는 경우 풀 대기 시간도 함께 확인합니다.
+
+Usage:
+    python manage.py benchmark_connections
+    python manage.py benchmark_connections --iterations 500 --threads 5
+    python manage.py benchmark_connections --database analytics
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+
+from data_sources.pool import connection_pools
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help = '요청마다 새로 연결하는 경우와 연결 풀 사용 시의 연결 비용을 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='대상 DB 별칭 (기본: default)'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='스레드별 요청 수 (기본: 200)'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=1,
+            help='동시 실행 스레드 수 - 요청 스레드 1 + DATA_QUERY_BATCH_WORKERS 재현 (기본: 1)'
+        )
+
+    def _request(self, alias):
+        """요청 1건: 연결 + SELECT 1 + 요청 종료 처리 (CONN_MAX_AGE=0이면 close)"""
+        connection = connections[alias]
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        connection.close()
+        return (time.perf_counter() - started) * 1000
+
+    def _measure(self, alias, iterations, threads):
+        latencies = []
+        lock = threading.Lock()
+
+        def run():
+            elapsed = [self._request(alias) for _ in range(iterations)]
+            with lock:
+                latencies.extend(elapsed)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for future in [executor.submit(run) for _ in range(threads)]:
+                future.result()
+        wall = time.perf_counter() - started
+        return latencies, wall
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        if alias not in connections:
+            raise CommandError(f'DATABASES에 {alias} 별칭이 없습니다.')
+        if connections[alias].vendor != 'mysql':
+            raise CommandError(f'{alias}는 MySQL DB가 아닙니다.')
+
+        iterations = max(options['iterations'], 1)
+        threads = max(options['threads'], 1)
+        total = iterations * threads
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('DB 연결 풀 벤치마크'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(f'{alias}: 요청 {total:,}건 (스레드 {threads}개 × {iterations:,}건, 요청당 SELECT 1)')
+
+        results = {}
+        for label, enabled in (('새 연결', False), ('연결 풀', True)):
+            with override_settings(DB_POOL_ENABLED=enabled):
+                # 풀 준비 / 첫 연결 (측정 제외)
+                self._request(alias)
+                latencies, wall = self._measure(alias, iterations, threads)
+            results[label] = wall
+
+            self.stdout.write(
+                f'  {label}  p50 {_percentile(latencies, 0.5):6.2f}ms  '
+                f'p95 {_percentile(latencies, 0.95):6.2f}ms  '
+                f'max {max(latencies):7.2f}ms | {total / wall:8.1f} 요청/초'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'  연결 풀 {results["새 연결"] / results["연결 풀"]:.2f}x 빠름 '
+            f'(요청당 연결 비용 {(results["새 연결"] - results["연결 풀"]) * 1000 / iterations:.2f}ms 절감)'
+        ))
+        self.stdout.write(f'  풀: {connection_pools.stats()["pools"].get(alias)}')
+        self.stdout.write('\n' + '=' * 60)
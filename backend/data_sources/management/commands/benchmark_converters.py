@@ -0,0 +1,109 @@
+"""
+Django Management Command: 결과 변환 마이크로벤치마크
+
+커서 튜플 → 응답 행 딕셔너리 변환을 비교합니다.
+- legacy: 값마다 hasattr(value, 'isoformat') 확인 후 인덱스로 딕셔너리 생성 (기존 루프)
+- sniff: 컬럼 단위 변환, 값으로 타입 판단 (cursor.description 타입 정보가 없을 때)
+- compiled: cursor.description으로 컬럼별 변환 함수를 미리 선택 (materialize 모듈)
+
+Usage:
+    python manage.py benchmark_converters
+    python manage.py benchmark_converters --rows 1000,10000,100000 --repeat 5
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data_sources.management.commands.benchmark_formats import (
+    RESULT_COLUMNS,
+    SAMPLE_DESCRIPTION,
+    sample_rows,
+)
+from data_sources.materialize import compile_converters
+from data_sources.results import build_result, render_body
+
+
+def legacy_rows(rows, result_columns):
+    """기존 fetch_rows 변환 루프"""
+    result_data = []
+    for row in rows:
+        row_dict = {}
+        for idx, col in enumerate(result_columns):
+            value = row[idx]
+
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+
+            row_dict[col] = value
+
+        result_data.append(row_dict)
+    return result_data
+
+
+def sniff_rows(rows, result_columns):
+    return render_body(build_result(rows, result_columns))['data']
+
+
+def compiled_rows(rows, result_columns):
+    converters = compile_converters(SAMPLE_DESCRIPTION)
+    return render_body(build_result(rows, result_columns, converters))['data']
+
+
+CANDIDATES = [
+    ('legacy', legacy_rows),
+    ('sniff', sniff_rows),
+    ('compiled', compiled_rows),
+]
+
+
+class Command(BaseCommand):
+    help = '조회 결과 변환(커서 튜플 → 행 딕셔너리) 방식별 시간을 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            default='1000,10000,100000',
+            help='행 수 목록 (쉼표 구분, 기본: 1000,10000,100000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='측정 반복 횟수 (최소값 사용, 기본: 5)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            row_counts = [int(value) for value in options['rows'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError(f"행 수 형식이 올바르지 않습니다: {options['rows']}")
+
+        repeat = max(options['repeat'], 1)
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('결과 변환 마이크로벤치마크'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(f'컬럼: {", ".join(RESULT_COLUMNS)} (DATETIME, VARCHAR x2, DOUBLE, DECIMAL)')
+
+        for count in row_counts:
+            rows = sample_rows(count)
+            self.stdout.write(f'\n[{count:,}행] (반복 {repeat}회 중 최소)')
+
+            baseline = None
+            for name, convert in CANDIDATES:
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    convert(rows, RESULT_COLUMNS)
+                    timings.append(time.perf_counter() - started)
+
+                best = min(timings)
+                line = f'  {name:<9} {best * 1000:8.1f}ms ({best / count * 1e9:6.0f}ns/행)'
+                if baseline is None:
+                    baseline = best
+                    self.stdout.write(line)
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'{line} | {baseline / best:.2f}x 빠름'))
+
+        self.stdout.write('\n' + '=' * 60)
@@ -0,0 +1,166 @@
+"""
+Django Management Command: 조회 결과 응답 형식 벤치마크
+
+가상의 fcc_data 형태 결과(날짜, 그룹, 측정값)로
+응답 형식별(rows, columnar, arrow) 서버 인코딩/클라이언트 디코딩 시간과 응답 크기를 비교합니다.
+
+Usage:
+    python manage.py benchmark_formats
+    python manage.py benchmark_formats --rows 1000,10000 --repeat 10
+"""
+
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from pymysql.constants import FIELD_TYPE
+from rest_framework.renderers import JSONRenderer
+
+from data_sources import arrow
+from data_sources.materialize import compile_converters, materialize
+from data_sources.results import RESULT_FORMATS, build_result, render_body
+
+RESULT_COLUMNS = ['cdate', 'fcc_group', 'classname', 'fcc', 'avg_fcc']
+RESULT_TYPES = ['timestamp', 'string', 'string', 'float', 'float']
+
+# PyMySQL cursor.description과 같은 형식 (name, type_code, ...)
+SAMPLE_DESCRIPTION = [
+    ('cdate', FIELD_TYPE.DATETIME, None, None, None, None, True),
+    ('fcc_group', FIELD_TYPE.VAR_STRING, None, None, None, None, True),
+    ('classname', FIELD_TYPE.VAR_STRING, None, None, None, None, True),
+    ('fcc', FIELD_TYPE.DOUBLE, None, None, None, None, True),
+    ('avg_fcc', FIELD_TYPE.NEWDECIMAL, None, None, None, None, True),
+]
+
+
+def sample_rows(count):
+    """커서 fetchall()과 같은 튜플 목록 생성 (AVG 결과는 MySQL처럼 Decimal)"""
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    groups = ['Desktop', 'Mobile', 'Server', 'Tablet']
+    return [
+        (
+            start + timedelta(minutes=index),
+            rng.choice(groups),
+            f'class_{index % 50}',
+            rng.random() * 3000,
+            Decimal(f'{rng.random() * 3000:.4f}'),
+        )
+        for index in range(count)
+    ]
+
+
+def json_encoder(result_format):
+    renderer = JSONRenderer()
+
+    def encode(rows):
+        converters = compile_converters(SAMPLE_DESCRIPTION)
+        body = render_body(
+            {**build_result(rows, RESULT_COLUMNS, converters), 'table_name': 'fcc_data'},
+            result_format
+        )
+        return renderer.render(body)
+
+    return encode, json.loads
+
+
+def arrow_encoder():
+    """Arrow IPC 스트림 (pyarrow 미설치 시 None)"""
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+
+    schema = arrow.arrow_schema(RESULT_COLUMNS, RESULT_TYPES)
+
+    def encode(rows):
+        chunk_size = 2000
+        converters = compile_converters(SAMPLE_DESCRIPTION, temporal=False)
+        chunks = (
+            materialize(rows[i:i + chunk_size], converters)
+            for i in range(0, len(rows), chunk_size)
+        )
+        return b''.join(arrow.iter_ipc_stream(schema, chunks))
+
+    def decode(payload):
+        return pyarrow.ipc.open_stream(payload).read_all()
+
+    return encode, decode
+
+
+class Command(BaseCommand):
+    help = '조회 결과 응답 형식별 인코딩/디코딩 시간과 크기를 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            default='1000,10000',
+            help='행 수 목록 (쉼표 구분, 기본: 1000,10000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='측정 반복 횟수 (최소값 사용, 기본: 5)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            row_counts = [int(value) for value in options['rows'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError(f"행 수 형식이 올바르지 않습니다: {options['rows']}")
+
+        repeat = max(options['repeat'], 1)
+
+        encoders = {
+            result_format: json_encoder(result_format) for result_format in RESULT_FORMATS
+        }
+        arrow_codec = arrow_encoder()
+        if arrow_codec is not None:
+            encoders['arrow'] = arrow_codec
+        else:
+            self.stdout.write(self.style.WARNING('pyarrow 미설치 - arrow 형식 제외'))
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('응답 형식 벤치마크'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write('인코딩: 커서 튜플 → 응답 바이트 (서버) / 디코딩: 응답 바이트 → 객체 (클라이언트)')
+
+        for count in row_counts:
+            rows = sample_rows(count)
+            self.stdout.write(f'\n[{count:,}행] (반복 {repeat}회 중 최소)')
+
+            baseline = None
+            for result_format, (encode, decode) in encoders.items():
+                encode_times = []
+                decode_times = []
+                payload = b''
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    payload = encode(rows)
+                    encoded = time.perf_counter()
+                    decode(payload)
+                    decoded = time.perf_counter()
+
+                    encode_times.append(encoded - started)
+                    decode_times.append(decoded - encoded)
+
+                total = min(encode_times) + min(decode_times)
+                line = (
+                    f'  {result_format:<9} 인코딩 {min(encode_times) * 1000:8.1f}ms | '
+                    f'디코딩 {min(decode_times) * 1000:8.1f}ms | '
+                    f'크기 {len(payload) / 1024:9.1f}KB'
+                )
+                if baseline is None:
+                    baseline = (total, len(payload))
+                    self.stdout.write(line)
+                else:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'{line} | 시간 {total / baseline[0]:.2f}x, '
+                        f'크기 {len(payload) / baseline[1]:.2f}x'
+                    ))
+
+        self.stdout.write('\n' + '=' * 60)
@@ -0,0 +1,193 @@
+"""
+Django Management Command: 동일 조회 병합(single-flight) 부하 테스트
+
+같은 리포트를 동시에 연 상황처럼 같은 조회 요청 N건을 동시에 실행하고
+실제 SQL 실행 횟수, 응답 상태, 응답 시간을 병합 사용 여부별로 비교합니다.
+- 결과 캐시는 끄고 실행 (캐시가 채워지기 전의 동시 요청만 측정)
+- --processes 2 이상이면 fork한 프로세스(gunicorn 워커와 같은 구조)마다 N건씩 실행
+
+Usage:
+    python manage.py benchmark_singleflight
+    python manage.py benchmark_singleflight --requests 100 --processes 3
+    python manage.py benchmark_singleflight --table fcc_data --start-date 2025-01-01 --end-date 2025-01-31
+"""
+
+import multiprocessing
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.test.utils import override_settings
+
+from data_sources.query import QueryError, run_query
+from data_sources.serializers import DataQuerySerializer
+from data_sources.singleflight import single_flight
+
+
+def _count_selects(table_name, counter, lock):
+    """대상 테이블 SELECT 실행 횟수를 세는 execute_wrapper"""
+    def wrapper(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT') and table_name in sql:
+            with lock:
+                counter['sql'] += 1
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+def _run_burst(spec, requests, start_at):
+    """
+    요청 N건을 스레드로 동시에 실행 (start_at 시각에 일제히 시작)
+
+    Returns:
+        (SQL 실행 횟수, 상태별 건수, 응답 시간 목록(ms))
+    """
+    counter = Counter()
+    statuses = Counter()
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        close_old_connections()
+        with connection.execute_wrapper(_count_selects(spec['table_name'], counter, lock)):
+            time.sleep(max(0.0, start_at - time.time()))
+            started = time.perf_counter()
+            try:
+                result = run_query(spec)
+                outcome = result.cache_status
+            except QueryError as e:
+                outcome = str(e.status_code)
+            elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            statuses[outcome] += 1
+            latencies.append(elapsed)
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return counter['sql'], statuses, latencies
+
+
+def _run_burst_in_child(args):
+    return _run_burst(*args)
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help = '같은 조회 요청 N건을 동시에 실행하여 동일 조회 병합 전후의 SQL 실행 횟수를 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            default='fcc_data',
+            help='대상 DataSource 테이블명 (기본: fcc_data)'
+        )
+        parser.add_argument(
+            '--date-column',
+            default='cdate',
+            help='날짜 컬럼 (기본: cdate)'
+        )
+        parser.add_argument(
+            '--start-date',
+            help='조회 시작 날짜 YYYY-MM-DD (기본: 전체 기간)'
+        )
+        parser.add_argument(
+            '--end-date',
+            help='조회 종료 날짜 YYYY-MM-DD (기본: 전체 기간)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='프로세스당 동시 요청 수 (기본: 50)'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='요청을 보내는 프로세스 수 - gunicorn 워커 수 (기본: 1)'
+        )
+
+    def _spec(self, options):
+        """리포트 차트와 같은 형태의 집계 조회 요청 (일별 그룹 평균)"""
+        raw_spec = {
+            'table_name': options['table'],
+            'date_column': options['date_column'],
+            'group_by_period': 'day',
+            'aggregations': [{'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'}],
+        }
+        if options['start_date']:
+            raw_spec['start_date'] = options['start_date']
+        if options['end_date']:
+            raw_spec['end_date'] = options['end_date']
+
+        serializer = DataQuerySerializer(data=raw_spec)
+        if not serializer.is_valid():
+            raise CommandError(f'조회 요청 검증 실패: {serializer.errors}')
+        return serializer.validated_data
+
+    def _measure(self, spec, requests, processes):
+        """모든 프로세스의 결과 합계"""
+        start_at = time.time() + 0.5 + 0.1 * processes
+        if processes == 1:
+            bursts = [_run_burst(spec, requests, start_at)]
+        else:
+            # fork 전에 부모 연결을 닫아 자식 프로세스가 같은 소켓을 공유하지 않도록 함
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Pool(processes) as pool:
+                bursts = pool.map(
+                    _run_burst_in_child, [(spec, requests, start_at)] * processes
+                )
+
+        executions = sum(burst[0] for burst in bursts)
+        statuses = sum((burst[1] for burst in bursts), Counter())
+        latencies = [latency for burst in bursts for latency in burst[2]]
+        return executions, statuses, latencies
+
+    def handle(self, *args, **options):
+        requests = max(options['requests'], 1)
+        processes = max(options['processes'], 1)
+        if processes > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError('--processes 2 이상은 fork를 지원하는 환경에서만 사용할 수 있습니다.')
+
+        spec = self._spec(options)
+        total = requests * processes
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('동일 조회 병합 부하 테스트'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(
+            f'동시 요청 {total:,}건 ({processes}개 프로세스 × {requests}건) - '
+            f'{spec["table_name"]} 일별 AVG(fcc), 결과 캐시 미사용'
+        )
+
+        cache_settings = {**getattr(settings, 'DATA_QUERY_CACHE', {}), 'ENABLED': False}
+        for label, enabled in (('병합 미사용', False), ('병합 사용', True)):
+            with override_settings(DATA_QUERY_CACHE=cache_settings, DATA_QUERY_SINGLEFLIGHT=enabled):
+                started = time.perf_counter()
+                executions, statuses, latencies = self._measure(spec, requests, processes)
+                wall = (time.perf_counter() - started) * 1000
+
+            line = (
+                f'  {label}: SQL {executions:,}회 / 요청 {total:,}건 | '
+                f'응답 {dict(sorted(statuses.items()))} | '
+                f'p50 {_percentile(latencies, 0.5):7.1f}ms  '
+                f'p95 {_percentile(latencies, 0.95):7.1f}ms  '
+                f'max {max(latencies):7.1f}ms | 전체 {wall:7.1f}ms'
+            )
+            self.stdout.write(self.style.SUCCESS(line) if enabled else line)
+
+        if processes == 1:
+            self.stdout.write(f'  병합 통계: {single_flight.stats()}')
+        self.stdout.write('\n' + '=' * 60)
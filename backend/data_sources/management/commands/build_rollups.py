@@ -0,0 +1,138 @@
+"""
+Django Management Command: 사전 집계(롤업) 테이블 빌드
+
+Usage:
+    python manage.py build_rollups
+    python manage.py build_rollups --table fcc_data
+    python manage.py build_rollups --table fcc_data --since 2025-01-01
+    python manage.py build_rollups --table fcc_data --define \\
+        --date-column cdate --dimensions fcc_group --measures fcc --grain day
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data_sources.models import DataSource, Rollup
+from data_sources.rollups import build_rollup
+
+
+class Command(BaseCommand):
+    help = '사전 집계(롤업) 테이블을 빌드합니다 (정의 등록 포함)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            help='대상 DataSource 테이블명 (기본: 전체 활성 롤업)'
+        )
+        parser.add_argument(
+            '--since',
+            help='증분 빌드 시작 날짜 YYYY-MM-DD (기본: 전체 빌드)'
+        )
+        parser.add_argument(
+            '--define',
+            action='store_true',
+            help='롤업 정의를 등록(또는 재활성화)한 뒤 빌드'
+        )
+        parser.add_argument(
+            '--date-column',
+            default='cdate',
+            help='--define: bucket 생성에 사용할 날짜 컬럼 (기본: cdate)'
+        )
+        parser.add_argument(
+            '--dimensions',
+            default='',
+            help='--define: 차원 컬럼 (쉼표 구분, 예: fcc_group,classname)'
+        )
+        parser.add_argument(
+            '--measures',
+            default='',
+            help='--define: 측정 컬럼 (쉼표 구분, 예: fcc)'
+        )
+        parser.add_argument(
+            '--grain',
+            choices=['day', 'month'],
+            default='day',
+            help='--define: 집계 단위 (기본: day)'
+        )
+
+    def handle(self, *args, **options):
+        table_name = options['table']
+
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError(f"날짜 형식이 올바르지 않습니다: {options['since']}")
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('롤업 테이블 빌드 시작'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(f'모드: {f"증분 ({since} 이후)" if since else "전체"}')
+
+        # 1. 롤업 정의 등록
+        if options['define']:
+            if not table_name:
+                raise CommandError('--define 사용 시 --table을 지정해야 합니다.')
+            self._define(table_name, options)
+
+        # 2. 빌드 대상 조회
+        rollups = Rollup.objects.filter(is_active=True).select_related('data_source')
+        if table_name:
+            rollups = rollups.filter(data_source__table_name=table_name)
+
+        if not rollups:
+            self.stdout.write(self.style.WARNING('\n빌드할 롤업 정의가 없습니다.'))
+            return
+
+        # 3. 빌드
+        failed = 0
+        for index, rollup in enumerate(rollups, start=1):
+            self.stdout.write(f'\n[{index}/{len(rollups)}] {rollup} → {rollup.table_name}')
+            try:
+                row_count = build_rollup(rollup, since=since)
+                self.stdout.write(
+                    self.style.SUCCESS(f'✓ {row_count:,}행')
+                )
+            except Exception as e:
+                failed += 1
+                self.stdout.write(
+                    self.style.ERROR(f'✗ 빌드 실패: {str(e)}')
+                )
+
+        self.stdout.write('\n' + '=' * 60)
+        if failed:
+            raise CommandError(f'롤업 {failed}개 빌드 실패')
+        self.stdout.write(self.style.SUCCESS('✓ 롤업 빌드 완료!'))
+        self.stdout.write('=' * 60)
+
+    def _define(self, table_name, options):
+        """롤업 정의 등록 (같은 정의가 있으면 재사용)"""
+        try:
+            data_source = DataSource.objects.get(table_name=table_name)
+        except DataSource.DoesNotExist:
+            raise CommandError(f"DataSource '{table_name}'이(가) 등록되지 않았습니다.")
+
+        dimensions = [col.strip() for col in options['dimensions'].split(',') if col.strip()]
+        measures = [col.strip() for col in options['measures'].split(',') if col.strip()]
+        if not measures:
+            raise CommandError('--define 사용 시 --measures를 지정해야 합니다.')
+
+        rollup, created = Rollup.objects.get_or_create(
+            data_source=data_source,
+            date_column=options['date_column'],
+            dimensions=dimensions,
+            measures=measures,
+            grain=options['grain'],
+            defaults={'is_active': True}
+        )
+        if not rollup.is_active:
+            rollup.is_active = True
+            rollup.save(update_fields=['is_active', 'updated_at'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ 롤업 정의 {"등록" if created else "확인"}: {rollup} (ID: {rollup.id})'
+            )
+        )
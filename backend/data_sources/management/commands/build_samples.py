@@ -0,0 +1,126 @@
+"""
+Django Management Command: 근사 집계용 샘플 테이블 빌드
+
+Usage:
+    python manage.py build_samples
+    python manage.py build_samples --table fcc_data
+    python manage.py build_samples --table fcc_data --since 2025-01-01
+    python manage.py build_samples --table fcc_data --define --rate 0.01 --date-column cdate
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data_sources.models import DataSource, SampleTable
+from data_sources.sampling import build_sample
+
+
+class Command(BaseCommand):
+    help = '근사 집계(accuracy=approximate)용 샘플 테이블을 빌드합니다 (정의 등록 포함)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            help='대상 DataSource 테이블명 (기본: 전체 활성 샘플)'
+        )
+        parser.add_argument(
+            '--since',
+            help='증분 빌드 시작 날짜 YYYY-MM-DD (기본: 전체 빌드)'
+        )
+        parser.add_argument(
+            '--define',
+            action='store_true',
+            help='샘플 정의를 등록(또는 재활성화)한 뒤 빌드'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=0.01,
+            help='--define: 샘플 비율 (기본: 0.01 = 1%%)'
+        )
+        parser.add_argument(
+            '--date-column',
+            default='cdate',
+            help='--define: 증분 갱신에 사용할 날짜 컬럼 (기본: cdate)'
+        )
+        parser.add_argument(
+            '--key-column',
+            default='id',
+            help='--define: 샘플 선택 해시 컬럼 (기본: id)'
+        )
+
+    def handle(self, *args, **options):
+        table_name = options['table']
+
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError(f"날짜 형식이 올바르지 않습니다: {options['since']}")
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('샘플 테이블 빌드 시작'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(f'모드: {f"증분 ({since} 이후)" if since else "전체"}')
+
+        # 1. 샘플 정의 등록
+        if options['define']:
+            if not table_name:
+                raise CommandError('--define 사용 시 --table을 지정해야 합니다.')
+            self._define(table_name, options)
+
+        # 2. 빌드 대상 조회
+        samples = SampleTable.objects.filter(is_active=True).select_related('data_source')
+        if table_name:
+            samples = samples.filter(data_source__table_name=table_name)
+
+        if not samples:
+            self.stdout.write(self.style.WARNING('\n빌드할 샘플 정의가 없습니다.'))
+            return
+
+        # 3. 빌드
+        failed = 0
+        for index, sample in enumerate(samples, start=1):
+            self.stdout.write(f'\n[{index}/{len(samples)}] {sample} → {sample.table_name}')
+            try:
+                row_count = build_sample(sample, since=since)
+                self.stdout.write(
+                    self.style.SUCCESS(f'✓ {row_count:,}행')
+                )
+            except Exception as e:
+                failed += 1
+                self.stdout.write(
+                    self.style.ERROR(f'✗ 빌드 실패: {str(e)}')
+                )
+
+        self.stdout.write('\n' + '=' * 60)
+        if failed:
+            raise CommandError(f'샘플 {failed}개 빌드 실패')
+        self.stdout.write(self.style.SUCCESS('✓ 샘플 빌드 완료!'))
+        self.stdout.write('=' * 60)
+
+    def _define(self, table_name, options):
+        """샘플 정의 등록 (같은 정의가 있으면 재사용)"""
+        try:
+            data_source = DataSource.objects.get(table_name=table_name)
+        except DataSource.DoesNotExist:
+            raise CommandError(f"DataSource '{table_name}'이(가) 등록되지 않았습니다.")
+
+        sample, created = SampleTable.objects.get_or_create(
+            data_source=data_source,
+            rate=options['rate'],
+            date_column=options['date_column'],
+            key_column=options['key_column'],
+            defaults={'is_active': True}
+        )
+        if not sample.is_active:
+            sample.is_active = True
+            sample.save(update_fields=['is_active', 'updated_at'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ 샘플 정의 {"등록" if created else "확인"}: {sample} (ID: {sample.id})'
+            )
+        )
@@ -0,0 +1,193 @@
+"""
+Django Management Command: 백분위 스케치(t-digest) 테이블 빌드
+
+Usage:
+    python manage.py build_sketches
+    python manage.py build_sketches --table fcc_data
+    python manage.py build_sketches --table fcc_data --since 2025-01-01
+    python manage.py build_sketches --table fcc_data --define \\
+        --date-column cdate --dimensions fcc_group --measures fcc
+    python manage.py build_sketches --table fcc_data --verify --tolerance 0.02
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from data_sources.models import DataSource, PercentileSketch
+from data_sources.sketches import build_sketch, verify_sketch
+from data_sources.tdigest import DEFAULT_COMPRESSION
+
+
+class Command(BaseCommand):
+    help = '백분위(P50/P75/P95/P99) 집계용 스케치 테이블을 빌드합니다 (정의 등록, 정확도 검증 포함)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            help='대상 DataSource 테이블명 (기본: 전체 활성 스케치)'
+        )
+        parser.add_argument(
+            '--since',
+            help='증분 빌드 시작 날짜 YYYY-MM-DD (기본: 전체 빌드)'
+        )
+        parser.add_argument(
+            '--define',
+            action='store_true',
+            help='스케치 정의를 등록(또는 재활성화)한 뒤 빌드'
+        )
+        parser.add_argument(
+            '--date-column',
+            default='cdate',
+            help='--define: 일별 bucket 생성에 사용할 날짜 컬럼 (기본: cdate)'
+        )
+        parser.add_argument(
+            '--dimensions',
+            default='',
+            help='--define: 차원 컬럼 (쉼표 구분, 예: fcc_group,classname)'
+        )
+        parser.add_argument(
+            '--measures',
+            default='',
+            help='--define: 측정 컬럼 (쉼표 구분, 예: fcc)'
+        )
+        parser.add_argument(
+            '--compression',
+            type=int,
+            default=DEFAULT_COMPRESSION,
+            help=f'--define: t-digest 압축 계수 (기본: {DEFAULT_COMPRESSION})'
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='빌드 후 월별 스케치 백분위를 원본 행 정확한 백분위와 비교'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.05,
+            help='--verify: 허용 최대 상대 오차 (기본: 0.05 = 5%%)'
+        )
+        parser.add_argument(
+            '--verify-max-rows',
+            type=int,
+            default=5000000,
+            help='--verify: 정확한 백분위 계산에 읽을 최대 원본 행 수 (기본: 5,000,000)'
+        )
+
+    def handle(self, *args, **options):
+        table_name = options['table']
+
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError(f"날짜 형식이 올바르지 않습니다: {options['since']}")
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('백분위 스케치 빌드 시작'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(f'모드: {f"증분 ({since} 이후)" if since else "전체"}')
+
+        # 1. 스케치 정의 등록
+        if options['define']:
+            if not table_name:
+                raise CommandError('--define 사용 시 --table을 지정해야 합니다.')
+            self._define(table_name, options)
+
+        # 2. 빌드 대상 조회
+        sketches = PercentileSketch.objects.filter(is_active=True).select_related('data_source')
+        if table_name:
+            sketches = sketches.filter(data_source__table_name=table_name)
+
+        if not sketches:
+            self.stdout.write(self.style.WARNING('\n빌드할 스케치 정의가 없습니다.'))
+            return
+
+        # 3. 빌드 (+ 정확도 검증)
+        failed = 0
+        for index, sketch in enumerate(sketches, start=1):
+            self.stdout.write(f'\n[{index}/{len(sketches)}] {sketch} → {sketch.table_name}')
+            try:
+                row_count = build_sketch(sketch, since=since)
+                self.stdout.write(
+                    self.style.SUCCESS(f'✓ {row_count:,}행')
+                )
+            except Exception as e:
+                failed += 1
+                self.stdout.write(
+                    self.style.ERROR(f'✗ 빌드 실패: {str(e)}')
+                )
+                continue
+
+            if options['verify'] and not self._verify(sketch, since, options):
+                failed += 1
+
+        self.stdout.write('\n' + '=' * 60)
+        if failed:
+            raise CommandError(f'스케치 {failed}개 빌드/검증 실패')
+        self.stdout.write(self.style.SUCCESS('✓ 스케치 빌드 완료!'))
+        self.stdout.write('=' * 60)
+
+    def _verify(self, sketch, since, options):
+        """월별 백분위 상대 오차 출력 (허용 오차 이내면 True)"""
+        try:
+            report = verify_sketch(
+                sketch, start_date=since, max_rows=options['verify_max_rows']
+            )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'✗ 검증 실패: {str(e)}'))
+            return False
+
+        passed = True
+        self.stdout.write(f"  {'측정':<16}{'함수':<6}{'기간 수':>8}{'최대 오차':>12}{'평균 오차':>12}")
+        for row in report:
+            line = (
+                f"  {row['measure']:<16}{row['function']:<6}{row['groups']:>8}"
+                f"{row['max_error']:>12.3%}{row['mean_error']:>12.3%}"
+            )
+            if row['max_error'] > options['tolerance']:
+                passed = False
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if passed:
+            self.stdout.write(
+                self.style.SUCCESS(f"✓ 정확도 검증 통과 (허용 오차 {options['tolerance']:.1%})")
+            )
+        else:
+            self.stdout.write(
+                self.style.ERROR(f"✗ 허용 오차 {options['tolerance']:.1%} 초과")
+            )
+        return passed
+
+    def _define(self, table_name, options):
+        """스케치 정의 등록 (같은 정의가 있으면 재사용)"""
+        try:
+            data_source = DataSource.objects.get(table_name=table_name)
+        except DataSource.DoesNotExist:
+            raise CommandError(f"DataSource '{table_name}'이(가) 등록되지 않았습니다.")
+
+        dimensions = [col.strip() for col in options['dimensions'].split(',') if col.strip()]
+        measures = [col.strip() for col in options['measures'].split(',') if col.strip()]
+        if not measures:
+            raise CommandError('--define 사용 시 --measures를 지정해야 합니다.')
+
+        sketch, created = PercentileSketch.objects.get_or_create(
+            data_source=data_source,
+            date_column=options['date_column'],
+            dimensions=dimensions,
+            measures=measures,
+            defaults={'is_active': True, 'compression': options['compression']}
+        )
+        if not sketch.is_active:
+            sketch.is_active = True
+            sketch.save(update_fields=['is_active', 'updated_at'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ 스케치 정의 {"등록" if created else "확인"}: {sketch} (ID: {sketch.id})'
+            )
+        )
@@ -0,0 +1,163 @@
+"""
+Django Management Command: 날짜 bucket 저장 생성 컬럼 및 인덱스 생성
+
+group_by_period 조회가 DATE()/YEARWEEK() 같은 함수 표현식 대신
+미리 계산된 컬럼(예: cdate_day, cdate_week)과 인덱스를 사용하도록 합니다.
+
+Usage:
+    python manage.py create_bucket_columns
+    python manage.py create_bucket_columns --table fcc_data --date-column cdate
+    python manage.py create_bucket_columns --periods day,month --explain
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from data_sources.models import DataSource
+from data_sources.query import PERIOD_EXPRESSIONS, bucket_column_name, build_query
+from data_sources.registry import schema_registry
+
+# period별 생성 컬럼 타입
+BUCKET_COLUMN_TYPES = {
+    'day': 'DATE',
+    'week': 'INT',
+    'month': 'CHAR(7)',
+    'year': 'SMALLINT',
+}
+
+
+class Command(BaseCommand):
+    help = '날짜 bucket 저장 생성 컬럼(STORED)과 인덱스를 생성합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            default='fcc_data',
+            help='대상 DataSource 테이블명 (기본: fcc_data)'
+        )
+        parser.add_argument(
+            '--date-column',
+            default='cdate',
+            help='기준 날짜 컬럼 (기본: cdate)'
+        )
+        parser.add_argument(
+            '--periods',
+            default='day,week,month,year',
+            help='생성할 bucket 단위 (쉼표 구분, 기본: day,week,month,year)'
+        )
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='생성 후 단위별 그룹화 쿼리의 EXPLAIN 결과 출력'
+        )
+
+    def handle(self, *args, **options):
+        table_name = options['table']
+        date_column = options['date_column']
+        periods = [p.strip() for p in options['periods'].split(',') if p.strip()]
+
+        invalid_periods = [p for p in periods if p not in BUCKET_COLUMN_TYPES]
+        if invalid_periods:
+            raise CommandError(f'지원하지 않는 단위: {invalid_periods}')
+
+        if not DataSource.objects.filter(table_name=table_name).exists():
+            raise CommandError(f"DataSource '{table_name}'이(가) 등록되지 않았습니다.")
+
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(self.style.WARNING('날짜 bucket 컬럼 생성 시작'))
+        self.stdout.write(self.style.WARNING('=' * 60))
+        self.stdout.write(f'대상: {table_name}.{date_column} ({", ".join(periods)})')
+
+        with connection.cursor() as cursor:
+            existing_columns = self._existing_columns(cursor, table_name)
+            if date_column not in existing_columns:
+                raise CommandError(f"컬럼 '{date_column}'이(가) 테이블에 없습니다.")
+            existing_indexes = self._existing_indexes(cursor, table_name)
+
+            # 1. ALTER TABLE 절 구성 (이미 있는 컬럼/인덱스는 건너뜀)
+            alter_parts = []
+
+            # 날짜 범위 조건(`col` >= %s AND `col` < %s)용 인덱스
+            if f'idx_{date_column}' not in existing_indexes:
+                alter_parts.append(f"ADD INDEX `idx_{date_column}` (`{date_column}`)")
+
+            for period in periods:
+                bucket_column = bucket_column_name(date_column, period)
+                if bucket_column not in existing_columns:
+                    expression = PERIOD_EXPRESSIONS[period].format(col=date_column)
+                    alter_parts.append(
+                        f"ADD COLUMN `{bucket_column}` {BUCKET_COLUMN_TYPES[period]} "
+                        f"GENERATED ALWAYS AS ({expression}) STORED"
+                    )
+                    self.stdout.write(f'  + 컬럼 {bucket_column} = {expression}')
+                if f'idx_{bucket_column}' not in existing_indexes:
+                    alter_parts.append(
+                        f"ADD INDEX `idx_{bucket_column}` (`{bucket_column}`)"
+                    )
+
+            # 2. 실행 (STORED 컬럼 추가는 테이블 재작성이 필요하므로 한 번에 실행)
+            if alter_parts:
+                self.stdout.write(f'\nALTER TABLE 실행 중... ({len(alter_parts)}개 변경)')
+                cursor.execute(
+                    f"ALTER TABLE `{table_name}` " + ", ".join(alter_parts),
+                    []
+                )
+                self.stdout.write(self.style.SUCCESS('✓ 컬럼/인덱스 생성 완료'))
+            else:
+                self.stdout.write(self.style.SUCCESS('\n✓ 이미 모든 컬럼/인덱스가 있습니다.'))
+
+        # 3. 스키마 레지스트리 무효화 → 쿼리 빌더가 bucket 컬럼 사용
+        schema_registry.invalidate()
+
+        if options['explain']:
+            self._explain(table_name, date_column, periods)
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(self.style.SUCCESS('✓ 날짜 bucket 컬럼 준비 완료!'))
+        self.stdout.write('=' * 60)
+
+    def _existing_columns(self, cursor, table_name):
+        cursor.execute(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            [table_name]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def _existing_indexes(self, cursor, table_name):
+        cursor.execute(
+            "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            [table_name]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def _explain(self, table_name, date_column, periods):
+        """단위별 그룹화 쿼리의 실행 계획 확인 (사용 인덱스, filesort 여부)"""
+        schema = schema_registry.get(table_name)
+
+        self.stdout.write('\n[EXPLAIN]')
+        for period in periods:
+            spec = {
+                'table_name': table_name,
+                'date_column': date_column,
+                'group_by_period': period,
+                'aggregations': [{'column': date_column, 'function': 'COUNT'}],
+            }
+            query, params, _ = build_query(spec, schema)
+
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN " + query, params)
+                names = [col[0] for col in cursor.description]
+                plan = [dict(zip(names, row)) for row in cursor.fetchall()]
+
+            for row in plan:
+                extra = row.get('Extra') or ''
+                line = (
+                    f"  {period:<5} key={row.get('key')} type={row.get('type')} "
+                    f"rows={row.get('rows')} extra={extra}"
+                )
+                if 'filesort' in extra or 'temporary' in extra:
+                    self.stdout.write(self.style.WARNING(line))
+                else:
+                    self.stdout.write(line)
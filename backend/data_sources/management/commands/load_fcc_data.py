@@ -14,7 +14,15 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import connection
 import pandas as pd
 from sqlalchemy import create_engine, text
-from django.conf import settings
+from sqlalchemy.pool import NullPool
+
+from data_sources.cache import bump_data_version
+from data_sources.indexes import ensure_indexes
+from data_sources.pool import dbapi_connection
+from data_sources.registry import schema_registry
+from data_sources.rollups import earliest_date, refresh_rollups
+from data_sources.sampling import refresh_samples
+from data_sources.sketches import refresh_sketches
 
 
 class Command(BaseCommand):
@@ -79,6 +87,37 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.SUCCESS(f'✓ {saved_count:,}개 행 저장됨')
             )
+
+            # to_sql이 테이블을 새로 만들 수 있으므로 스키마 레지스트리 무효화
+            schema_registry.invalidate()
+
+            # 원본이 바뀌었으므로 바로 데이터 버전 갱신 → 캐시된 조회 결과 무효화
+            # (아래 롤업/샘플/스케치 갱신이 실패해도 이전 결과가 캐시에 남지 않음)
+            bump_data_version('fcc_data')
+
+            try:
+                # 적용된 추천 인덱스 복구 (테이블이 새로 만들어진 경우)
+                for index_name in ensure_indexes('fcc_data'):
+                    self.stdout.write(f'  인덱스 복구: {index_name}')
+
+                # 롤업 갱신 (추가 모드: 추가된 가장 이른 날짜부터 증분, 교체 모드: 전체)
+                since = earliest_date(df['cdate']) if append_mode and 'cdate' in df else None
+                rollup_results = refresh_rollups('fcc_data', since=since)
+                for rollup_table, row_count in rollup_results.items():
+                    self.stdout.write(f'  롤업 갱신: {rollup_table} ({row_count:,}행)')
+
+                # 근사 집계용 샘플 갱신 (롤업과 같은 증분 기준)
+                sample_results = refresh_samples('fcc_data', since=since)
+                for sample_table, row_count in sample_results.items():
+                    self.stdout.write(f'  샘플 갱신: {sample_table} ({row_count:,}행)')
+
+                # 백분위 스케치 갱신 (롤업과 같은 증분 기준)
+                sketch_results = refresh_sketches('fcc_data', since=since)
+                for sketch_table, row_count in sketch_results.items():
+                    self.stdout.write(f'  스케치 갱신: {sketch_table} ({row_count:,}행)')
+            finally:
+                # 갱신 도중 캐시된 (갱신 전 롤업/샘플/스케치 기준) 결과 무효화
+                bump_data_version('fcc_data')
         except Exception as e:
             raise CommandError(f'데이터 저장 실패: {str(e)}')
 
@@ -170,13 +209,12 @@ class Command(BaseCommand):
         Returns:
             저장된 행 수
         """
-        # Django settings에서 DB 정보 가져오기
-        db_settings = settings.DATABASES['default']
-
-        # SQLAlchemy 엔진 생성
+        # SQLAlchemy 엔진 생성 - Django와 같은 연결 풀/설정(init_command, charset) 사용
+        # (엔진 자체 풀은 끄고 연결을 닫으면 data_sources.pool에 반납)
         engine = create_engine(
-            f"mysql+pymysql://{db_settings['USER']}:{db_settings['PASSWORD']}"
-            f"@{db_settings['HOST']}:{db_settings['PORT']}/{db_settings['NAME']}"
+            "mysql+pymysql://",
+            creator=lambda: dbapi_connection('default'),
+            poolclass=NullPool,
         )
 
         table_name = 'fcc_data'
@@ -0,0 +1,201 @@
+"""
+조회 결과 변환 파이프라인 (컬럼별 사전 컴파일)
+
+쿼리마다 cursor.description을 한 번만 검사하여 컬럼별 변환 함수를 고르고,
+값마다 hasattr(value, 'isoformat')를 확인하던 행 단위 루프를 대체합니다.
+
+- 정수/실수/문자열: 변환 없음 (복사 없이 컬럼 튜플 그대로 사용)
+- DATE/DATETIME/TIMESTAMP: isoformat 일괄 적용 (JSON 형식)
+- DECIMAL: float 변환 (settings.DATA_QUERY_DECIMAL_AS_FLOAT)
+- 타입 정보가 없는 DB 드라이버(개발용 SQLite 등): 첫 번째 non-NULL 값으로 판단
+
+모든 응답 형식(rows, columnar, ndjson, arrow)이 같은 파이프라인을 사용하며,
+행 형식(rows, ndjson)은 컬럼 구성별로 생성한 row_builder로 딕셔너리를 만듭니다.
+arrow는 날짜/시간을 원본 객체로 유지해야 하므로 temporal=False로 컴파일합니다.
+
+대량 결과를 만드는 동안에는 순환 GC를 멈춥니다 (gc_paused).
+새 컨테이너(튜플/딕셔너리)가 수십만 개 생기면 세대별 GC가 반복 실행되어
+변환 시간보다 GC 시간이 더 커지기 때문입니다 (순환 참조가 생기지 않는 구간).
+"""
+
+import gc
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+from django.conf import settings
+from pymysql.constants import FIELD_TYPE
+
+DATE_TYPE_CODES = {FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE}
+DATETIME_TYPE_CODES = {FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP}
+DECIMAL_TYPE_CODES = {FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+
+
+def decimal_as_float():
+    return getattr(settings, 'DATA_QUERY_DECIMAL_AS_FLOAT', True)
+
+
+# ==================== 컬럼 변환 함수 ====================
+# 모두 컬럼 값 튜플을 받아 시퀀스(리스트 또는 변환 없는 원본 튜플)를 반환합니다.
+
+def identity(values):
+    # 변환이 없는 컬럼은 복사하지 않음 (튜플 그대로 사용)
+    return values
+
+
+def _isoformat_or_none(values):
+    return [None if value is None else value.isoformat() for value in values]
+
+
+def _safe_isoformat(values):
+    """0000-00-00 같은 값이 문자열로 오는 경우까지 처리"""
+    return [
+        value.isoformat() if hasattr(value, 'isoformat') else value
+        for value in values
+    ]
+
+
+def _temporal_formatter(method):
+    """
+    날짜/시간 컬럼 formatter
+
+    NULL이 없으면 언바운드 메서드를 map으로 적용 (값마다 속성 조회 없음)
+    """
+    def convert(values):
+        try:
+            if None in values:
+                return _isoformat_or_none(values)
+            return list(map(method, values))
+        except TypeError:
+            return _safe_isoformat(values)
+    return convert
+
+
+format_dates = _temporal_formatter(date.isoformat)
+format_datetimes = _temporal_formatter(datetime.isoformat)
+
+
+def decimals_to_float(values):
+    if None in values:
+        return [None if value is None else float(value) for value in values]
+    return list(map(float, values))
+
+
+def sniff(values):
+    """타입 정보 없이 값으로 판단 (첫 번째 non-NULL 값 기준)"""
+    for value in values:
+        if value is None:
+            continue
+        if hasattr(value, 'isoformat'):
+            return _safe_isoformat(values)
+        if isinstance(value, Decimal) and decimal_as_float():
+            return decimals_to_float(values)
+        return values
+    return values
+
+
+def sniff_native(values):
+    """sniff의 arrow용 버전 (날짜/시간은 원본 객체 유지)"""
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, Decimal) and decimal_as_float():
+            return decimals_to_float(values)
+        return values
+    return values
+
+
+# ==================== 컴파일 ====================
+
+def compile_converters(description, temporal=True):
+    """
+    cursor.description → 컬럼별 변환 함수 목록
+
+    Args:
+        description: DB-API cursor.description
+        temporal: True면 날짜/시간을 ISO 문자열로 변환 (JSON 형식용)
+
+    Returns:
+        결과 컬럼 순서의 변환 함수 목록
+    """
+    use_float = decimal_as_float()
+    converters = []
+
+    for column in description or ():
+        type_code = column[1]
+        if type_code is None:
+            converters.append(sniff if temporal else sniff_native)
+        elif type_code in DATETIME_TYPE_CODES:
+            converters.append(format_datetimes if temporal else identity)
+        elif type_code in DATE_TYPE_CODES:
+            converters.append(format_dates if temporal else identity)
+        elif type_code in DECIMAL_TYPE_CODES and use_float:
+            converters.append(decimals_to_float)
+        else:
+            converters.append(identity)
+
+    return converters
+
+
+@contextmanager
+def gc_paused():
+    """순환 GC 일시 중지 (이미 꺼져 있으면 그대로 유지)"""
+    enabled = gc.isenabled()
+    if enabled:
+        gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def materialize(rows, converters):
+    """
+    커서 행 튜플 목록 → 변환된 컬럼 값 리스트 목록
+
+    Args:
+        rows: cursor.fetchall() / fetchmany() 결과
+        converters: compile_converters() 결과
+
+    Returns:
+        [[컬럼1 값...], [컬럼2 값...], ...]
+    """
+    if not rows:
+        return [[] for _ in converters]
+    with gc_paused():
+        return [
+            convert(values) for convert, values in zip(converters, zip(*rows))
+        ]
+
+
+@lru_cache(maxsize=256)
+def row_builder(columns):
+    """
+    컬럼 단위 값 → 행 딕셔너리 목록 변환 함수 (컬럼 구성별 1회 생성)
+
+    dict(zip(columns, row))보다 빠른 고정 키 딕셔너리 표현식을 사용하는 함수를 생성합니다.
+    컬럼명은 검증된 식별자이며 repr()로 문자열 리터럴로만 삽입됩니다.
+
+    Args:
+        columns: 컬럼명 튜플
+
+    Returns:
+        build(values) → [{컬럼: 값, ...}, ...]
+    """
+    if not columns:
+        return lambda values: []
+
+    names = [f'_{index}' for index in range(len(columns))]
+    items = ', '.join(f'{col!r}: {name}' for col, name in zip(columns, names))
+    targets = ', '.join(names) + (',' if len(names) == 1 else '')
+    source = (
+        'def build(values):\n'
+        '    with gc_paused():\n'
+        f'        return [{{{items}}} for {targets} in zip(*values)]\n'
+    )
+
+    namespace = {'gc_paused': gc_paused}
+    exec(source, namespace)
+    return namespace['build']
@@ -1,5 +1,5 @@
 from django.db import models
-from django.core.validators import RegexValidator
+from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
 
 
 class DataSource(models.Model):
@@ -35,6 +35,24 @@ class DataSource(models.Model):
         default=True,
         verbose_name="활성 상태"
     )
+    max_examined_rows = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="최대 읽기 행 수",
+        help_text="EXPLAIN 예상 행 수가 이 값을 넘는 조회는 거부 (비우면 DATA_QUERY_MAX_EXAMINED_ROWS)"
+    )
+    max_execution_ms = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="최대 실행 시간 (ms)",
+        help_text="MAX_EXECUTION_TIME 힌트 값 (비우면 DATA_QUERY_MAX_EXECUTION_MS)"
+    )
+    max_concurrent_queries = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="최대 동시 조회 수",
+        help_text="이 테이블을 동시에 조회할 수 있는 최대 쿼리 수, 전체 워커 합계 (비우면 DATA_QUERY_MAX_CONCURRENT_PER_SOURCE)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -53,3 +71,403 @@ class DataSource(models.Model):
         with connection.cursor() as cursor:
             cursor.execute(f"SHOW COLUMNS FROM {self.table_name}")
             return [row[0] for row in cursor.fetchall()]
+
+
+class Rollup(models.Model):
+    """
+    사전 집계(rollup) 테이블 정의
+
+    DataSource의 원본 테이블을 날짜 단위(bucket) + 차원 컬럼별로 미리 집계한 테이블.
+    측정 컬럼마다 SUM, COUNT, MIN, MAX를 저장하므로 AVG도 정확히 재계산됩니다.
+    """
+    GRAIN_CHOICES = [
+        ('day', '일별'),
+        ('month', '월별'),
+    ]
+
+    data_source = models.ForeignKey(
+        DataSource,
+        on_delete=models.CASCADE,
+        related_name='rollups',
+        verbose_name="데이터 소스"
+    )
+    date_column = models.CharField(
+        max_length=100,
+        verbose_name="날짜 컬럼",
+        validators=[
+            RegexValidator(
+                regex=r'^[a-zA-Z_][a-zA-Z0-9_]*$',
+                message='유효한 컬럼명이어야 합니다 (영문자, 숫자, 언더스코어만 허용)'
+            )
+        ],
+        help_text="bucket 생성에 사용할 원본 테이블의 날짜 컬럼 (예: cdate)"
+    )
+    dimensions = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="차원 컬럼",
+        help_text="GROUP BY 컬럼 배열 (예: ['fcc_group'])"
+    )
+    measures = models.JSONField(
+        default=list,
+        verbose_name="측정 컬럼",
+        help_text="집계 대상 컬럼 배열 (예: ['fcc'])"
+    )
+    grain = models.CharField(
+        max_length=10,
+        choices=GRAIN_CHOICES,
+        default='day',
+        verbose_name="집계 단위"
+    )
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name="활성 상태"
+    )
+    last_built_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="마지막 빌드 시간"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'data_source_rollups'
+        ordering = ['data_source', 'grain', 'id']
+        verbose_name = '롤업 테이블'
+        verbose_name_plural = '롤업 테이블들'
+
+    def __str__(self):
+        dims = ', '.join(self.dimensions) or '-'
+        return f"{self.data_source.table_name} [{self.grain}] ({dims})"
+
+    @property
+    def table_name(self):
+        """물리 롤업 테이블명"""
+        return f"rollup_{self.id}_{self.grain}"
+
+    def clean(self):
+        """차원/측정 컬럼명 검증 (SQL Injection 방지)"""
+        from django.core.exceptions import ValidationError
+        import re
+
+        pattern = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+        for field_name in ('dimensions', 'measures'):
+            value = getattr(self, field_name)
+            if not isinstance(value, list):
+                raise ValidationError({field_name: '컬럼명 배열이어야 합니다.'})
+            for col in value:
+                if not isinstance(col, str) or not pattern.match(col):
+                    raise ValidationError(
+                        {field_name: f"컬럼명 '{col}'이 유효하지 않습니다."}
+                    )
+
+        if not self.measures:
+            raise ValidationError({'measures': '측정 컬럼을 하나 이상 지정해야 합니다.'})
+
+
+class SampleTable(models.Model):
+    """
+    근사 집계용 샘플 테이블 정의
+
+    원본 테이블에서 키 컬럼 해시로 결정적으로 고른 일부 행(rate 비율)을 복사한 테이블.
+    accuracy="approximate" 집계 조회가 원본 대신 조회하고 결과를 비율로 보정합니다.
+    """
+    data_source = models.ForeignKey(
+        DataSource,
+        on_delete=models.CASCADE,
+        related_name='samples',
+        verbose_name="데이터 소스"
+    )
+    date_column = models.CharField(
+        max_length=100,
+        verbose_name="날짜 컬럼",
+        validators=[
+            RegexValidator(
+                regex=r'^[a-zA-Z_][a-zA-Z0-9_]*$',
+                message='유효한 컬럼명이어야 합니다 (영문자, 숫자, 언더스코어만 허용)'
+            )
+        ],
+        help_text="증분 갱신 및 인덱스에 사용할 날짜 컬럼 (예: cdate)"
+    )
+    key_column = models.CharField(
+        max_length=100,
+        default='id',
+        verbose_name="해시 키 컬럼",
+        validators=[
+            RegexValidator(
+                regex=r'^[a-zA-Z_][a-zA-Z0-9_]*$',
+                message='유효한 컬럼명이어야 합니다 (영문자, 숫자, 언더스코어만 허용)'
+            )
+        ],
+        help_text="샘플 선택 해시(CRC32)에 사용할 고유 컬럼"
+    )
+    rate = models.FloatField(
+        default=0.01,
+        validators=[MinValueValidator(0.0001), MaxValueValidator(0.5)],
+        verbose_name="샘플 비율",
+        help_text="원본 행 중 샘플에 포함할 비율 (0.0001 ~ 0.5)"
+    )
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name="활성 상태"
+    )
+    row_count = models.BigIntegerField(
+        default=0,
+        verbose_name="샘플 행 수"
+    )
+    last_built_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="마지막 빌드 시간"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'data_source_samples'
+        ordering = ['data_source', 'rate', 'id']
+        verbose_name = '샘플 테이블'
+        verbose_name_plural = '샘플 테이블들'
+
+    def __str__(self):
+        return f"{self.data_source.table_name} [{self.rate:.2%}]"
+
+    @property
+    def table_name(self):
+        """물리 샘플 테이블명"""
+        return f"sample_{self.id}"
+
+
+class PercentileSketch(models.Model):
+    """
+    백분위 스케치(t-digest) 테이블 정의
+
+    원본 테이블을 일(bucket) + 차원 컬럼별로 묶어 측정 컬럼마다 t-digest를 저장한 테이블.
+    P50/P75/P95/P99 집계 조회가 일별 스케치를 병합하여 주/월/연 백분위를 계산합니다.
+    """
+    data_source = models.ForeignKey(
+        DataSource,
+        on_delete=models.CASCADE,
+        related_name='sketches',
+        verbose_name="데이터 소스"
+    )
+    date_column = models.CharField(
+        max_length=100,
+        verbose_name="날짜 컬럼",
+        validators=[
+            RegexValidator(
+                regex=r'^[a-zA-Z_][a-zA-Z0-9_]*$',
+                message='유효한 컬럼명이어야 합니다 (영문자, 숫자, 언더스코어만 허용)'
+            )
+        ],
+        help_text="일별 bucket 생성에 사용할 원본 테이블의 날짜 컬럼 (예: cdate)"
+    )
+    dimensions = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="차원 컬럼",
+        help_text="GROUP BY 컬럼 배열 (예: ['fcc_group'])"
+    )
+    measures = models.JSONField(
+        default=list,
+        verbose_name="측정 컬럼",
+        help_text="백분위 대상 컬럼 배열 (예: ['fcc'])"
+    )
+    compression = models.PositiveIntegerField(
+        default=200,
+        validators=[MinValueValidator(20), MaxValueValidator(1000)],
+        verbose_name="압축 계수",
+        help_text="t-digest 압축 계수 δ (클수록 정확하고 스케치가 커짐, 20 ~ 1000)"
+    )
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name="활성 상태"
+    )
+    row_count = models.BigIntegerField(
+        default=0,
+        verbose_name="스케치 행 수"
+    )
+    last_built_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="마지막 빌드 시간"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'data_source_sketches'
+        ordering = ['data_source', 'id']
+        verbose_name = '백분위 스케치'
+        verbose_name_plural = '백분위 스케치들'
+
+    def __str__(self):
+        dims = ', '.join(self.dimensions) or '-'
+        return f"{self.data_source.table_name} [sketch] ({dims})"
+
+    @property
+    def table_name(self):
+        """물리 스케치 테이블명"""
+        return f"sketch_{self.id}_day"
+
+    def clean(self):
+        """차원/측정 컬럼명 검증 (SQL Injection 방지)"""
+        from django.core.exceptions import ValidationError
+        import re
+
+        pattern = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+        for field_name in ('dimensions', 'measures'):
+            value = getattr(self, field_name)
+            if not isinstance(value, list):
+                raise ValidationError({field_name: '컬럼명 배열이어야 합니다.'})
+            for col in value:
+                if not isinstance(col, str) or not pattern.match(col):
+                    raise ValidationError(
+                        {field_name: f"컬럼명 '{col}'이 유효하지 않습니다."}
+                    )
+
+        if not self.measures:
+            raise ValidationError({'measures': '측정 컬럼을 하나 이상 지정해야 합니다.'})
+
+
+class QueryShape(models.Model):
+    """
+    관측된 데이터 조회 형태 (인덱스 추천 입력)
+
+    날짜 필터/그룹화/집계 컬럼만 남기고 날짜 값과 limit을 제거한 정규화된 요청.
+    원본 테이블을 조회한 요청만 기록됩니다 (캐시/롤업으로 처리된 요청 제외).
+    """
+    data_source = models.ForeignKey(
+        DataSource,
+        on_delete=models.CASCADE,
+        related_name='query_shapes',
+        verbose_name="데이터 소스"
+    )
+    shape_hash = models.CharField(
+        max_length=64,
+        verbose_name="형태 해시"
+    )
+    date_column = models.CharField(
+        max_length=100,
+        verbose_name="날짜 컬럼"
+    )
+    has_date_filter = models.BooleanField(
+        default=False,
+        verbose_name="날짜 필터 사용"
+    )
+    group_by_period = models.CharField(
+        max_length=10,
+        blank=True,
+        verbose_name="날짜 그룹화 단위"
+    )
+    group_columns = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="GROUP BY 컬럼"
+    )
+    measures = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="집계 컬럼"
+    )
+    equality_filters = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="동등 필터 컬럼",
+        help_text="eq / in / is_null 조건 컬럼"
+    )
+    range_filters = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="범위 필터 컬럼",
+        help_text="range / not_in 조건 컬럼"
+    )
+    hits = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="조회 횟수"
+    )
+    last_seen_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="마지막 조회 시간"
+    )
+
+    class Meta:
+        db_table = 'data_source_query_shapes'
+        ordering = ['data_source', '-hits']
+        unique_together = [('data_source', 'shape_hash')]
+        verbose_name = '조회 형태'
+        verbose_name_plural = '조회 형태들'
+
+    def __str__(self):
+        dims = ', '.join(self.group_columns) or '-'
+        return f"{self.data_source.table_name} [{self.group_by_period or '-'}] ({dims}) x{self.hits}"
+
+
+class IndexRecommendation(models.Model):
+    """
+    인덱스 추천 (advise_indexes 커맨드가 생성)
+
+    적용(applied) 상태의 추천은 load_fcc_data 실행 후 인덱스가 없으면 다시 생성됩니다.
+    """
+    STATUS_CHOICES = [
+        ('proposed', '추천'),
+        ('applied', '적용'),
+        ('rejected', '효과 없음'),
+    ]
+
+    data_source = models.ForeignKey(
+        DataSource,
+        on_delete=models.CASCADE,
+        related_name='index_recommendations',
+        verbose_name="데이터 소스"
+    )
+    index_name = models.CharField(
+        max_length=64,
+        verbose_name="인덱스명"
+    )
+    columns = models.JSONField(
+        default=list,
+        verbose_name="인덱스 컬럼",
+        help_text="순서대로 나열된 컬럼 배열 (예: ['cdate', 'fcc_group', 'fcc'])"
+    )
+    hits = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="대상 조회 횟수"
+    )
+    rows_before = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="EXPLAIN 예상 행 수 (적용 전)"
+    )
+    rows_after = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="EXPLAIN 예상 행 수 (적용 후)"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='proposed',
+        verbose_name="상태"
+    )
+    applied_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="적용 시간"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'data_source_index_recommendations'
+        ordering = ['data_source', '-hits']
+        unique_together = [('data_source', 'index_name')]
+        verbose_name = '인덱스 추천'
+        verbose_name_plural = '인덱스 추천들'
+
+    def __str__(self):
+        return f"{self.data_source.table_name}.{self.index_name} ({', '.join(self.columns)})"
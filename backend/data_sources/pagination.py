@@ -0,0 +1,99 @@
+"""
+커서(keyset) 페이지네이션 - 집계 없는 원본 행 조회
+
+OFFSET은 앞 페이지 행을 모두 읽고 버리므로 깊은 페이지일수록 느려집니다.
+마지막으로 받은 행의 (date_column, id)를 불투명 커서 토큰으로 돌려주고,
+다음 페이지는 그 위치부터 인덱스를 탐색(seek)하므로 페이지 깊이와 무관하게 일정한 시간이 걸립니다.
+
+    `cdate` >= %s AND (`cdate` > %s OR `id` > %s) ORDER BY `cdate`, `id` LIMIT n+1
+
+- 날짜 컬럼 인덱스(create_bucket_columns가 만드는 idx_{col})만 있으면 됨
+  (InnoDB 보조 인덱스는 기본 키 id를 포함하므로 (cdate, id) 순서로 탐색)
+- limit + 1건을 조회하여 다음 페이지 존재 여부 판단 (마지막 페이지는 next_cursor: null)
+- 날짜가 NULL인 행은 위치를 표현할 수 없으므로 페이지네이션 조회에서 제외
+- 토큰은 django.core.signing으로 서명 (변조/다른 테이블 커서 재사용 거부)
+"""
+
+from datetime import date, datetime
+
+from django.core import signing
+
+from .results import select_columns
+
+# 같은 날짜 안에서 순서를 정하는 고유 키 컬럼 (load_fcc_data가 만드는 기본 키)
+KEY_COLUMN = 'id'
+
+CURSOR_SALT = 'data_sources.pagination'
+
+
+class InvalidCursor(Exception):
+    """해석할 수 없거나 다른 조회의 커서 토큰"""
+
+
+def encode_cursor(table_name, date_column, date_value, row_id):
+    """마지막 행 위치 → 커서 토큰"""
+    if hasattr(date_value, 'isoformat'):
+        date_value = date_value.isoformat()
+    return signing.dumps(
+        [table_name, date_column, date_value, row_id],
+        salt=CURSOR_SALT,
+        compress=True,
+    )
+
+
+def _parse_key_date(value):
+    """커서의 날짜 문자열 → date/datetime (DB 드라이버가 날짜 파라미터로 전달)"""
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    return datetime.fromisoformat(value)
+
+
+def decode_cursor(token, table_name, date_column):
+    """
+    커서 토큰 → (날짜 값, id)
+
+    Raises:
+        InvalidCursor: 서명 불일치, 형식 오류, 다른 테이블/날짜 컬럼의 커서
+    """
+    try:
+        cursor_table, cursor_column, date_value, row_id = signing.loads(token, salt=CURSOR_SALT)
+        key = (_parse_key_date(date_value), int(row_id))
+    except (signing.BadSignature, ValueError, TypeError):
+        raise InvalidCursor('유효하지 않은 커서입니다.')
+
+    if (cursor_table, cursor_column) != (table_name, date_column):
+        raise InvalidCursor('다른 조회 조건(테이블/날짜 컬럼)에서 발급된 커서입니다.')
+
+    return key
+
+
+def paginate_result(result, spec):
+    """
+    limit + 1건 조회 결과 → 한 페이지 결과 + next_cursor
+
+    페이지 위치 계산용으로 추가 조회한 날짜/id 컬럼은 요청한 컬럼이 아니면 제거합니다.
+
+    Args:
+        result: 컬럼 단위 결과 (요청 컬럼 + 키 컬럼)
+        spec: paginate가 켜진 조회 요청
+
+    Returns:
+        컬럼 단위 결과 ({'columns', 'values', 'count', 'next_cursor'})
+    """
+    limit = spec.get('limit', 1000)
+    date_column = spec.get('date_column', 'date')
+
+    next_cursor = None
+    if result['count'] > limit:
+        index = {col: idx for idx, col in enumerate(result['columns'])}
+        last = limit - 1
+        next_cursor = encode_cursor(
+            spec['table_name'],
+            date_column,
+            result['values'][index[date_column]][last],
+            result['values'][index[KEY_COLUMN]][last],
+        )
+
+    page = select_columns(result, [(col, col) for col in spec.get('columns', [])], limit)
+    page['next_cursor'] = next_cursor
+    return page
@@ -0,0 +1,372 @@
+"""
+MySQL 연결 풀 (워커 프로세스별, DB 별칭별)
+
+CONN_MAX_AGE=0(Django 기본값)이면 요청마다 TCP 연결 + 인증 + init_command + 세션 설정을 새로 하고,
+일괄 조회 스레드(DATA_QUERY_BATCH_WORKERS)도 스캔마다 새로 연결합니다.
+data_sources.backends.mysql 백엔드는 Django 연결을 열고 닫는 대신 이 풀에서 빌리고 반납합니다.
+
+1. 풀 크기: DB_POOL_SIZE (워커 프로세스 + DB 별칭별 물리 연결 최대 수)
+   - 요청 스레드 1 + 일괄 조회 스레드(DATA_QUERY_BATCH_WORKERS) 이상 권장
+   - 모두 사용 중이면 DB_POOL_TIMEOUT_MS까지 대기 후 OperationalError
+     (gunicorn 워커 수 × 풀 크기 × DB 별칭 수가 MySQL max_connections를 넘지 않도록 설정)
+
+2. 연결 생성 시 1회만 실행: init_command(sql_mode), 격리 수준/SQL_AUTO_IS_NULL 세션 설정
+   - 반납 시 진행 중인 트랜잭션은 롤백, 오류가 났거나 트랜잭션 블록 안에서 닫힌 연결은 폐기
+
+3. 상태 확인
+   - DB_POOL_PING_INTERVAL초 넘게 쉬던 연결은 빌려주기 전에 ping (실패 시 폐기 후 새로 연결)
+   - DB_POOL_RECYCLE초보다 오래된 연결은 폐기 후 새로 연결 (MySQL wait_timeout보다 짧게)
+
+4. 사용처
+   - Django ORM / connection.cursor() (백엔드가 자동 사용)
+   - load_fcc_data의 SQLAlchemy 엔진 (dbapi_connection()으로 같은 풀 공유)
+
+fork 후(gunicorn --preload 등) 자식 프로세스는 부모의 연결을 쓰지 않고 새 풀을 만듭니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 대기 시간 분위수 계산에 사용할 최근 표본 수 (DB 별칭별)
+WAIT_SAMPLES = 1000
+
+
+def pool_enabled():
+    return getattr(settings, 'DB_POOL_ENABLED', True)
+
+
+def pool_size():
+    return max(getattr(settings, 'DB_POOL_SIZE', 8), 1)
+
+
+def pool_timeout_ms():
+    return getattr(settings, 'DB_POOL_TIMEOUT_MS', 5000)
+
+
+def pool_recycle():
+    """연결 최대 수명 (초)"""
+    return getattr(settings, 'DB_POOL_RECYCLE', 3600)
+
+
+def ping_interval():
+    """빌려주기 전 ping이 필요한 유휴 시간 (초)"""
+    return getattr(settings, 'DB_POOL_PING_INTERVAL', 30)
+
+
+class PoolTimeout(Exception):
+    """풀의 모든 연결이 사용 중이고 대기 시간을 넘김"""
+
+
+class _Entry:
+    """풀이 관리하는 물리 연결 1개"""
+
+    __slots__ = ('connection', 'created_at', 'released_at')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.released_at = self.created_at
+
+
+class ConnectionPool:
+    """
+    DB 별칭 1개의 연결 풀
+
+    Attributes:
+        checkouts: 빌려준 횟수
+        reused: 기존 연결을 재사용한 횟수 (나머지는 새로 연결)
+        created: 물리 연결 생성 횟수
+        waits: 빈 연결을 기다린 횟수
+        timeouts: 대기 시간 초과 횟수
+        recycled: 최대 수명 초과로 다시 연결한 횟수
+        health_failures: ping 실패로 폐기한 횟수
+        discarded: 반납 시 폐기한 횟수 (오류, 트랜잭션 블록 안에서 닫힘, 롤백 실패)
+    """
+
+    def __init__(self, alias, connect, size):
+        self.alias = alias
+        self.size = size
+        self._connect = connect
+        self._pid = os.getpid()
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._entries = {}
+        self._open = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.reused = 0
+        self.created = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.health_failures = 0
+        self.discarded = 0
+        self.wait_ms_max = 0.0
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+
+    @property
+    def forked(self):
+        return self._pid != os.getpid()
+
+    def _in_use(self):
+        return self._open - len(self._idle)
+
+    def acquire(self):
+        """
+        연결 빌리기
+
+        Returns:
+            (DB-API 연결, 새로 만든 연결이면 True)
+
+        Raises:
+            PoolTimeout: DB_POOL_TIMEOUT_MS 안에 빈 연결이 없음
+            연결 생성 실패 시 DB 드라이버 오류
+        """
+        started = time.monotonic()
+        deadline = started + pool_timeout_ms() / 1000
+        waited = False
+
+        with self._condition:
+            while not self._idle and self._open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f'DB 연결 풀({self.alias})의 연결 {self.size}개가 모두 사용 중입니다 '
+                        f'({pool_timeout_ms()}ms 대기).'
+                    )
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                self._condition.wait(remaining)
+
+            entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                self._open += 1
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use())
+            if waited:
+                waited_ms = (time.monotonic() - started) * 1000
+                self.wait_ms_max = max(self.wait_ms_max, waited_ms)
+                self._waits.append(waited_ms)
+
+        if entry is not None:
+            entry = self._check(entry)
+            if entry is not None:
+                with self._condition:
+                    self.reused += 1
+                return entry.connection, False
+
+        # 새 연결 (자리는 위에서 확보)
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.created += 1
+            self._entries[id(connection)] = _Entry(connection)
+        return connection, True
+
+    def _check(self, entry):
+        """유휴 연결 상태 확인 (사용할 수 없으면 닫고 None - 자리는 새 연결이 사용)"""
+        now = time.monotonic()
+        if now - entry.created_at > pool_recycle():
+            with self._condition:
+                self.recycled += 1
+            self._drop(entry)
+            return None
+
+        if now - entry.released_at > ping_interval():
+            try:
+                entry.connection.ping(reconnect=False)
+            except Exception as e:
+                logger.info(f"DB 연결 풀({self.alias}) 유휴 연결 ping 실패, 다시 연결: {str(e)}")
+                with self._condition:
+                    self.health_failures += 1
+                self._drop(entry)
+                return None
+        return entry
+
+    def _drop(self, entry):
+        """물리 연결 닫기 (풀의 자리는 호출한 쪽이 정리)"""
+        with self._condition:
+            self._entries.pop(id(entry.connection), None)
+        try:
+            entry.connection.close()
+        except Exception:
+            pass
+
+    def release(self, connection, discard=False):
+        """
+        연결 반납
+
+        진행 중인 트랜잭션은 롤백하고, discard이거나 롤백에 실패하면 폐기합니다.
+        """
+        with self._condition:
+            entry = self._entries.get(id(connection))
+        if entry is None or entry.connection is not connection:
+            # 풀 밖에서 만든 연결 (풀 비활성 상태에서 연 연결 등)
+            connection.close()
+            return
+
+        if not discard and not connection.open:
+            discard = True
+        if not discard and not connection.get_autocommit():
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+
+        if discard:
+            self._drop(entry)
+            with self._condition:
+                self.discarded += 1
+                self._open -= 1
+                self._condition.notify()
+            return
+
+        entry.released_at = time.monotonic()
+        with self._condition:
+            self._idle.append(entry)
+            self._condition.notify()
+
+    def close(self):
+        """유휴 연결 모두 닫기 (사용 중인 연결은 반납 시 풀로 돌아옴)"""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for entry in idle:
+            self._drop(entry)
+
+    @staticmethod
+    def _percentile(samples, q):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self):
+        with self._condition:
+            in_use = self._in_use()
+            waits = list(self._waits)
+            return {
+                'size': self.size,
+                'open': self._open,
+                'in_use': in_use,
+                'idle': len(self._idle),
+                'saturation': round(in_use / self.size, 2),
+                'peak_in_use': self.peak_in_use,
+                'checkouts': self.checkouts,
+                'reused': self.reused,
+                'created': self.created,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'wait_ms': {
+                    'avg': round(sum(waits) / len(waits), 1) if waits else 0.0,
+                    'p95': round(self._percentile(waits, 0.95), 1),
+                    'max': round(self.wait_ms_max, 1),
+                },
+                'recycled': self.recycled,
+                'health_failures': self.health_failures,
+                'discarded': self.discarded,
+            }
+
+
+class PoolRegistry:
+    """DB 별칭별 연결 풀 (워커 프로세스 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def get(self, alias, connect):
+        """
+        alias의 연결 풀 (없거나 fork 전에 만든 풀이면 생성)
+
+        Args:
+            alias: DB 별칭
+            connect: 물리 연결을 새로 만드는 함수 (인자 없음)
+        """
+        with self._lock:
+            pool = self._pools.get(alias)
+            if pool is None or pool.forked:
+                # fork 전 연결은 부모 프로세스와 소켓을 공유하므로 닫지 않고 버림
+                pool = self._pools[alias] = ConnectionPool(alias, connect, pool_size())
+            return pool
+
+    def close_all(self):
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+
+    def stats(self):
+        with self._lock:
+            pools = dict(self._pools)
+        return {
+            'enabled': pool_enabled(),
+            'size': pool_size(),
+            'timeout_ms': pool_timeout_ms(),
+            'pools': {
+                alias: pool.stats()
+                for alias, pool in sorted(pools.items()) if not pool.forked
+            },
+        }
+
+
+connection_pools = PoolRegistry()
+
+
+class PooledDBAPIConnection:
+    """
+    풀에서 빌린 DB-API 연결 (close() 시 풀에 반납)
+
+    SQLAlchemy 엔진의 creator로 사용하면 엔진이 연결을 닫을 때 물리 연결 대신 풀에 반납됩니다.
+    """
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        connection = self.__dict__.get('_connection')
+        if connection is None:
+            raise AttributeError(name)
+        return getattr(connection, name)
+
+    def close(self):
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool.release(connection)
+
+
+def dbapi_connection(alias='default'):
+    """
+    풀에서 DB-API 연결 빌리기 (Django 밖의 라이브러리용, 풀 비활성 시 새 연결)
+
+    Django 커서와 같은 연결 설정(init_command, charset)을 사용합니다.
+    반환된 연결은 autocommit이 꺼져 있으므로 (DB-API 기본값) 사용 후 commit/rollback 후 close()하세요.
+    """
+    from django.db import connections
+
+    wrapper = connections[alias]
+    if not pool_enabled() or not hasattr(wrapper, 'connection_pool'):
+        connection = wrapper.get_new_connection(wrapper.get_connection_params())
+    else:
+        pool = wrapper.connection_pool()
+        connection, _ = pool.acquire()
+        connection = PooledDBAPIConnection(pool, connection)
+    connection.autocommit(False)
+    return connection
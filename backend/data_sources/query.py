@@ -0,0 +1,645 @@
+"""
+동적 데이터 조회 실행 계층
+
+DataQueryAPIView(단건)와 DataQueryBatchAPIView(일괄)가 공유하는
+검증 → 캐시 조회 → SQL 생성 → 실행 → 결과 변환 흐름을 정의합니다.
+
+오류는 QueryError로 발생시키며, 뷰는 이를 HTTP 응답으로 변환합니다.
+"""
+
+import logging
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import status
+
+from .admission import DEFAULT_PRIORITY, AdmissionRejected, admission_controller
+from .cache import query_cache, get_cache_settings, make_cache_key, data_version
+from .downsample import downsample_result
+from .cost_guard import (
+    CostExceeded,
+    cost_estimator,
+    downgrade_enabled,
+    is_timeout,
+    timeout_exceeded,
+    with_time_limit,
+)
+from .compiler import (  # noqa: F401 (기존 import 경로 유지)
+    PERIOD_EXPRESSIONS,
+    CompileError,
+    bucket_column_name,
+    period_expression,
+    query_compiler,
+)
+from .filters import filter_columns, filter_tables
+from .gapfill import fill_result
+from .indexes import shape_collector
+from .materialize import compile_converters
+from .pagination import KEY_COLUMN, paginate_result
+from .registry import schema_registry
+from .replicas import read_connection, replica_router
+from .results import build_result, render_body
+from .rollups import route_query
+from .sampling import (
+    APPROXIMATE_FUNCTIONS,
+    SampleTooSmall,
+    build_sample_query,
+    estimate_result,
+    exact_bounds,
+    find_sample,
+    min_sample_rows,
+)
+from .singleflight import single_flight
+from .sketches import (
+    TooManyRows,
+    exact_max_rows,
+    execute_exact,
+    execute_sketch,
+    find_sketch,
+    has_percentiles,
+    prefers_exact,
+)
+from .topn import apply_top_n
+
+logger = logging.getLogger(__name__)
+
+
+class QueryError(Exception):
+    """
+    데이터 조회 실패
+
+    Attributes:
+        message: 사용자에게 반환할 에러 메시지
+        status_code: HTTP 상태 코드
+        extra: 응답 본문에 추가할 필드 (예: available_columns)
+    """
+
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST, extra=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.extra = extra or {}
+
+    def to_response_body(self):
+        return {'error': self.message, **self.extra}
+
+
+class QueryResult:
+    """
+    데이터 조회 결과
+
+    Attributes:
+        body: 응답 본문 (요청한 format으로 변환된 결과)
+        cache_status: 'HIT', 'MISS' 또는 'COALESCED' (동시에 실행된 같은 조회의 결과 공유)
+    """
+
+    def __init__(self, body, cache_status):
+        self.body = body
+        self.cache_status = cache_status
+
+
+def resolve_schema(table_name):
+    """
+    테이블명 화이트리스트 검증 (1단계 방어)
+
+    스키마 레지스트리에서 조회하므로 메타데이터 쿼리가 발생하지 않습니다.
+
+    Raises:
+        QueryError: 등록되지 않았거나 비활성 테이블 (404), 컬럼 조회 실패 (500)
+    """
+    try:
+        schema = schema_registry.get(table_name)
+    except Exception as e:
+        logger.error(
+            f"테이블 컬럼 조회 실패: {table_name} - {str(e)}"
+        )
+        raise QueryError(
+            f'테이블 컬럼 조회 실패: {str(e)}',
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    if schema is None:
+        logger.warning(
+            f"데이터 조회 실패: 등록되지 않은 테이블 '{table_name}'"
+        )
+        raise QueryError(
+            f"테이블 '{table_name}'이(가) 등록되지 않았거나 비활성 상태입니다.",
+            status.HTTP_404_NOT_FOUND
+        )
+
+    return schema
+
+
+def validate_columns(schema, spec):
+    """
+    컬럼명 화이트리스트 검증 (2단계 방어)
+
+    요청된 컬럼, 집계 컬럼, 필터 컬럼, date_column이 실제 테이블 컬럼에 있는지 확인합니다.
+
+    Raises:
+        QueryError: 유효하지 않은 컬럼 (400)
+    """
+    columns = spec.get('columns', [])
+    aggregations = spec.get('aggregations', [])
+    date_column = spec.get('date_column', 'date')
+
+    # 요청된 컬럼이 실제 테이블 컬럼에 있는지 확인
+    all_columns_to_check = set(columns)
+
+    # 집계 함수에 사용되는 컬럼도 검증
+    for agg in aggregations:
+        all_columns_to_check.add(agg['column'])
+
+    # 필터 컬럼 (WHERE 절에 사용)
+    all_columns_to_check |= filter_columns(spec)
+
+    # date_column도 추가
+    if date_column:
+        all_columns_to_check.add(date_column)
+
+    # 커서 페이지네이션은 같은 날짜 안의 순서를 id로 결정
+    if spec.get('paginate') and KEY_COLUMN not in schema.column_set:
+        raise QueryError(
+            f"커서 페이지네이션에는 '{KEY_COLUMN}' 컬럼이 필요합니다 "
+            f"(테이블: {schema.table_name})."
+        )
+
+    invalid_columns = schema.invalid_columns(all_columns_to_check)
+    if invalid_columns:
+        logger.warning(
+            f"데이터 조회 실패: 유효하지 않은 컬럼 {invalid_columns} "
+            f"(테이블: {schema.table_name})"
+        )
+        raise QueryError(
+            f'유효하지 않은 컬럼: {invalid_columns}',
+            extra={'available_columns': list(schema.columns)}
+        )
+
+
+def build_query(spec, schema=None):
+    """
+    SQL 쿼리 생성 (3단계 방어: 파라미터화된 쿼리)
+
+    구조가 같은 요청은 query_compiler에 캐시된 SQL 템플릿을 재사용하고
+    날짜와 limit만 파라미터로 바인딩합니다.
+
+    Args:
+        spec: 검증된 조회 요청
+        schema: DataSourceSchema (bucket 생성 컬럼 사용 여부 판단)
+
+    Returns:
+        (query, params, result_columns)
+
+    Raises:
+        QueryError: SELECT 절이 비어있는 경우 (400)
+    """
+    try:
+        plan = query_compiler.compile(spec, schema)
+    except CompileError as e:
+        raise QueryError(str(e))
+
+    query, params = plan.bind(spec)
+    return query, params, list(plan.result_columns)
+
+
+def fetch_rows(query, params, result_columns, using=DEFAULT_DB_ALIAS):
+    """쿼리 실행 후 결과를 컬럼 단위 결과로 변환 (cursor.description 기반 변환 함수 사용)"""
+    with read_connection(using).cursor() as cursor:
+        cursor.execute(query, params)
+        converters = compile_converters(cursor.description)
+        rows = cursor.fetchall()
+
+    return build_result(rows, result_columns, converters)
+
+
+def query_key(spec):
+    """정규화된 조회 요청 + 테이블 데이터 버전 키 (결과 캐시와 동일 조회 병합에 사용)"""
+    return make_cache_key(spec, data_version(spec['table_name']))
+
+
+def lookup_cached(spec):
+    """
+    결과 캐시 조회 (정규화된 요청 + 테이블 데이터 버전 기준)
+
+    Returns:
+        (cache_key, cached_body) - 캐시 비활성 시 cache_key는 None,
+        캐시에 없으면 cached_body는 None
+    """
+    if not get_cache_settings()['ENABLED']:
+        return None, None
+
+    table_name = spec['table_name']
+    cache_key = query_key(spec)
+    cached_body = query_cache.get(cache_key)
+    if cached_body is not None:
+        logger.info(f"데이터 조회 캐시 적중: {table_name}")
+    return cache_key, cached_body
+
+
+def store_cached(cache_key, body):
+    """조회 결과 캐시 저장 (캐시 비활성 시 무시)"""
+    if cache_key is not None:
+        query_cache.set(cache_key, body)
+
+
+@contextmanager
+def execution_slot(schema, priority=DEFAULT_PRIORITY):
+    """
+    DB 실행 구간을 동시 실행 슬롯 안에서 수행 (admission 모듈)
+
+    Raises:
+        QueryError: 대기열 초과 또는 대기 시간 초과 (503)
+    """
+    try:
+        with admission_controller.slot(schema, priority):
+            yield
+    except AdmissionRejected as e:
+        raise QueryError(str(e), status.HTTP_503_SERVICE_UNAVAILABLE, e.to_extra())
+
+
+def check_timeout(error, schema):
+    """
+    실행 시간 예산(MAX_EXECUTION_TIME) 초과로 중단된 쿼리 오류면 422 발생
+
+    Raises:
+        QueryError: 실행 시간 예산 초과 (422, budget/limit/data_source 포함)
+    """
+    if not is_timeout(error):
+        return
+    cost_estimator.record('timeouts')
+    exceeded = timeout_exceeded(schema)
+    logger.warning(f"조회 시간 초과: {str(exceeded)}")
+    raise QueryError(
+        str(exceeded),
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        extra=exceeded.to_extra(schema)
+    )
+
+
+def admit_query(spec, schema, query, params, allow_downgrade=True, using=DEFAULT_DB_ALIAS):
+    """
+    원본 테이블 쿼리 비용 검사 (EXPLAIN 예상 행 수 ≤ DataSource 예산)
+
+    예산을 넘는 AVG/SUM/COUNT 집계는 샘플 테이블이 있으면 근사 집계로 낮춰 응답합니다
+    (allow_downgrade=False인 스트리밍 조회는 거부만 함).
+
+    Returns:
+        None - 실행 승인
+        근사 집계 결과 - 예산 초과로 낮춘 경우 (cost_guard 필드 포함)
+
+    Raises:
+        QueryError: 예산 초과 (422, budget/limit/estimated_rows/data_source 포함)
+    """
+    try:
+        cost_estimator.admit(schema, query, params, using)
+        return None
+    except CostExceeded as exceeded:
+        error = exceeded
+
+    aggregations = spec.get('aggregations', [])
+    if (
+        allow_downgrade
+        and downgrade_enabled()
+        and aggregations
+        and all(agg['function'] in APPROXIMATE_FUNCTIONS for agg in aggregations)
+        and find_sample(schema) is not None
+    ):
+        try:
+            result = execute_approximate(spec, schema, using)
+        except QueryError as e:
+            logger.warning(f"근사 집계로 낮추기 실패: {schema.table_name} - {e.message}")
+        else:
+            cost_estimator.record('downgraded')
+            logger.warning(
+                f"조회 비용 초과, 근사 집계로 응답: {schema.table_name} - "
+                f"예상 {error.estimate:,}행 > 예산 {error.limit:,}행"
+            )
+            return {**result, 'cost_guard': {'downgraded': True, **error.to_extra(schema)}}
+
+    cost_estimator.record('rejected')
+    logger.warning(f"조회 비용 초과로 거부: {schema.table_name} - {str(error)}")
+    raise QueryError(
+        str(error),
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        extra=error.to_extra(schema)
+    )
+
+
+def execute_approximate(spec, schema, using=DEFAULT_DB_ALIAS):
+    """
+    근사 집계 실행 (샘플 테이블 집계 후 비율 보정, 95% 신뢰구간 포함)
+
+    Raises:
+        QueryError: 샘플 테이블이 없거나 샘플 행이 너무 적음 (422), 실행 실패 (500)
+    """
+    table_name = spec['table_name']
+    sample = find_sample(schema) if schema is not None else None
+    if sample is None:
+        raise QueryError(
+            f"'{table_name}'의 근사 집계용 샘플 테이블이 없습니다 "
+            f"(python manage.py build_samples --table {table_name} --define).",
+            status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    query, params, result_columns = build_sample_query(spec, sample)
+    query = with_time_limit(query, schema)
+    try:
+        logger.info(
+            f"데이터 조회 쿼리 실행 (근사): {table_name} → {sample.table_name} - "
+            f"샘플 비율 {sample.rate:.2%}, 집계 {len(spec.get('aggregations', []))}개"
+        )
+        logger.debug(f"쿼리: {query}, 파라미터: {params}")
+
+        result = fetch_rows(query, params, result_columns, using)
+    except Exception as e:
+        check_timeout(e, schema)
+        logger.error(f"근사 조회 실패: {table_name} - {str(e)}")
+        raise QueryError(
+            f'데이터 조회 중 오류 발생: {str(e)}',
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    try:
+        result = estimate_result(result, spec, sample)
+    except SampleTooSmall as e:
+        logger.warning(f"근사 조회 거부: {table_name} - {str(e)}")
+        raise QueryError(
+            str(e),
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            extra={'min_sample_rows': min_sample_rows(), 'smallest_group_rows': e.smallest}
+        )
+
+    logger.info(
+        f"데이터 조회 성공 (근사): {table_name} - {result['count']}건 조회 ({sample.table_name})"
+    )
+
+    return {
+        **result,
+        'table_name': table_name,
+        'source_table': sample.table_name
+    }
+
+
+def execute_percentiles(spec, schema, using=DEFAULT_DB_ALIAS):
+    """
+    백분위 집계 실행 (짧은 기간은 원본 행으로 정확히, 그 외에는 일별 스케치 병합)
+
+    Raises:
+        QueryError: 스케치가 없고 원본 행이 너무 많음 (422), 실행 실패 (500)
+    """
+    table_name = spec['table_name']
+    sketch = find_sketch(schema, spec)
+    result = None
+    source_table = table_name
+
+    try:
+        if sketch is None or prefers_exact(spec):
+            try:
+                result = execute_exact(spec, schema, using=using)
+            except TooManyRows as e:
+                if sketch is None:
+                    logger.warning(f"백분위 조회 거부: {table_name} - {str(e)}")
+                    raise QueryError(
+                        f"{str(e)} 기간을 줄이거나 스케치를 빌드하세요 "
+                        f"(python manage.py build_sketches --table {table_name} --define).",
+                        status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        extra={'max_rows': exact_max_rows()}
+                    )
+
+        if result is None:
+            source_table = sketch.table_name
+            logger.info(
+                f"데이터 조회 쿼리 실행 (스케치): {table_name} → {source_table} - "
+                f"집계 {len(spec.get('aggregations', []))}개"
+            )
+            result = execute_sketch(spec, sketch, using)
+    except QueryError:
+        raise
+    except Exception as e:
+        check_timeout(e, schema)
+        logger.error(f"백분위 조회 실패: {table_name} - {str(e)}")
+        raise QueryError(
+            f'데이터 조회 중 오류 발생: {str(e)}',
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    logger.info(
+        f"데이터 조회 성공 (백분위): {table_name} - {result['count']}건 조회 ({source_table})"
+    )
+
+    return {
+        **result,
+        'table_name': table_name,
+        'source_table': source_table
+    }
+
+
+def execute_spec(spec):
+    """
+    검증을 마친 조회 요청의 SQL 생성 및 실행 (캐시 미사용)
+
+    사용 가능한 롤업 테이블이 있으면 롤업을 조회하고,
+    롤업 조회가 실패하면 원본 테이블로 다시 조회합니다.
+    accuracy="approximate"는 롤업(정확)이 없을 때 샘플 테이블로 근사 집계합니다.
+    백분위(P50/P75/P95/P99) 집계는 롤업 대신 스케치 테이블 또는 원본 행으로 계산합니다.
+    SQL은 replica_router가 고른 읽기 복제본(없거나 지연되면 default)에서 실행합니다.
+    큰 IN 목록 필터는 같은 연결의 임시 테이블에 적재한 뒤 실행합니다 (filters 모듈).
+
+    Returns:
+        컬럼 단위 결과 ({'columns', 'values', 'count', 'table_name', 'source_table'})
+        - 커서 페이지네이션 조회는 next_cursor 포함
+        - 응답 본문은 results.render_body로 변환
+
+    Raises:
+        QueryError: SELECT 절이 비어있거나 (400) 비용 예산 초과 (422) 실행 실패 (500)
+    """
+    table_name = spec['table_name']
+    schema = schema_registry.get(table_name)
+    # 읽기 복제본 선택 (지연/상태 확인, 없으면 default)
+    using = replica_router.read_alias(table_name)
+
+    try:
+        with filter_tables(spec, using) as using:
+            return run_steps(execution_steps(spec, schema, using), using)
+    except QueryError:
+        raise
+    except Exception as e:
+        logger.error(f"데이터 조회 실패: {table_name} - {str(e)}")
+        raise QueryError(
+            f'데이터 조회 중 오류 발생: {str(e)}',
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+# execution_steps가 실행기에 요청하는 작업 종류
+FETCH_STEP = 'fetch'  # (FETCH_STEP, query, params, result_columns) → SQL 실행 결과
+CALL_STEP = 'call'  # (CALL_STEP, 인자 없는 함수) → 동기 DB 작업(EXPLAIN, ORM 등) 결과
+
+
+def execution_steps(spec, schema, using):
+    """
+    롤업 → 근사/백분위 → 원본 순 실행 계획 (동기 execute_spec / 비동기 execute_spec_async 공통)
+
+    라우팅, SQL 생성, 비용 검사(근사 전환 포함), 실행 시간 제한, 페이지네이션, top_n 후처리를 담당하고
+    SQL 실행과 동기 DB 작업은 직접 하지 않고 yield로 실행기에 요청합니다.
+    실행기는 결과를 send로, 실패는 예외 그대로 throw로 돌려줍니다 (run_steps / run_steps_async).
+
+    Returns:
+        컬럼 단위 결과 (제너레이터 반환값)
+    """
+    table_name = spec['table_name']
+    columns = spec.get('columns', [])
+    limit = spec.get('limit', 1000)
+    aggregations = spec.get('aggregations', [])
+
+    result = None
+    source_table = table_name
+
+    if has_percentiles(spec):
+        return (yield CALL_STEP, partial(execute_percentiles, spec, schema, using))
+
+    # 롤업 라우팅 (원본 대신 사전 집계 테이블 조회)
+    routed = route_query(spec, schema)
+    if routed is not None:
+        query, params, result_columns, source_table = routed
+        query = with_time_limit(query, schema)
+        try:
+            logger.info(
+                f"데이터 조회 쿼리 실행 (롤업): {table_name} → {source_table} - "
+                f"컬럼 {len(columns)}개, 집계 {len(aggregations)}개, 제한 {limit}건"
+            )
+            logger.debug(f"쿼리: {query}, 파라미터: {params}")
+
+            result = yield FETCH_STEP, query, params, result_columns
+        except Exception as e:
+            check_timeout(e, schema)
+            logger.warning(
+                f"롤업 조회 실패, 원본 테이블로 재시도: {source_table} - {str(e)}"
+            )
+            source_table = table_name
+
+    approximate = spec.get('accuracy') == 'approximate'
+    if approximate:
+        if result is None:
+            return (yield CALL_STEP, partial(execute_approximate, spec, schema, using))
+        result = exact_bounds(result, spec)
+
+    if result is None:
+        query, params, result_columns = build_query(spec, schema)
+
+        # 비용 검사 (EXPLAIN) → 예산 초과 시 근사 집계로 낮추거나 422
+        downgraded = yield CALL_STEP, partial(
+            admit_query, spec, schema, query, params, using=using
+        )
+        if downgraded is not None:
+            return downgraded
+        query = with_time_limit(query, schema)
+
+        try:
+            logger.info(
+                f"데이터 조회 쿼리 실행: {table_name} - "
+                f"컬럼 {len(columns)}개, 집계 {len(aggregations)}개, 제한 {limit}건"
+            )
+            logger.debug(f"쿼리: {query}, 파라미터: {params}")
+
+            result = yield FETCH_STEP, query, params, result_columns
+        except Exception as e:
+            check_timeout(e, schema)
+            logger.error(
+                f"데이터 조회 실패: {table_name} - {str(e)}"
+            )
+            raise QueryError(
+                f'데이터 조회 중 오류 발생: {str(e)}',
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        # 주기가 지나면 QueryShape에 반영 (ORM)
+        yield CALL_STEP, partial(shape_collector.record, spec)
+
+        # 롤업은 집계 조회만 라우팅하므로 페이지네이션은 원본 조회에서만 발생
+        if spec.get('paginate'):
+            result = paginate_result(result, spec)
+
+    # 상위 N개 + "기타" (롤업/원본 결과 공통 - "기타" 행 이름 지정, 보조 컬럼 제거)
+    if spec.get('top_n'):
+        result = apply_top_n(result, spec)
+
+    logger.info(
+        f"데이터 조회 성공: {table_name} - {result['count']}건 조회 ({source_table})"
+    )
+
+    return {
+        **result,
+        'table_name': table_name,
+        'source_table': source_table
+    }
+
+
+def run_steps(steps, using):
+    """execution_steps 동기 실행기 (SQL은 using 연결의 fetch_rows, 동기 작업은 직접 호출)"""
+    reply, error = None, None
+    while True:
+        try:
+            step = steps.send(reply) if error is None else steps.throw(error)
+        except StopIteration as stop:
+            return stop.value
+
+        reply, error = None, None
+        try:
+            if step[0] == FETCH_STEP:
+                reply = fetch_rows(*step[1:], using)
+            else:
+                reply = step[1]()
+        except Exception as e:
+            error = e
+
+
+def present_result(body, spec):
+    """
+    캐시/실행 결과 → 응답 본문 (fill 빈 구간 채우기, max_points 다운샘플링 후 요청한 format으로 변환)
+    """
+    return render_body(
+        downsample_result(fill_result(body, spec), spec), spec.get('format', 'rows')
+    )
+
+
+def run_query(spec, schema=None, priority=DEFAULT_PRIORITY):
+    """
+    검증된 조회 요청 1건 실행
+
+    Args:
+        spec: DataQuerySerializer.validated_data
+        schema: 이미 확인한 DataSourceSchema (일괄 조회 시 테이블별 1회 검증)
+        priority: 동시 실행 슬롯 우선순위 (캐시 미스로 DB를 조회할 때만 사용)
+
+    Returns:
+        QueryResult
+
+    Raises:
+        QueryError: 검증 또는 실행 실패, 동시 실행 대기 초과 (503)
+    """
+    if schema is None:
+        schema = resolve_schema(spec['table_name'])
+
+    validate_columns(schema, spec)
+
+    cache_key, cached_body = lookup_cached(spec)
+    if cached_body is not None:
+        return QueryResult(present_result(cached_body, spec), 'HIT')
+
+    def execute():
+        with execution_slot(schema, priority):
+            body = execute_spec(spec)
+        # 병합 대기가 끝나기 전에 캐시를 채워 뒤이어 들어온 요청은 캐시 적중
+        store_cached(cache_key, body)
+        return body
+
+    # 동시에 들어온 같은 조회는 1회만 실행 (singleflight 모듈)
+    body, shared = single_flight.do(cache_key or query_key(spec), execute)
+    if not shared:
+        return QueryResult(present_result(body, spec), 'MISS')
+
+    # 다른 워커가 실행한 결과일 수 있으므로 이 워커 캐시에도 저장
+    store_cached(cache_key, body)
+    return QueryResult(present_result(body, spec), 'COALESCED')
@@ -0,0 +1,298 @@
+"""
+DataSource 스키마 레지스트리 (프로세스 단위)
+
+데이터 조회 요청마다 실행되던 메타데이터 쿼리
+(DataSource.objects.get + SHOW COLUMNS)를 메모리 내 딕셔너리 조회로 대체합니다.
+
+- 워커 기동 시 warm()으로 활성 DataSource와 컬럼/롤업 정보를 한 번에 적재
+- DataSource/Rollup 저장/삭제 시그널, register_fcc_data/load_fcc_data 커맨드에서 무효화
+- 다른 프로세스의 무효화는 generations 스탬프로 감지
+- hit/miss 카운터로 메타데이터 왕복 제거 효과 확인
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connection
+
+from . import generations
+
+logger = logging.getLogger(__name__)
+
+GENERATION_NAME = 'schema_registry'
+
+
+@dataclass(frozen=True)
+class RollupSpec:
+    """빌드 완료된 활성 롤업 테이블 정보"""
+    rollup_id: int
+    table_name: str
+    grain: str
+    date_column: str
+    dimensions: frozenset
+    measures: frozenset
+
+
+@dataclass(frozen=True)
+class SampleSpec:
+    """빌드 완료된 활성 샘플 테이블 정보"""
+    sample_id: int
+    table_name: str
+    rate: float
+    date_column: str
+
+
+@dataclass(frozen=True)
+class SketchSpec:
+    """빌드 완료된 활성 백분위 스케치 테이블 정보"""
+    sketch_id: int
+    table_name: str
+    date_column: str
+    dimensions: frozenset
+    measures: frozenset
+    compression: int
+
+
+@dataclass(frozen=True)
+class DataSourceSchema:
+    """활성 DataSource 하나의 스키마 스냅샷"""
+    data_source_id: int
+    name: str
+    table_name: str
+    columns: tuple
+    column_types: dict = field(default_factory=dict)
+    rollups: tuple = ()
+    samples: tuple = ()
+    sketches: tuple = ()
+    max_examined_rows: int = None
+    max_execution_ms: int = None
+    max_concurrent_queries: int = None
+
+    def __post_init__(self):
+        object.__setattr__(self, 'column_set', frozenset(self.columns))
+
+    def invalid_columns(self, names):
+        """테이블에 존재하지 않는 컬럼 집합"""
+        return set(names) - self.column_set
+
+
+class SchemaRegistry:
+    """
+    활성 DataSource 스키마 캐시
+
+    table_name → DataSourceSchema 매핑을 보관하며, 다음 경우 전체를 다시 적재합니다.
+    - 아직 적재되지 않음
+    - generations 스탬프가 변경됨 (다른 프로세스에서 무효화)
+    - TTL(settings.DATA_SOURCE_SCHEMA_TTL, 초) 경과
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._schemas = None
+        self._generation = None
+        self._loaded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'DATA_SOURCE_SCHEMA_TTL', 300)
+
+    def _is_stale(self):
+        if self._schemas is None:
+            return True
+        if generations.current(GENERATION_NAME) != self._generation:
+            return True
+        return time.monotonic() - self._loaded_at > self.ttl
+
+    def _load(self):
+        """활성 DataSource, 컬럼 정보, 롤업/샘플/스케치 정보를 5개의 쿼리로 적재"""
+        from .models import DataSource, PercentileSketch, Rollup, SampleTable
+
+        generation = generations.current(GENERATION_NAME)
+
+        sources = list(
+            DataSource.objects.filter(is_active=True)
+            .order_by('name')
+            .values_list(
+                'id', 'name', 'table_name', 'columns_metadata',
+                'max_examined_rows', 'max_execution_ms', 'max_concurrent_queries',
+            )
+        )
+
+        table_names = sorted({source[2] for source in sources})
+        columns_by_table = self._fetch_columns(table_names)
+
+        rollups_by_source = {}
+        for rollup in Rollup.objects.filter(
+            is_active=True,
+            last_built_at__isnull=False,
+            data_source__is_active=True,
+        ):
+            rollups_by_source.setdefault(rollup.data_source_id, []).append(
+                RollupSpec(
+                    rollup_id=rollup.id,
+                    table_name=rollup.table_name,
+                    grain=rollup.grain,
+                    date_column=rollup.date_column,
+                    dimensions=frozenset(rollup.dimensions),
+                    measures=frozenset(rollup.measures),
+                )
+            )
+
+        samples_by_source = {}
+        for sample in SampleTable.objects.filter(
+            is_active=True,
+            last_built_at__isnull=False,
+            data_source__is_active=True,
+        ):
+            samples_by_source.setdefault(sample.data_source_id, []).append(
+                SampleSpec(
+                    sample_id=sample.id,
+                    table_name=sample.table_name,
+                    rate=sample.rate,
+                    date_column=sample.date_column,
+                )
+            )
+
+        sketches_by_source = {}
+        for sketch in PercentileSketch.objects.filter(
+            is_active=True,
+            last_built_at__isnull=False,
+            data_source__is_active=True,
+        ):
+            sketches_by_source.setdefault(sketch.data_source_id, []).append(
+                SketchSpec(
+                    sketch_id=sketch.id,
+                    table_name=sketch.table_name,
+                    date_column=sketch.date_column,
+                    dimensions=frozenset(sketch.dimensions),
+                    measures=frozenset(sketch.measures),
+                    compression=sketch.compression,
+                )
+            )
+
+        schemas = {}
+        for source_id, name, table_name, metadata, max_rows, max_ms, max_concurrent in sources:
+            # 같은 테이블을 가리키는 DataSource가 여러 개면 이름순 첫 번째 사용
+            if table_name in schemas:
+                continue
+            columns = columns_by_table.get(table_name, [])
+            schemas[table_name] = DataSourceSchema(
+                data_source_id=source_id,
+                name=name,
+                table_name=table_name,
+                columns=tuple(col for col, _ in columns),
+                column_types=self._column_types(columns, metadata),
+                rollups=tuple(rollups_by_source.get(source_id, [])),
+                samples=tuple(samples_by_source.get(source_id, [])),
+                sketches=tuple(sketches_by_source.get(source_id, [])),
+                max_examined_rows=max_rows,
+                max_execution_ms=max_ms,
+                max_concurrent_queries=max_concurrent,
+            )
+
+        self._schemas = schemas
+        self._generation = generation
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+
+        logger.info(f"스키마 레지스트리 적재: DataSource {len(schemas)}개")
+
+    def _column_types(self, columns, metadata):
+        """컬럼 타입 (DataSource.columns_metadata의 type 우선, 없으면 information_schema)"""
+        column_types = {col: col_type for col, col_type in columns}
+        for col, meta in (metadata or {}).items():
+            if col in column_types and isinstance(meta, dict) and meta.get('type'):
+                column_types[col] = str(meta['type']).lower()
+        return column_types
+
+    def _fetch_columns(self, table_names):
+        """
+        테이블별 (컬럼명, 타입) 목록 조회
+
+        information_schema 1회 조회로 모든 테이블의 컬럼 정보를 가져옵니다.
+        """
+        columns_by_table = {table_name: [] for table_name in table_names}
+        if not table_names:
+            return columns_by_table
+
+        placeholders = ', '.join(['%s'] * len(table_names))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE "
+                "FROM information_schema.COLUMNS "
+                "WHERE table_schema = DATABASE() "
+                f"AND table_name IN ({placeholders}) "
+                "ORDER BY TABLE_NAME, ORDINAL_POSITION",
+                table_names
+            )
+            for table_name, col_name, col_type in cursor.fetchall():
+                if table_name in columns_by_table:
+                    columns_by_table[table_name].append((col_name, col_type.lower()))
+
+        return columns_by_table
+
+    def get(self, table_name):
+        """
+        활성 DataSource 스키마 조회
+
+        Returns:
+            DataSourceSchema 또는 None (등록되지 않았거나 비활성)
+        """
+        with self._lock:
+            if self._is_stale():
+                self.misses += 1
+                self._load()
+            else:
+                self.hits += 1
+            return self._schemas.get(table_name)
+
+    def warm(self):
+        """스키마 강제 적재 (워커 기동 시 호출)"""
+        with self._lock:
+            self._load()
+
+    def invalidate(self, broadcast=True):
+        """
+        캐시 무효화
+
+        Args:
+            broadcast: True면 generations 스탬프를 갱신하여 다른 프로세스에도 전파
+        """
+        with self._lock:
+            self._schemas = None
+            if broadcast:
+                generations.bump(GENERATION_NAME)
+
+    def stats(self):
+        """hit/miss 카운터 반환"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'data_sources': len(self._schemas) if self._schemas is not None else 0,
+            }
+
+
+schema_registry = SchemaRegistry()
+
+
+def warm_schema_registry():
+    """
+    워커 기동 시 스키마 레지스트리 예열
+
+    DB가 아직 준비되지 않았거나 테이블이 없어도 기동은 계속되어야 하므로
+    오류는 로그만 남깁니다 (첫 요청에서 다시 적재).
+    """
+    try:
+        schema_registry.warm()
+    except Exception as e:
+        logger.warning(f"스키마 레지스트리 예열 실패 (첫 조회 시 재시도): {str(e)}")
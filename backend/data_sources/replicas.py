@@ -0,0 +1,304 @@
+"""
+분석 조회용 읽기 복제본(replica) 라우팅
+
+리포트 조회가 관리자 저장, 템플릿 저장, load_fcc_data 대량 INSERT와 같은 MySQL 인스턴스에서 경쟁하지 않도록
+데이터 조회(원본/롤업/샘플/스케치 SELECT, EXPLAIN)를 DATABASES['analytics'] 복제본으로 보냅니다.
+
+1. 복제본 목록
+   - DATABASES의 'analytics', 'analytics_2', ... (settings의 MYSQL_REPLICA_HOSTS로 생성)
+   - 복제본이 없으면 모든 조회를 default(primary)에서 실행
+
+2. 상태 확인 (프로세스별, 복제본마다 DATA_QUERY_REPLICA_CHECK_INTERVAL초에 1회)
+   - MySQL: SHOW REPLICA STATUS의 Seconds_Behind_Source (복제 중단이면 NULL → 제외)
+     (조회 계정에 REPLICATION CLIENT 권한 필요 - docker/mysql/init.sql)
+   - 지연이 DATA_QUERY_REPLICA_MAX_LAG초를 넘거나 연결에 실패한 복제본은 다음 확인 때까지 제외
+   - 복제 설정이 없는 DB(로컬 테스트용 사본, SQLite)는 지연 0으로 간주
+
+3. 지연 인지 (테이블별)
+   - 테이블의 마지막 쓰기 시각 = 데이터 버전(bump_data_version) / 스키마 레지스트리 세대 중 최근 값
+     (load_fcc_data 적재, 롤업/샘플/스케치 빌드 후 갱신)
+   - 복제본이 그 쓰기를 반영했다고 볼 수 없으면(확인 시각 - 지연 < 쓰기 시각) primary에서 실행
+     → 적재 직후 조회가 복제본의 이전 데이터를 새 데이터 버전의 캐시 키로 저장하지 않음
+
+4. 순환 (round-robin)
+   - 조건을 만족하는 복제본을 차례로 사용, 모두 제외되면 primary로 실행 (fallback 사유별 집계)
+   - 연결 시점에 실패한 복제본은 즉시 제외 표시 후 같은 조회를 primary에서 실행
+
+ORM 모델(DataSource, Rollup 등 메타데이터)은 AnalyticsRouter가 항상 default로 보냅니다
+(관리자 저장 직후 조회가 지연된 메타데이터를 읽지 않도록).
+"""
+
+import logging
+import threading
+import time
+from itertools import count
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from . import generations
+from .cache import data_version
+from .registry import GENERATION_NAME
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_ALIAS = 'analytics'
+
+# Seconds_Behind_Source는 초 단위 정수이므로 1초 여유를 두고 반영 여부 판단
+LAG_MARGIN = 1.0
+
+# 복제본 지연 컬럼 (MySQL 8.0.22+ / 이전 버전)
+LAG_COLUMNS = ('Seconds_Behind_Source', 'Seconds_Behind_Master')
+
+FALLBACK_REASONS = ('down', 'lagging', 'stale')
+
+
+def replica_aliases():
+    """분석 조회용 복제본 DB 별칭 ('analytics', 'analytics_2', ...)"""
+    return [
+        alias for alias in settings.DATABASES
+        if alias == ANALYTICS_ALIAS or alias.startswith(f'{ANALYTICS_ALIAS}_')
+    ]
+
+
+def routing_enabled():
+    return getattr(settings, 'DATA_QUERY_REPLICA_ROUTING', True) and bool(replica_aliases())
+
+
+def max_lag():
+    """복제본 최대 허용 지연 (초)"""
+    return getattr(settings, 'DATA_QUERY_REPLICA_MAX_LAG', 30)
+
+
+def check_interval():
+    """복제본 상태 확인 주기 (초)"""
+    return getattr(settings, 'DATA_QUERY_REPLICA_CHECK_INTERVAL', 5)
+
+
+def last_write(table_name):
+    """
+    테이블의 마지막 쓰기 시각 (epoch 초, 기록이 없으면 0)
+
+    데이터 버전과 스키마 레지스트리 세대는 모두 generations 스탬프(time_ns)입니다.
+    """
+    stamp = max(data_version(table_name), generations.current(GENERATION_NAME))
+    return stamp / 1e9
+
+
+def probe_lag(alias):
+    """
+    복제본 지연 확인
+
+    Returns:
+        지연 초 (복제 설정이 없으면 0)
+
+    Raises:
+        연결 실패 등 DB 오류, ValueError: 복제가 중단됨 (지연 NULL)
+    """
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        if connection.vendor != 'mysql':
+            cursor.execute('SELECT 1')
+            return 0.0
+
+        try:
+            cursor.execute('SHOW REPLICA STATUS')
+        except Exception:
+            # MySQL 8.0.22 이전
+            cursor.execute('SHOW SLAVE STATUS')
+        columns = [column[0] for column in cursor.description or ()]
+        row = cursor.fetchone()
+
+    if row is None:
+        return 0.0
+
+    status = dict(zip(columns, row))
+    for column in LAG_COLUMNS:
+        if column in status:
+            if status[column] is None:
+                raise ValueError('복제가 중단되었습니다 (SQL/IO 스레드 정지).')
+            return float(status[column])
+    return 0.0
+
+
+class _ReplicaState:
+    """복제본 1개의 최근 상태 (프로세스별)"""
+
+    __slots__ = ('healthy', 'lag', 'checked_at', 'probing', 'error', 'routed')
+
+    def __init__(self):
+        self.healthy = False
+        self.lag = None
+        self.checked_at = None
+        self.probing = False
+        self.error = None
+        self.routed = 0
+
+
+class ReplicaRouter:
+    """
+    조회별 실행 DB 선택 (지연 인지 + 상태 기반 순환)
+
+    Attributes:
+        primary_reads: primary에서 실행한 조회 수 (복제본 미설정 포함)
+        fallbacks: 복제본 대신 primary로 실행한 사유별 횟수
+            (down: 사용 가능한 복제본 없음, lagging: 최대 지연 초과, stale: 최근 쓰기 미반영)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+        self._turn = count()
+        self.primary_reads = 0
+        self.fallbacks = dict.fromkeys(FALLBACK_REASONS, 0)
+
+    def _state(self, alias):
+        state = self._states.get(alias)
+        if state is None:
+            state = self._states[alias] = _ReplicaState()
+        return state
+
+    def _refresh(self, alias):
+        """확인 주기가 지났으면 상태 확인 (같은 복제본은 한 스레드만 확인, 나머지는 직전 상태 사용)"""
+        with self._lock:
+            state = self._state(alias)
+            if state.probing or (
+                state.checked_at is not None and time.time() - state.checked_at < check_interval()
+            ):
+                return state
+            state.probing = True
+
+        now = time.time()
+        try:
+            lag = probe_lag(alias)
+            error = None if lag <= max_lag() else f'복제 지연 {lag:.0f}초 > 최대 {max_lag()}초'
+        except Exception as e:
+            lag = None
+            error = str(e)
+            connections[alias].close()
+
+        with self._lock:
+            if error is not None and state.error != error:
+                logger.warning(f"복제본 제외: {alias} - {error}")
+            elif error is None and state.error is not None:
+                logger.info(f"복제본 복구: {alias} (지연 {lag:.0f}초)")
+            state.healthy = error is None
+            state.lag = lag
+            state.checked_at = now
+            state.probing = False
+            state.error = error
+        return state
+
+    def read_alias(self, table_name):
+        """
+        데이터 조회를 실행할 DB 별칭
+
+        Returns:
+            복제본 별칭 또는 default (복제본이 없거나 모두 제외된 경우)
+        """
+        if not routing_enabled():
+            with self._lock:
+                self.primary_reads += 1
+            return DEFAULT_DB_ALIAS
+
+        aliases = replica_aliases()
+        start = next(self._turn)
+        written_at = last_write(table_name)
+        reason = 'down'
+
+        for offset in range(len(aliases)):
+            alias = aliases[(start + offset) % len(aliases)]
+            state = self._refresh(alias)
+            with self._lock:
+                healthy, lag, checked_at = state.healthy, state.lag, state.checked_at
+            if not healthy:
+                if lag is not None and reason == 'down':
+                    reason = 'lagging'
+                continue
+            # 확인 시점 기준으로 복제본이 반영한 시각 이전의 쓰기만 읽을 수 있음
+            if written_at > checked_at - lag - LAG_MARGIN:
+                reason = 'stale'
+                continue
+            with self._lock:
+                state.routed += 1
+            return alias
+
+        with self._lock:
+            self.primary_reads += 1
+            self.fallbacks[reason] += 1
+        logger.debug(f"복제본 대신 primary에서 조회 ({reason}): {table_name}")
+        return DEFAULT_DB_ALIAS
+
+    def mark_down(self, alias, error):
+        """조회 중 연결 실패한 복제본을 다음 확인 주기까지 제외"""
+        with self._lock:
+            state = self._state(alias)
+            state.healthy = False
+            state.lag = None
+            state.checked_at = time.time()
+            state.error = str(error)
+            self.primary_reads += 1
+            self.fallbacks['down'] += 1
+        logger.warning(f"복제본 연결 실패, primary로 조회: {alias} - {str(error)}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': routing_enabled(),
+                'max_lag': max_lag(),
+                'primary_reads': self.primary_reads,
+                'fallbacks': dict(self.fallbacks),
+                'replicas': {
+                    alias: {
+                        'healthy': state.healthy,
+                        'lag': state.lag,
+                        'checked_ago': round(time.time() - state.checked_at, 1)
+                        if state.checked_at is not None else None,
+                        'error': state.error,
+                        'routed': state.routed,
+                    }
+                    for alias, state in ((alias, self._state(alias)) for alias in replica_aliases())
+                },
+            }
+
+
+replica_router = ReplicaRouter()
+
+
+def read_connection(using):
+    """
+    using 별칭의 연결 (복제본 연결 실패 시 제외 표시 후 primary 연결)
+
+    Django 연결은 첫 커서 생성 시 접속하므로 여기서 미리 접속하여 실패를 확인합니다.
+    """
+    connection = connections[using]
+    if using == DEFAULT_DB_ALIAS:
+        return connection
+    try:
+        connection.ensure_connection()
+    except Exception as e:
+        connection.close()
+        replica_router.mark_down(using, e)
+        return connections[DEFAULT_DB_ALIAS]
+    return connection
+
+
+class AnalyticsRouter:
+    """
+    DATABASE_ROUTERS용 라우터
+
+    - ORM 읽기/쓰기: default (메타데이터는 primary 기준)
+    - 마이그레이션: 복제본 별칭에서는 실행하지 않음 (스키마는 복제로 반영)
+    데이터 조회 SQL의 복제본 선택은 replica_router.read_alias()가 담당합니다.
+    """
+
+    def db_for_read(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,92 @@
+"""
+조회 결과 표현 및 응답 형식 변환
+
+내부 결과는 컬럼 단위(struct-of-arrays)로 보관합니다.
+
+    {'columns': [컬럼명...], 'values': [[컬럼1 값...], [컬럼2 값...]], 'count': N, ...}
+
+- 커서 튜플을 행마다 딕셔너리로 만들지 않고 컬럼별로 한 번에 변환 (materialize 모듈)
+- 캐시/병합(fusion)도 이 형태를 그대로 사용하고, 응답 직전에 요청한 형식으로 변환
+
+응답 형식 (요청 본문의 format):
+- rows (기본): {"data": [{"col": 값, ...}, ...]}
+- columnar: {"columns": [...], "data": {"col": [값, ...]}} - 행마다 컬럼명이 반복되지 않음
+"""
+
+from .materialize import materialize, row_builder, sniff
+
+RESULT_FORMATS = ['rows', 'columnar']
+
+
+def build_result(rows, result_columns, converters=None):
+    """
+    커서 결과(튜플 목록) → 컬럼 단위 결과
+
+    Args:
+        rows: 커서 행 튜플 목록
+        result_columns: 결과 컬럼명 목록
+        converters: materialize.compile_converters(cursor.description) 결과
+                    (None이면 값으로 타입 판단)
+
+    Returns:
+        {'columns': [...], 'values': [[...], ...], 'count': N}
+    """
+    if converters is None:
+        converters = [sniff] * len(result_columns)
+
+    return {
+        'columns': list(result_columns),
+        'values': materialize(rows, converters),
+        'count': len(rows),
+    }
+
+
+def select_columns(result, columns, limit=None):
+    """
+    결과에서 일부 컬럼만 선택
+
+    Args:
+        result: 컬럼 단위 결과
+        columns: [(출력 컬럼명, 원본 컬럼명), ...]
+        limit: 최대 행 수
+
+    Returns:
+        컬럼 단위 결과 (values는 새 리스트)
+    """
+    index = {col: idx for idx, col in enumerate(result['columns'])}
+    values = [result['values'][index[source]][:limit] for _, source in columns]
+
+    return {
+        'columns': [alias for alias, _ in columns],
+        'values': values,
+        'count': min(result['count'], limit) if limit is not None else result['count'],
+    }
+
+
+def iter_rows(body):
+    """컬럼 단위 결과의 행 튜플 순회"""
+    return zip(*body['values'])
+
+
+def render_body(body, result_format='rows'):
+    """
+    내부 결과 → 응답 본문
+
+    Args:
+        body: 컬럼 단위 결과 ({'columns', 'values', 'count', 'table_name', 'source_table'})
+        result_format: RESULT_FORMATS 중 하나
+    """
+    columns = body['columns']
+    meta = {key: value for key, value in body.items() if key not in ('columns', 'values')}
+
+    if result_format == 'columnar':
+        return {
+            'columns': columns,
+            'data': dict(zip(columns, body['values'])),
+            **meta,
+        }
+
+    return {
+        'data': row_builder(tuple(columns))(body['values']),
+        **meta,
+    }
@@ -0,0 +1,373 @@
+"""
+사전 집계(rollup) 테이블 관리 및 쿼리 라우팅
+
+1. 빌드 (build_rollup / refresh_rollups)
+   - 원본 테이블을 bucket(일/월) + 차원 컬럼별로 집계하여 롤업 테이블에 저장
+   - 측정 컬럼마다 {col}__sum, {col}__count, {col}__min, {col}__max 저장
+   - 전체 빌드: 새 테이블 생성 후 RENAME TABLE로 원자적 교체
+   - 증분 빌드: since 이후 bucket만 삭제 후 다시 집계
+
+2. 라우팅 (route_query)
+   - 집계 조회 중 롤업으로 정확히 계산 가능한 요청을 롤업 테이블 조회로 재작성
+   - AVG = SUM(sum) / SUM(count) 로 재계산하므로 결과가 원본 집계와 같음
+"""
+
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .filters import filter_clauses, filter_columns, filter_params
+from .registry import schema_registry
+from .topn import helper_aggregations, wrap_query
+
+logger = logging.getLogger(__name__)
+
+# 롤업 bucket 표현식 (원본 날짜 컬럼 기준)
+# 리터럴 %는 %%로 작성하고 실행 시 항상 params를 전달합니다 (query.PERIOD_EXPRESSIONS와 동일)
+BUCKET_EXPRESSIONS = {
+    'day': "DATE(`{col}`)",
+    'month': "DATE(DATE_FORMAT(`{col}`, '%%Y-%%m-01'))",
+}
+
+# group_by_period별 bucket 재그룹화 표현식 (원본 쿼리와 같은 값을 만듦)
+PERIOD_EXPRESSIONS = {
+    'day': "`bucket`",
+    'week': "YEARWEEK(`bucket`)",
+    'month': "DATE_FORMAT(`bucket`, '%%Y-%%m')",
+    'year': "YEAR(`bucket`)",
+}
+
+# 롤업 컬럼으로 원본 집계 함수를 재계산하는 표현식
+AGGREGATE_EXPRESSIONS = {
+    'AVG': "SUM(`{col}__sum`) / NULLIF(SUM(`{col}__count`), 0)",
+    'SUM': "SUM(`{col}__sum`)",
+    'COUNT': "CAST(SUM(`{col}__count`) AS SIGNED)",
+    'MIN': "MIN(`{col}__min`)",
+    'MAX': "MAX(`{col}__max`)",
+}
+
+
+def routing_enabled():
+    return getattr(settings, 'DATA_QUERY_ROLLUP_ROUTING', True)
+
+
+# ==================== 빌드 ====================
+
+def _select_sql(rollup, source_table, where=''):
+    """원본 테이블 → 롤업 행 집계 SELECT 문"""
+    bucket = BUCKET_EXPRESSIONS[rollup.grain].format(col=rollup.date_column)
+
+    select_parts = [f"{bucket} AS `bucket`"]
+    select_parts.extend(f"`{dim}`" for dim in rollup.dimensions)
+    for measure in rollup.measures:
+        select_parts.extend([
+            f"SUM(`{measure}`) AS `{measure}__sum`",
+            f"COUNT(`{measure}`) AS `{measure}__count`",
+            f"MIN(`{measure}`) AS `{measure}__min`",
+            f"MAX(`{measure}`) AS `{measure}__max`",
+        ])
+
+    group_by_parts = [bucket] + [f"`{dim}`" for dim in rollup.dimensions]
+
+    return (
+        f"SELECT {', '.join(select_parts)} FROM `{source_table}`"
+        f"{where} GROUP BY {', '.join(group_by_parts)}"
+    )
+
+
+def _table_exists(cursor, table_name):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() "
+        "AND table_name = %s",
+        [table_name]
+    )
+    return cursor.fetchone() is not None
+
+
+def _validate_rollup(rollup):
+    """롤업 정의의 컬럼이 원본 테이블에 있는지 확인"""
+    rollup.full_clean(exclude=['data_source'])
+
+    schema = schema_registry.get(rollup.data_source.table_name)
+    if schema is None:
+        raise ValueError(
+            f"테이블 '{rollup.data_source.table_name}'이(가) 등록되지 않았거나 비활성 상태입니다."
+        )
+
+    invalid_columns = schema.invalid_columns(
+        [rollup.date_column, *rollup.dimensions, *rollup.measures]
+    )
+    if invalid_columns:
+        raise ValueError(f"유효하지 않은 컬럼: {invalid_columns}")
+
+
+def build_rollup(rollup, since=None):
+    """
+    롤업 테이블 빌드
+
+    Args:
+        rollup: Rollup 인스턴스
+        since: date - 지정 시 해당 날짜가 속한 bucket부터 증분 빌드,
+               None이거나 롤업 테이블이 없으면 전체 빌드
+
+    Returns:
+        롤업 테이블 행 수
+    """
+    _validate_rollup(rollup)
+
+    source_table = rollup.data_source.table_name
+    table_name = rollup.table_name
+
+    with connection.cursor() as cursor:
+        if since is not None and _table_exists(cursor, table_name):
+            # 증분 빌드: since가 속한 bucket부터 다시 집계
+            if rollup.grain == 'month':
+                since = since.replace(day=1)
+
+            with transaction.atomic():
+                cursor.execute(
+                    f"DELETE FROM `{table_name}` WHERE `bucket` >= %s",
+                    [since]
+                )
+                cursor.execute(
+                    f"INSERT INTO `{table_name}` "
+                    + _select_sql(rollup, source_table, f" WHERE `{rollup.date_column}` >= %s"),
+                    [since]
+                )
+            mode = f'증분 ({since} 이후)'
+        else:
+            # 전체 빌드: 새 테이블 생성 후 원자적 교체
+            build_table = f"{table_name}__build"
+            old_table = f"{table_name}__old"
+
+            cursor.execute(f"DROP TABLE IF EXISTS `{build_table}`")
+            cursor.execute(
+                f"CREATE TABLE `{build_table}` AS " + _select_sql(rollup, source_table),
+                []
+            )
+            index_columns = ', '.join(
+                ['`bucket`'] + [f"`{dim}`" for dim in rollup.dimensions]
+            )
+            cursor.execute(
+                f"ALTER TABLE `{build_table}` ADD INDEX `idx_bucket_dims` ({index_columns})"
+            )
+
+            if _table_exists(cursor, table_name):
+                cursor.execute(
+                    f"RENAME TABLE `{table_name}` TO `{old_table}`, "
+                    f"`{build_table}` TO `{table_name}`"
+                )
+                cursor.execute(f"DROP TABLE IF EXISTS `{old_table}`")
+            else:
+                cursor.execute(f"RENAME TABLE `{build_table}` TO `{table_name}`")
+            mode = '전체'
+
+        cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
+        row_count = cursor.fetchone()[0]
+
+    # last_built_at 저장 → 시그널로 스키마 레지스트리 무효화 (라우팅 대상 갱신)
+    rollup.last_built_at = timezone.now()
+    rollup.save(update_fields=['last_built_at', 'updated_at'])
+
+    logger.info(f"롤업 빌드 완료: {table_name} ({mode}) - {row_count}행")
+    return row_count
+
+
+def refresh_rollups(table_name, since=None):
+    """
+    DataSource 테이블의 활성 롤업 전체 갱신 (load_fcc_data 이후 호출)
+
+    Args:
+        table_name: 원본 테이블명
+        since: date - 증분 빌드 시작 날짜 (None이면 전체 빌드)
+
+    Returns:
+        {롤업 테이블명: 행 수}
+    """
+    from .models import Rollup
+
+    results = {}
+    rollups = Rollup.objects.filter(
+        data_source__table_name=table_name,
+        is_active=True,
+    ).select_related('data_source')
+
+    for rollup in rollups:
+        results[rollup.table_name] = build_rollup(rollup, since=since)
+
+    return results
+
+
+# ==================== 라우팅 ====================
+
+def _is_month_aligned(spec):
+    """날짜 필터가 월 경계와 일치하는지 (월 롤업 사용 가능 여부)"""
+    start_date = spec.get('start_date')
+    end_date = spec.get('end_date')
+
+    if start_date and start_date.day != 1:
+        return False
+    if end_date and (end_date + timedelta(days=1)).day != 1:
+        return False
+    return True
+
+
+def find_rollup(schema, spec):
+    """
+    조회 요청을 정확히 계산할 수 있는 롤업 선택
+
+    조건:
+    - 집계 조회이며 date_column이 롤업의 날짜 컬럼과 같음
+    - GROUP BY 컬럼과 필터 컬럼이 롤업 차원의 부분집합 (남는 차원은 재집계)
+    - 집계 컬럼이 모두 롤업 측정 컬럼
+    - 월 롤업은 group_by_period가 month/year이고 날짜 필터가 월 경계일 때만
+
+    여러 개가 가능하면 월 롤업 → 차원이 적은 롤업 순으로 선택합니다.
+
+    Returns:
+        RollupSpec 또는 None
+    """
+    aggregations = spec.get('aggregations', [])
+    if not aggregations or not schema.rollups:
+        return None
+
+    columns = set(spec.get('columns', [])) | filter_columns(spec)
+    measures = {agg['column'] for agg in aggregations}
+    date_column = spec.get('date_column', 'date')
+    group_by_period = spec.get('group_by_period')
+
+    candidates = []
+    for rollup in schema.rollups:
+        if rollup.date_column != date_column:
+            continue
+        if not columns <= rollup.dimensions or not measures <= rollup.measures:
+            continue
+        if rollup.grain == 'month' and (
+            group_by_period not in ('month', 'year') or not _is_month_aligned(spec)
+        ):
+            continue
+        candidates.append(rollup)
+
+    if not candidates:
+        return None
+
+    return min(
+        candidates,
+        key=lambda rollup: (rollup.grain != 'month', len(rollup.dimensions))
+    )
+
+
+def build_rollup_query(spec, rollup):
+    """
+    롤업 테이블 대상 SQL 생성
+
+    결과 컬럼명/값 형식은 원본 테이블 쿼리(build_query)와 같습니다.
+    top_n 조회는 롤업 재집계 결과를 상위 N개 + "기타" 순위 SQL로 감쌉니다 (topn 모듈).
+
+    Returns:
+        (query, params, result_columns)
+    """
+    columns = spec.get('columns', [])
+    start_date = spec.get('start_date')
+    end_date = spec.get('end_date')
+    date_column = spec.get('date_column', 'date')
+    limit = spec.get('limit', 1000)
+    group_by_period = spec.get('group_by_period')
+    aggregations = spec['aggregations']
+    top_n = bool(spec.get('top_n'))
+    if top_n:
+        aggregations = aggregations + helper_aggregations(spec)
+
+    select_parts = []
+    group_by_parts = []
+    result_columns = []
+
+    if group_by_period:
+        period_expr = PERIOD_EXPRESSIONS[group_by_period]
+        date_alias = f"{date_column}_{group_by_period}"
+        select_parts.append(f"{period_expr} as {date_alias}")
+        group_by_parts.append(period_expr)
+        result_columns.append(date_alias)
+
+    for col in columns:
+        select_parts.append(f"`{col}`")
+        group_by_parts.append(f"`{col}`")
+        result_columns.append(col)
+
+    for agg in aggregations:
+        col = agg['column']
+        func = agg['function']
+        alias = agg.get('alias', f"{func.lower()}_{col}")
+        select_parts.append(f"{AGGREGATE_EXPRESSIONS[func].format(col=col)} as {alias}")
+        result_columns.append(alias)
+
+    query = f"SELECT {', '.join(select_parts)} FROM `{rollup.table_name}`"
+    params = []
+
+    where_clauses = []
+    if start_date:
+        where_clauses.append("`bucket` >= %s")
+        params.append(start_date)
+    if end_date:
+        where_clauses.append("`bucket` <= %s")
+        params.append(end_date)
+    # 차원 필터 (필터 컬럼은 모두 롤업 차원)
+    where_clauses.extend(filter_clauses(spec))
+    params.extend(filter_params(spec))
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    if group_by_parts:
+        query += " GROUP BY " + ", ".join(group_by_parts)
+
+    if top_n:
+        query, result_columns = wrap_query(spec, query)
+        return query, [int(spec['top_n']), *params, int(spec['top_n'])], result_columns
+
+    if group_by_period:
+        query += f" ORDER BY {date_alias} ASC"
+
+    query += f" LIMIT {int(limit)}"
+
+    return query, params, result_columns
+
+
+def route_query(spec, schema):
+    """
+    조회 요청 라우팅
+
+    Args:
+        spec: 검증된 조회 요청
+        schema: DataSourceSchema (롤업 목록 포함)
+
+    Returns:
+        (query, params, result_columns, source_table) - 적합한 롤업이 있을 때
+        None - 원본 테이블 조회 필요
+    """
+    if not routing_enabled() or schema is None:
+        return None
+
+    rollup = find_rollup(schema, spec)
+    if rollup is None:
+        return None
+
+    query, params, result_columns = build_rollup_query(spec, rollup)
+    return query, params, result_columns, rollup.table_name
+
+
+def earliest_date(values):
+    """증분 빌드 시작 날짜 계산 (datetime/date/문자열 혼합 허용)"""
+    dates = []
+    for value in values:
+        if value is None:
+            continue
+        if hasattr(value, 'date') and callable(value.date):
+            value = value.date()
+        elif isinstance(value, str):
+            value = date.fromisoformat(value[:10])
+        dates.append(value)
+    return min(dates) if dates else None
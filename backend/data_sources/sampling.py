@@ -0,0 +1,393 @@
+"""
+근사 집계 (accuracy="approximate") - 샘플 테이블 관리 및 추정
+
+수억 행 테이블에서 한 달치 AVG/COUNT도 수 초가 걸리는 경우,
+원본의 일부 행만 복사한 샘플 테이블을 집계하고 결과를 비율로 보정합니다.
+
+1. 빌드 (build_sample / refresh_samples)
+   - 키 컬럼 해시로 결정적 선택: MOD(CRC32(id), 10000) < rate * 10000
+     → 같은 행은 항상 같은 결정 (증분 갱신해도 샘플이 흔들리지 않음)
+   - 전체 빌드: 새 테이블 생성 후 RENAME TABLE로 원자적 교체
+   - 증분 빌드: since 이후 날짜만 삭제 후 다시 선택 (rollups와 동일, 컬럼 목록 명시)
+     원본 컬럼이 바뀌었으면 전체 빌드
+
+2. 추정 (build_sample_query / estimate_result)
+   - 각 행이 확률 p(=rate)로 독립 선택된 표본(Bernoulli 샘플링)으로 보고 추정
+   - COUNT: n / p,  표준오차 sqrt(n (1 - p)) / p
+   - SUM:   Σx / p, 표준오차 sqrt((1 - p) Σx²) / p
+   - AVG:   Σx / n, 표준오차 sqrt((1 - p) 분산 / n)
+   - 값마다 95% 신뢰구간 {alias}_lower, {alias}_upper 컬럼을 함께 반환
+   - 그룹 중 샘플 행이 DATA_QUERY_SAMPLE_MIN_ROWS 미만이면 추정하지 않고 거부
+     (결과 그룹이 없으면 빈 결과, 그룹화 없는 집계의 COUNT는 0 - 구간 [0, 0])
+   - MIN/MAX는 샘플로 오차 범위를 줄 수 없으므로 지원하지 않음
+"""
+
+import logging
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .compiler import bucket_column_name, period_expression
+from .filters import filter_clauses, filter_params
+from .registry import schema_registry
+from .rollups import _table_exists
+
+logger = logging.getLogger(__name__)
+
+# 해시 구간 수 (rate 해상도 0.01%)
+HASH_BUCKETS = 10000
+
+# 95% 신뢰구간
+CONFIDENCE = 0.95
+Z_SCORE = 1.96
+
+APPROXIMATE_FUNCTIONS = {'AVG', 'SUM', 'COUNT'}
+
+# 샘플 집계 컬럼 접미사 (결과 컬럼명과 충돌하지 않도록 __ 사용)
+SAMPLE_ROWS_COLUMN = '__sample_rows'
+
+
+def min_sample_rows():
+    return getattr(settings, 'DATA_QUERY_SAMPLE_MIN_ROWS', 100)
+
+
+class SampleTooSmall(Exception):
+    """추정에 쓰기에는 샘플 행이 너무 적음"""
+
+    def __init__(self, message, smallest):
+        super().__init__(message)
+        self.smallest = smallest
+
+
+# ==================== 빌드 ====================
+
+def _hash_predicate(sample):
+    threshold = max(int(round(sample.rate * HASH_BUCKETS)), 1)
+    return f"MOD(CRC32(`{sample.key_column}`), {HASH_BUCKETS}) < {threshold}"
+
+
+def _table_columns(cursor, table_name):
+    """테이블 컬럼명 (정의 순서)"""
+    cursor.execute(
+        "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+        "ORDER BY ORDINAL_POSITION",
+        [table_name]
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _validate_sample(sample):
+    """샘플 정의의 컬럼이 원본 테이블에 있는지 확인"""
+    sample.full_clean(exclude=['data_source'])
+
+    schema = schema_registry.get(sample.data_source.table_name)
+    if schema is None:
+        raise ValueError(
+            f"테이블 '{sample.data_source.table_name}'이(가) 등록되지 않았거나 비활성 상태입니다."
+        )
+
+    invalid_columns = schema.invalid_columns([sample.date_column, sample.key_column])
+    if invalid_columns:
+        raise ValueError(f"유효하지 않은 컬럼: {invalid_columns}")
+
+
+def build_sample(sample, since=None):
+    """
+    샘플 테이블 빌드
+
+    Args:
+        sample: SampleTable 인스턴스
+        since: date - 지정 시 해당 날짜 이후 행만 다시 선택 (증분),
+               None이거나 샘플 테이블이 없으면 전체 빌드
+
+    Returns:
+        샘플 테이블 행 수
+    """
+    _validate_sample(sample)
+
+    source_table = sample.data_source.table_name
+    table_name = sample.table_name
+    predicate = _hash_predicate(sample)
+
+    with connection.cursor() as cursor:
+        columns = None
+        if since is not None and _table_exists(cursor, table_name):
+            columns = _table_columns(cursor, table_name)
+            # 원본에 컬럼이 추가/삭제되었으면 샘플도 같은 컬럼을 갖도록 전체 빌드
+            if set(columns) != set(_table_columns(cursor, source_table)):
+                logger.info(f"원본 컬럼 변경으로 샘플 전체 빌드: {table_name}")
+                columns = None
+
+        if columns is not None:
+            column_list = ', '.join(f"`{col}`" for col in columns)
+            with transaction.atomic():
+                cursor.execute(
+                    f"DELETE FROM `{table_name}` WHERE `{sample.date_column}` >= %s",
+                    [since]
+                )
+                cursor.execute(
+                    f"INSERT INTO `{table_name}` ({column_list}) "
+                    f"SELECT {column_list} FROM `{source_table}` "
+                    f"WHERE `{sample.date_column}` >= %s AND {predicate}",
+                    [since]
+                )
+            mode = f'증분 ({since} 이후)'
+        else:
+            # 전체 빌드: 새 테이블 생성 후 원자적 교체
+            build_table = f"{table_name}__build"
+            old_table = f"{table_name}__old"
+
+            cursor.execute(f"DROP TABLE IF EXISTS `{build_table}`")
+            cursor.execute(
+                f"CREATE TABLE `{build_table}` AS "
+                f"SELECT * FROM `{source_table}` WHERE {predicate}",
+                []
+            )
+            cursor.execute(
+                f"ALTER TABLE `{build_table}` ADD INDEX `idx_date` (`{sample.date_column}`)"
+            )
+
+            if _table_exists(cursor, table_name):
+                cursor.execute(
+                    f"RENAME TABLE `{table_name}` TO `{old_table}`, "
+                    f"`{build_table}` TO `{table_name}`"
+                )
+                cursor.execute(f"DROP TABLE IF EXISTS `{old_table}`")
+            else:
+                cursor.execute(f"RENAME TABLE `{build_table}` TO `{table_name}`")
+            mode = '전체'
+
+        cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
+        row_count = cursor.fetchone()[0]
+
+    # last_built_at 저장 → 시그널로 스키마 레지스트리 무효화 (근사 조회 대상 갱신)
+    sample.row_count = row_count
+    sample.last_built_at = timezone.now()
+    sample.save(update_fields=['row_count', 'last_built_at', 'updated_at'])
+
+    logger.info(f"샘플 빌드 완료: {table_name} ({mode}) - {row_count}행")
+    return row_count
+
+
+def refresh_samples(table_name, since=None):
+    """
+    DataSource 테이블의 활성 샘플 전체 갱신 (load_fcc_data 이후 호출)
+
+    Returns:
+        {샘플 테이블명: 행 수}
+    """
+    from .models import SampleTable
+
+    results = {}
+    samples = SampleTable.objects.filter(
+        data_source__table_name=table_name,
+        is_active=True,
+    ).select_related('data_source')
+
+    for sample in samples:
+        results[sample.table_name] = build_sample(sample, since=since)
+
+    return results
+
+
+# ==================== 조회 ====================
+
+def find_sample(schema):
+    """가장 큰 비율(가장 정확한)의 빌드된 샘플 (없으면 None)"""
+    if not schema.samples:
+        return None
+    return max(schema.samples, key=lambda sample: sample.rate)
+
+
+def _aggregation_alias(agg):
+    return agg.get('alias', f"{agg['function'].lower()}_{agg['column']}")
+
+
+def build_sample_query(spec, sample):
+    """
+    샘플 테이블 집계 SQL
+
+    결과 보정에 필요한 그룹별 행 수, 측정 컬럼별 COUNT/SUM/제곱합을 조회합니다.
+    샘플 테이블에는 bucket 생성 컬럼 인덱스가 없으므로 날짜 함수 표현식을 사용합니다.
+
+    Returns:
+        (query, params, result_columns)
+    """
+    columns = spec.get('columns', [])
+    date_column = spec.get('date_column', 'date')
+    group_by_period = spec.get('group_by_period')
+    limit = spec.get('limit', 1000)
+
+    select_parts = []
+    result_columns = []
+    group_by_parts = []
+
+    if group_by_period:
+        period_expr = period_expression(date_column, group_by_period)
+        date_alias = bucket_column_name(date_column, group_by_period)
+        select_parts.append(f"{period_expr} as {date_alias}")
+        result_columns.append(date_alias)
+        group_by_parts.append(period_expr)
+
+    for col in columns:
+        select_parts.append(f"`{col}`")
+        result_columns.append(col)
+        group_by_parts.append(f"`{col}`")
+
+    select_parts.append(f"COUNT(*) as `{SAMPLE_ROWS_COLUMN}`")
+    result_columns.append(SAMPLE_ROWS_COLUMN)
+
+    for agg in spec.get('aggregations', []):
+        col = agg['column']
+        alias = _aggregation_alias(agg)
+        select_parts.append(f"COUNT(`{col}`) as `{alias}__n`")
+        result_columns.append(f"{alias}__n")
+        if agg['function'] != 'COUNT':
+            select_parts.append(f"SUM(`{col}`) as `{alias}__s`")
+            select_parts.append(f"SUM(`{col}` * `{col}`) as `{alias}__ss`")
+            result_columns.extend([f"{alias}__s", f"{alias}__ss"])
+
+    query = f"SELECT {', '.join(select_parts)} FROM `{sample.table_name}`"
+
+    where_clauses = []
+    params = []
+    if spec.get('start_date'):
+        where_clauses.append(f"`{date_column}` >= %s")
+        params.append(spec['start_date'])
+    if spec.get('end_date'):
+        where_clauses.append(f"`{date_column}` < %s")
+        params.append(spec['end_date'] + timedelta(days=1))
+    # 차원 필터 (샘플 테이블은 원본과 같은 컬럼)
+    where_clauses.extend(filter_clauses(spec))
+    params.extend(filter_params(spec))
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    if group_by_parts:
+        query += " GROUP BY " + ", ".join(group_by_parts)
+    if group_by_period:
+        query += f" ORDER BY {group_by_parts[0]} ASC"
+
+    query += " LIMIT %s"
+    params.append(int(limit))
+
+    return query, params, result_columns
+
+
+def _estimate(function, n, total, squares, rate):
+    """(추정값, 표준오차)"""
+    if function == 'COUNT':
+        return n / rate, math.sqrt(n * (1 - rate)) / rate
+    if n == 0 or total is None:
+        return None, None
+
+    total, squares = float(total), float(squares or 0)
+    if function == 'SUM':
+        return total / rate, math.sqrt((1 - rate) * squares) / rate
+
+    mean = total / n
+    variance = max(squares / n - mean * mean, 0.0)
+    return mean, math.sqrt((1 - rate) * variance / n)
+
+
+def estimate_result(result, spec, sample):
+    """
+    샘플 집계 결과 → 보정된 추정값 + 95% 신뢰구간
+
+    Args:
+        result: build_sample_query 결과의 컬럼 단위 결과
+        spec: 조회 요청
+        sample: SampleSpec
+
+    Returns:
+        컬럼 단위 결과 (집계별 alias, alias_lower, alias_upper)
+
+    Raises:
+        SampleTooSmall: 샘플 행이 DATA_QUERY_SAMPLE_MIN_ROWS 미만인 그룹이 있음
+            (결과 행이 없거나 그룹화 없는 집계에 샘플 행이 없으면 검사하지 않음 - 빈 결과 / 0건)
+    """
+    values = dict(zip(result['columns'], result['values']))
+    sample_rows = values[SAMPLE_ROWS_COLUMN]
+
+    # 그룹화 없는 집계는 조건에 맞는 행이 없어도 1행(COUNT 0)을 반환하므로 실제 그룹만 검사
+    smallest = min((rows for rows in sample_rows if rows), default=None)
+    if smallest is not None and smallest < min_sample_rows():
+        raise SampleTooSmall(
+            f"샘플 행이 너무 적어 근사 집계를 할 수 없습니다 "
+            f"(그룹 최소 {smallest}행, 필요 {min_sample_rows()}행). "
+            f"기간/그룹을 넓히거나 accuracy를 exact로 지정하세요.",
+            smallest
+        )
+
+    group_columns = list(spec.get('columns', []))
+    if spec.get('group_by_period'):
+        group_columns.insert(
+            0, bucket_column_name(spec.get('date_column', 'date'), spec['group_by_period'])
+        )
+    columns = list(group_columns)
+    output = [values[col] for col in group_columns]
+
+    for agg in spec.get('aggregations', []):
+        function = agg['function']
+        alias = _aggregation_alias(agg)
+        counts = values[f"{alias}__n"]
+        totals = values.get(f"{alias}__s", [None] * len(counts))
+        squares = values.get(f"{alias}__ss", [None] * len(counts))
+
+        estimates, lowers, uppers = [], [], []
+        for n, total, square in zip(counts, totals, squares):
+            value, error = _estimate(function, n, total, square, sample.rate)
+            if value is None:
+                estimates.append(None)
+                lowers.append(None)
+                uppers.append(None)
+                continue
+            margin = Z_SCORE * error
+            if function == 'COUNT':
+                estimates.append(int(round(value)))
+                lowers.append(max(int(math.floor(value - margin)), n))
+                uppers.append(int(math.ceil(value + margin)))
+            else:
+                estimates.append(value)
+                lowers.append(value - margin)
+                uppers.append(value + margin)
+
+        columns.extend([alias, f"{alias}_lower", f"{alias}_upper"])
+        output.extend([estimates, lowers, uppers])
+
+    return {
+        'columns': columns,
+        'values': output,
+        'count': result['count'],
+        'accuracy': {
+            'mode': 'approximate',
+            'sample_rate': sample.rate,
+            'confidence': CONFIDENCE,
+            'sample_rows': int(sum(sample_rows)),
+        },
+    }
+
+
+def exact_bounds(result, spec):
+    """
+    정확한 결과(롤업 조회)에 근사 결과와 같은 형태의 신뢰구간 컬럼 추가 (구간 = 값)
+    """
+    index = {col: idx for idx, col in enumerate(result['columns'])}
+    columns = list(result['columns'])
+    values = list(result['values'])
+
+    for agg in spec.get('aggregations', []):
+        alias = _aggregation_alias(agg)
+        columns.extend([f"{alias}_lower", f"{alias}_upper"])
+        values.extend([values[index[alias]], values[index[alias]]])
+
+    return {
+        **result,
+        'columns': columns,
+        'values': values,
+        'accuracy': {'mode': 'exact'},
+    }
@@ -6,7 +6,18 @@ DRF Serializers for data_sources app.
 
 import re
 from rest_framework import serializers
+from .downsample import DOWNSAMPLE_METHODS, MIN_POINTS
+from .filters import FILTER_OPS, LIST_OPS, max_values, normalize_filters
+from .gapfill import FILL_METHODS
 from .models import DataSource
+from .pagination import InvalidCursor, decode_cursor
+from .results import RESULT_FORMATS
+from .sampling import APPROXIMATE_FUNCTIONS
+from .sketches import PERCENTILE_FUNCTIONS
+from .topn import DEFAULT_LABEL as TOP_N_DEFAULT_LABEL
+
+# 스트리밍으로만 제공되는 응답 형식
+STREAM_ONLY_FORMATS = ['ndjson', 'arrow']
 
 
 class DataSourceSerializer(serializers.ModelSerializer):
@@ -28,6 +39,9 @@ class DataSourceSerializer(serializers.ModelSerializer):
             'columns_metadata',
             'columns',
             'is_active',
+            'max_examined_rows',
+            'max_execution_ms',
+            'max_concurrent_queries',
             'created_at',
             'updated_at'
         ]
@@ -196,9 +210,9 @@ class AggregationFieldSerializer(serializers.Serializer):
     )
 
     function = serializers.ChoiceField(
-        choices=['AVG', 'SUM', 'COUNT', 'MIN', 'MAX'],
+        choices=['AVG', 'SUM', 'COUNT', 'MIN', 'MAX', *PERCENTILE_FUNCTIONS],
         required=True,
-        help_text="집계 함수 (AVG, SUM, COUNT, MIN, MAX)"
+        help_text="집계 함수 (AVG, SUM, COUNT, MIN, MAX, 백분위 P50, P75, P95, P99)"
     )
 
     alias = serializers.CharField(
@@ -227,6 +241,115 @@ class AggregationFieldSerializer(serializers.Serializer):
         return value
 
 
+class FilterClauseSerializer(serializers.Serializer):
+    """
+    차원 필터 조건 Serializer
+
+    예: {"column": "fcc_group", "op": "in", "values": ["Mobile", "Tablet"]}
+    - eq: value (문자열/숫자)
+    - in, not_in: values (문자열/숫자 배열)
+    - range: min, max (양 끝 포함, 하나 이상)
+    - is_null: value (true: IS NULL, false: IS NOT NULL, 기본 true)
+    """
+
+    # 값 문자열 최대 길이
+    MAX_VALUE_LENGTH = 500
+
+    column = serializers.CharField(
+        max_length=100,
+        required=True,
+        help_text="필터 컬럼명"
+    )
+
+    op = serializers.ChoiceField(
+        choices=FILTER_OPS,
+        required=True,
+        help_text="연산자 (eq, in, not_in, range, is_null)"
+    )
+
+    value = serializers.JSONField(
+        required=False,
+        help_text="eq 비교 값 또는 is_null 여부"
+    )
+
+    values = serializers.ListField(
+        child=serializers.JSONField(),
+        required=False,
+        help_text="in/not_in 값 배열"
+    )
+
+    min = serializers.JSONField(
+        required=False,
+        help_text="range 최솟값 (포함)"
+    )
+
+    max = serializers.JSONField(
+        required=False,
+        help_text="range 최댓값 (포함)"
+    )
+
+    def validate_column(self, value):
+        """컬럼명 검증"""
+        pattern = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+        if not pattern.match(value):
+            raise serializers.ValidationError(
+                f"컬럼명 '{value}'이 유효하지 않습니다."
+            )
+        return value
+
+    def _check_scalar(self, field, value):
+        """비교 값은 문자열/숫자만 허용 (NULL 비교는 is_null 사용)"""
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise serializers.ValidationError(
+                {field: "비교 값은 문자열 또는 숫자여야 합니다 (NULL은 op=is_null 사용)."}
+            )
+        if isinstance(value, str) and len(value) > self.MAX_VALUE_LENGTH:
+            raise serializers.ValidationError(
+                {field: f"비교 값은 최대 {self.MAX_VALUE_LENGTH}자입니다."}
+            )
+
+    def validate(self, attrs):
+        """연산자별 필수 값 검증"""
+        op = attrs['op']
+
+        if op == 'eq':
+            if 'value' not in attrs:
+                raise serializers.ValidationError({'value': "op=eq에는 value가 필요합니다."})
+            self._check_scalar('value', attrs['value'])
+
+        elif op in LIST_OPS:
+            values = attrs.get('values')
+            if not values:
+                raise serializers.ValidationError(
+                    {'values': f"op={op}에는 비어 있지 않은 values 배열이 필요합니다."}
+                )
+            if len(values) > max_values():
+                raise serializers.ValidationError(
+                    {'values': f"values는 최대 {max_values()}개입니다."}
+                )
+            for value in values:
+                self._check_scalar('values', value)
+
+        elif op == 'range':
+            low, high = attrs.get('min'), attrs.get('max')
+            if low is None and high is None:
+                raise serializers.ValidationError("op=range에는 min 또는 max가 필요합니다.")
+            for bound in ('min', 'max'):
+                if attrs.get(bound) is not None:
+                    self._check_scalar(bound, attrs[bound])
+            if (
+                low is not None and high is not None
+                and isinstance(low, str) == isinstance(high, str)
+                and low > high
+            ):
+                raise serializers.ValidationError("range의 min은 max보다 클 수 없습니다.")
+
+        elif 'value' in attrs and not isinstance(attrs['value'], bool):
+            raise serializers.ValidationError({'value': "op=is_null의 value는 true/false입니다."})
+
+        return attrs
+
+
 class DataQuerySerializer(serializers.Serializer):
     """
     데이터 조회 요청 Serializer
@@ -237,8 +360,36 @@ class DataQuerySerializer(serializers.Serializer):
     집계 기능 지원:
     - group_by_period: day/week/month별 집계
     - aggregations: AVG, SUM, COUNT, MIN, MAX 집계 함수
+
+    차원 필터:
+    - filters: [{"column", "op", "value" | "values" | "min"/"max"}] (filters 모듈, 모두 AND)
+
+    응답 형식:
+    - format: rows(기본) 또는 columnar
+    - stream: true 또는 format=ndjson/arrow이면 스트리밍 응답 (최대 건수 상향)
+
+    근사 집계 (대용량 테이블):
+    - accuracy: exact(기본) 또는 approximate (샘플 테이블 집계, 95% 신뢰구간 포함)
+
+    다운샘플링 (라인/영역 차트):
+    - max_points: 계열별 최대 점 수 (초과 시 서버에서 줄여서 응답)
+    - downsample: lttb(기본) 또는 minmax
+
+    빈 구간 채우기 (날짜 그룹 조회, gapfill 모듈):
+    - fill: null, zero, previous → [start_date, end_date]의 모든 bucket을 계열별로 응답
+
+    커서 페이지네이션 (집계 없는 원본 행 조회):
+    - paginate: true → (date_column, id) 순 정렬, 응답에 next_cursor
+    - cursor: 이전 응답의 next_cursor (지정 시 paginate 자동 적용)
+
+    상위 N개 + "기타" (파이/막대 차트, topn 모듈):
+    - top_n: 상위 그룹 수, top_n_by: 순위 기준 집계 별칭 (기본: 첫 번째 집계)
+    - top_n_others: 나머지 그룹을 합친 "기타" 행 포함 여부 (기본 true), top_n_label: "기타" 행 이름
     """
 
+    # 일반 조회 최대 건수 (스트리밍은 settings.DATA_QUERY_STREAM_MAX_ROWS)
+    MAX_LIMIT = 10000
+
     table_name = serializers.CharField(
         max_length=100,
         required=True,
@@ -272,8 +423,7 @@ class DataQuerySerializer(serializers.Serializer):
         required=False,
         default=1000,
         min_value=1,
-        max_value=10000,
-        help_text="최대 조회 건수 (기본: 1000, 최대: 10000)"
+        help_text="최대 조회 건수 (기본: 1000, 최대: 10000, 스트리밍 시 DATA_QUERY_STREAM_MAX_ROWS)"
     )
 
     # 집계 관련 필드
@@ -289,6 +439,96 @@ class DataQuerySerializer(serializers.Serializer):
         help_text="집계 함수 배열"
     )
 
+    filters = serializers.ListField(
+        child=FilterClauseSerializer(),
+        required=False,
+        help_text="차원 필터 조건 배열 (모두 AND, eq/in/not_in/range/is_null)"
+    )
+
+    format = serializers.ChoiceField(
+        choices=RESULT_FORMATS + STREAM_ONLY_FORMATS,
+        required=False,
+        default='rows',
+        help_text=(
+            "응답 형식 (rows: 행 객체 배열, columnar: 컬럼별 값 배열, "
+            "ndjson: 행별 JSON 줄, arrow: Arrow IPC 스트림 - ndjson/arrow는 스트리밍)"
+        )
+    )
+
+    stream = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="스트리밍 응답 (서버 측 커서로 행을 나눠 전송, 캐시 미사용)"
+    )
+
+    accuracy = serializers.ChoiceField(
+        choices=['exact', 'approximate'],
+        required=False,
+        default='exact',
+        help_text=(
+            "집계 정확도 (approximate: 샘플 테이블로 AVG/SUM/COUNT 근사, "
+            "{alias}_lower/{alias}_upper 신뢰구간 포함)"
+        )
+    )
+
+    max_points = serializers.IntegerField(
+        required=False,
+        min_value=MIN_POINTS,
+        help_text="계열별 최대 점 수 (라인/영역 차트, 초과 시 서버 측 다운샘플링)"
+    )
+
+    downsample = serializers.ChoiceField(
+        choices=DOWNSAMPLE_METHODS,
+        required=False,
+        default='lttb',
+        help_text="다운샘플링 방식 (lttb: 삼각형 넓이 기준, minmax: 구간별 최솟값/최댓값)"
+    )
+
+    fill = serializers.ChoiceField(
+        choices=FILL_METHODS,
+        required=False,
+        help_text=(
+            "행이 없는 날짜 bucket 채우기 (null: null, zero: 0, previous: 직전 값) - "
+            "group_by_period, start_date, end_date 필요"
+        )
+    )
+
+    paginate = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="커서 페이지네이션 (집계 없는 조회, 응답의 next_cursor로 다음 페이지 요청)"
+    )
+
+    cursor = serializers.CharField(
+        required=False,
+        max_length=500,
+        help_text="이전 응답의 next_cursor (다음 페이지 조회)"
+    )
+
+    top_n = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=MAX_LIMIT - 1,
+        help_text="집계 기준 상위 N개 그룹만 조회하고 나머지는 \"기타\" 1행으로 합침 (columns + aggregations 필요)"
+    )
+
+    top_n_by = serializers.CharField(
+        required=False,
+        max_length=100,
+        help_text="상위 N개 순위 기준 집계 별칭 (기본: 첫 번째 집계)"
+    )
+
+    top_n_others = serializers.BooleanField(
+        required=False,
+        help_text="나머지 그룹을 합친 \"기타\" 행 포함 여부 (기본: true)"
+    )
+
+    top_n_label = serializers.CharField(
+        required=False,
+        max_length=100,
+        help_text=f"\"기타\" 행의 그룹 컬럼 값 (기본: {TOP_N_DEFAULT_LABEL})"
+    )
+
     def validate_table_name(self, value):
         """
         테이블명 검증 (SQL Injection 방지)
@@ -356,6 +596,107 @@ class DataQuerySerializer(serializers.Serializer):
         aggregations = attrs.get('aggregations', [])
         group_by_period = attrs.get('group_by_period')
 
+        # 응답 형식 / 최대 건수 검증 (스트리밍만 더 많은 행 허용)
+        if attrs.get('format') in STREAM_ONLY_FORMATS:
+            attrs['stream'] = True
+
+        if attrs.get('stream'):
+            if attrs.get('format') == 'columnar':
+                raise serializers.ValidationError(
+                    "스트리밍 응답은 rows, ndjson, arrow 형식만 지원합니다."
+                )
+            from django.conf import settings
+            max_limit = getattr(settings, 'DATA_QUERY_STREAM_MAX_ROWS', 1000000)
+        else:
+            max_limit = self.MAX_LIMIT
+
+        if attrs.get('limit', 1000) > max_limit:
+            raise serializers.ValidationError(
+                {'limit': f"최대 조회 건수는 {max_limit}건입니다."}
+            )
+
+        # 근사 집계는 오차 범위를 계산할 수 있는 집계 조회만 지원
+        if attrs.get('accuracy') == 'approximate':
+            if not aggregations:
+                raise serializers.ValidationError(
+                    "accuracy=approximate는 집계 조회에서만 사용할 수 있습니다."
+                )
+            unsupported = sorted({
+                agg['function'] for agg in aggregations
+            } - APPROXIMATE_FUNCTIONS)
+            if unsupported:
+                raise serializers.ValidationError(
+                    f"accuracy=approximate는 {', '.join(sorted(APPROXIMATE_FUNCTIONS))} "
+                    f"집계만 지원합니다 (지원하지 않음: {', '.join(unsupported)})."
+                )
+            if attrs.get('stream'):
+                raise serializers.ValidationError(
+                    "스트리밍 응답에서는 accuracy=approximate를 사용할 수 없습니다."
+                )
+
+        # 백분위는 스케치 병합/원본 행 계산 결과로 응답하므로 스트리밍 불가
+        if attrs.get('stream') and any(
+            agg['function'] in PERCENTILE_FUNCTIONS for agg in aggregations
+        ):
+            raise serializers.ValidationError(
+                "스트리밍 응답에서는 백분위(P50, P75, P95, P99) 집계를 사용할 수 없습니다."
+            )
+
+        # 다운샘플링은 결과 전체가 필요하므로 스트리밍/페이지네이션과 함께 사용 불가
+        if attrs.get('max_points') and (
+            attrs.get('stream') or attrs.get('paginate') or attrs.get('cursor')
+        ):
+            raise serializers.ValidationError(
+                "max_points는 스트리밍 응답이나 커서 페이지네이션과 함께 사용할 수 없습니다."
+            )
+
+        # 빈 구간 채우기는 기간 전체 bucket을 알아야 하고 결과 전체에 적용
+        if attrs.get('fill'):
+            if not group_by_period or not start_date or not end_date:
+                raise serializers.ValidationError(
+                    "fill을 사용하려면 group_by_period, start_date, end_date를 지정해야 합니다."
+                )
+            if attrs.get('stream'):
+                raise serializers.ValidationError(
+                    "스트리밍 응답에서는 fill을 사용할 수 없습니다."
+                )
+
+        # 커서 페이지네이션 검증 (토큰 → 마지막 행 위치)
+        if attrs.get('cursor'):
+            attrs['paginate'] = True
+
+        if attrs.get('paginate'):
+            if aggregations or group_by_period:
+                raise serializers.ValidationError(
+                    "커서 페이지네이션은 집계 없는 원본 행 조회에서만 사용할 수 있습니다."
+                )
+            if attrs.get('stream'):
+                raise serializers.ValidationError(
+                    "스트리밍 응답에서는 커서 페이지네이션을 사용할 수 없습니다."
+                )
+
+            token = attrs.pop('cursor', None)
+            if token:
+                try:
+                    attrs['after'] = decode_cursor(
+                        token, attrs['table_name'], attrs.get('date_column')
+                    )
+                except InvalidCursor as e:
+                    raise serializers.ValidationError({'cursor': str(e)})
+
+        # 상위 N개 + "기타" 검증 (지정하지 않으면 관련 옵션 제거 → 기존 캐시 키 유지)
+        if attrs.get('top_n'):
+            self._validate_top_n(attrs)
+        else:
+            for key in ('top_n', 'top_n_by', 'top_n_others', 'top_n_label'):
+                attrs.pop(key, None)
+
+        # 필터 정규화 (조건 순서/중복과 무관하게 같은 캐시 키)
+        if attrs.get('filters'):
+            attrs['filters'] = normalize_filters(attrs['filters'])
+        else:
+            attrs.pop('filters', None)
+
         # 날짜 범위 검증
         if start_date and end_date:
             if start_date > end_date:
@@ -384,3 +725,77 @@ class DataQuerySerializer(serializers.Serializer):
                 )
 
         return attrs
+
+    def _validate_top_n(self, attrs):
+        """
+        top_n 교차 검증 및 기본값 채우기
+
+        그룹 컬럼별 집계만 순위를 매길 수 있으며, "기타" 행은 SQL 집계를 다시 합쳐 계산하므로
+        백분위/근사 집계와 함께 사용할 수 없습니다.
+        """
+        aggregations = attrs.get('aggregations', [])
+        if not aggregations or not attrs.get('columns'):
+            raise serializers.ValidationError(
+                "top_n은 columns와 aggregations를 함께 지정한 집계 조회에서만 사용할 수 있습니다."
+            )
+        if attrs.get('group_by_period'):
+            raise serializers.ValidationError(
+                "top_n은 날짜 그룹화(group_by_period)와 함께 사용할 수 없습니다."
+            )
+        if attrs.get('stream') or attrs.get('accuracy') == 'approximate':
+            raise serializers.ValidationError(
+                "top_n은 스트리밍 응답이나 accuracy=approximate와 함께 사용할 수 없습니다."
+            )
+        if any(agg['function'] in PERCENTILE_FUNCTIONS for agg in aggregations):
+            raise serializers.ValidationError(
+                "top_n은 백분위(P50, P75, P95, P99) 집계와 함께 사용할 수 없습니다."
+            )
+
+        aliases = [
+            agg.get('alias', f"{agg['function'].lower()}_{agg['column']}")
+            for agg in aggregations
+        ]
+        attrs.setdefault('top_n_by', aliases[0])
+        if attrs['top_n_by'] not in aliases:
+            raise serializers.ValidationError({
+                'top_n_by': f"top_n_by는 집계 별칭 중 하나여야 합니다 ({', '.join(aliases)})."
+            })
+        attrs.setdefault('top_n_others', True)
+        attrs.setdefault('top_n_label', TOP_N_DEFAULT_LABEL)
+
+
+class DataQueryBatchSerializer(serializers.Serializer):
+    """
+    일괄 데이터 조회 요청 Serializer
+
+    차트 ID를 키로 하는 DataQuerySerializer 요청 묶음
+    개별 요청은 실행 시 따로 검증하여 하나가 실패해도 나머지는 실행됩니다.
+
+    예: {"queries": {"chart1": {"table_name": "fcc_data", ...}, "chart2": {...}}}
+    """
+
+    queries = serializers.DictField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        help_text="차트 ID → 데이터 조회 요청 (DataQuerySerializer 형식)"
+    )
+
+    def validate_queries(self, value):
+        """
+        요청 개수 및 차트 ID 검증
+        """
+        from django.conf import settings
+
+        max_size = getattr(settings, 'DATA_QUERY_BATCH_MAX_SIZE', 20)
+        if len(value) > max_size:
+            raise serializers.ValidationError(
+                f"한 번에 최대 {max_size}개의 조회만 요청할 수 있습니다."
+            )
+
+        for chart_id in value:
+            if len(chart_id) > 100:
+                raise serializers.ValidationError(
+                    f"차트 ID '{chart_id[:20]}...'이(가) 너무 깁니다 (최대 100자)."
+                )
+
+        return value
@@ -0,0 +1,24 @@
+"""
+data_sources 앱 시그널 핸들러
+
+DataSource/Rollup/SampleTable/PercentileSketch 변경 시 스키마 레지스트리를 무효화합니다.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import DataSource, PercentileSketch, Rollup, SampleTable
+from .registry import schema_registry
+
+
+@receiver(post_save, sender=DataSource)
+@receiver(post_delete, sender=DataSource)
+@receiver(post_save, sender=Rollup)
+@receiver(post_delete, sender=Rollup)
+@receiver(post_save, sender=SampleTable)
+@receiver(post_delete, sender=SampleTable)
+@receiver(post_save, sender=PercentileSketch)
+@receiver(post_delete, sender=PercentileSketch)
+def invalidate_schema_registry(sender, instance, **kwargs):
+    """DataSource/Rollup/SampleTable/PercentileSketch 저장/삭제 시 스키마 레지스트리 무효화 (다른 워커에도 전파)"""
+    schema_registry.invalidate()
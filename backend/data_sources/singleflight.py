@@ -0,0 +1,323 @@
+"""
+동일 조회 요청 병합 (single-flight)
+
+메일 발송 직후 같은 /report/yyyymmdd를 여러 명이 동시에 열면 결과 캐시가 채워지기 전에
+같은 차트 조회가 동시에 실행됩니다 (thundering herd).
+정규화된 조회 키(make_cache_key와 같은 키)별로 첫 요청(leader)만 실행하고,
+동시에 들어온 같은 요청(follower)은 leader의 결과를 기다렸다가 공유합니다.
+
+1. 워커 내부: 진행 중인 키 → threading.Event, 같은 프로세스의 follower는 이벤트 대기
+2. 워커 간: state_dir()/singleflight/ 잠금 파일(fcntl.flock, 키 해시로 STRIPES개에 분산)
+   - 잠금을 잡은 워커가 실행 후 결과를 인계 파일(JSON, HANDOFF_TTL초)로 남기고 잠금 해제
+   - 잠금을 기다린 워커는 인계 파일을 읽어 실행 없이 응답 (없으면 직접 실행)
+
+- leader 실행이 실패하면 같은 워커의 follower도 같은 오류로 응답하고,
+  다른 워커는 인계 파일이 없으므로 직접 실행합니다.
+- DATA_QUERY_SINGLEFLIGHT_TIMEOUT_MS 안에 결과를 받지 못한 follower는 병합 없이 직접 실행합니다.
+- fcntl이 없는 환경(Windows 개발 PC)에서는 워커 내부 병합만 사용합니다.
+- ASGI 뷰는 ado()를 사용합니다 (워커 내부 대기는 asyncio.Future, 워커 간 잠금 파일은 동기 경로와 공유).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from .cache import FileStore
+from .generations import state_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 워커 간 잠금 파일 수 (키 해시로 분산, 다른 키가 같은 파일을 쓰면 순서대로 실행될 뿐 결과는 키별)
+STRIPES = 1024
+
+# 인계 파일 보관 시간 (초) - 대기 중이던 다른 워커가 읽을 때까지만 필요
+HANDOFF_TTL = 30
+
+# 다른 워커의 잠금 해제 확인 간격 (초)
+POLL_INTERVAL = 0.01
+
+# 만료된 인계 파일 정리 주기 (초, 프로세스별)
+SWEEP_INTERVAL = 60
+
+
+def singleflight_enabled():
+    return getattr(settings, 'DATA_QUERY_SINGLEFLIGHT', True)
+
+
+def wait_timeout_ms():
+    return getattr(settings, 'DATA_QUERY_SINGLEFLIGHT_TIMEOUT_MS', 25000)
+
+
+def _directory():
+    return state_dir() / 'singleflight'
+
+
+def _open_stripe(key):
+    """키의 워커 간 잠금 파일 열기 (키 해시로 STRIPES개 중 하나)"""
+    stripe = int(hashlib.sha256(key.encode('utf-8')).hexdigest()[:8], 16) % STRIPES
+    directory = _directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    return os.open(directory / f"{stripe}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+
+
+def _try_lock(fd):
+    """비차단 배타 잠금 시도 (다른 워커가 잡고 있으면 False)"""
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+class _Flight:
+    """진행 중인 실행 1건 (같은 워커의 follower가 공유)"""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    키별 동시 실행 병합
+
+    Attributes:
+        leaders: 직접 실행한 횟수
+        local_followers: 같은 워커의 실행 결과를 공유받은 횟수
+        remote_followers: 다른 워커의 실행 결과(인계 파일)를 공유받은 횟수
+        timeouts: 대기 시간 초과로 직접 실행한 횟수
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._async_flights = {}
+        self._last_sweep = 0.0
+        self.leaders = 0
+        self.local_followers = 0
+        self.remote_followers = 0
+        self.timeouts = 0
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def do(self, key, fn):
+        """
+        같은 키의 실행이 진행 중이면 그 결과를 기다리고, 아니면 fn() 실행
+
+        Args:
+            key: 정규화된 조회 키 (make_cache_key 결과)
+            fn: 결과(JSON 직렬화 가능한 dict)를 반환하는 함수
+
+        Returns:
+            (결과, 공유 여부) - 공유 여부는 다른 요청의 실행 결과를 받았으면 True
+
+        Raises:
+            fn()이 발생시킨 예외 (같은 워커의 follower도 leader의 예외를 그대로 받음)
+        """
+        if not singleflight_enabled():
+            return fn(), False
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            return self._follow(flight, fn)
+
+        try:
+            flight.value = self._lead(key, fn)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _follow(self, flight, fn):
+        """같은 워커의 leader 결과 대기"""
+        if not flight.done.wait(wait_timeout_ms() / 1000):
+            self._count('timeouts')
+            logger.warning('동일 조회 대기 시간 초과, 직접 실행')
+            return fn(), False
+        if flight.error is not None:
+            raise flight.error
+        self._count('local_followers')
+        return flight.value[0], True
+
+    async def ado(self, key, fn):
+        """
+        do()의 비동기 버전
+
+        Args:
+            key: 정규화된 조회 키
+            fn: 결과를 반환하는 코루틴 함수
+
+        Returns:
+            (결과, 공유 여부)
+        """
+        if not singleflight_enabled():
+            return await fn(), False
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            future = self._async_flights.get(flight_key)
+            leader = future is None
+            if leader:
+                future = self._async_flights[flight_key] = loop.create_future()
+
+        if not leader:
+            try:
+                value = await asyncio.wait_for(asyncio.shield(future), wait_timeout_ms() / 1000)
+            except asyncio.TimeoutError:
+                self._count('timeouts')
+                logger.warning('동일 조회 대기 시간 초과, 직접 실행')
+                return await fn(), False
+            except asyncio.CancelledError:
+                # leader 요청이 취소(클라이언트 연결 종료)되면 직접 실행
+                if not future.cancelled():
+                    raise
+                return await fn(), False
+            self._count('local_followers')
+            return value[0], True
+
+        try:
+            result = await self._alead(key, fn)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 follower가 없어도 "exception was never retrieved" 경고를 남기지 않도록 조회 처리
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                self._async_flights.pop(flight_key, None)
+
+    def _lead(self, key, fn):
+        """다른 워커와의 병합 (잠금 파일) 후 실행 또는 인계 결과 사용"""
+        if fcntl is None:
+            self._count('leaders')
+            return fn(), False
+
+        fd = _open_stripe(key)
+        deadline = time.monotonic() + wait_timeout_ms() / 1000
+        waited = False
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                self._count('timeouts')
+                logger.warning('다른 워커의 동일 조회 대기 시간 초과, 직접 실행')
+                return fn(), False
+            waited = True
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            value = self._handed_off(key) if waited else None
+            if value is not None:
+                return value, True
+            value = fn()
+            self._hand_off(key, value)
+            return value, False
+        finally:
+            self._unlock(fd)
+
+    async def _alead(self, key, fn):
+        """_lead()의 비동기 버전 (잠금 대기 중 이벤트 루프를 막지 않음)"""
+        if fcntl is None:
+            self._count('leaders')
+            return await fn(), False
+
+        fd = _open_stripe(key)
+        deadline = time.monotonic() + wait_timeout_ms() / 1000
+        waited = False
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                self._count('timeouts')
+                logger.warning('다른 워커의 동일 조회 대기 시간 초과, 직접 실행')
+                return await fn(), False
+            waited = True
+            await asyncio.sleep(POLL_INTERVAL)
+
+        try:
+            value = self._handed_off(key) if waited else None
+            if value is not None:
+                return value, True
+            value = await fn()
+            self._hand_off(key, value)
+            return value, False
+        finally:
+            self._unlock(fd)
+
+    def _handed_off(self, key):
+        """잠금을 기다리는 동안 다른 워커가 남긴 결과 (없으면 None)"""
+        value = FileStore(_directory(), HANDOFF_TTL).get(key)
+        if value is not None:
+            self._count('remote_followers')
+        return value
+
+    def _hand_off(self, key, value):
+        """실행 결과를 잠금을 기다리는 다른 워커에 인계"""
+        self._count('leaders')
+        try:
+            FileStore(_directory(), HANDOFF_TTL).set(key, value)
+        except Exception as e:
+            logger.warning(f"동일 조회 결과 인계 실패: {str(e)}")
+
+    def _unlock(self, fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+        self._sweep()
+
+    def _sweep(self):
+        """만료된 인계 파일 삭제 (프로세스별 SWEEP_INTERVAL마다 1회)"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep < SWEEP_INTERVAL:
+                return
+            self._last_sweep = now
+
+        for path in _directory().glob('*.json'):
+            try:
+                if now - path.stat().st_mtime > HANDOFF_TTL:
+                    path.unlink(missing_ok=True)
+            except OSError:
+                continue
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': singleflight_enabled(),
+                'cross_worker': fcntl is not None,
+                'in_flight': len(self._flights) + len(self._async_flights),
+                'leaders': self.leaders,
+                'local_followers': self.local_followers,
+                'remote_followers': self.remote_followers,
+                'timeouts': self.timeouts,
+            }
+
+
+single_flight = SingleFlight()
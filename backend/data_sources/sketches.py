@@ -0,0 +1,557 @@
+"""
+백분위 집계 (P50/P75/P95/P99) - 스케치 테이블 관리 및 조회
+
+FCC는 지연 시간 지표라 평균보다 꼬리(P95/P99)가 중요하지만
+MySQL에는 백분위 집계 함수가 없고, 원본 행을 모두 읽어 정렬해야 정확히 계산됩니다.
+
+1. 빌드 (build_sketch / refresh_sketches) - load_fcc_data 이후 실행
+   - 원본 테이블을 일(bucket) + 차원 컬럼별로 묶어 측정 컬럼마다 t-digest 저장
+     ({col}__count, {col}__digest BLOB, 스케치 하나 약 1KB)
+   - 하루씩 날짜 인덱스 범위로 읽어 Python에서 스케치 생성 (메모리 사용량 = 하루치 값)
+   - 전체 빌드: 새 테이블 생성 후 RENAME TABLE로 원자적 교체
+   - 증분 빌드: since 이후 bucket만 삭제 후 다시 생성 (rollups와 동일)
+
+2. 조회 (execute_sketch / execute_exact - query.execute_percentiles가 선택)
+   - 일별 스케치를 기간(주/월/연) + 그룹별로 병합하여 백분위 추정 (원본 행 재조회 없음)
+   - 같은 요청의 AVG/SUM/COUNT/MIN/MAX는 스케치의 정확한 요약값으로 계산
+   - 날짜 범위가 DATA_QUERY_PERCENTILE_EXACT_DAYS 이하이거나 맞는 스케치가 없으면
+     원본 행을 읽어 정확히 계산 (DATA_QUERY_PERCENTILE_EXACT_MAX_ROWS 초과 시 스케치 사용, 없으면 거부)
+   - 정확한 백분위는 선형 보간 (PERCENTILE_CONT, numpy.percentile 기본값과 같은 정의)
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from itertools import groupby
+
+import numpy as np
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.utils import timezone
+
+from .compiler import bucket_column_name, period_expression
+from .cost_guard import with_time_limit
+from .filters import filter_clauses, filter_columns, filter_params
+from .materialize import compile_converters, identity
+from .registry import schema_registry
+from .replicas import read_connection
+from .results import build_result
+from .rollups import PERIOD_EXPRESSIONS as BUCKET_PERIOD_EXPRESSIONS
+from .rollups import _table_exists, earliest_date
+from .tdigest import TDigest
+
+logger = logging.getLogger(__name__)
+
+# 집계 함수 → 분위수
+PERCENTILE_FUNCTIONS = {
+    'P50': 0.50,
+    'P75': 0.75,
+    'P95': 0.95,
+    'P99': 0.99,
+}
+
+# 스케치 빌드 INSERT 배치 크기
+INSERT_BATCH_SIZE = 500
+
+
+def exact_days():
+    return getattr(settings, 'DATA_QUERY_PERCENTILE_EXACT_DAYS', 7)
+
+
+def exact_max_rows():
+    return getattr(settings, 'DATA_QUERY_PERCENTILE_EXACT_MAX_ROWS', 500000)
+
+
+def has_percentiles(spec):
+    """백분위 집계가 포함된 요청인지"""
+    return any(
+        agg['function'] in PERCENTILE_FUNCTIONS for agg in spec.get('aggregations', [])
+    )
+
+
+class TooManyRows(Exception):
+    """정확한 백분위 계산에 읽을 원본 행이 너무 많음"""
+
+
+# ==================== 빌드 ====================
+
+def _validate_sketch(sketch):
+    """스케치 정의의 컬럼이 원본 테이블에 있는지 확인"""
+    sketch.full_clean(exclude=['data_source'])
+
+    schema = schema_registry.get(sketch.data_source.table_name)
+    if schema is None:
+        raise ValueError(
+            f"테이블 '{sketch.data_source.table_name}'이(가) 등록되지 않았거나 비활성 상태입니다."
+        )
+
+    invalid_columns = schema.invalid_columns(
+        [sketch.date_column, *sketch.dimensions, *sketch.measures]
+    )
+    if invalid_columns:
+        raise ValueError(f"유효하지 않은 컬럼: {invalid_columns}")
+
+
+def _create_table(cursor, sketch, source_table, table_name):
+    """스케치 테이블 생성 (bucket/차원 컬럼 타입은 원본에서 가져옴)"""
+    dims = ''.join(f", `{dim}`" for dim in sketch.dimensions)
+    cursor.execute(
+        f"CREATE TABLE `{table_name}` AS "
+        f"SELECT DATE(`{sketch.date_column}`) AS `bucket`{dims} FROM `{source_table}` LIMIT 0"
+    )
+
+    alterations = []
+    for measure in sketch.measures:
+        alterations.extend([
+            f"ADD COLUMN `{measure}__count` BIGINT NOT NULL DEFAULT 0",
+            f"ADD COLUMN `{measure}__digest` BLOB NULL",
+        ])
+    index_columns = ', '.join(['`bucket`'] + [f"`{dim}`" for dim in sketch.dimensions])
+    alterations.append(f"ADD INDEX `idx_bucket_dims` ({index_columns})")
+    cursor.execute(f"ALTER TABLE `{table_name}` " + ', '.join(alterations))
+
+
+def _day_rows(cursor, sketch, source_table, day):
+    """원본 하루치 → 스케치 테이블 행 목록 (차원 값 조합별 1행)"""
+    select_columns = ', '.join(
+        f"`{col}`" for col in [*sketch.dimensions, *sketch.measures]
+    )
+    cursor.execute(
+        f"SELECT {select_columns} FROM `{source_table}` "
+        f"WHERE `{sketch.date_column}` >= %s AND `{sketch.date_column}` < %s",
+        [day, day + timedelta(days=1)]
+    )
+
+    width = len(sketch.dimensions)
+    groups = defaultdict(list)
+    for row in cursor.fetchall():
+        groups[row[:width]].append(row[width:])
+
+    rows = []
+    for key, values in groups.items():
+        row = [day, *key]
+        for measure_values in zip(*values):
+            digest = TDigest.from_values(measure_values, sketch.compression)
+            row.extend([digest.count, digest.to_bytes() if digest.count else None])
+        rows.append(row)
+    return rows
+
+
+def _fill_table(cursor, sketch, source_table, table_name, since=None):
+    """since(없으면 처음) 이후 하루씩 스케치 생성 후 INSERT"""
+    date_column = sketch.date_column
+    query = f"SELECT MIN(`{date_column}`), MAX(`{date_column}`) FROM `{source_table}`"
+    params = []
+    if since is not None:
+        query += f" WHERE `{date_column}` >= %s"
+        params.append(since)
+    cursor.execute(query, params)
+    first, last = (earliest_date([value]) for value in cursor.fetchone())
+    if first is None:
+        return
+
+    insert_columns = ['bucket', *sketch.dimensions]
+    for measure in sketch.measures:
+        insert_columns.extend([f"{measure}__count", f"{measure}__digest"])
+    insert_sql = (
+        f"INSERT INTO `{table_name}` ({', '.join(f'`{col}`' for col in insert_columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(insert_columns))})"
+    )
+
+    pending = []
+    day = first
+    while day <= last:
+        pending.extend(_day_rows(cursor, sketch, source_table, day))
+        if len(pending) >= INSERT_BATCH_SIZE:
+            cursor.executemany(insert_sql, pending)
+            pending = []
+        day += timedelta(days=1)
+
+    if pending:
+        cursor.executemany(insert_sql, pending)
+
+
+def build_sketch(sketch, since=None):
+    """
+    스케치 테이블 빌드
+
+    Args:
+        sketch: PercentileSketch 인스턴스
+        since: date - 지정 시 해당 날짜부터 증분 빌드,
+               None이거나 스케치 테이블이 없으면 전체 빌드
+
+    Returns:
+        스케치 테이블 행 수
+    """
+    _validate_sketch(sketch)
+
+    source_table = sketch.data_source.table_name
+    table_name = sketch.table_name
+
+    with connection.cursor() as cursor:
+        if since is not None and _table_exists(cursor, table_name):
+            with transaction.atomic():
+                cursor.execute(
+                    f"DELETE FROM `{table_name}` WHERE `bucket` >= %s",
+                    [since]
+                )
+                _fill_table(cursor, sketch, source_table, table_name, since)
+            mode = f'증분 ({since} 이후)'
+        else:
+            # 전체 빌드: 새 테이블 생성 후 원자적 교체
+            build_table = f"{table_name}__build"
+            old_table = f"{table_name}__old"
+
+            cursor.execute(f"DROP TABLE IF EXISTS `{build_table}`")
+            _create_table(cursor, sketch, source_table, build_table)
+            _fill_table(cursor, sketch, source_table, build_table)
+
+            if _table_exists(cursor, table_name):
+                cursor.execute(
+                    f"RENAME TABLE `{table_name}` TO `{old_table}`, "
+                    f"`{build_table}` TO `{table_name}`"
+                )
+                cursor.execute(f"DROP TABLE IF EXISTS `{old_table}`")
+            else:
+                cursor.execute(f"RENAME TABLE `{build_table}` TO `{table_name}`")
+            mode = '전체'
+
+        cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
+        row_count = cursor.fetchone()[0]
+
+    # last_built_at 저장 → 시그널로 스키마 레지스트리 무효화 (백분위 조회 대상 갱신)
+    sketch.row_count = row_count
+    sketch.last_built_at = timezone.now()
+    sketch.save(update_fields=['row_count', 'last_built_at', 'updated_at'])
+
+    logger.info(f"스케치 빌드 완료: {table_name} ({mode}) - {row_count}행")
+    return row_count
+
+
+def refresh_sketches(table_name, since=None):
+    """
+    DataSource 테이블의 활성 스케치 전체 갱신 (load_fcc_data 이후 호출)
+
+    Returns:
+        {스케치 테이블명: 행 수}
+    """
+    from .models import PercentileSketch
+
+    results = {}
+    sketches = PercentileSketch.objects.filter(
+        data_source__table_name=table_name,
+        is_active=True,
+    ).select_related('data_source')
+
+    for sketch in sketches:
+        results[sketch.table_name] = build_sketch(sketch, since=since)
+
+    return results
+
+
+# ==================== 조회 ====================
+
+def _aggregation_alias(agg):
+    return agg.get('alias', f"{agg['function'].lower()}_{agg['column']}")
+
+
+def _measures(spec):
+    """집계 대상 컬럼 (요청 순서, 중복 제거)"""
+    return list(dict.fromkeys(agg['column'] for agg in spec['aggregations']))
+
+
+def find_sketch(schema, spec):
+    """
+    요청을 계산할 수 있는 스케치 (GROUP BY/필터 컬럼 ⊆ 차원, 집계 컬럼 ⊆ 측정 컬럼)
+
+    여러 개가 가능하면 차원이 적은(병합할 스케치가 적은) 스케치를 선택합니다.
+    """
+    if schema is None or not schema.sketches:
+        return None
+
+    columns = set(spec.get('columns', [])) | filter_columns(spec)
+    measures = set(_measures(spec))
+    date_column = spec.get('date_column', 'date')
+
+    candidates = [
+        sketch for sketch in schema.sketches
+        if sketch.date_column == date_column
+        and columns <= sketch.dimensions
+        and measures <= sketch.measures
+    ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda sketch: len(sketch.dimensions))
+
+
+def prefers_exact(spec):
+    """날짜 범위가 짧아 원본 행으로 정확히 계산할 요청인지"""
+    start_date = spec.get('start_date')
+    end_date = spec.get('end_date')
+    if not start_date or not end_date:
+        return False
+    return (end_date - start_date).days + 1 <= exact_days()
+
+
+def _group_columns(spec):
+    columns = list(spec.get('columns', []))
+    if spec.get('group_by_period'):
+        columns.insert(
+            0, bucket_column_name(spec.get('date_column', 'date'), spec['group_by_period'])
+        )
+    return columns
+
+
+def _select(spec, period_expr, source, date_filter, value_columns):
+    """그룹 키 + 값 컬럼 SELECT 문 (그룹 순 정렬, itertools.groupby로 묶음)"""
+    group_by_period = spec.get('group_by_period')
+    select_parts = []
+    order_parts = []
+
+    if group_by_period:
+        date_alias = bucket_column_name(spec.get('date_column', 'date'), group_by_period)
+        select_parts.append(f"{period_expr} as {date_alias}")
+        order_parts.append(period_expr)
+
+    for col in spec.get('columns', []):
+        select_parts.append(f"`{col}`")
+        order_parts.append(f"`{col}`")
+
+    select_parts.extend(f"`{col}`" for col in value_columns)
+
+    query = f"SELECT {', '.join(select_parts)} FROM `{source}`"
+    params = []
+
+    where_clauses = []
+    if spec.get('start_date'):
+        where_clauses.append(f"`{date_filter}` >= %s")
+        params.append(spec['start_date'])
+    if spec.get('end_date'):
+        where_clauses.append(f"`{date_filter}` < %s")
+        params.append(spec['end_date'] + timedelta(days=1))
+    # 차원 필터 (스케치 테이블은 필터 컬럼이 모두 차원인 경우만 사용)
+    where_clauses.extend(filter_clauses(spec))
+    params.extend(filter_params(spec))
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    if order_parts:
+        query += " ORDER BY " + ", ".join(order_parts)
+
+    return query, params
+
+
+def build_exact_query(spec, schema=None, max_rows=None):
+    """
+    원본 행 조회 SQL (정확한 백분위 계산용)
+
+    최대 행 수(기본: DATA_QUERY_PERCENTILE_EXACT_MAX_ROWS) + 1건을 조회하여 초과 여부를 판단합니다.
+
+    Returns:
+        (query, params)
+    """
+    date_column = spec.get('date_column', 'date')
+    period_expr = None
+    if spec.get('group_by_period'):
+        period_expr = period_expression(date_column, spec['group_by_period'], schema)
+
+    query, params = _select(spec, period_expr, spec['table_name'], date_column, _measures(spec))
+    query += " LIMIT %s"
+    params.append((max_rows or exact_max_rows()) + 1)
+    return query, params
+
+
+def build_sketch_query(spec, sketch):
+    """
+    스케치 테이블 조회 SQL (그룹별로 병합할 일별 스케치)
+
+    Returns:
+        (query, params)
+    """
+    period_expr = None
+    if spec.get('group_by_period'):
+        period_expr = BUCKET_PERIOD_EXPRESSIONS[spec['group_by_period']]
+
+    digest_columns = [f"{measure}__digest" for measure in _measures(spec)]
+    return _select(spec, period_expr, sketch.table_name, 'bucket', digest_columns)
+
+
+def _exact_value(function, values):
+    """값 배열(NULL 제외 float) → 집계 값 (SQL과 같이 값이 없으면 NULL, COUNT는 0)"""
+    if function == 'COUNT':
+        return len(values)
+    if not len(values):
+        return None
+    if function in PERCENTILE_FUNCTIONS:
+        return float(np.percentile(values, PERCENTILE_FUNCTIONS[function] * 100))
+    if function == 'AVG':
+        return float(values.mean())
+    if function == 'SUM':
+        return float(values.sum())
+    if function == 'MIN':
+        return float(values.min())
+    return float(values.max())
+
+
+def _digest_value(function, digest):
+    """병합된 스케치 → 집계 값"""
+    if function == 'COUNT':
+        return int(digest.count)
+    if not digest.count:
+        return None
+    if function in PERCENTILE_FUNCTIONS:
+        return digest.quantile(PERCENTILE_FUNCTIONS[function])
+    if function == 'AVG':
+        return digest.total / digest.count
+    if function == 'SUM':
+        return digest.total
+    if function == 'MIN':
+        return digest.minimum
+    return digest.maximum
+
+
+def _aggregate(rows, key_width, spec, reduce_group, agg_value):
+    """
+    정렬된 (그룹 키..., 측정 컬럼 값...) 행 → 그룹별 출력 행 (limit 적용)
+
+    reduce_group은 그룹의 측정 컬럼 값 목록을 요약(값 배열/병합 스케치)하고,
+    agg_value는 요약에서 집계 함수 값을 계산합니다.
+    """
+    measures = _measures(spec)
+    aggregations = spec['aggregations']
+    limit = spec.get('limit', 1000)
+
+    output = []
+    for key, group in groupby(rows, key=lambda row: row[:key_width]):
+        columns = list(zip(*(row[key_width:] for row in group)))
+        reduced = dict(zip(measures, (reduce_group(values) for values in columns)))
+        output.append(
+            (*key, *(agg_value(agg['function'], reduced[agg['column']]) for agg in aggregations))
+        )
+        if len(output) >= limit:
+            break
+    return output
+
+
+def _fetch(query, params, using=DEFAULT_DB_ALIAS):
+    with read_connection(using).cursor() as cursor:
+        cursor.execute(query, params)
+        description = cursor.description
+        rows = cursor.fetchall()
+    return description, rows
+
+
+def _to_result(spec, description, rows, key_width):
+    """출력 행 → 컬럼 단위 결과 (그룹 키는 원본 조회와 같은 변환 적용)"""
+    result_columns = _group_columns(spec) + [
+        _aggregation_alias(agg) for agg in spec['aggregations']
+    ]
+    converters = compile_converters(description)[:key_width]
+    converters += [identity] * len(spec['aggregations'])
+    return build_result(rows, result_columns, converters)
+
+
+def execute_exact(spec, schema=None, max_rows=None, using=DEFAULT_DB_ALIAS):
+    """
+    원본 행으로 정확한 백분위 계산
+
+    Raises:
+        TooManyRows: 원본 행이 max_rows(기본: DATA_QUERY_PERCENTILE_EXACT_MAX_ROWS) 초과
+    """
+    max_rows = max_rows or exact_max_rows()
+    query, params = build_exact_query(spec, schema, max_rows)
+    query = with_time_limit(query, schema)
+    logger.debug(f"쿼리: {query}, 파라미터: {params}")
+    description, rows = _fetch(query, params, using)
+    if len(rows) > max_rows:
+        raise TooManyRows(
+            f"정확한 백분위 계산에 필요한 원본 행이 {max_rows}건을 넘습니다."
+        )
+
+    key_width = len(_group_columns(spec))
+
+    def reduce_group(values):
+        values = np.array([np.nan if value is None else value for value in values], dtype=float)
+        return values[~np.isnan(values)]
+
+    output = _aggregate(rows, key_width, spec, reduce_group, _exact_value)
+    return {
+        **_to_result(spec, description, output, key_width),
+        'accuracy': {'mode': 'exact'},
+    }
+
+
+def execute_sketch(spec, sketch, using=DEFAULT_DB_ALIAS):
+    """일별 스케치 병합으로 백분위 추정"""
+    query, params = build_sketch_query(spec, sketch)
+    logger.debug(f"쿼리: {query}, 파라미터: {params}")
+    description, rows = _fetch(query, params, using)
+
+    key_width = len(_group_columns(spec))
+
+    def reduce_group(blobs):
+        return TDigest.merge(
+            [TDigest.from_bytes(bytes(blob)) for blob in blobs if blob is not None],
+            sketch.compression,
+        )
+
+    output = _aggregate(rows, key_width, spec, reduce_group, _digest_value)
+    return {
+        **_to_result(spec, description, output, key_width),
+        'accuracy': {'mode': 'approximate', 'method': 'tdigest', 'compression': sketch.compression},
+    }
+
+
+# ==================== 정확도 검증 ====================
+
+def verify_sketch(sketch, group_by_period='month', start_date=None, end_date=None, max_rows=None):
+    """
+    스케치 백분위와 원본 행 정확한 백분위 비교 (build_sketches --verify)
+
+    측정 컬럼마다 기간별 P50/P75/P95/P99를 두 방식으로 계산하여 상대 오차를 구합니다.
+
+    Args:
+        sketch: PercentileSketch 인스턴스 (빌드 완료)
+        group_by_period: 비교할 기간 단위
+        start_date / end_date: 비교 범위 (None이면 전체)
+        max_rows: 정확한 계산에 읽을 최대 원본 행 수
+
+    Returns:
+        [{'measure', 'function', 'groups', 'max_error', 'mean_error'}, ...]
+        (오차는 |추정 - 정확| / |정확|, 정확한 값이 0이면 절대 오차)
+    """
+    report = []
+    for measure in sketch.measures:
+        spec = {
+            'table_name': sketch.data_source.table_name,
+            'date_column': sketch.date_column,
+            'group_by_period': group_by_period,
+            'start_date': start_date,
+            'end_date': end_date,
+            'limit': 100000,
+            'aggregations': [
+                {'column': measure, 'function': function, 'alias': function.lower()}
+                for function in PERCENTILE_FUNCTIONS
+            ],
+        }
+        exact = execute_exact(spec, max_rows=max_rows)
+        estimated = execute_sketch(spec, sketch)
+        exact_values = dict(zip(exact['columns'], exact['values']))
+        estimated_values = dict(zip(estimated['columns'], estimated['values']))
+
+        for function in PERCENTILE_FUNCTIONS:
+            errors = [
+                abs(guess - truth) / (abs(truth) or 1.0)
+                for truth, guess in zip(
+                    exact_values[function.lower()], estimated_values[function.lower()]
+                )
+                if truth is not None and guess is not None
+            ]
+            report.append({
+                'measure': measure,
+                'function': function,
+                'groups': len(errors),
+                'max_error': max(errors, default=0.0),
+                'mean_error': sum(errors) / len(errors) if errors else 0.0,
+            })
+    return report
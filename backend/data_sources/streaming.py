@@ -0,0 +1,275 @@
+"""
+스트리밍 데이터 조회 (대용량 결과)
+
+일반 조회는 fetchall() → 전체 변환 → 전체 직렬화 순서라 메모리 사용량이 결과 크기에 비례합니다.
+스트리밍 조회는 서버 측 커서(PyMySQL SSCursor)에서 chunk 단위로 읽어 바로 직렬화하므로
+결과 행 수와 관계없이 요청당 메모리가 chunk 크기로 일정합니다.
+
+- format=rows: 청크 단위 JSON ({"data": [...], "count": N, ...} - count는 마지막에 전송)
+- format=ndjson: 행마다 JSON 한 줄 (application/x-ndjson)
+- format=arrow: Arrow IPC 스트림 (chunk마다 record batch, arrow 모듈)
+- 캐시 미사용 (대용량 결과를 캐시에 적재하지 않음)
+- 실행 도중 오류는 상태 코드를 바꿀 수 없으므로 본문 마지막에 error 필드/줄로 전달
+"""
+
+import json
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import arrow
+from .materialize import compile_converters, materialize, row_builder
+from .admission import DEFAULT_PRIORITY
+from .filters import filter_tables
+from .query import (
+    QueryError,
+    admit_query,
+    build_query,
+    execution_slot,
+    resolve_schema,
+    validate_columns,
+)
+from .replicas import read_connection, replica_router
+from .rollups import route_query
+
+logger = logging.getLogger(__name__)
+
+STREAM_CONTENT_TYPES = {
+    'rows': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'arrow': arrow.ARROW_STREAM_MEDIA_TYPE,
+}
+
+
+def _dumps(value):
+    return json.dumps(value, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+def open_server_side_cursor(using=DEFAULT_DB_ALIAS):
+    """
+    서버 측(unbuffered) 커서 생성
+
+    MySQL은 PyMySQL SSCursor를 사용하여 결과를 클라이언트 메모리에 모두 받지 않고
+    fetchmany() 호출 시 필요한 만큼만 읽습니다.
+    다른 DB(개발용)는 Django 커서를 그대로 사용합니다.
+    """
+    connection = read_connection(using)
+    if connection.vendor == 'mysql':
+        from pymysql.cursors import SSCursor
+
+        connection.ensure_connection()
+        return connection.connection.cursor(SSCursor)
+    return connection.cursor()
+
+
+class QueryStream:
+    """
+    스트리밍 응답 본문 (StreamingHttpResponse의 streaming_content)
+
+    close()는 응답 종료 시 Django가 호출하므로 클라이언트가 중간에 끊어도
+    커서와 동시 실행 슬롯이 정리됩니다.
+    """
+
+    def __init__(self, cursor, result_columns, meta, result_format, chunk_size,
+                 logical_types=None, slot=None):
+        self.cursor = cursor
+        self.slot = slot
+        self.result_columns = result_columns
+        self.logical_types = logical_types or []
+        self.meta = meta
+        self.result_format = result_format
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._closed = False
+
+    @property
+    def content_type(self):
+        return STREAM_CONTENT_TYPES[self.result_format]
+
+    def _raw_chunks(self):
+        """chunk 단위 커서 행 튜플 목록 (변환 없음)"""
+        while True:
+            rows = self.cursor.fetchmany(self.chunk_size)
+            if not rows:
+                return
+            self.count += len(rows)
+            yield rows
+
+    def _chunks(self):
+        """chunk 단위 행 딕셔너리 목록 (날짜/시간 변환 적용)"""
+        converters = compile_converters(self.cursor.description)
+        build_rows = row_builder(tuple(self.result_columns))
+        for rows in self._raw_chunks():
+            yield build_rows(materialize(rows, converters))
+
+    def _iter_arrow(self):
+        # 날짜/시간은 Arrow 타입으로 그대로 전달
+        converters = compile_converters(self.cursor.description, temporal=False)
+        schema = arrow.arrow_schema(self.result_columns, self.logical_types)
+        yield from arrow.iter_ipc_stream(
+            schema,
+            (materialize(rows, converters) for rows in self._raw_chunks())
+        )
+
+    def _iter_ndjson(self):
+        for rows in self._chunks():
+            yield ''.join(_dumps(row) + '\n' for row in rows).encode('utf-8')
+
+    def _iter_json(self):
+        yield b'{"data":['
+        separator = ''
+        for rows in self._chunks():
+            # 행 배열을 한 번에 직렬화 후 대괄호 제거
+            yield (separator + _dumps(rows)[1:-1]).encode('utf-8')
+            separator = ','
+        yield (
+            '],' + _dumps({'count': self.count, **self.meta})[1:]
+        ).encode('utf-8')
+
+    def __iter__(self):
+        try:
+            if self.result_format == 'ndjson':
+                yield from self._iter_ndjson()
+            elif self.result_format == 'arrow':
+                yield from self._iter_arrow()
+            else:
+                yield from self._iter_json()
+
+            logger.info(
+                f"스트리밍 조회 완료: {self.meta['table_name']} - {self.count}건 ({self.meta['source_table']})"
+            )
+        except Exception as e:
+            logger.error(f"스트리밍 조회 실패: {self.meta['table_name']} - {str(e)}")
+            error = {'error': f'데이터 조회 중 오류 발생: {str(e)}', 'count': self.count}
+            if self.result_format == 'arrow':
+                # 바이너리 스트림에는 오류를 덧붙일 수 없음 → 종료 표시 없이 중단
+                return
+            if self.result_format == 'ndjson':
+                yield (_dumps(error) + '\n').encode('utf-8')
+            else:
+                yield ('],' + _dumps(error)[1:]).encode('utf-8')
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            try:
+                self.cursor.close()
+            except Exception as e:
+                logger.warning(f"스트리밍 커서 정리 실패: {str(e)}")
+            if self.slot is not None:
+                self.slot.close()
+
+
+def _execute_plans(spec, schema, plans, using, chunk_size):
+    """
+    롤업 → 원본 테이블 순서로 서버 측 커서 실행
+
+    비용 검사(EXPLAIN)는 원본 테이블 쿼리를 실행할 때만 수행합니다
+    (롤업 조회가 성공하면 검사하지 않음 - 일반 조회의 execution_steps와 같음).
+
+    Returns:
+        (커서, 결과 컬럼, 조회한 테이블)
+    """
+    table_name = spec['table_name']
+    for index, (query, params, result_columns, source_table) in enumerate(plans):
+        if index == len(plans) - 1:
+            admit_query(spec, schema, query, params, allow_downgrade=False, using=using)
+
+        logger.info(
+            f"스트리밍 조회 쿼리 실행: {table_name} → {source_table} - "
+            f"제한 {spec.get('limit', 1000)}건, chunk {chunk_size}건"
+        )
+        logger.debug(f"쿼리: {query}, 파라미터: {params}")
+
+        cursor = open_server_side_cursor(using)
+        try:
+            cursor.execute(query, params)
+            return cursor, result_columns, source_table
+        except Exception as e:
+            cursor.close()
+            if index < len(plans) - 1:
+                logger.warning(
+                    f"롤업 조회 실패, 원본 테이블로 재시도: {source_table} - {str(e)}"
+                )
+                continue
+            logger.error(f"스트리밍 조회 실패: {table_name} - {str(e)}")
+            raise QueryError(
+                f'데이터 조회 중 오류 발생: {str(e)}',
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+def stream_query(spec, priority=DEFAULT_PRIORITY):
+    """
+    스트리밍 조회 시작
+
+    검증과 쿼리 실행(첫 응답 수신)까지는 응답 전에 수행하므로
+    이 단계의 오류는 일반 조회와 같은 상태 코드로 반환됩니다.
+    동시 실행 슬롯은 응답 전송이 끝날 때(QueryStream.close)까지 유지합니다.
+
+    Returns:
+        QueryStream
+
+    Raises:
+        QueryError: 검증 또는 실행 실패 (pyarrow 미설치 시 406, 동시 실행 대기 초과 시 503)
+    """
+    table_name = spec['table_name']
+    result_format = spec.get('format', 'rows')
+    schema = resolve_schema(table_name)
+    validate_columns(schema, spec)
+
+    logical_types = None
+    if result_format == 'arrow':
+        try:
+            arrow.ensure_available()
+        except arrow.ArrowUnavailable as e:
+            raise QueryError(str(e), status.HTTP_406_NOT_ACCEPTABLE)
+        logical_types = arrow.result_logical_types(spec, schema)
+
+    chunk_size = getattr(settings, 'DATA_QUERY_STREAM_CHUNK_SIZE', 2000)
+
+    # 읽기 복제본 선택 (서버 측 커서도 같은 연결에서 실행)
+    using = replica_router.read_alias(table_name)
+
+    # 롤업 라우팅 (실패 시 원본 테이블로 재시도) → 원본 테이블
+    plans = []
+    routed = route_query(spec, schema)
+    if routed is not None:
+        plans.append(routed)
+    query, params, result_columns = build_query(spec, schema)
+    plans.append((query, params, result_columns, table_name))
+
+    slot = ExitStack()
+    slot.enter_context(execution_slot(schema, priority))
+    try:
+        # 큰 IN 목록 임시 테이블 (서버 측 커서와 같은 연결, 스트림 종료 시 슬롯 반납 전에 삭제)
+        using = slot.enter_context(filter_tables(spec, using))
+        cursor, result_columns, source_table = _execute_plans(
+            spec, schema, plans, using, chunk_size
+        )
+    except QueryError:
+        slot.close()
+        raise
+    except Exception as e:
+        slot.close()
+        logger.error(f"스트리밍 조회 준비 실패: {table_name} - {str(e)}")
+        raise QueryError(
+            f'데이터 조회 중 오류 발생: {str(e)}',
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    return QueryStream(
+        cursor,
+        result_columns,
+        {'table_name': table_name, 'source_table': source_table},
+        result_format,
+        chunk_size,
+        logical_types,
+        slot,
+    )
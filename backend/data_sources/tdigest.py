@@ -0,0 +1,152 @@
+"""
+병합 가능한 백분위 스케치 (t-digest)
+
+값 분포를 (평균, 가중치) 중심점(centroid) 수십 개로 요약합니다.
+- 중심점 크기는 k1 척도 함수 k(q) = δ/2π · asin(2q - 1)로 제한되어
+  분포 양 끝(P1, P99)은 작은 중심점(단일 값)으로 남고 가운데만 크게 합쳐집니다.
+- 일별 스케치를 합쳐(merge) 주/월/연 백분위를 원본 행 없이 계산합니다.
+- 정렬 + 누적합 + reduceat으로 압축하므로 값/중심점 수에 대해 NumPy 벡터 연산만 사용합니다.
+- count, sum, min, max는 따로 보관하여 정확합니다 (AVG/SUM/COUNT/MIN/MAX도 스케치로 계산 가능).
+
+압축되지 않은(모든 중심점 가중치 1) 스케치의 백분위는
+정확한 선형 보간 백분위(numpy.percentile 기본값)와 같습니다.
+"""
+
+import struct
+
+import numpy as np
+
+# 기본 압축 계수 δ (중심점 수 ≈ δ/2 이하, 클수록 정확하고 큼)
+DEFAULT_COMPRESSION = 200
+
+# 직렬화 헤더: 형식 버전, count, sum, min, max, 중심점 수
+_HEADER = struct.Struct('<BQdddI')
+_VERSION = 1
+
+
+class TDigest:
+    """
+    t-digest 스케치
+
+    Attributes:
+        means: 중심점 평균 (오름차순 float64 배열)
+        weights: 중심점 가중치 (float64 배열, 합계 = count)
+        count / total / minimum / maximum: 정확한 요약값
+    """
+
+    __slots__ = ('means', 'weights', 'count', 'total', 'minimum', 'maximum')
+
+    def __init__(self, means, weights, count, total, minimum, maximum):
+        self.means = means
+        self.weights = weights
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0), np.empty(0), 0, 0.0, np.nan, np.nan)
+
+    @classmethod
+    def from_values(cls, values, compression=DEFAULT_COMPRESSION):
+        """
+        값 배열 → 스케치 (NULL/nan 제외)
+
+        Args:
+            values: 숫자 시퀀스 (None 허용)
+            compression: 압축 계수 δ
+        """
+        values = np.asarray(
+            [np.nan if value is None else value for value in values], dtype=float
+        )
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return cls.empty()
+
+        values.sort()
+        means, weights = _compress(values, np.ones(len(values)), compression)
+        return cls(
+            means, weights, len(values), float(values.sum()),
+            float(values[0]), float(values[-1]),
+        )
+
+    @classmethod
+    def merge(cls, digests, compression=DEFAULT_COMPRESSION):
+        """여러 스케치 → 하나의 스케치 (중심점 합친 뒤 재압축)"""
+        digests = [digest for digest in digests if digest.count]
+        if not digests:
+            return cls.empty()
+        if len(digests) == 1:
+            return digests[0]
+
+        means = np.concatenate([digest.means for digest in digests])
+        weights = np.concatenate([digest.weights for digest in digests])
+        order = np.argsort(means, kind='stable')
+        means, weights = _compress(means[order], weights[order], compression)
+        return cls(
+            means, weights,
+            sum(digest.count for digest in digests),
+            sum(digest.total for digest in digests),
+            min(digest.minimum for digest in digests),
+            max(digest.maximum for digest in digests),
+        )
+
+    def quantile(self, q):
+        """
+        q 분위수 추정 (0 ≤ q ≤ 1, 빈 스케치는 None)
+
+        중심점 i의 위치를 (앞 가중치 합 + w_i/2)로 두고 선형 보간합니다.
+        목표 위치는 q·(n-1) + 0.5이므로 단일 값 중심점만 있으면 정확한 백분위와 같습니다.
+        """
+        if not self.count:
+            return None
+
+        centers = np.cumsum(self.weights) - self.weights / 2
+        target = q * (self.count - 1) + 0.5
+        positions = np.concatenate(([0.0], centers, [float(self.count)]))
+        points = np.concatenate(([self.minimum], self.means, [self.maximum]))
+        return float(np.interp(target, positions, points))
+
+    def to_bytes(self):
+        """DB 저장용 바이트열 (헤더 + float64 평균 + uint32 가중치)"""
+        return (
+            _HEADER.pack(
+                _VERSION, self.count, self.total,
+                self.minimum, self.maximum, len(self.means),
+            )
+            + self.means.astype('<f8').tobytes()
+            + self.weights.astype('<u4').tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data):
+        """to_bytes() 결과 → 스케치"""
+        version, count, total, minimum, maximum, size = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f'지원하지 않는 스케치 형식 버전: {version}')
+
+        offset = _HEADER.size
+        means = np.frombuffer(data, dtype='<f8', count=size, offset=offset)
+        weights = np.frombuffer(
+            data, dtype='<u4', count=size, offset=offset + 8 * size
+        ).astype(float)
+        return cls(means, weights, count, total, minimum, maximum)
+
+
+def _compress(means, weights, compression):
+    """
+    정렬된 (평균, 가중치) → 압축된 중심점
+
+    각 점을 누적 분위수 중앙 q의 k1 척도 값 정수 구간으로 묶습니다.
+    한 구간의 k 폭이 1 이하이므로 t-digest 크기 제한을 만족합니다.
+    """
+    total = weights.sum()
+    quantiles = (np.cumsum(weights) - weights / 2) / total
+    scale = compression / (2 * np.pi) * np.arcsin(2 * quantiles - 1)
+    cluster = np.floor(scale - scale[0]).astype(np.int64)
+
+    starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+    cluster_weights = np.add.reduceat(weights, starts)
+    cluster_means = np.add.reduceat(means * weights, starts) / cluster_weights
+    return cluster_means, cluster_weights
@@ -1,3 +1,1380 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.db.utils import ConnectionHandler
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework.exceptions import ValidationError
+
+from . import async_query, query, replicas, streaming
+from .admission import (
+    PRIORITY_HEADER, AdmissionController, SlotPool, TicketQueue, admission_enabled, request_priority,
+)
+from .cache import (
+    FileStore, QueryResultCache, bump_data_version, data_version, make_cache_key, query_cache,
+)
+from .compiler import QueryCompiler, plan_key
+from .downsample import downsample_result, lttb_indices, minmax_indices
+from .filters import (
+    filter_clauses, filter_key, filter_params, filter_shape, filter_tables, temp_table_name,
+)
+from .gapfill import bucket_start, calendar, fill_result, format_buckets, parse_buckets
+from .indexes import ensure_indexes, explain, index_name_for
+from .models import DataSource, IndexRecommendation
+from .registry import DataSourceSchema, SampleSpec, schema_registry
+from .sampling import SampleTooSmall, build_sample_query, estimate_result
+from .serializers import DataQuerySerializer
+from .singleflight import single_flight
+from .tdigest import TDigest
+from .topn import DEFAULT_LABEL, GROUPS_COLUMN, OTHERS_COLUMN, apply_top_n
+
+FCC_SCHEMA = DataSourceSchema(
+    data_source_id=1,
+    name='FCC 데이터',
+    table_name='fcc_data',
+    columns=('cdate', 'fcc_group', 'fcc', 'classname', 'classid'),
+)
+
+
+def validated(payload):
+    serializer = DataQuerySerializer(data=payload)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+class SingleFlightTests(SimpleTestCase):
+    """동시에 들어온 같은 조회는 DB를 한 번만 조회"""
+
+    THREADS = 8
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        settings_override = override_settings(
+            DATA_QUERY_STATE_DIR=state_dir.name,
+            DATA_QUERY_COST_GUARD=False,
+            DATA_QUERY_REPLICA_ROUTING=False,
+            DATA_QUERY_SHAPE_TRACKING=False,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        query_cache.clear()
+        self.addCleanup(query_cache.clear)
+
+        patcher = mock.patch.object(query.schema_registry, 'get', return_value=FCC_SCHEMA)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run_concurrently(self, target):
+        barrier = threading.Barrier(self.THREADS)
+        results = [None] * self.THREADS
+        errors = []
+
+        def worker(index):
+            barrier.wait()
+            try:
+                results[index] = target()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual(errors, [])
+        return results
+
+    def _slow_fetch(self, query_sql, params, result_columns, using='default'):
+        # 나머지 스레드가 leader 실행 중에 도착하도록 대기
+        time.sleep(0.2)
+        return {'columns': list(result_columns), 'values': [['Mobile'], [3]], 'count': 1}
+
+    def test_do_runs_once(self):
+        fetch = mock.Mock(side_effect=self._slow_fetch)
+
+        def execute():
+            return fetch('SELECT 1', [], ['fcc_group', 'n'])
+
+        results = self._run_concurrently(lambda: single_flight.do('same-key', execute))
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False] + [True] * (self.THREADS - 1))
+        self.assertTrue(all(body == results[0][0] for body, _ in results))
+
+    def test_run_query_fetches_once(self):
+        spec = validated({
+            'table_name': 'fcc_data',
+            'date_column': 'cdate',
+            'columns': ['fcc_group'],
+            'aggregations': [{'column': 'fcc', 'function': 'COUNT', 'alias': 'n'}],
+        })
+
+        with mock.patch.object(query, 'fetch_rows', side_effect=self._slow_fetch) as fetch:
+            results = self._run_concurrently(lambda: query.run_query(spec, FCC_SCHEMA))
+
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(
+            sorted(result.cache_status for result in results),
+            sorted(['MISS'] + ['COALESCED'] * (self.THREADS - 1))
+        )
+        self.assertTrue(all(result.body == results[0].body for result in results))
+
+
+@unittest.skipUnless(connection.vendor == 'mysql', 'EXPLAIN 인덱스 사용 확인은 MySQL 전용')
+class BucketIndexExplainTests(TransactionTestCase):
+    """bucket 컬럼 + 추천 인덱스가 있으면 반 열린 날짜 범위 조회가 인덱스 사용"""
+
+    TABLE = 'test_fcc_explain'
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        settings_override = override_settings(DATA_QUERY_STATE_DIR=state_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        start = date(2025, 1, 1)
+        rows = [
+            (start + timedelta(days=day), ('Mobile', 'Desktop', 'Tablet')[i % 3], float(i))
+            for day in range(365) for i in range(10)
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE `{self.TABLE}` ("
+                f"`id` BIGINT AUTO_INCREMENT PRIMARY KEY, `cdate` DATE NOT NULL, "
+                f"`fcc_group` VARCHAR(20) NOT NULL, `fcc` DOUBLE NULL)"
+            )
+            cursor.executemany(
+                f"INSERT INTO `{self.TABLE}` (`cdate`, `fcc_group`, `fcc`) VALUES (%s, %s, %s)",
+                rows
+            )
+        self.addCleanup(self._drop_table)
+
+        data_source = DataSource.objects.create(name='EXPLAIN 테스트', table_name=self.TABLE)
+        call_command(
+            'create_bucket_columns', table=self.TABLE, date_column='cdate', periods='day',
+            stdout=StringIO()
+        )
+
+        self.covering_columns = ['cdate', 'cdate_day', 'fcc_group', 'fcc']
+        IndexRecommendation.objects.create(
+            data_source=data_source,
+            index_name=index_name_for(self.covering_columns),
+            columns=self.covering_columns,
+            status='applied',
+        )
+        self.assertEqual(ensure_indexes(self.TABLE), [index_name_for(self.covering_columns)])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE TABLE `{self.TABLE}`")
+            cursor.fetchall()
+        schema_registry.invalidate()
+
+    def _drop_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS `{self.TABLE}`")
+        schema_registry.invalidate()
+
+    def test_date_range_query_uses_index(self):
+        spec = validated({
+            'table_name': self.TABLE,
+            'date_column': 'cdate',
+            'start_date': '2025-03-01',
+            'end_date': '2025-03-07',
+            'group_by_period': 'day',
+            'columns': ['fcc_group'],
+            'aggregations': [{'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'}],
+        })
+        schema = schema_registry.get(self.TABLE)
+        sql, params, _ = query.build_query(spec, schema)
+
+        # 함수 표현식(DATE(cdate)) 대신 bucket 컬럼, 종료일은 다음 날 미만 (반 열린 구간)
+        self.assertIn('`cdate_day`', sql)
+        self.assertIn('`cdate` >= %s', sql)
+        self.assertIn('`cdate` < %s', sql)
+        self.assertEqual(params[:2], [date(2025, 3, 1), date(2025, 3, 8)])
+
+        plan = explain(sql, params)
+        self.assertTrue(plan['keys'])
+        self.assertIn(plan['keys'][0], {'idx_cdate', index_name_for(self.covering_columns)})
+
+
+
+class KeysetPaginationTests(TransactionTestCase):
+    """커서 페이지네이션: 같은 날짜가 여러 행이어도 (날짜, id) 순서로 빠짐없이, 커서 변조/재사용 거부"""
+
+    TABLE = 'test_fcc_pages'
+    SCHEMA = DataSourceSchema(
+        data_source_id=2,
+        name='페이지네이션 테스트',
+        table_name=TABLE,
+        columns=('id', 'cdate', 'fcc_group', 'fcc'),
+    )
+    # 날짜별 3~4행, id는 날짜 순서와 무관하게 배정
+    ROWS = [
+        (7, date(2025, 1, 1), 'Mobile', 1.0),
+        (2, date(2025, 1, 1), 'Desktop', 2.0),
+        (9, date(2025, 1, 1), 'Tablet', 3.0),
+        (4, date(2025, 1, 1), 'Mobile', 4.0),
+        (1, date(2025, 1, 2), 'Desktop', 5.0),
+        (8, date(2025, 1, 2), 'Tablet', 6.0),
+        (5, date(2025, 1, 2), 'Mobile', 7.0),
+        (3, date(2025, 1, 3), 'Desktop', 8.0),
+        (10, date(2025, 1, 3), 'Tablet', 9.0),
+        (6, date(2025, 1, 3), 'Mobile', 10.0),
+    ]
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        settings_override = override_settings(
+            DATA_QUERY_STATE_DIR=state_dir.name,
+            DATA_QUERY_COST_GUARD=False,
+            DATA_QUERY_REPLICA_ROUTING=False,
+            DATA_QUERY_SHAPE_TRACKING=False,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        query_cache.clear()
+        self.addCleanup(query_cache.clear)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE `{self.TABLE}` (`id` BIGINT PRIMARY KEY, `cdate` DATE NULL, "
+                f"`fcc_group` VARCHAR(20) NOT NULL, `fcc` DOUBLE NULL)"
+            )
+            cursor.executemany(
+                f"INSERT INTO `{self.TABLE}` (`id`, `cdate`, `fcc_group`, `fcc`) "
+                f"VALUES (%s, %s, %s, %s)",
+                self.ROWS + [(11, None, 'Mobile', 11.0)]
+            )
+        self.addCleanup(self._drop_table)
+
+        patcher = mock.patch.object(query.schema_registry, 'get', return_value=self.SCHEMA)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _drop_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS `{self.TABLE}`")
+
+    def _page(self, limit, cursor=None, **overrides):
+        payload = {
+            'table_name': self.TABLE,
+            'date_column': 'cdate',
+            'columns': ['id', 'cdate', 'fcc'],
+            'format': 'columnar',
+            'paginate': True,
+            'limit': limit,
+            **overrides,
+        }
+        if cursor is not None:
+            payload['cursor'] = cursor
+        return query.run_query(validated(payload), self.SCHEMA).body
+
+    def test_pages_across_equal_dates(self):
+        seen = []
+        cursor = None
+        for _ in range(len(self.ROWS)):
+            page = self._page(3, cursor)
+            self.assertEqual(page['columns'], ['id', 'cdate', 'fcc'])
+            self.assertLessEqual(page['count'], 3)
+            seen.extend(zip(page['data']['cdate'], page['data']['id']))
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        # 날짜가 NULL인 행은 제외, 나머지는 (날짜, id) 순서로 중복/누락 없이
+        expected = sorted((day, row_id) for row_id, day, _, _ in self.ROWS)
+        self.assertEqual([(str(day), row_id) for day, row_id in seen],
+                         [(day.isoformat(), row_id) for day, row_id in expected])
+
+    def test_last_page_has_no_cursor(self):
+        page = self._page(len(self.ROWS))
+        self.assertEqual(page['count'], len(self.ROWS))
+        self.assertIsNone(page['next_cursor'])
+
+        first = self._page(len(self.ROWS) - 1)
+        self.assertIsNotNone(first['next_cursor'])
+        last = self._page(len(self.ROWS) - 1, first['next_cursor'])
+        self.assertEqual(last['count'], 1)
+        self.assertIsNone(last['next_cursor'])
+
+    def test_tampered_cursor_rejected(self):
+        token = self._page(3)['next_cursor']
+        payload, signature = token.rsplit(':', 1)
+        tampered = f"{payload}:{signature[:-1]}{'A' if signature[-1] != 'A' else 'B'}"
+
+        for bad in (tampered, 'not-a-cursor'):
+            with self.subTest(cursor=bad), self.assertRaises(ValidationError) as raised:
+                self._page(3, bad)
+            self.assertIn('cursor', raised.exception.detail)
+
+    def test_cursor_from_other_query_rejected(self):
+        token = self._page(3)['next_cursor']
+
+        for overrides in ({'table_name': 'fcc_data'}, {'date_column': 'fcc'}):
+            with self.subTest(**overrides), self.assertRaises(ValidationError) as raised:
+                self._page(3, token, **overrides)
+            self.assertIn('cursor', raised.exception.detail)
+
+
+class TopNTests(SimpleTestCase):
+    """apply_top_n: "기타" 행 이름 지정, 보조 컬럼 제거, 합친 그룹 수"""
+
+    SPEC = {
+        'columns': ['classname'],
+        'aggregations': [{'column': 'fcc', 'function': 'COUNT', 'alias': 'n'}],
+        'top_n': 2,
+        'top_n_by': 'n',
+    }
+    RESULT = {
+        'columns': ['classname', 'n', OTHERS_COLUMN, GROUPS_COLUMN],
+        'values': [['A', 'B', 'C'], [5, 3, 4], [0, 0, 1], [1, 1, 7]],
+        'count': 3,
+    }
+
+    def test_others_row(self):
+        body = apply_top_n(self.RESULT, {**self.SPEC, 'top_n_label': 'Others'})
+        self.assertEqual(body['columns'], ['classname', 'n'])
+        self.assertEqual(body['values'], [['A', 'B', 'Others'], [5, 3, 4]])
+        self.assertEqual(body['count'], 3)
+        self.assertEqual(body['top_n'], {'n': 2, 'by': 'n', 'others_groups': 7})
+
+    def test_default_label(self):
+        body = apply_top_n(self.RESULT, self.SPEC)
+        self.assertEqual(body['values'][0][-1], DEFAULT_LABEL)
+
+    def test_drop_others_row(self):
+        body = apply_top_n(self.RESULT, {**self.SPEC, 'top_n_others': False})
+        self.assertEqual(body['values'], [['A', 'B'], [5, 3]])
+        self.assertEqual(body['count'], 2)
+        self.assertEqual(body['top_n']['others_groups'], 7)
+
+    def test_fewer_groups_than_n(self):
+        result = {
+            'columns': self.RESULT['columns'],
+            'values': [['A'], [5], [0], [1]],
+            'count': 1,
+        }
+        body = apply_top_n(result, self.SPEC)
+        self.assertEqual(body['values'], [['A'], [5]])
+        self.assertEqual(body['top_n']['others_groups'], 0)
+
+
+@unittest.skipUnless(connection.vendor == 'mysql', '상위 N개 + 기타 SQL(ROW_NUMBER) 확인은 MySQL 전용')
+class TopNQueryTests(TransactionTestCase):
+    """상위 N개 + "기타" SQL: AVG는 ΣSUM/ΣCOUNT, 동률은 그룹 컬럼 순, 기타 행 제외 옵션"""
+
+    TABLE = 'test_fcc_topn'
+    SCHEMA = DataSourceSchema(
+        data_source_id=3,
+        name='상위 N개 테스트',
+        table_name=TABLE,
+        columns=('id', 'cdate', 'classname', 'fcc'),
+    )
+    # C와 D는 건수 동률(2) → 이름 순으로 C가 3위, D는 기타 (D의 NULL은 COUNT/AVG에서 제외)
+    GROUPS = {
+        'A': [1.0, 2.0, 3.0, 4.0, 5.0],
+        'B': [10.0, 20.0, 30.0],
+        'D': [1.0, 1.0, None],
+        'C': [7.0, 9.0],
+        'E': [100.0],
+        'F': [4.0],
+    }
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        settings_override = override_settings(
+            DATA_QUERY_STATE_DIR=state_dir.name,
+            DATA_QUERY_COST_GUARD=False,
+            DATA_QUERY_REPLICA_ROUTING=False,
+            DATA_QUERY_SHAPE_TRACKING=False,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        query_cache.clear()
+        self.addCleanup(query_cache.clear)
+
+        rows = [
+            (row_id, date(2025, 1, 1), classname, value)
+            for row_id, (classname, value) in enumerate(
+                ((classname, value) for classname, values in self.GROUPS.items() for value in values),
+                start=1,
+            )
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE `{self.TABLE}` (`id` BIGINT PRIMARY KEY, `cdate` DATE NOT NULL, "
+                f"`classname` VARCHAR(20) NOT NULL, `fcc` DOUBLE NULL)"
+            )
+            cursor.executemany(
+                f"INSERT INTO `{self.TABLE}` (`id`, `cdate`, `classname`, `fcc`) "
+                f"VALUES (%s, %s, %s, %s)",
+                rows
+            )
+        self.addCleanup(self._drop_table)
+
+        patcher = mock.patch.object(query.schema_registry, 'get', return_value=self.SCHEMA)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _drop_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS `{self.TABLE}`")
+
+    def _run(self, **overrides):
+        spec = validated({
+            'table_name': self.TABLE,
+            'date_column': 'cdate',
+            'columns': ['classname'],
+            'aggregations': [
+                {'column': 'fcc', 'function': 'COUNT', 'alias': 'n'},
+                {'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'},
+                {'column': 'fcc', 'function': 'MAX', 'alias': 'max_fcc'},
+            ],
+            'top_n': 3,
+            'top_n_by': 'n',
+            'format': 'columnar',
+            **overrides,
+        })
+        return query.run_query(spec, self.SCHEMA).body
+
+    def test_top_n_with_others(self):
+        body = self._run()
+
+        self.assertEqual(body['columns'], ['classname', 'n', 'avg_fcc', 'max_fcc'])
+        self.assertEqual(body['data']['classname'], ['A', 'B', 'C', DEFAULT_LABEL])
+        self.assertEqual([int(n) for n in body['data']['n']], [5, 3, 2, 4])
+        # 기타 AVG = (1 + 1 + 100 + 4) / 4 (그룹 평균의 평균 35가 아님)
+        self.assertEqual([float(avg) for avg in body['data']['avg_fcc']], [3.0, 20.0, 8.0, 26.5])
+        self.assertEqual([float(value) for value in body['data']['max_fcc']], [5.0, 30.0, 9.0, 100.0])
+        self.assertEqual(body['top_n'], {'n': 3, 'by': 'n', 'others_groups': 3})
+
+    def test_without_others_row(self):
+        body = self._run(top_n_others=False)
+
+        self.assertEqual(body['data']['classname'], ['A', 'B', 'C'])
+        self.assertEqual(body['top_n']['others_groups'], 3)
+
+
+class FilterTests(SimpleTestCase):
+    """필터 정규화는 조건 순서와 무관 (캐시/실행 계획 키 동일), 구조가 바뀌면 실행 계획 키도 바뀜"""
+
+    BASE = {
+        'table_name': 'fcc_data',
+        'date_column': 'cdate',
+        'columns': ['fcc_group'],
+        'aggregations': [{'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'}],
+    }
+
+    def _spec(self, filters):
+        return validated({**self.BASE, 'filters': filters})
+
+    def test_normalization_is_order_independent(self):
+        first = self._spec([
+            {'column': 'fcc_group', 'op': 'in', 'values': ['Tablet', 'Mobile', 'Tablet']},
+            {'column': 'fcc', 'op': 'range', 'min': 0, 'max': 5000},
+            {'column': 'classid', 'op': 'is_null', 'value': False},
+        ])
+        second = self._spec([
+            {'column': 'classid', 'op': 'is_null', 'value': False},
+            {'column': 'fcc', 'op': 'range', 'max': 5000, 'min': 0},
+            {'column': 'fcc_group', 'op': 'in', 'values': ['Mobile', 'Tablet']},
+            {'column': 'fcc_group', 'op': 'in', 'values': ['Mobile', 'Tablet']},
+        ])
+
+        self.assertEqual(first['filters'], second['filters'])
+        self.assertEqual(make_cache_key(first, 1), make_cache_key(second, 1))
+        self.assertEqual(plan_key(first), plan_key(second))
+        self.assertEqual(filter_key(first), filter_key(second))
+
+    def test_plan_reused_across_filter_values(self):
+        compiler = QueryCompiler()
+        first = self._spec([{'column': 'fcc_group', 'op': 'in', 'values': ['Mobile', 'Tablet']}])
+        second = self._spec([{'column': 'fcc_group', 'op': 'in', 'values': ['Desktop', 'Mobile']}])
+
+        plan = compiler.compile(first)
+        self.assertIs(compiler.compile(second), plan)
+        self.assertEqual(plan.bind(first)[1], ['Mobile', 'Tablet', 1000])
+        self.assertEqual(plan.bind(second)[1], ['Desktop', 'Mobile', 1000])
+
+        # IN 목록 크기가 다르면 자리표시자 수가 다르므로 다른 실행 계획
+        third = self._spec([{'column': 'fcc_group', 'op': 'in', 'values': ['Mobile']}])
+        self.assertNotEqual(plan_key(third), plan_key(first))
+
+    def test_shape_changes_at_temp_table_threshold(self):
+        with override_settings(DATA_QUERY_FILTER_TEMP_TABLE_MIN=3):
+            below = self._spec([{'column': 'classname', 'op': 'not_in', 'values': ['a', 'b']}])
+            at = self._spec([{'column': 'classname', 'op': 'not_in', 'values': ['a', 'b', 'c']}])
+
+            self.assertEqual(filter_shape(below), (('classname', 'not_in', 2),))
+            self.assertEqual(filter_shape(at), (('classname', 'not_in', 'table'),))
+            self.assertNotEqual(plan_key(below), plan_key(at))
+
+            self.assertEqual(filter_clauses(below), ['`classname` NOT IN (%s, %s)'])
+            self.assertEqual(filter_params(below), ['a', 'b'])
+            self.assertEqual(
+                filter_clauses(at), [f'`classname` NOT IN (SELECT `value` FROM `{temp_table_name(0)}`)']
+            )
+            self.assertEqual(filter_params(at), [])
+
+
+class FilterQueryTests(TransactionTestCase):
+    """연산자별 WHERE 조건과 파라미터 순서가 맞는지 실제 조회로 확인 (IN 목록 자리표시자/임시 테이블 모두)"""
+
+    TABLE = 'test_fcc_filters'
+    SCHEMA = DataSourceSchema(
+        data_source_id=4,
+        name='필터 테스트',
+        table_name=TABLE,
+        columns=('id', 'cdate', 'fcc_group', 'fcc', 'classid'),
+    )
+    ROWS = [
+        (1, 'Mobile', 10.0, 'c1'),
+        (2, 'Desktop', 20.0, None),
+        (3, 'Tablet', 30.0, 'c3'),
+        (4, 'Mobile', 40.0, None),
+        (5, 'Desktop', 50.0, 'c5'),
+        (6, 'Tablet', None, 'c6'),
+    ]
+    # (필터 목록, 기대 id 집합)
+    CASES = [
+        ([{'column': 'fcc_group', 'op': 'eq', 'value': 'Mobile'}], {1, 4}),
+        ([{'column': 'fcc_group', 'op': 'in', 'values': ['Mobile', 'Tablet', 'TV']}], {1, 3, 4, 6}),
+        ([{'column': 'fcc_group', 'op': 'not_in', 'values': ['Mobile', 'TV', 'Phone']}], {2, 3, 5, 6}),
+        ([{'column': 'fcc', 'op': 'range', 'min': 20, 'max': 40}], {2, 3, 4}),
+        ([{'column': 'fcc', 'op': 'range', 'min': 35}], {4, 5}),
+        ([{'column': 'fcc', 'op': 'range', 'max': 20}], {1, 2}),
+        ([{'column': 'classid', 'op': 'is_null', 'value': True}], {2, 4}),
+        ([{'column': 'classid', 'op': 'is_null', 'value': False}], {1, 3, 5, 6}),
+        (
+            [
+                {'column': 'fcc', 'op': 'range', 'min': 15},
+                {'column': 'fcc_group', 'op': 'not_in', 'values': ['Tablet', 'TV', 'Phone']},
+                {'column': 'classid', 'op': 'is_null', 'value': False},
+                {'column': 'fcc_group', 'op': 'in', 'values': ['Desktop', 'Mobile', 'Tablet']},
+                {'column': 'fcc', 'op': 'range', 'max': 45},
+                {'column': 'id', 'op': 'eq', 'value': 5},
+            ],
+            set(),
+        ),
+        (
+            [
+                {'column': 'fcc', 'op': 'range', 'min': 15, 'max': 60},
+                {'column': 'fcc_group', 'op': 'not_in', 'values': ['Tablet', 'TV', 'Phone']},
+                {'column': 'classid', 'op': 'is_null', 'value': False},
+                {'column': 'fcc_group', 'op': 'in', 'values': ['Desktop', 'Mobile', 'Tablet']},
+            ],
+            {5},
+        ),
+    ]
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        settings_override = override_settings(
+            DATA_QUERY_STATE_DIR=state_dir.name,
+            DATA_QUERY_COST_GUARD=False,
+            DATA_QUERY_REPLICA_ROUTING=False,
+            DATA_QUERY_SHAPE_TRACKING=False,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        query_cache.clear()
+        self.addCleanup(query_cache.clear)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE `{self.TABLE}` (`id` BIGINT PRIMARY KEY, `cdate` DATE NOT NULL, "
+                f"`fcc_group` VARCHAR(20) NOT NULL, `fcc` DOUBLE NULL, `classid` VARCHAR(20) NULL)"
+            )
+            cursor.executemany(
+                f"INSERT INTO `{self.TABLE}` (`id`, `cdate`, `fcc_group`, `fcc`, `classid`) "
+                f"VALUES (%s, %s, %s, %s, %s)",
+                [(row_id, date(2025, 1, 1), *rest) for row_id, *rest in self.ROWS]
+            )
+        self.addCleanup(self._drop_table)
+
+        patcher = mock.patch.object(query.schema_registry, 'get', return_value=self.SCHEMA)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _drop_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS `{self.TABLE}`")
+
+    def _spec(self, filters):
+        return validated({
+            'table_name': self.TABLE,
+            'date_column': 'cdate',
+            'columns': ['id'],
+            'filters': filters,
+            'format': 'columnar',
+        })
+
+    def _ids(self, filters):
+        return set(query.run_query(self._spec(filters), self.SCHEMA).body['data']['id'])
+
+    def _temp_table_exists(self, name):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM `{name}`")
+                cursor.fetchall()
+        except Exception:
+            return False
+        return True
+
+    def test_clauses_and_params_line_up(self):
+        for threshold in (200, 3):
+            with override_settings(DATA_QUERY_FILTER_TEMP_TABLE_MIN=threshold):
+                query_cache.clear()
+                for filters, expected in self.CASES:
+                    with self.subTest(threshold=threshold, filters=filters):
+                        self.assertEqual(self._ids(filters), expected)
+
+    def test_temp_tables_dropped_on_exit(self):
+        filters = [
+            {'column': 'fcc_group', 'op': 'in', 'values': ['Mobile', 'Tablet', 'TV']},
+            {'column': 'fcc_group', 'op': 'not_in', 'values': ['Mobile', 'TV', 'Phone']},
+        ]
+        with override_settings(DATA_QUERY_FILTER_TEMP_TABLE_MIN=3):
+            spec = self._spec(filters)
+            names = [temp_table_name(0), temp_table_name(1)]
+
+            with filter_tables(spec) as using:
+                self.assertEqual(using, DEFAULT_DB_ALIAS)
+                self.assertTrue(all(self._temp_table_exists(name) for name in names))
+            self.assertFalse(any(self._temp_table_exists(name) for name in names))
+
+            # 조회 중 오류가 나도 삭제
+            with self.assertRaises(RuntimeError):
+                with filter_tables(spec):
+                    raise RuntimeError('query failed')
+            self.assertFalse(any(self._temp_table_exists(name) for name in names))
+
+class TDigestTests(SimpleTestCase):
+    """
+    t-digest 백분위 정확도 (기본 압축 계수 200)
+
+    추정값의 순위 오차 |rank(추정값) - q| ≤ 0.002, 값 오차는 정확한 백분위의 2% 이내
+    (로그정규분포 10만 개, 1개 스케치 및 30개 스케치 병합)
+    """
+
+    QUANTILES = (0.5, 0.75, 0.95, 0.99)
+    MAX_RANK_ERROR = 0.002
+    MAX_RELATIVE_ERROR = 0.02
+
+    def setUp(self):
+        rng = np.random.default_rng(20250101)
+        self.values = rng.lognormal(mean=3, sigma=1, size=100_000)
+        self.sorted_values = np.sort(self.values)
+
+    def assertAccurate(self, digest):
+        self.assertEqual(digest.count, len(self.values))
+        self.assertAlmostEqual(digest.total, float(self.values.sum()), delta=1e-6 * digest.total)
+        self.assertEqual(digest.minimum, self.sorted_values[0])
+        self.assertEqual(digest.maximum, self.sorted_values[-1])
+
+        for q in self.QUANTILES:
+            with self.subTest(q=q):
+                estimate = digest.quantile(q)
+                exact = np.percentile(self.values, q * 100)
+                rank = np.searchsorted(self.sorted_values, estimate) / len(self.values)
+                self.assertLessEqual(abs(rank - q), self.MAX_RANK_ERROR)
+                self.assertLessEqual(abs(estimate - exact) / exact, self.MAX_RELATIVE_ERROR)
+
+    def test_from_values(self):
+        digest = TDigest.from_values(self.values)
+        self.assertLess(len(digest.means), 200)
+        self.assertAccurate(digest)
+
+    def test_merge(self):
+        # 일별 스케치 30개 → 월 스케치
+        digests = [TDigest.from_values(part) for part in np.array_split(self.values, 30)]
+        self.assertAccurate(TDigest.merge(digests))
+
+    def test_bytes_round_trip(self):
+        digest = TDigest.from_values(self.values)
+        restored = TDigest.from_bytes(digest.to_bytes())
+
+        np.testing.assert_array_equal(restored.means, digest.means)
+        np.testing.assert_array_equal(restored.weights, digest.weights)
+        self.assertEqual(
+            (restored.count, restored.total, restored.minimum, restored.maximum),
+            (digest.count, digest.total, digest.minimum, digest.maximum)
+        )
+        for q in self.QUANTILES:
+            self.assertEqual(restored.quantile(q), digest.quantile(q))
+
+    def test_uncompressed_matches_exact_percentile(self):
+        # 값이 적으면 모든 중심점 가중치가 1 → numpy.percentile(선형 보간)과 같음
+        values = [3.0, None, 1.0, 7.5, 2.0, 10.0, 4.0]
+        digest = TDigest.from_values(values)
+        present = [value for value in values if value is not None]
+
+        self.assertTrue(np.all(digest.weights == 1))
+        for q in (0.0, 0.1, 0.5, 0.75, 0.95, 0.99, 1.0):
+            self.assertAlmostEqual(digest.quantile(q), np.percentile(present, q * 100), places=12)
+
+    def test_empty(self):
+        digest = TDigest.merge([TDigest.from_values([None]), TDigest.empty()])
+        self.assertEqual(digest.count, 0)
+        self.assertIsNone(digest.quantile(0.5))
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    """지연 인지 복제본 선택 (SQLite default + analytics, 복제 설정 없음 → 지연 0)"""
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        self.state_dir = Path(state_dir.name)
+        settings_override = override_settings(
+            DATA_QUERY_STATE_DIR=state_dir.name,
+            DATA_QUERY_REPLICA_ROUTING=True,
+            DATA_QUERY_REPLICA_CHECK_INTERVAL=60,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.connections = ConnectionHandler({
+            DEFAULT_DB_ALIAS: {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': str(self.state_dir / 'primary.sqlite3'),
+            },
+            replicas.ANALYTICS_ALIAS: {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': str(self.state_dir / 'replica.sqlite3'),
+            },
+        })
+        self.addCleanup(self.connections.close_all)
+        self.router = replicas.ReplicaRouter()
+
+        for target, value in (
+            ('connections', self.connections),
+            ('replica_router', self.router),
+            ('replica_aliases', mock.Mock(return_value=[replicas.ANALYTICS_ALIAS])),
+        ):
+            patcher = mock.patch.object(replicas, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _age_writes(self, seconds):
+        """기록된 쓰기 스탬프(데이터 버전, 스키마 세대)를 seconds초 전으로"""
+        for stamp in self.state_dir.glob('*.stamp'):
+            written = stamp.stat().st_mtime_ns - int(seconds * 1e9)
+            os.utime(stamp, ns=(written, written))
+
+    def test_old_write_reads_replica(self):
+        bump_data_version('fcc_data')
+        self._age_writes(60)
+
+        self.assertEqual(self.router.read_alias('fcc_data'), replicas.ANALYTICS_ALIAS)
+        stats = self.router.stats()
+        self.assertEqual(stats['primary_reads'], 0)
+        self.assertEqual(stats['replicas'][replicas.ANALYTICS_ALIAS]['lag'], 0.0)
+        self.assertEqual(stats['replicas'][replicas.ANALYTICS_ALIAS]['routed'], 1)
+
+    def test_recent_write_falls_back_stale(self):
+        self.assertEqual(self.router.read_alias('fcc_data'), replicas.ANALYTICS_ALIAS)
+
+        # 적재 직후: 마지막 상태 확인 이후의 쓰기는 복제본에 반영되었다고 볼 수 없음
+        bump_data_version('fcc_data')
+        self.assertEqual(self.router.read_alias('fcc_data'), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.router.stats()['fallbacks'], {'down': 0, 'lagging': 0, 'stale': 1})
+
+        # 다른 테이블은 영향 없음
+        self.assertEqual(self.router.read_alias('other_table'), replicas.ANALYTICS_ALIAS)
+
+    def test_connect_failure_falls_back_down(self):
+        self.assertEqual(self.router.read_alias('fcc_data'), replicas.ANALYTICS_ALIAS)
+
+        # 상태 확인 이후 복제본 접속 불가 (없는 디렉토리의 DB 파일)
+        replica = self.connections[replicas.ANALYTICS_ALIAS]
+        replica.close()
+        replica.settings_dict['NAME'] = str(self.state_dir / 'missing' / 'replica.sqlite3')
+
+        connection_used = replicas.read_connection(replicas.ANALYTICS_ALIAS)
+        self.assertIs(connection_used, self.connections[DEFAULT_DB_ALIAS])
+
+        # 다음 확인 주기까지 제외
+        self.assertEqual(self.router.read_alias('fcc_data'), DEFAULT_DB_ALIAS)
+        stats = self.router.stats()
+        self.assertEqual(stats['fallbacks']['down'], 2)
+        self.assertFalse(stats['replicas'][replicas.ANALYTICS_ALIAS]['healthy'])
+        self.assertIsNotNone(stats['replicas'][replicas.ANALYTICS_ALIAS]['error'])
+
+
+class RequestPriorityTests(SimpleTestCase):
+    """우선순위는 서버에서 결정, X-Query-Priority 헤더는 낮출 때만 적용"""
+
+    def _priority(self, user, header=None):
+        headers = {PRIORITY_HEADER: header} if header is not None else {}
+        request = RequestFactory().post('/api/data-sources/query/', headers=headers)
+        request.user = user
+        return request_priority(request)
+
+    def test_anonymous_cannot_raise_priority(self):
+        self.assertEqual(self._priority(AnonymousUser()), 'viewer')
+        self.assertEqual(self._priority(AnonymousUser(), 'interactive'), 'viewer')
+        self.assertEqual(self._priority(AnonymousUser(), 'unknown'), 'viewer')
+        self.assertEqual(self._priority(AnonymousUser(), ' Batch '), 'batch')
+
+    def test_staff_session_is_interactive(self):
+        staff = User(username='editor', is_staff=True)
+        self.assertEqual(self._priority(staff), 'interactive')
+        self.assertEqual(self._priority(staff, 'viewer'), 'viewer')
+        self.assertEqual(self._priority(staff, 'batch'), 'batch')
+
+        # 로그인했지만 staff가 아니면 viewer
+        self.assertEqual(self._priority(User(username='reader'), 'interactive'), 'viewer')
+
+
+@unittest.skipUnless(admission_enabled(), 'fcntl 잠금 파일이 필요합니다')
+class AdmissionFifoTests(SimpleTestCase):
+    """같은 우선순위의 대기자는 도착 순서대로 실행, 새 요청은 대기자를 앞지르지 못함"""
+
+    WAITERS = 5
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        settings_override = override_settings(
+            DATA_QUERY_STATE_DIR=state_dir.name,
+            DATA_QUERY_MAX_CONCURRENT=1,
+            DATA_QUERY_MAX_CONCURRENT_PER_SOURCE=1,
+            DATA_QUERY_QUEUE_TIMEOUT_MS=10000,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.controller = AdmissionController()
+
+    def _wait_for_waiting(self, count):
+        deadline = time.monotonic() + 5
+        while self.controller.waiting < count:
+            self.assertLess(time.monotonic(), deadline, '대기열 진입 시간 초과')
+            time.sleep(0.001)
+
+    def test_waiters_admitted_in_arrival_order(self):
+        admitted = []
+
+        def waiter(index):
+            with self.controller.slot(FCC_SCHEMA):
+                admitted.append(index)
+                time.sleep(0.005)
+
+        threads = []
+        with self.controller.slot(FCC_SCHEMA):
+            for index in range(self.WAITERS):
+                thread = threading.Thread(target=waiter, args=(index,))
+                thread.start()
+                threads.append(thread)
+                self._wait_for_waiting(index + 1)
+
+        # 슬롯 반환 직후 들어온 새 요청도 앞선 대기자 뒤에서 실행
+        with self.controller.slot(FCC_SCHEMA):
+            admitted.append('late')
+
+        for thread in threads:
+            thread.join()
+        self.assertEqual(admitted, [*range(self.WAITERS), 'late'])
+
+    def test_async_waiters_admitted_in_arrival_order(self):
+        admitted = []
+
+        async def waiter(index):
+            async with self.controller.aslot(FCC_SCHEMA):
+                admitted.append(index)
+                await asyncio.sleep(0.005)
+
+        async def scenario():
+            tasks = []
+            async with self.controller.aslot(FCC_SCHEMA):
+                for index in range(self.WAITERS):
+                    tasks.append(asyncio.create_task(waiter(index)))
+                    while self.controller.waiting < index + 1:
+                        await asyncio.sleep(0.001)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(asyncio.wait_for(scenario(), 10))
+        self.assertEqual(admitted, list(range(self.WAITERS)))
+
+    def test_abandoned_tickets_are_skipped(self):
+        queue = TicketQueue('fifo-test.viewer')
+        head, middle, last, tail = (queue.take() for _ in range(4))
+        self.assertTrue(queue.is_turn(head[0]))
+        self.assertFalse(queue.is_turn(last[0]))
+
+        # 중간 대기자들이 번호표를 반납하지 않고 사라짐 (프로세스 종료와 같음 - 잠금만 풀림)
+        SlotPool.release(middle[1])
+        SlotPool.release(last[1])
+        self.assertFalse(queue.is_turn(tail[0]))
+
+        queue.leave(*head)
+        self.assertTrue(queue.is_turn(tail[0]))
+        queue.leave(*tail)
+
+        newcomer = queue.take()
+        self.assertTrue(queue.is_turn(newcomer[0]))
+        queue.leave(*newcomer)
+
+
+class QueryCacheTests(SimpleTestCase):
+    """캐시 키 (데이터 버전, 결과와 무관한 필드) + L1 LRU 한도 + L2 파일 저장소 한도"""
+
+    SPEC = {
+        'table_name': 'fcc_data',
+        'date_column': 'cdate',
+        'columns': ['fcc_group'],
+        'aggregations': [{'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'}],
+    }
+    BODY = {'columns': ['fcc_group', 'avg_fcc'], 'values': [['Mobile'], [1.5]], 'count': 1}
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        self.state_dir = Path(state_dir.name)
+        settings_override = override_settings(DATA_QUERY_STATE_DIR=state_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _size(self, value):
+        return len(json.dumps(value, cls=DjangoJSONEncoder).encode('utf-8'))
+
+    def test_bump_data_version_invalidates(self):
+        cache = QueryResultCache(max_entries=8, max_bytes=1024 * 1024)
+        key = make_cache_key(self.SPEC, data_version('fcc_data'))
+        cache.set(key, self.BODY)
+        self.assertEqual(cache.get(make_cache_key(self.SPEC, data_version('fcc_data'))), self.BODY)
+
+        bump_data_version('fcc_data')
+        bumped_key = make_cache_key(self.SPEC, data_version('fcc_data'))
+        self.assertNotEqual(bumped_key, key)
+        self.assertIsNone(cache.get(bumped_key))
+
+    def test_result_independent_keys_share_entry(self):
+        key = make_cache_key(self.SPEC, 1)
+        variants = [
+            {'format': 'csv'},
+            {'stream': True},
+            {'max_points': 100, 'downsample': 'minmax'},
+            {'fill': {'method': 'zero'}},
+        ]
+        for variant in variants:
+            self.assertEqual(make_cache_key({**self.SPEC, **variant}, 1), key)
+
+        self.assertNotEqual(make_cache_key({**self.SPEC, 'limit': 10}, 1), key)
+        self.assertNotEqual(make_cache_key(self.SPEC, 2), key)
+
+    def test_lru_entry_bound(self):
+        cache = QueryResultCache(max_entries=2, max_bytes=1024 * 1024)
+        cache.set('a', self.BODY)
+        cache.set('b', self.BODY)
+        cache.get('a')  # a가 최근 사용 → b가 가장 오래됨
+        cache.set('c', self.BODY)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), self.BODY)
+        self.assertEqual(cache.get('c'), self.BODY)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_lru_byte_bound(self):
+        size = self._size(self.BODY)
+        cache = QueryResultCache(max_entries=100, max_bytes=size * 2 + size // 2)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, self.BODY)
+
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertLessEqual(stats['bytes'], stats['max_bytes'])
+        self.assertIsNone(cache.get('a'))
+
+        # 단일 항목이 한도를 넘으면 L1에 저장하지 않음
+        large = {**self.BODY, 'values': [['x' * (size * 3)], [1.0]]}
+        cache.set('large', large)
+        self.assertIsNone(cache.get('large'))
+
+    def _file_store_keys(self, location):
+        return sorted(path.stem for path in Path(location).glob('*.json'))
+
+    def _age(self, store, key, seconds):
+        path = store._path(key)
+        mtime = time.time() - seconds
+        os.utime(path, (mtime, mtime))
+
+    def test_file_store_evicts_oldest_over_entry_bound(self):
+        store = FileStore(self.state_dir / 'l2', timeout=3600, max_entries=2)
+        for age, key in ((30, 'a'), (20, 'b')):
+            store.set(key, self.BODY)
+            self._age(store, key, age)
+        store.set('c', self.BODY)
+
+        self.assertEqual(self._file_store_keys(store.location), ['b', 'c'])
+        self.assertIsNone(store.get('a'))
+
+    def test_file_store_evicts_oldest_over_byte_bound(self):
+        size = self._size(self.BODY)
+        store = FileStore(self.state_dir / 'l2', timeout=3600, max_bytes=size * 2)
+        for age, key in ((30, 'a'), (20, 'b')):
+            store.set(key, self.BODY)
+            self._age(store, key, age)
+        store.set('c', self.BODY)
+
+        self.assertEqual(self._file_store_keys(store.location), ['b', 'c'])
+
+    def test_file_store_sweeps_expired_on_write(self):
+        store = FileStore(self.state_dir / 'l2', timeout=60)
+        store.set('old', self.BODY)
+        self._age(store, 'old', 120)
+        leftover = store.location / 'crashed.123.456.tmp'
+        leftover.write_text('{}', encoding='utf-8')
+        os.utime(leftover, (time.time() - 120, time.time() - 120))
+        other = store.location / 'stripe.lock'
+        other.touch()
+        os.utime(other, (time.time() - 120, time.time() - 120))
+
+        store.set('new', self.BODY)
+
+        self.assertEqual(self._file_store_keys(store.location), ['new'])
+        self.assertFalse(leftover.exists())
+        # JSON/임시 파일이 아닌 파일(동일 조회 잠금 파일 등)은 남겨둠
+        self.assertTrue(other.exists())
+
+
+class SampleEstimateTests(SimpleTestCase):
+    """샘플 집계 결과 보정 (결과가 없으면 빈 결과, 실제 그룹만 최소 행 수 검사)"""
+
+    SAMPLE = SampleSpec(sample_id=1, table_name='sample_1', rate=0.5, date_column='cdate')
+
+    def _estimate(self, spec, rows):
+        _, _, result_columns = build_sample_query(spec, self.SAMPLE)
+        values = [list(column) for column in zip(*rows)] or [[] for _ in result_columns]
+        return estimate_result(
+            {'columns': result_columns, 'values': values, 'count': len(rows)}, spec, self.SAMPLE
+        )
+
+    def _spec(self, columns):
+        return {
+            'table_name': 'fcc_data',
+            'date_column': 'cdate',
+            'columns': columns,
+            'aggregations': [
+                {'column': 'fcc', 'function': 'COUNT', 'alias': 'n'},
+                {'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'},
+            ],
+        }
+
+    def test_no_groups_returns_empty_result(self):
+        result = self._estimate(self._spec(['fcc_group']), [])
+
+        self.assertEqual(result['count'], 0)
+        self.assertEqual(result['columns'], [
+            'fcc_group', 'n', 'n_lower', 'n_upper', 'avg_fcc', 'avg_fcc_lower', 'avg_fcc_upper'
+        ])
+        self.assertEqual(result['values'], [[]] * 7)
+        self.assertEqual(result['accuracy']['sample_rows'], 0)
+
+    def test_ungrouped_without_sample_rows_is_zero(self):
+        # 그룹화 없는 집계: (샘플 행 수, COUNT(fcc), AVG 보조 COUNT/SUM/제곱합)
+        result = self._estimate(self._spec([]), [(0, 0, 0, None, None)])
+
+        values = dict(zip(result['columns'], result['values']))
+        self.assertEqual((values['n'], values['n_lower'], values['n_upper']), ([0], [0], [0]))
+        self.assertEqual(values['avg_fcc'], [None])
+
+    def test_small_group_is_rejected(self):
+        with override_settings(DATA_QUERY_SAMPLE_MIN_ROWS=100):
+            with self.assertRaises(SampleTooSmall):
+                self._estimate(self._spec(['fcc_group']), [
+                    ('Mobile', 500, 500, 500, 1000.0, 3000.0),
+                    ('Tablet', 5, 5, 5, 10.0, 30.0),
+                ])
+
+
+@override_settings(DATA_QUERY_COST_GUARD=False, DATA_QUERY_SHAPE_TRACKING=False)
+class ExecutionStepsTests(SimpleTestCase):
+    """동기/비동기 실행기가 같은 실행 계획(execution_steps)으로 같은 결과"""
+
+    SPEC = {
+        'table_name': 'fcc_data',
+        'date_column': 'cdate',
+        'columns': ['fcc_group'],
+        'aggregations': [{'column': 'fcc', 'function': 'COUNT', 'alias': 'n'}],
+        'limit': 10,
+    }
+
+    def _run_both(self, fetch):
+        async def fetch_async(*args):
+            return fetch(*args)
+
+        with mock.patch.object(query, 'fetch_rows', side_effect=fetch) as sync_fetch:
+            sync_body = query.run_steps(query.execution_steps(self.SPEC, FCC_SCHEMA, 'default'), 'default')
+        with mock.patch.object(async_query, 'fetch_rows_async', side_effect=fetch_async) as async_fetch:
+            async_body = asyncio.run(async_query.run_steps_async(
+                query.execution_steps(self.SPEC, FCC_SCHEMA, 'default'), 'default'
+            ))
+        self.assertEqual(sync_fetch.call_args, async_fetch.call_args)
+        return sync_body, async_body
+
+    def test_same_body(self):
+        def fetch(sql, params, result_columns, using):
+            return {'columns': list(result_columns), 'values': [['Mobile'], [3]], 'count': 1}
+
+        sync_body, async_body = self._run_both(fetch)
+        self.assertEqual(sync_body, async_body)
+        self.assertEqual(sync_body['source_table'], 'fcc_data')
+        self.assertEqual(sync_body['values'], [['Mobile'], [3]])
+
+    def test_fetch_error_is_query_error(self):
+        def fetch(sql, params, result_columns, using):
+            raise RuntimeError('connection lost')
+
+        for run in (
+            lambda: query.run_steps(query.execution_steps(self.SPEC, FCC_SCHEMA, 'default'), 'default'),
+            lambda: asyncio.run(async_query.run_steps_async(
+                query.execution_steps(self.SPEC, FCC_SCHEMA, 'default'), 'default'
+            )),
+        ):
+            with mock.patch.object(query, 'fetch_rows', side_effect=fetch), \
+                    mock.patch.object(async_query, 'fetch_rows_async', side_effect=fetch):
+                with self.assertRaises(query.QueryError) as raised:
+                    run()
+            self.assertEqual(raised.exception.status_code, 500)
+
+
+
+@override_settings(DATA_QUERY_ADMISSION=False, DATA_QUERY_REPLICA_ROUTING=False)
+class StreamQueryAdmissionTests(SimpleTestCase):
+    """스트리밍 조회도 원본 테이블 쿼리를 실행할 때만 비용 검사 (롤업 조회는 검사하지 않음)"""
+
+    SPEC = ExecutionStepsTests.SPEC
+    ROLLUP_PLAN = ('SELECT 1 FROM `fcc_data_rollup`', [], ['fcc_group', 'n'], 'fcc_data_rollup')
+
+    def _stream(self, routed, cursors):
+        with mock.patch.object(streaming, 'resolve_schema', return_value=FCC_SCHEMA), \
+                mock.patch.object(streaming, 'route_query', return_value=routed), \
+                mock.patch.object(streaming, 'open_server_side_cursor', side_effect=cursors), \
+                mock.patch.object(streaming, 'admit_query', return_value=None) as admit:
+            stream = streaming.stream_query(self.SPEC)
+        stream.close()
+        return stream, admit
+
+    def test_rollup_skips_admission(self):
+        stream, admit = self._stream(self.ROLLUP_PLAN, [mock.Mock()])
+        admit.assert_not_called()
+        self.assertEqual(stream.meta['source_table'], 'fcc_data_rollup')
+
+    def test_raw_fallback_is_admitted(self):
+        failing = mock.Mock()
+        failing.execute.side_effect = RuntimeError('rollup table missing')
+        stream, admit = self._stream(self.ROLLUP_PLAN, [failing, mock.Mock()])
+        admit.assert_called_once()
+        self.assertIn('`fcc_data`', admit.call_args.args[2])
+        self.assertEqual(stream.meta['source_table'], 'fcc_data')
+
+    def test_raw_query_is_admitted(self):
+        stream, admit = self._stream(None, [mock.Mock()])
+        admit.assert_called_once()
+        self.assertEqual(stream.meta['source_table'], 'fcc_data')
+
+class DownsampleTests(SimpleTestCase):
+    """다운샘플링은 첫/마지막 점과 최고/최저점을 유지하고 max_points 이하로 줄임"""
+
+    N = 1000
+
+    def setUp(self):
+        rng = np.random.default_rng(20250101)
+        self.x = np.arange(self.N, dtype=float)
+        self.y = np.sin(self.x / 50) + rng.normal(scale=0.05, size=self.N)
+        self.peak, self.trough = 123, 789
+        self.y[self.peak] = 10.0
+        self.y[self.trough] = -10.0
+
+    def assertKeepsShape(self, indices, threshold):
+        self.assertLessEqual(len(indices), threshold)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], self.N - 1)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertIn(self.peak, indices)
+        self.assertIn(self.trough, indices)
+
+    def test_lttb_indices(self):
+        self.assertKeepsShape(lttb_indices(self.x, self.y, 50), 50)
+
+    def test_minmax_indices(self):
+        self.assertKeepsShape(minmax_indices(self.y, 50), 50)
+
+    def test_nan_measures_are_not_selected_over_values(self):
+        y = self.y.copy()
+        y[400:420] = np.nan
+        for indices in (lttb_indices(self.x, y, 50), minmax_indices(y, 50)):
+            self.assertIn(self.peak, indices)
+            self.assertFalse(np.isnan(y[indices]).any())
+
+    def _result(self):
+        days = [(date(2023, 1, 1) + timedelta(days=day)).isoformat() for day in range(self.N // 2)]
+        return {
+            'columns': ['cdate_day', 'fcc_group', 'avg_fcc', 'max_classname'],
+            'values': [
+                days * 2,
+                ['Mobile'] * len(days) + ['Desktop'] * len(days),
+                [float(value) for value in self.y],
+                ['class'] * self.N,
+            ],
+            'count': self.N,
+        }
+
+    def _spec(self, aggregations, method='lttb'):
+        return {
+            'table_name': 'fcc_data',
+            'date_column': 'cdate',
+            'group_by_period': 'day',
+            'columns': ['fcc_group'],
+            'aggregations': aggregations,
+            'max_points': 40,
+            'downsample': method,
+        }
+
+    def test_downsample_result_per_series(self):
+        result = self._result()
+        for method in ('lttb', 'minmax'):
+            with self.subTest(method=method):
+                spec = self._spec([
+                    {'column': 'fcc', 'function': 'AVG', 'alias': 'avg_fcc'},
+                    {'column': 'classname', 'function': 'MAX', 'alias': 'max_classname'},
+                ], method)
+                body = downsample_result(result, spec)
+
+                self.assertEqual(body['original_count'], self.N)
+                self.assertEqual(body['downsample'], method)
+                self.assertEqual(body['columns'], result['columns'])
+                self.assertTrue(all(len(column) == body['count'] for column in body['values']))
+
+                # 계열(fcc_group)별로 max_points 이하, 최고/최저점 유지
+                groups = body['values'][1]
+                for group in ('Mobile', 'Desktop'):
+                    self.assertLessEqual(groups.count(group), spec['max_points'])
+                self.assertIn(10.0, body['values'][2])
+                self.assertIn(-10.0, body['values'][2])
+
+    def test_non_numeric_measures_only_are_left_as_is(self):
+        result = self._result()
+        spec = self._spec([{'column': 'classname', 'function': 'MAX', 'alias': 'max_classname'}])
+        self.assertIs(downsample_result(result, spec), result)
+
+
+class GapFillTests(SimpleTestCase):
+    """빈 날짜 구간 채우기: 일/주/월 달력, YEARWEEK 연도 경계, null/zero/previous, 최대 행 수"""
+
+    def _spec(self, period, start, end, method='null', columns=()):
+        return {
+            'table_name': 'fcc_data',
+            'date_column': 'cdate',
+            'group_by_period': period,
+            'start_date': start,
+            'end_date': end,
+            'columns': list(columns),
+            'aggregations': [{'column': 'fcc', 'function': 'SUM', 'alias': 'sum_fcc'}],
+            'fill': method,
+        }
+
+    def _result(self, bucket_column, rows):
+        columns = [bucket_column] + (['fcc_group'] if len(rows[0]) == 3 else []) + ['sum_fcc']
+        return {'columns': columns, 'values': [list(values) for values in zip(*rows)], 'count': len(rows)}
+
+    def test_day_gaps(self):
+        result = self._result('cdate_day', [('2025-01-01', 1.0), ('2025-01-03', 3.0)])
+        body = fill_result(result, self._spec('day', date(2025, 1, 1), date(2025, 1, 4)))
+
+        self.assertEqual(body['values'], [
+            ['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-04'],
+            [1.0, None, 3.0, None],
+        ])
+        self.assertEqual(body['count'], 4)
+        self.assertEqual(body['fill'], {'method': 'null', 'filled': 2})
+
+    def test_week_gaps_across_year_boundary(self):
+        # YEARWEEK 기본 모드: 2023-12-31(일)~2024-01-06은 202353, 2024년 1주차는 첫 일요일(1/7)부터
+        self.assertEqual(
+            format_buckets(calendar(date(2023, 12, 24), date(2024, 1, 13), 'week'), 'week', None),
+            [202352, 202353, 202401],
+        )
+        self.assertEqual(bucket_start(date(2024, 1, 1), 'week'), np.datetime64('2023-12-31'))
+        self.assertEqual(
+            parse_buckets([202353, 202401, 202152], 'week').tolist(),
+            [date(2023, 12, 31), date(2024, 1, 7), date(2021, 12, 26)],
+        )
+
+        result = self._result('cdate_week', [(202352, 5.0), (202401, 7.0)])
+        body = fill_result(result, self._spec('week', date(2023, 12, 24), date(2024, 1, 13)))
+        self.assertEqual(body['values'], [[202352, 202353, 202401], [5.0, None, 7.0]])
+
+    def test_month_gaps(self):
+        result = self._result('cdate_month', [('2024-01', 1.0), ('2024-03', 3.0)])
+        body = fill_result(result, self._spec('month', date(2024, 1, 15), date(2024, 4, 2), 'zero'))
+
+        self.assertEqual(body['values'], [
+            ['2024-01', '2024-02', '2024-03', '2024-04'],
+            [1.0, 0, 3.0, 0],
+        ])
+
+    def _series_result(self):
+        return self._result('cdate_day', [
+            ('2025-01-01', 'Mobile', 1.0),
+            ('2025-01-02', 'Desktop', 2.0),
+            ('2025-01-03', 'Mobile', 3.0),
+        ])
+
+    def test_zero_fill_per_series(self):
+        spec = self._spec('day', date(2025, 1, 1), date(2025, 1, 3), 'zero', ['fcc_group'])
+        body = fill_result(self._series_result(), spec)
+
+        self.assertEqual(body['values'], [
+            ['2025-01-01', '2025-01-01', '2025-01-02', '2025-01-02', '2025-01-03', '2025-01-03'],
+            ['Mobile', 'Desktop', 'Mobile', 'Desktop', 'Mobile', 'Desktop'],
+            [1.0, 0, 0, 2.0, 3.0, 0],
+        ])
+        self.assertEqual(body['fill']['filled'], 3)
+
+    def test_previous_fill_per_series(self):
+        spec = self._spec('day', date(2025, 1, 1), date(2025, 1, 3), 'previous', ['fcc_group'])
+        body = fill_result(self._series_result(), spec)
+
+        # 계열별 직전 값 (Desktop의 첫 값 이전 구간은 null)
+        self.assertEqual(body['values'][1], ['Mobile', 'Desktop'] * 3)
+        self.assertEqual(body['values'][2], [1.0, None, 1.0, 2.0, 3.0, 2.0])
+
+    def test_max_rows_bypass(self):
+        result = self._result('cdate_day', [('2025-01-01', 1.0), ('2025-01-03', 3.0)])
+        spec = self._spec('day', date(2025, 1, 1), date(2025, 1, 31))
+
+        with override_settings(DATA_QUERY_FILL_MAX_ROWS=30):
+            body = fill_result(result, spec)
+        self.assertEqual(body['values'], result['values'])
+        self.assertEqual(body['count'], 2)
+        self.assertEqual(body['fill'], {'method': 'null', 'filled': 0, 'skipped': 'max_rows'})
+
+        with override_settings(DATA_QUERY_FILL_MAX_ROWS=31):
+            self.assertEqual(fill_result(result, spec)['count'], 31)
+
+    def test_unexpected_buckets_left_as_is(self):
+        result = self._result('cdate_day', [('2024-12-31', 1.0)])
+        spec = self._spec('day', date(2025, 1, 1), date(2025, 1, 3))
+        self.assertIs(fill_result(result, spec), result)
@@ -0,0 +1,152 @@
+"""
+상위 N개 그룹 + "기타" 1행 (top_n) - 파이/막대 차트
+
+classname/classid처럼 그룹이 수천 개인 컬럼을 그대로 그리거나 LIMIT으로 임의 순서로 자르지 않고,
+top_n_by 집계 기준 상위 N개 그룹과 나머지 그룹을 합친 정확한 "기타" 행을 한 번의 SQL로 계산합니다.
+
+    {"columns": ["classname"], "aggregations": [{"column": "fcc", "function": "COUNT", "alias": "n"}],
+     "top_n": 10, "top_n_by": "n"}
+
+1. SQL (wrap_query) - 원본/롤업 집계 SQL을 감싸 1회 실행
+   - 안쪽: 그룹별 집계 (ORDER BY/LIMIT 없음, AVG는 SUM/COUNT 보조 집계 추가)
+   - ROW_NUMBER() OVER (ORDER BY top_n_by DESC, 그룹 컬럼)로 순위
+   - 순위 N 이하는 그룹 그대로, 나머지는 한 그룹(순위 0)으로 다시 집계
+     SUM/COUNT는 합계, MIN/MAX는 최솟값/최댓값, AVG는 SUM 합계 / COUNT 합계 (정확한 값)
+   - 결과는 순위 순, "기타" 행이 마지막
+
+2. 결과 정리 (apply_top_n)
+   - "기타" 행의 그룹 컬럼을 top_n_label로 채우고 보조 컬럼(_others, _groups) 제거
+   - top_n_others=false면 "기타" 행 제외
+   - 응답의 top_n에 n, by, others_groups(기타로 합친 그룹 수)
+
+날짜 그룹화, 백분위, 근사 집계, 스트리밍과는 함께 사용할 수 없습니다 (DataQuerySerializer에서 검증).
+"""
+
+DEFAULT_LABEL = '기타'
+
+# 바깥 쿼리 보조 컬럼 ("기타" 행 여부, 합친 그룹 수)
+OTHERS_COLUMN = '_others'
+GROUPS_COLUMN = '_groups'
+RANK_COLUMN = '_rank'
+
+# "기타" 행 재집계 (안쪽 결과의 별칭 기준)
+COMBINE_EXPRESSIONS = {
+    'SUM': "SUM(`{alias}`)",
+    'COUNT': "CAST(SUM(`{alias}`) AS SIGNED)",
+    'MIN': "MIN(`{alias}`)",
+    'MAX': "MAX(`{alias}`)",
+    # 그룹 1개(상위 N 행)는 안쪽 AVG 그대로, 여러 그룹은 합계 / 건수
+    'AVG': (
+        "CASE WHEN COUNT(*) = 1 THEN MIN(`{alias}`) "
+        "ELSE SUM(`{sum_alias}`) / NULLIF(SUM(`{count_alias}`), 0) END"
+    ),
+}
+
+
+def _alias(agg):
+    return agg.get('alias', f"{agg['function'].lower()}_{agg['column']}")
+
+
+def _helper_aliases(index):
+    return f"_topn_sum_{index}", f"_topn_count_{index}"
+
+
+def helper_aggregations(spec):
+    """
+    안쪽 집계 SQL에 추가할 보조 집계 (AVG의 "기타" 행을 정확히 계산하기 위한 SUM/COUNT)
+    """
+    helpers = []
+    for index, agg in enumerate(spec.get('aggregations', [])):
+        if agg['function'] == 'AVG':
+            sum_alias, count_alias = _helper_aliases(index)
+            helpers.append({'column': agg['column'], 'function': 'SUM', 'alias': sum_alias})
+            helpers.append({'column': agg['column'], 'function': 'COUNT', 'alias': count_alias})
+    return helpers
+
+
+def wrap_query(spec, inner_sql):
+    """
+    그룹별 집계 SQL → 상위 N개 + "기타" SQL
+
+    Args:
+        spec: top_n이 지정된 조회 요청
+        inner_sql: helper_aggregations를 포함한 그룹별 집계 SQL (ORDER BY/LIMIT 없음)
+
+    Returns:
+        (sql, result_columns) - sql의 N 자리표시자는 2개 (inner_sql 앞 1개, 뒤 1개)
+    """
+    columns = spec['columns']
+    by = spec['top_n_by']
+
+    select_parts = [f"MIN(`{col}`) AS `{col}`" for col in columns]
+    result_columns = list(columns)
+
+    for index, agg in enumerate(spec['aggregations']):
+        alias = _alias(agg)
+        sum_alias, count_alias = _helper_aliases(index)
+        expression = COMBINE_EXPRESSIONS[agg['function']].format(
+            alias=alias, sum_alias=sum_alias, count_alias=count_alias
+        )
+        select_parts.append(f"{expression} AS `{alias}`")
+        result_columns.append(alias)
+
+    select_parts.append(f"MIN(`{RANK_COLUMN}`) > %s AS `{OTHERS_COLUMN}`")
+    select_parts.append(f"COUNT(*) AS `{GROUPS_COLUMN}`")
+    result_columns.extend([OTHERS_COLUMN, GROUPS_COLUMN])
+
+    # 집계 값이 같으면 그룹 컬럼 순 (요청마다 같은 순위)
+    order_parts = [f"`{by}` DESC"] + [f"`{col}` ASC" for col in columns]
+
+    sql = (
+        f"SELECT {', '.join(select_parts)} FROM ("
+        f"SELECT `_g`.*, ROW_NUMBER() OVER (ORDER BY {', '.join(order_parts)}) AS `{RANK_COLUMN}` "
+        f"FROM ({inner_sql}) AS `_g`"
+        f") AS `_r` "
+        f"GROUP BY CASE WHEN `{RANK_COLUMN}` <= %s THEN `{RANK_COLUMN}` ELSE 0 END "
+        f"ORDER BY MIN(`{RANK_COLUMN}`) ASC"
+    )
+    return sql, result_columns
+
+
+def apply_top_n(result, spec):
+    """
+    wrap_query 결과 → 응답 결과 ("기타" 행 이름 지정, 보조 컬럼 제거)
+
+    Args:
+        result: 컬럼 단위 결과 (요청 컬럼 + _others, _groups)
+        spec: top_n이 지정된 조회 요청
+
+    Returns:
+        컬럼 단위 결과 ({'columns', 'values', 'count', 'top_n'})
+    """
+    index = {col: idx for idx, col in enumerate(result['columns'])}
+    others_flags = result['values'][index[OTHERS_COLUMN]]
+    groups = result['values'][index[GROUPS_COLUMN]]
+    group_columns = set(spec['columns'])
+    keep_others = spec.get('top_n_others', True)
+    label = spec.get('top_n_label', DEFAULT_LABEL)
+
+    rows = [row for row, flag in enumerate(others_flags) if keep_others or not flag]
+    others_groups = sum(
+        count for flag, count in zip(others_flags, groups) if flag
+    )
+
+    columns = [col for col in result['columns'] if col not in (OTHERS_COLUMN, GROUPS_COLUMN)]
+    values = []
+    for col in columns:
+        source = result['values'][index[col]]
+        if col in group_columns:
+            values.append([label if others_flags[row] else source[row] for row in rows])
+        else:
+            values.append([source[row] for row in rows])
+
+    return {
+        'columns': columns,
+        'values': values,
+        'count': len(rows),
+        'top_n': {
+            'n': spec['top_n'],
+            'by': spec['top_n_by'],
+            'others_groups': int(others_groups),
+        },
+    }
@@ -8,6 +8,10 @@ URL configuration for data_sources app.
 - /api/data-sources/sources/{id}/test/    - 연결 테스트 (POST)
 
 - /api/data-sources/query/                - 데이터 조회 (POST)
+- /api/data-sources/query/batch/          - 일괄 데이터 조회 (POST)
+- /api/data-sources/query/async/          - 비동기 데이터 조회 (POST, ASGI/uvicorn 워커)
+- /api/data-sources/query/batch/async/    - 비동기 일괄 데이터 조회 (POST, ASGI/uvicorn 워커)
+- /api/data-sources/query/stats/          - 조회 계층 통계 (GET)
 """
 
 from django.urls import path, include
@@ -36,4 +40,24 @@ urlpatterns = [
         views.DataQueryAPIView.as_view(),
         name='data-query'
     ),
+    path(
+        'query/batch/',
+        views.DataQueryBatchAPIView.as_view(),
+        name='data-query-batch'
+    ),
+    path(
+        'query/async/',
+        views.AsyncDataQueryView.as_view(),
+        name='data-query-async'
+    ),
+    path(
+        'query/batch/async/',
+        views.AsyncDataQueryBatchView.as_view(),
+        name='data-query-batch-async'
+    ),
+    path(
+        'query/stats/',
+        views.QueryStatsAPIView.as_view(),
+        name='data-query-stats'
+    ),
 ]
@@ -4,26 +4,80 @@ DRF ViewSets and APIViews for data_sources app.
 데이터 소스 및 동적 데이터 조회에 대한 API 뷰 정의
 """
 
+import json
 import logging
-import re
-from django.db import connection
 
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets, status, views
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
 
 from .models import DataSource
+from .admission import admission_controller, request_priority
+from .async_query import in_thread, run_batch_async, run_query_async
+from .batch import run_batch
+from .cache import query_cache
+from .compiler import query_compiler
+from .cost_guard import cost_estimator
+from .fusion import fusion_stats
+from .pool import connection_pools
+from .query import QueryError, run_query
+from .registry import schema_registry
+from .replicas import replica_router
+from .singleflight import single_flight
+from .arrow import ARROW_STREAM_MEDIA_TYPE, ArrowContentNegotiation
+from .streaming import stream_query
 from .serializers import (
     DataSourceSerializer,
     DataSourceListSerializer,
-    DataQuerySerializer
+    DataQuerySerializer,
+    DataQueryBatchSerializer
 )
 
 logger = logging.getLogger(__name__)
 
 
+def error_response(error):
+    """QueryError → 에러 응답 (동시 실행 대기 초과 503은 Retry-After 헤더 포함)"""
+    headers = None
+    if 'retry_after' in error.extra:
+        headers = {'Retry-After': str(error.extra['retry_after'])}
+    return Response(error.to_response_body(), status=error.status_code, headers=headers)
+
+
+def json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    """비동기 뷰 응답 (DRF Response와 같은 JSONRenderer로 렌더링)"""
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status_code,
+        content_type='application/json',
+        headers=headers
+    )
+
+
+def async_error_response(error):
+    """QueryError → 비동기 뷰 에러 응답 (error_response와 같은 본문/헤더)"""
+    headers = None
+    if 'retry_after' in error.extra:
+        headers = {'Retry-After': str(error.extra['retry_after'])}
+    return json_response(error.to_response_body(), error.status_code, headers)
+
+
+def parse_json_body(request):
+    """요청 본문 JSON 파싱 (DRF JSONParser 대체, 실패 시 None)"""
+    try:
+        data = json.loads(request.body or b'{}')
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="데이터 소스 목록 조회",
@@ -292,8 +346,139 @@ class DataQueryAPIView(views.APIView):
         "table_name": "daily_sales"
     }
     ```
+
+    ## 스트리밍 응답 (요청에 "stream": true 또는 "format": "ndjson")
+
+    서버 측 커서로 행을 나눠 전송하므로 결과 크기와 관계없이 메모리 사용량이 일정합니다.
+    limit을 DATA_QUERY_STREAM_MAX_ROWS까지 지정할 수 있으며 캐시는 사용하지 않습니다.
+    - format=rows: 일반 조회와 같은 JSON (count는 본문 마지막에 포함)
+    - format=ndjson: 행마다 JSON 한 줄 (application/x-ndjson)
+
+    ## Arrow IPC 스트림 (요청에 "format": "arrow" 또는 Accept: application/vnd.apache.arrow.stream)
+
+    분석용 대량 조회를 JSON 변환 없이 전달합니다 (스트리밍, pyarrow 필요).
+    컬럼 타입은 DataSource 메타데이터에서 결정됩니다.
+
+    ```python
+    table = pyarrow.ipc.open_stream(response.content).read_all()
+    ```
+
+    ## 컬럼 형식 응답 (요청에 "format": "columnar")
+
+    행마다 컬럼명을 반복하지 않아 대용량 결과의 응답 크기와 직렬화 시간이 줄어듭니다.
+
+    ```json
+    {
+        "columns": ["date", "revenue", "profit"],
+        "data": {
+            "date": ["2024-01-01", "2024-01-02"],
+            "revenue": [10000, 12000],
+            "profit": [3000, 3500]
+        },
+        "count": 2,
+        "table_name": "daily_sales"
+    }
+    ```
+
+    ## 빈 구간 채우기 (요청에 "fill": "null" | "zero" | "previous")
+
+    group_by_period 조회에서 행이 없는 날/주/월을 [start_date, end_date] 전체에 걸쳐 계열별로 채웁니다.
+    캐시된 결과에 응답 직전 적용하며, max_points 다운샘플링과 columnar 형식은 채운 결과에 적용됩니다.
+    응답의 fill.filled는 채운 행 수입니다.
+
+    ## 커서 페이지네이션 (요청에 "paginate": true, 다음 페이지는 "cursor": next_cursor)
+
+    집계 없는 원본 행을 limit건씩 (date_column, id) 순으로 나눠 조회합니다.
+    OFFSET 없이 마지막 행 위치부터 인덱스를 탐색하므로 페이지 깊이와 관계없이 응답 시간이 일정합니다.
+    마지막 페이지의 next_cursor는 null입니다 (날짜가 NULL인 행은 제외).
+
+    ## 차원 필터 (요청에 "filters")
+
+    날짜 범위 외의 조건을 SQL WHERE 절로 처리합니다 (컬럼은 화이트리스트 검증, 값은 모두 파라미터).
+    연산자: eq, in, not_in, range(min/max, 양 끝 포함), is_null(value: false면 IS NOT NULL)
+
+    ```json
+    "filters": [
+        {"column": "fcc_group", "op": "in", "values": ["Mobile", "Tablet"]},
+        {"column": "fcc", "op": "range", "min": 0, "max": 5000}
+    ]
+    ```
+
+    필터 컬럼이 모두 롤업/스케치 차원이면 롤업/스케치를 사용하고, 큰 IN 목록은 임시 테이블로 조회합니다.
+
+    ## 상위 N개 + "기타" (요청에 "top_n", 파이/막대 차트)
+
+    top_n_by 집계(기본: 첫 번째 집계) 기준 상위 N개 그룹과, 나머지 그룹을 합친 정확한 "기타" 행 1개를
+    윈도 함수(ROW_NUMBER) SQL 1회로 계산합니다. "기타" 행은 마지막이며 그룹 컬럼 값은 top_n_label입니다.
+
+    ```json
+    {"columns": ["classname"], "aggregations": [{"column": "fcc", "function": "COUNT", "alias": "n"}],
+     "top_n": 10, "top_n_by": "n"}
+    → "data": [..., {"classname": "기타", "n": 5230}], "top_n": {"n": 10, "by": "n", "others_groups": 412}
+    ```
+
+    ## 근사 집계 (요청에 "accuracy": "approximate", AVG/SUM/COUNT만)
+
+    롤업이 맞으면 정확한 롤업 결과를, 아니면 build_samples로 만든 해시 샘플 테이블에서
+    추정값과 95% 신뢰구간({alias}_lower, {alias}_upper)을 돌려줍니다.
+    응답의 accuracy에 mode, sample_rate, sample_rows가 담기며,
+    샘플이 없거나 그룹별 샘플 행이 너무 적으면 422를 반환합니다.
+
+    ## 백분위 집계 (aggregations의 function: "P50", "P75", "P95", "P99")
+
+    build_sketches로 만든 일별 t-digest 스케치를 기간/그룹별로 병합하여 추정합니다
+    (응답 accuracy.method = "tdigest").
+    날짜 범위가 짧거나(DATA_QUERY_PERCENTILE_EXACT_DAYS 이하) 맞는 스케치가 없으면
+    원본 행으로 정확히 계산하며, 읽을 행이 너무 많으면 422를 반환합니다.
+
+    ## 조회 비용 제한 (422)
+
+    원본 테이블 조회는 EXPLAIN 예상 행 수가 DataSource 예산(max_examined_rows)을 넘으면 거부되고,
+    실행 시간이 예산(max_execution_ms, MAX_EXECUTION_TIME 힌트)을 넘으면 중단됩니다.
+    AVG/SUM/COUNT 집계는 샘플 테이블이 있으면 근사 집계로 응답합니다 (cost_guard.downgraded).
+
+    ```json
+    {
+        "error": "조회 예상 행 수(12,000,000행)가 'FCC 데이터'의 예산(max_examined_rows 5,000,000행)을 초과합니다. ...",
+        "budget": "max_examined_rows",
+        "limit": 5000000,
+        "estimated_rows": 12000000,
+        "data_source": "FCC 데이터"
+    }
+    ```
+
+    ## 동일 조회 병합 (X-Cache: COALESCED)
+
+    캐시가 채워지기 전에 같은 조회가 동시에 들어오면(워커 간 포함) 첫 요청만 실행하고
+    나머지는 그 결과를 공유합니다. 공유받은 응답의 X-Cache 헤더는 COALESCED입니다.
+
+    ## 동시 실행 제한 (503)
+
+    캐시 미스 조회는 DataSource별(max_concurrent_queries)/전체 동시 실행 슬롯을 잡고 실행합니다.
+    우선순위(interactive | viewer | batch)에 따라 쓸 수 있는 슬롯 비율이 다르며, 우선순위는 서버에서 정합니다
+    (로그인한 staff 세션은 interactive, 그 외 viewer). X-Query-Priority 헤더는 우선순위를 낮출 때만 적용됩니다.
+    대기열이 가득 차거나 대기 시간이 DATA_QUERY_QUEUE_TIMEOUT_MS를 넘으면 Retry-After 헤더와 함께 503을 반환합니다.
+
+    ```json
+    {
+        "error": "조회 요청이 많아 5,000ms 안에 실행하지 못했습니다. 잠시 후 다시 시도하세요.",
+        "reason": "queue_timeout",
+        "pool": "fcc_data",
+        "priority": "viewer",
+        "waited_ms": 5003,
+        "retry_after": 5
+    }
+    ```
+
+    ## 읽기 복제본 (MYSQL_REPLICA_HOSTS)
+
+    데이터 조회 SQL은 읽기 복제본(DATABASES['analytics'], ...)에서 차례로 실행합니다.
+    복제 지연이 DATA_QUERY_REPLICA_MAX_LAG를 넘거나, 테이블의 최근 적재/롤업 빌드를 아직 반영하지 못했거나,
+    연결에 실패한 복제본은 건너뛰고 모두 해당되면 primary에서 실행합니다 (응답 형식은 동일).
     """
 
+    content_negotiation_class = ArrowContentNegotiation
+
     @extend_schema(
         summary="동적 데이터 조회",
         description="등록된 데이터 소스 테이블에서 동적으로 데이터를 조회합니다. SQL Injection 방지를 위한 화이트리스트 검증이 적용됩니다.",
@@ -302,10 +487,17 @@ class DataQueryAPIView(views.APIView):
             200: {
                 'type': 'object',
                 'properties': {
-                    'data': {
+                    'columns': {
                         'type': 'array',
-                        'items': {'type': 'object'},
-                        'description': '조회된 데이터 배열'
+                        'items': {'type': 'string'},
+                        'description': '컬럼명 배열 (format=columnar인 경우)'
+                    },
+                    'data': {
+                        'oneOf': [
+                            {'type': 'array', 'items': {'type': 'object'}},
+                            {'type': 'object', 'additionalProperties': {'type': 'array'}},
+                        ],
+                        'description': '조회된 데이터 (rows: 행 객체 배열, columnar: 컬럼명 → 값 배열)'
                     },
                     'count': {
                         'type': 'integer',
@@ -314,6 +506,15 @@ class DataQueryAPIView(views.APIView):
                     'table_name': {
                         'type': 'string',
                         'description': '조회한 테이블명'
+                    },
+                    'next_cursor': {
+                        'type': 'string',
+                        'nullable': True,
+                        'description': '다음 페이지 커서 (paginate 요청인 경우, 마지막 페이지는 null)'
+                    },
+                    'accuracy': {
+                        'type': 'object',
+                        'description': '근사 집계 정보 (accuracy=approximate: mode, sample_rate, confidence, sample_rows / 백분위 집계: mode, method, compression)'
                     }
                 },
                 'example': {
@@ -349,7 +550,13 @@ class DataQueryAPIView(views.APIView):
         SQL Injection 방지를 위한 엄격한 검증 적용
         """
         # 1. 요청 데이터 검증
-        serializer = DataQuerySerializer(data=request.data)
+        data = request.data
+
+        # Accept 헤더로 Arrow IPC 스트림 요청 시 format=arrow와 동일하게 처리
+        if ARROW_STREAM_MEDIA_TYPE in request.headers.get('Accept', ''):
+            data = {**data, 'format': 'arrow'}
+
+        serializer = DataQuerySerializer(data=data)
         if not serializer.is_valid():
             logger.warning(
                 f"데이터 조회 요청 검증 실패: {serializer.errors}"
@@ -359,210 +566,247 @@ class DataQueryAPIView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        validated_data = serializer.validated_data
+        spec = serializer.validated_data
+        priority = request_priority(request)
 
-        table_name = validated_data['table_name']
-        columns = validated_data.get('columns', [])
-        start_date = validated_data.get('start_date')
-        end_date = validated_data.get('end_date')
-        date_column = validated_data.get('date_column', 'date')
-        limit = validated_data.get('limit', 1000)
-        group_by_period = validated_data.get('group_by_period')
-        aggregations = validated_data.get('aggregations', [])
+        # 스트리밍 조회 (서버 측 커서, 캐시 미사용)
+        if spec.get('stream'):
+            try:
+                query_stream = stream_query(spec, priority)
+            except QueryError as e:
+                return error_response(e)
 
-        # 2. 테이블명 화이트리스트 검증 (1단계 방어)
-        try:
-            data_source = DataSource.objects.get(
-                table_name=table_name,
-                is_active=True
-            )
-        except DataSource.DoesNotExist:
-            logger.warning(
-                f"데이터 조회 실패: 등록되지 않은 테이블 '{table_name}'"
-            )
-            return Response(
-                {
-                    'error': f"테이블 '{table_name}'이(가) 등록되지 않았거나 비활성 상태입니다."
-                },
-                status=status.HTTP_404_NOT_FOUND
+            response = StreamingHttpResponse(
+                query_stream,
+                content_type=query_stream.content_type
             )
+            response['X-Cache'] = 'BYPASS'
+            # 프록시 버퍼링 비활성화 (chunk 즉시 전달)
+            response['X-Accel-Buffering'] = 'no'
+            return response
 
-        # 3. 컬럼명 화이트리스트 검증 (2단계 방어)
+        # 2~5. 화이트리스트 검증, 캐시 조회, 쿼리 생성 및 실행
         try:
-            available_columns = data_source.get_columns()
-        except Exception as e:
-            logger.error(
-                f"테이블 컬럼 조회 실패: {table_name} - {str(e)}"
-            )
-            return Response(
-                {'error': f'테이블 컬럼 조회 실패: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            result = run_query(spec, priority=priority)
+        except QueryError as e:
+            return error_response(e)
+
+        return Response(result.body, headers={'X-Cache': result.cache_status})
+
 
-        # 요청된 컬럼이 실제 테이블 컬럼에 있는지 확인
-        all_columns_to_check = set(columns)
+@extend_schema(tags=['data-query'])
+class DataQueryBatchAPIView(views.APIView):
+    """
+    일괄 데이터 조회 API
+
+    POST /api/data-sources/query/batch/
+
+    리포트 하나의 차트 조회를 한 번의 요청으로 실행합니다.
+    - 개별 요청은 DataQueryAPIView와 동일하게 검증/캐시/실행
+    - 같은 테이블은 화이트리스트 검증 1회
+    - 독립적인 쿼리는 별도 DB 연결에서 동시 실행
+    - 한 차트의 실패가 다른 차트에 영향을 주지 않음 (결과별 status)
+    - 동시 실행 슬롯은 실제 실행하는 스캔마다 1개 (요청 우선순위, 대기 초과 시 해당 차트만 503)
+
+    ## 요청 본문 예시
+
+    ```json
+    {
+        "queries": {
+            "daily": {"table_name": "fcc_data", "date_column": "cdate", "group_by_period": "day",
+                      "aggregations": [{"column": "fcc", "function": "AVG", "alias": "avg_fcc"}]},
+            "group": {"table_name": "fcc_data", "columns": ["fcc_group"], "date_column": "cdate",
+                      "aggregations": [{"column": "fcc", "function": "AVG", "alias": "avg_fcc"}]}
+        }
+    }
+    ```
 
-        # 집계 함수에 사용되는 컬럼도 검증
-        for agg in aggregations:
-            all_columns_to_check.add(agg['column'])
+    ## 응답 예시
 
-        # date_column도 추가
-        if date_column:
-            all_columns_to_check.add(date_column)
+    ```json
+    {
+        "results": {
+            "daily": {"status": 200, "cache": "MISS", "data": [...], "count": 7, "table_name": "fcc_data"},
+            "group": {"status": 400, "error": "유효하지 않은 컬럼: {'fcc_grp'}"}
+        },
+        "count": 2
+    }
+    ```
+    """
 
-        invalid_columns = all_columns_to_check - set(available_columns)
-        if invalid_columns:
+    @extend_schema(
+        summary="일괄 데이터 조회",
+        description="여러 차트의 데이터 조회 요청을 한 번에 실행합니다. 결과는 차트 ID별로 반환되며, 개별 실패는 다른 결과에 영향을 주지 않습니다.",
+        request=DataQueryBatchSerializer,
+        responses={
+            200: {
+                'type': 'object',
+                'properties': {
+                    'results': {
+                        'type': 'object',
+                        'additionalProperties': {'type': 'object'},
+                        'description': '차트 ID별 조회 결과 (status 필드 포함)'
+                    },
+                    'count': {
+                        'type': 'integer',
+                        'description': '조회 요청 건수'
+                    }
+                }
+            }
+        },
+        tags=['data-query'],
+    )
+    def post(self, request):
+        """일괄 조회 실행"""
+        serializer = DataQueryBatchSerializer(data=request.data)
+        if not serializer.is_valid():
             logger.warning(
-                f"데이터 조회 실패: 유효하지 않은 컬럼 {invalid_columns} "
-                f"(테이블: {table_name})"
+                f"일괄 조회 요청 검증 실패: {serializer.errors}"
             )
             return Response(
-                {
-                    'error': f'유효하지 않은 컬럼: {invalid_columns}',
-                    'available_columns': available_columns
-                },
+                serializer.errors,
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 4. SQL 쿼리 생성 (3단계 방어: 파라미터화된 쿼리)
-        try:
-            # SELECT 절 생성
-            select_parts = []
-            result_columns = []  # 결과 컬럼명 목록 (딕셔너리 변환용)
-
-            # 1. 날짜 그룹화 (group_by_period가 있는 경우)
-            if group_by_period:
-                date_func_map = {
-                    'day': 'DATE',
-                    'week': 'YEARWEEK',
-                    'month': "DATE_FORMAT(`{col}`, '%Y-%m')",
-                    'year': 'YEAR'
-                }
+        queries = serializer.validated_data['queries']
+        priority = request_priority(request)
+        results = run_batch(queries, priority)
 
-                if group_by_period == 'month':
-                    date_alias = f"{date_column}_{group_by_period}"
-                    select_parts.append(
-                        f"DATE_FORMAT(`{date_column}`, '%Y-%m') as {date_alias}"
-                    )
-                    result_columns.append(date_alias)
-                else:
-                    date_func = date_func_map[group_by_period]
-                    date_alias = f"{date_column}_{group_by_period}"
-                    select_parts.append(f"{date_func}(`{date_column}`) as {date_alias}")
-                    result_columns.append(date_alias)
-
-            # 2. 일반 컬럼 (GROUP BY에 사용)
-            for col in columns:
-                select_parts.append(f"`{col}`")
-                result_columns.append(col)
-
-            # 3. 집계 함수
-            for agg in aggregations:
-                col = agg['column']
-                func = agg['function']
-                alias = agg.get('alias', f"{func.lower()}_{col}")
-                select_parts.append(f"{func}(`{col}`) as {alias}")
-                result_columns.append(alias)
-
-            # SELECT 절이 비어있으면 에러
-            if not select_parts:
-                return Response(
-                    {'error': '조회할 컬럼 또는 집계 함수를 지정해야 합니다.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            columns_str = ', '.join(select_parts)
-
-            # 기본 쿼리
-            query = f"SELECT {columns_str} FROM `{table_name}`"
-            params = []
-
-            # WHERE 절 추가 (날짜 필터링)
-            where_clauses = []
-
-            if start_date:
-                where_clauses.append(f"`{date_column}` >= %s")
-                params.append(start_date)
-
-            if end_date:
-                where_clauses.append(f"`{date_column}` <= %s")
-                params.append(end_date)
-
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
-
-            # GROUP BY 절 추가 (집계 사용 시)
-            if aggregations:
-                group_by_parts = []
-
-                # 날짜 그룹화
-                if group_by_period:
-                    if group_by_period == 'month':
-                        group_by_parts.append(f"DATE_FORMAT(`{date_column}`, '%Y-%m')")
-                    else:
-                        date_func = date_func_map[group_by_period]
-                        group_by_parts.append(f"{date_func}(`{date_column}`)")
-
-                # 일반 컬럼으로 그룹화
-                for col in columns:
-                    group_by_parts.append(f"`{col}`")
-
-                if group_by_parts:
-                    query += " GROUP BY " + ", ".join(group_by_parts)
-
-            # ORDER BY 추가
-            if group_by_period:
-                # 날짜 그룹화 시 날짜 기준 정렬
-                date_alias = f"{date_column}_{group_by_period}"
-                query += f" ORDER BY {date_alias} ASC"
-            elif date_column in columns:
-                # 일반 조회 시 날짜 컬럼이 있으면 날짜순 정렬
-                query += f" ORDER BY `{date_column}` ASC"
-
-            # LIMIT 추가
-            query += f" LIMIT {int(limit)}"  # limit은 이미 검증됨
+        failed = sum(1 for result in results.values() if result['status'] != 200)
+        logger.info(
+            f"일괄 조회 완료: {len(results)}건 (실패 {failed}건)"
+        )
+
+        return Response({
+            'results': results,
+            'count': len(results)
+        })
 
-            logger.info(
-                f"데이터 조회 쿼리 실행: {table_name} - "
-                f"컬럼 {len(columns)}개, 집계 {len(aggregations)}개, 제한 {limit}건"
-            )
-            logger.debug(f"쿼리: {query}, 파라미터: {params}")
 
-            # 5. 쿼리 실행
-            with connection.cursor() as cursor:
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncDataQueryView(View):
+    """
+    비동기 데이터 조회 API
 
-                # 결과를 딕셔너리 배열로 변환
-                result_data = []
-                for row in rows:
-                    row_dict = {}
-                    for idx, col in enumerate(result_columns):
-                        value = row[idx]
+    POST /api/data-sources/query/async/
 
-                        # 날짜/시간 객체를 문자열로 변환
-                        if hasattr(value, 'isoformat'):
-                            value = value.isoformat()
+    요청/응답 형식은 DataQueryAPIView와 같습니다 (X-Cache, X-Query-Priority, 503 Retry-After 포함).
+    uvicorn 워커(config.asgi)에서 조회 SQL을 aiomysql 연결 풀로 await하므로
+    느린 조회가 워커를 점유하지 않고, 워커 하나가 여러 iframe의 조회를 동시에 처리합니다.
 
-                        row_dict[col] = value
+    - 스트리밍 조회(stream, ndjson, arrow)는 DataQueryAPIView 사용 (400)
+    - aiomysql 미설치/비활성 시 동기 실행 경로를 스레드에서 실행 (async_query 모듈)
+    """
 
-                    result_data.append(row_dict)
+    http_method_names = ['post', 'options']
 
-            logger.info(
-                f"데이터 조회 성공: {table_name} - {len(result_data)}건 조회"
+    async def post(self, request):
+        """동적 데이터 조회 실행 (비동기)"""
+        data = parse_json_body(request)
+        if data is None:
+            return json_response(
+                {'error': '요청 본문은 JSON 객체여야 합니다.'},
+                status.HTTP_400_BAD_REQUEST
             )
 
-            return Response({
-                'data': result_data,
-                'count': len(result_data),
-                'table_name': table_name
-            })
+        serializer = DataQuerySerializer(data=data)
+        if not serializer.is_valid():
+            logger.warning(
+                f"데이터 조회 요청 검증 실패: {serializer.errors}"
+            )
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
-        except Exception as e:
-            logger.error(
-                f"데이터 조회 실패: {table_name} - {str(e)}"
+        spec = serializer.validated_data
+        if spec.get('stream'):
+            return json_response(
+                {'error': '스트리밍 조회는 /api/data-sources/query/ 를 사용하세요.'},
+                status.HTTP_400_BAD_REQUEST
             )
-            return Response(
-                {'error': f'데이터 조회 중 오류 발생: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        priority = await in_thread(request_priority, request)
+        try:
+            result = await run_query_async(spec, priority)
+        except QueryError as e:
+            return async_error_response(e)
+
+        return json_response(result.body, headers={'X-Cache': result.cache_status})
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncDataQueryBatchView(View):
+    """
+    비동기 일괄 데이터 조회 API
+
+    POST /api/data-sources/query/batch/async/
+
+    요청/응답 형식은 DataQueryBatchAPIView와 같습니다.
+    병합 후 남은 독립 스캔들을 스레드 풀 대신 asyncio.gather로 동시에 실행합니다
+    (스캔마다 동시 실행 슬롯 1개, 동일 조회 병합은 동기 엔드포인트와 공유).
+    """
+
+    http_method_names = ['post', 'options']
+
+    async def post(self, request):
+        """일괄 조회 실행 (비동기)"""
+        data = parse_json_body(request)
+        if data is None:
+            return json_response(
+                {'error': '요청 본문은 JSON 객체여야 합니다.'},
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = DataQueryBatchSerializer(data=data)
+        if not serializer.is_valid():
+            logger.warning(
+                f"일괄 조회 요청 검증 실패: {serializer.errors}"
             )
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        queries = serializer.validated_data['queries']
+        priority = await in_thread(request_priority, request)
+        results = await run_batch_async(queries, priority)
+
+        failed = sum(1 for result in results.values() if result['status'] != 200)
+        logger.info(
+            f"비동기 일괄 조회 완료: {len(results)}건 (실패 {failed}건)"
+        )
+
+        return json_response({
+            'results': results,
+            'count': len(results)
+        })
+
+
+@extend_schema(tags=['data-query'])
+class QueryStatsAPIView(views.APIView):
+    """
+    데이터 조회 계층 통계 API
+
+    GET /api/data-sources/query/stats/
+
+    현재 워커 프로세스의 스키마 레지스트리/SQL 실행 계획/결과 캐시 hit/miss 카운터와
+    공유 스캔 병합 횟수, 비용 제한(EXPLAIN 캐시, 거부/근사 전환/시간 초과) 카운터,
+    동시 실행 제한의 우선순위별 승인/대기/거부 횟수와 대기 시간(avg/p50/p95/max),
+    동일 조회 병합(leader 실행/결과 공유) 횟수, 읽기 복제본별 상태(지연, 조회 수)와
+    primary 대체(fallback) 사유별 횟수, DB 별칭별 연결 풀 사용량(포화도, 대기 시간, 재연결)을 반환합니다.
+    (gunicorn 워커별로 값이 다름 - admission.running/queue_depth만 전체 워커 합계)
+    """
+
+    @extend_schema(
+        summary="데이터 조회 통계",
+        description="스키마 레지스트리, 결과 캐시 등 조회 계층의 워커별 통계를 조회합니다.",
+        tags=['data-query'],
+    )
+    def get(self, request):
+        """조회 계층 통계 반환"""
+        return Response({
+            'schema_registry': schema_registry.stats(),
+            'query_plans': query_compiler.stats(),
+            'query_cache': query_cache.stats(),
+            'shared_scan': fusion_stats.stats(),
+            'cost_guard': cost_estimator.stats(),
+            'admission': admission_controller.stats(),
+            'single_flight': single_flight.stats(),
+            'replicas': replica_router.stats(),
+            'db_pool': connection_pools.stats(),
+        })
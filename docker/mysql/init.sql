@@ -9,6 +9,8 @@ CREATE DATABASE IF NOT EXISTS email_reports CHARACTER SET utf8mb4 COLLATE utf8mb
 -- PyMySQL 호환성을 위해 mysql_native_password 사용
 CREATE USER IF NOT EXISTS 'django_user'@'%' IDENTIFIED WITH mysql_native_password BY 'django_password';
 GRANT ALL PRIVILEGES ON email_reports.* TO 'django_user'@'%';
+-- 읽기 복제본 지연 확인(SHOW REPLICA STATUS)용
+GRANT REPLICATION CLIENT ON *.* TO 'django_user'@'%';
 FLUSH PRIVILEGES;
 
 -- 기본 설정
@@ -0,0 +1,32 @@
+#!/bin/bash
+# MySQL 읽기 복제본 초기화 스크립트 (docker-compose.replica.yml의 db_replica 첫 기동 시 1회 실행)
+# primary 전체 덤프(GTID 포함)를 적재한 뒤 GTID 자동 위치로 복제 시작
+
+set -euo pipefail
+
+SOURCE_HOST="${REPLICA_SOURCE_HOST:-db}"
+
+# primary 기동 대기
+until mysqladmin ping -h "$SOURCE_HOST" -uroot -p"$MYSQL_ROOT_PASSWORD" --silent; do
+  echo "primary($SOURCE_HOST) 대기 중..."
+  sleep 2
+done
+
+# 복제본의 GTID 기록 초기화 후 primary 덤프 적재 (사용자/권한 포함)
+mysql -uroot -p"$MYSQL_ROOT_PASSWORD" -e "RESET MASTER;"
+mysqldump -h "$SOURCE_HOST" -uroot -p"$MYSQL_ROOT_PASSWORD" \
+  --all-databases --single-transaction --triggers --routines --events --set-gtid-purged=ON \
+  | mysql -uroot -p"$MYSQL_ROOT_PASSWORD"
+
+# 복제 시작 (개발용으로 root 계정 사용)
+mysql -uroot -p"$MYSQL_ROOT_PASSWORD" <<SQL
+CHANGE REPLICATION SOURCE TO
+  SOURCE_HOST='$SOURCE_HOST',
+  SOURCE_USER='root',
+  SOURCE_PASSWORD='$MYSQL_ROOT_PASSWORD',
+  SOURCE_AUTO_POSITION=1,
+  GET_SOURCE_PUBLIC_KEY=1;
+START REPLICA;
+SQL
+
+echo "읽기 복제본 초기화 완료 (source: $SOURCE_HOST)"
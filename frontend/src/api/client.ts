@@ -5,14 +5,25 @@
  */
 
 import type {
+  ChartDataItem,
   DataQueryRequest,
   DataQueryResponse,
+  DataQueryColumnarResponse,
+  DataQueryBatchItem,
+  DataQueryBatchResponse,
+  DataQueryBatchSuccess,
+  DataQueryPriority,
   ApiErrorResponse,
 } from '../types/api'
 
 // 환경변수에서 API Base URL 가져오기
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:10003'
 
+// 일괄 조회를 비동기 엔드포인트로 요청 (백엔드를 uvicorn 워커로 실행하는 경우)
+const BATCH_QUERY_PATH = import.meta.env.VITE_USE_ASYNC_QUERY === 'true'
+  ? '/api/data-sources/query/batch/async/'
+  : '/api/data-sources/query/batch/'
+
 /**
  * API 에러 클래스
  */
@@ -33,6 +44,7 @@ export class ApiError extends Error {
  * POST /api/data-sources/query/
  *
  * @param request - 데이터 조회 요청 파라미터
+ * @param priority - 조회 우선순위 (서버가 정한 우선순위보다 낮출 때만 적용, 에디터의 'interactive'는 staff 로그인 세션에서만 유효)
  * @returns 조회된 데이터 배열
  * @throws {ApiError} API 호출 실패 시
  *
@@ -49,13 +61,15 @@ export class ApiError extends Error {
  * ```
  */
 export async function fetchDataQuery(
-  request: DataQueryRequest
+  request: DataQueryRequest,
+  priority?: DataQueryPriority
 ): Promise<DataQueryResponse> {
   try {
     const response = await fetch(`${API_BASE_URL}/api/data-sources/query/`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
+        ...(priority ? { 'X-Query-Priority': priority } : {}),
       },
       body: JSON.stringify(request),
     })
@@ -83,6 +97,128 @@ export async function fetchDataQuery(
   }
 }
 
+/**
+ * 컬럼 형식 데이터 조회 API 호출
+ *
+ * POST /api/data-sources/query/ (format: 'columnar')
+ *
+ * 행마다 컬럼명을 반복하지 않으므로 대용량 결과의 응답 크기와 파싱 시간이 줄어듭니다.
+ *
+ * @param request - 데이터 조회 요청 파라미터 (format은 자동 지정)
+ * @returns 컬럼명 → 값 배열
+ * @throws {ApiError} API 호출 실패 시
+ *
+ * @example
+ * ```typescript
+ * const { columns, data } = await fetchDataQueryColumnar({
+ *   table_name: 'fcc_data',
+ *   columns: ['cdate', 'fcc'],
+ *   date_column: 'cdate',
+ *   limit: 10000
+ * })
+ * console.log(data.fcc.length) // 10000
+ * ```
+ */
+export async function fetchDataQueryColumnar(
+  request: Omit<DataQueryRequest, 'format'>
+): Promise<DataQueryColumnarResponse> {
+  const data = await fetchDataQuery({ ...request, format: 'columnar' })
+  return data as unknown as DataQueryColumnarResponse
+}
+
+/**
+ * 컬럼 형식 응답 → 행 객체 배열 변환 (기존 차트 컴포넌트 입력용)
+ *
+ * @example
+ * ```typescript
+ * columnarToRows({ columns: ['a'], data: { a: [1, 2] }, count: 2, table_name: 't' })
+ * // [{ a: 1 }, { a: 2 }]
+ * ```
+ */
+export function columnarToRows(response: DataQueryColumnarResponse): ChartDataItem[] {
+  const { columns, data, count } = response
+  const rows: ChartDataItem[] = new Array(count)
+
+  for (let i = 0; i < count; i++) {
+    const row: ChartDataItem = {}
+    for (const column of columns) {
+      row[column] = data[column][i]
+    }
+    rows[i] = row
+  }
+
+  return rows
+}
+
+/**
+ * 일괄 데이터 조회 API 호출
+ *
+ * POST /api/data-sources/query/batch/
+ * (VITE_USE_ASYNC_QUERY=true이면 /api/data-sources/query/batch/async/ - 요청/응답 형식 동일)
+ *
+ * 여러 차트의 조회를 한 번의 요청으로 실행합니다.
+ * 개별 차트의 실패는 결과의 status로 전달되며 예외를 발생시키지 않습니다.
+ *
+ * @param queries - 차트 ID → 데이터 조회 요청
+ * @param priority - 조회 우선순위 (일괄 생성은 'batch', 서버가 정한 우선순위보다 낮출 때만 적용)
+ * @returns 차트 ID별 조회 결과
+ * @throws {ApiError} 일괄 요청 자체가 실패한 경우
+ *
+ * @example
+ * ```typescript
+ * const { results } = await fetchDataQueryBatch({
+ *   daily: { table_name: 'fcc_data', date_column: 'cdate', group_by_period: 'day', aggregations: [...] },
+ *   group: { table_name: 'fcc_data', columns: ['fcc_group'], date_column: 'cdate', aggregations: [...] },
+ * })
+ * if (isBatchSuccess(results.daily)) console.log(results.daily.data)
+ * ```
+ */
+export async function fetchDataQueryBatch(
+  queries: Record<string, DataQueryRequest>,
+  priority?: DataQueryPriority
+): Promise<DataQueryBatchResponse> {
+  try {
+    const response = await fetch(`${API_BASE_URL}${BATCH_QUERY_PATH}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(priority ? { 'X-Query-Priority': priority } : {}),
+      },
+      body: JSON.stringify({ queries }),
+    })
+
+    if (!response.ok) {
+      const errorData: ApiErrorResponse = await response.json()
+      throw new ApiError(
+        errorData.error || `API 호출 실패: ${response.status}`,
+        response.status,
+        errorData
+      )
+    }
+
+    const data: DataQueryBatchResponse = await response.json()
+    return data
+  } catch (error) {
+    if (error instanceof ApiError) {
+      throw error
+    }
+
+    // 네트워크 에러 등
+    throw new ApiError(
+      error instanceof Error ? error.message : 'API 호출 중 알 수 없는 오류 발생'
+    )
+  }
+}
+
+/**
+ * 일괄 조회 결과 성공 여부 (타입 가드)
+ */
+export function isBatchSuccess(
+  item: DataQueryBatchItem | undefined
+): item is DataQueryBatchSuccess {
+  return item !== undefined && item.status === 200
+}
+
 /**
  * 날짜 형식 변환: YYYYMMDD → YYYY-MM-DD
  *
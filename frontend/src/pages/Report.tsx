@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react'
 import { useParams } from 'react-router-dom'
 import { BarChart, LineChart, PieChart, CombinationChart } from '../components/charts'
-import { fetchDataQuery, formatDateForApi } from '../api/client'
+import { fetchDataQueryBatch, isBatchSuccess, formatDateForApi } from '../api/client'
 import type { ChartDataItem } from '../types/api'
 
 // 샘플 데이터 (폴백용 - API 호출 실패 시 사용)
@@ -113,10 +113,10 @@ const Report: React.FC = () => {
 
         console.log('API 호출 시작:', { apiDate, startDate7Days, startDate4Weeks, startDateMonth })
 
-        // 4개 차트 데이터 병렬 로딩 (fcc_data 기반)
-        const results = await Promise.allSettled([
+        // 4개 차트 데이터 일괄 로딩 (fcc_data 기반, 1회 요청)
+        const { results: batchResults } = await fetchDataQueryBatch({
           // Bar Chart - 일별 FCC 평균 (최근 7일)
-          fetchDataQuery({
+          dailyFcc: {
             table_name: 'fcc_data',
             columns: [],
             start_date: startDate7Days,
@@ -127,10 +127,10 @@ const Report: React.FC = () => {
               { column: 'fcc', function: 'AVG', alias: 'avg_fcc' },
             ],
             limit: 7,
-          }),
+          },
 
           // Line Chart - 주별 FCC 평균 (최근 4주)
-          fetchDataQuery({
+          weeklyFcc: {
             table_name: 'fcc_data',
             columns: [],
             start_date: startDate4Weeks,
@@ -141,10 +141,10 @@ const Report: React.FC = () => {
               { column: 'fcc', function: 'AVG', alias: 'avg_fcc' },
             ],
             limit: 4,
-          }),
+          },
 
           // Pie Chart - FCC 그룹별 평균 (최근 1개월)
-          fetchDataQuery({
+          fccGroup: {
             table_name: 'fcc_data',
             columns: ['fcc_group'],
             start_date: startDateMonth,
@@ -154,10 +154,10 @@ const Report: React.FC = () => {
               { column: 'fcc', function: 'AVG', alias: 'avg_fcc' },
             ],
             limit: 10,
-          }),
+          },
 
           // Combination Chart - 그룹별 FCC 평균 vs 최대값 (최근 1개월)
-          fetchDataQuery({
+          fccGroupComparison: {
             table_name: 'fcc_data',
             columns: ['fcc_group'],
             start_date: startDateMonth,
@@ -168,43 +168,49 @@ const Report: React.FC = () => {
               { column: 'fcc', function: 'MAX', alias: 'max_fcc' },
             ],
             limit: 10,
-          }),
-        ])
+          },
+        })
 
         // 결과 처리 (성공한 데이터는 사용, 실패한 데이터는 샘플 데이터 폴백)
+        const results = [
+          batchResults.dailyFcc,
+          batchResults.weeklyFcc,
+          batchResults.fccGroup,
+          batchResults.fccGroupComparison,
+        ]
         const [dailyFccResult, weeklyFccResult, fccGroupResult, fccGroupComparisonResult] =
           results
 
-        if (dailyFccResult.status === 'fulfilled') {
-          setDailyFcc(dailyFccResult.value.data)
-          console.log('일별 FCC 데이터 로드 성공:', dailyFccResult.value.count, '건')
+        if (isBatchSuccess(dailyFccResult)) {
+          setDailyFcc(dailyFccResult.data)
+          console.log('일별 FCC 데이터 로드 성공:', dailyFccResult.count, '건')
         } else {
-          console.warn('일별 FCC API 실패, 샘플 데이터 사용:', dailyFccResult.reason)
+          console.warn('일별 FCC API 실패, 샘플 데이터 사용:', dailyFccResult?.error)
         }
 
-        if (weeklyFccResult.status === 'fulfilled') {
-          setWeeklyFcc(weeklyFccResult.value.data)
-          console.log('주별 FCC 데이터 로드 성공:', weeklyFccResult.value.count, '건')
+        if (isBatchSuccess(weeklyFccResult)) {
+          setWeeklyFcc(weeklyFccResult.data)
+          console.log('주별 FCC 데이터 로드 성공:', weeklyFccResult.count, '건')
         } else {
-          console.warn('주별 FCC API 실패, 샘플 데이터 사용:', weeklyFccResult.reason)
+          console.warn('주별 FCC API 실패, 샘플 데이터 사용:', weeklyFccResult?.error)
         }
 
-        if (fccGroupResult.status === 'fulfilled') {
-          setFccGroup(fccGroupResult.value.data)
-          console.log('FCC 그룹 데이터 로드 성공:', fccGroupResult.value.count, '건')
+        if (isBatchSuccess(fccGroupResult)) {
+          setFccGroup(fccGroupResult.data)
+          console.log('FCC 그룹 데이터 로드 성공:', fccGroupResult.count, '건')
         } else {
-          console.warn('FCC 그룹 API 실패, 샘플 데이터 사용:', fccGroupResult.reason)
+          console.warn('FCC 그룹 API 실패, 샘플 데이터 사용:', fccGroupResult?.error)
         }
 
-        if (fccGroupComparisonResult.status === 'fulfilled') {
-          setFccGroupComparison(fccGroupComparisonResult.value.data)
-          console.log('FCC 그룹 비교 데이터 로드 성공:', fccGroupComparisonResult.value.count, '건')
+        if (isBatchSuccess(fccGroupComparisonResult)) {
+          setFccGroupComparison(fccGroupComparisonResult.data)
+          console.log('FCC 그룹 비교 데이터 로드 성공:', fccGroupComparisonResult.count, '건')
         } else {
-          console.warn('FCC 그룹 비교 API 실패, 샘플 데이터 사용:', fccGroupComparisonResult.reason)
+          console.warn('FCC 그룹 비교 API 실패, 샘플 데이터 사용:', fccGroupComparisonResult?.error)
         }
 
         // 모든 API가 실패한 경우 에러 표시
-        const allFailed = results.every((result) => result.status === 'rejected')
+        const allFailed = results.every((result) => !isBatchSuccess(result))
         if (allFailed) {
           setError('모든 데이터 로딩에 실패했습니다. 샘플 데이터를 표시합니다.')
         }
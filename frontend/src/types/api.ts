@@ -11,13 +11,38 @@ export interface AggregationField {
   /** 집계할 컬럼명 */
   column: string
 
-  /** 집계 함수 (AVG, SUM, COUNT, MIN, MAX) */
-  function: 'AVG' | 'SUM' | 'COUNT' | 'MIN' | 'MAX'
+  /** 집계 함수 (AVG, SUM, COUNT, MIN, MAX, 백분위 P50/P75/P95/P99) */
+  function: 'AVG' | 'SUM' | 'COUNT' | 'MIN' | 'MAX' | 'P50' | 'P75' | 'P95' | 'P99'
 
   /** 결과 컬럼 별칭 (선택사항) */
   alias?: string
 }
 
+/**
+ * 차원 필터 조건 (SQL WHERE 절로 처리, 값은 파라미터 바인딩)
+ */
+export type FilterValue = string | number
+
+export interface FilterClause {
+  /** 조건 컬럼명 */
+  column: string
+
+  /** 연산자 (range는 min/max 양 끝 포함, is_null의 value가 false면 IS NOT NULL) */
+  op: 'eq' | 'in' | 'not_in' | 'range' | 'is_null'
+
+  /** eq 비교 값 / is_null 여부 */
+  value?: FilterValue | boolean
+
+  /** in / not_in 값 목록 */
+  values?: FilterValue[]
+
+  /** range 하한 (선택사항) */
+  min?: FilterValue
+
+  /** range 상한 (선택사항) */
+  max?: FilterValue
+}
+
 /**
  * 데이터 조회 요청 인터페이스
  *
@@ -52,6 +77,100 @@ export interface DataQueryRequest {
 
   /** 집계 함수 배열 */
   aggregations?: AggregationField[]
+
+  /** 차원 필터 (모든 조건을 AND로 결합) */
+  filters?: FilterClause[]
+
+  /** 상위 N개 그룹만 조회하고 나머지는 "기타" 1행으로 합침 (columns + aggregations 필요) */
+  top_n?: number
+
+  /** 상위 N개 순위 기준 집계 별칭 (기본값: 첫 번째 집계) */
+  top_n_by?: string
+
+  /** "기타" 행 포함 여부 (기본값: true) */
+  top_n_others?: boolean
+
+  /** "기타" 행의 그룹 컬럼 값 (기본값: '기타') */
+  top_n_label?: string
+
+  /** 응답 형식 (기본값: 'rows') */
+  format?: DataQueryFormat
+
+  /** 스트리밍 응답 (대용량 조회, limit 상한 증가 / 캐시 미사용) */
+  stream?: boolean
+
+  /** 계열별 최대 점 수 (라인/영역 차트, 초과 시 서버 측 다운샘플링) */
+  max_points?: number
+
+  /** 다운샘플링 방식 (기본값: 'lttb') */
+  downsample?: 'lttb' | 'minmax'
+
+  /** 행이 없는 날짜 bucket 채우기 (group_by_period, start_date, end_date 필요) */
+  fill?: 'null' | 'zero' | 'previous'
+
+  /** 커서 페이지네이션 (집계 없는 조회, 응답의 next_cursor로 다음 페이지 요청) */
+  paginate?: boolean
+
+  /** 이전 응답의 next_cursor (지정 시 paginate 자동 적용) */
+  cursor?: string
+
+  /** 집계 정확도 (approximate: 샘플 테이블 추정값 + {alias}_lower/{alias}_upper, AVG/SUM/COUNT만) */
+  accuracy?: 'exact' | 'approximate'
+}
+
+/**
+ * 근사 집계 정보 (accuracy: 'approximate' 또는 백분위 집계 요청인 경우)
+ */
+export interface DataQueryAccuracy {
+  /** 실제 적용된 방식 (롤업/원본 행으로 처리되면 exact) */
+  mode: 'exact' | 'approximate'
+
+  /** 백분위 추정 방식 (스케치 병합으로 계산한 경우) */
+  method?: 'tdigest'
+
+  /** t-digest 압축 계수 (스케치 병합으로 계산한 경우) */
+  compression?: number
+
+  /** 샘플 비율 (approximate인 경우) */
+  sample_rate?: number
+
+  /** 신뢰수준 (approximate인 경우, 0.95) */
+  confidence?: number
+
+  /** 추정에 사용한 샘플 행 수 (approximate인 경우) */
+  sample_rows?: number
+}
+
+/**
+ * 데이터 조회 응답 형식
+ *
+ * - rows: 행 객체 배열
+ * - columnar: 컬럼명 → 값 배열 (행마다 컬럼명이 반복되지 않아 대용량 결과에 유리)
+ * - ndjson: 행마다 JSON 한 줄 (스트리밍 전용)
+ * - arrow: Apache Arrow IPC 스트림 (스트리밍 전용, 분석 도구용)
+ */
+export type DataQueryFormat = 'rows' | 'columnar' | 'ndjson' | 'arrow'
+
+/**
+ * 조회 우선순위 (X-Query-Priority 헤더)
+ *
+ * - interactive: 에디터 (동시 실행 슬롯 전부 사용, staff 로그인 세션만)
+ * - viewer: 리포트 조회 (기본값, 슬롯의 75%까지)
+ * - batch: 일괄 생성/자동화 (슬롯의 50%까지)
+ *
+ * 우선순위는 서버가 정하며 헤더는 그보다 낮출 때만 적용됩니다.
+ */
+export type DataQueryPriority = 'interactive' | 'viewer' | 'batch'
+
+/**
+ * 비용 제한으로 근사 집계로 낮춘 응답 정보
+ */
+export interface DataQueryCostGuard {
+  downgraded: true
+  budget: 'max_examined_rows'
+  limit: number
+  estimated_rows: number
+  data_source: string
 }
 
 /**
@@ -66,6 +185,139 @@ export interface DataQueryResponse {
 
   /** 조회한 테이블명 */
   table_name: string
+
+  /** 다음 페이지 커서 (paginate 요청인 경우, 마지막 페이지는 null) */
+  next_cursor?: string | null
+
+  /** 상위 N개 + "기타" 정보 (top_n 요청인 경우) */
+  top_n?: DataQueryTopN
+
+  /** 빈 구간 채우기 정보 (fill 요청인 경우) */
+  fill?: DataQueryFill
+
+  /** 다운샘플링 전 건수 (max_points로 줄어든 경우) */
+  original_count?: number
+
+  /** 적용된 다운샘플링 방식 (max_points로 줄어든 경우) */
+  downsample?: 'lttb' | 'minmax'
+
+  /** 근사 집계 정보 (accuracy: 'approximate' 또는 백분위 집계 요청인 경우) */
+  accuracy?: DataQueryAccuracy
+
+  /** 조회 비용 예산 초과로 근사 집계로 낮춰 응답한 경우 */
+  cost_guard?: DataQueryCostGuard
+}
+
+/**
+ * 빈 구간 채우기 정보
+ */
+export interface DataQueryFill {
+  /** 채우기 방식 */
+  method: 'null' | 'zero' | 'previous'
+
+  /** 채운 행 수 */
+  filled: number
+
+  /** 채우지 않은 이유 (결과가 DATA_QUERY_FILL_MAX_ROWS 초과) */
+  skipped?: 'max_rows'
+}
+
+/**
+ * 상위 N개 + "기타" 정보
+ */
+export interface DataQueryTopN {
+  /** 요청한 상위 그룹 수 */
+  n: number
+
+  /** 순위 기준 집계 별칭 */
+  by: string
+
+  /** "기타" 행으로 합친 그룹 수 */
+  others_groups: number
+}
+
+/**
+ * 컬럼 형식 데이터 조회 응답 인터페이스 (format: 'columnar')
+ *
+ * @example
+ * { columns: ['date', 'revenue'], data: { date: ['2025-01-01'], revenue: [10000] }, count: 1 }
+ */
+export interface DataQueryColumnarResponse {
+  /** 컬럼명 배열 (조회 순서) */
+  columns: string[]
+
+  /** 컬럼명 → 값 배열 */
+  data: Record<string, Array<string | number | null>>
+
+  /** 조회된 데이터 건수 */
+  count: number
+
+  /** 조회한 테이블명 */
+  table_name: string
+
+  /** 다음 페이지 커서 (paginate 요청인 경우, 마지막 페이지는 null) */
+  next_cursor?: string | null
+
+  /** 상위 N개 + "기타" 정보 (top_n 요청인 경우) */
+  top_n?: DataQueryTopN
+
+  /** 빈 구간 채우기 정보 (fill 요청인 경우) */
+  fill?: DataQueryFill
+
+  /** 다운샘플링 전 건수 (max_points로 줄어든 경우) */
+  original_count?: number
+
+  /** 적용된 다운샘플링 방식 (max_points로 줄어든 경우) */
+  downsample?: 'lttb' | 'minmax'
+
+  /** 근사 집계 정보 (accuracy: 'approximate' 또는 백분위 집계 요청인 경우) */
+  accuracy?: DataQueryAccuracy
+
+  /** 조회 비용 예산 초과로 근사 집계로 낮춰 응답한 경우 */
+  cost_guard?: DataQueryCostGuard
+}
+
+/**
+ * 일괄 데이터 조회 요청 인터페이스
+ *
+ * POST /api/data-sources/query/batch/
+ */
+export interface DataQueryBatchRequest {
+  /** 차트 ID → 데이터 조회 요청 */
+  queries: Record<string, DataQueryRequest>
+}
+
+/**
+ * 일괄 조회 성공 결과
+ */
+export interface DataQueryBatchSuccess extends DataQueryResponse {
+  status: 200
+
+  /** 결과 캐시 적중 여부 (COALESCED: 동시에 실행된 같은 조회의 결과 공유) */
+  cache: 'HIT' | 'MISS' | 'COALESCED'
+}
+
+/**
+ * 일괄 조회 실패 결과 (다른 차트 결과에는 영향 없음)
+ */
+export interface DataQueryBatchFailure extends ApiErrorResponse {
+  status: number
+
+  /** 요청 검증 실패 상세 */
+  details?: Record<string, unknown>
+}
+
+export type DataQueryBatchItem = DataQueryBatchSuccess | DataQueryBatchFailure
+
+/**
+ * 일괄 데이터 조회 응답 인터페이스
+ */
+export interface DataQueryBatchResponse {
+  /** 차트 ID별 조회 결과 */
+  results: Record<string, DataQueryBatchItem>
+
+  /** 조회 요청 건수 */
+  count: number
 }
 
 /**
@@ -91,6 +343,33 @@ export interface ApiErrorResponse {
 
   /** 사용 가능한 컬럼 목록 (컬럼명 검증 실패 시) */
   available_columns?: string[]
+
+  /** 초과한 조회 비용 예산 (422 - 비용 제한으로 거부/중단된 경우) */
+  budget?: 'max_examined_rows' | 'max_execution_ms'
+
+  /** 예산 값 (행 수 또는 밀리초) */
+  limit?: number
+
+  /** EXPLAIN 예상 행 수 (max_examined_rows 초과인 경우) */
+  estimated_rows?: number
+
+  /** 예산을 적용한 데이터 소스 이름 */
+  data_source?: string
+
+  /** 동시 실행 대기 실패 사유 (503) */
+  reason?: 'queue_full' | 'queue_timeout'
+
+  /** 기다린 슬롯 (테이블명 또는 'global') */
+  pool?: string
+
+  /** 요청 우선순위 */
+  priority?: DataQueryPriority
+
+  /** 거부까지 기다린 시간 (밀리초) */
+  waited_ms?: number
+
+  /** 재시도까지 권장 대기 시간 (초, Retry-After 헤더와 같음) */
+  retry_after?: number
 }
 
 // ==================== 템플릿 API ====================